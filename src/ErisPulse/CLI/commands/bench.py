@@ -0,0 +1,204 @@
+"""
+Bench 命令实现
+
+在已安装的部署上运行内置基准测试场景，写出 JSON 基线并与历史基线比较
+"""
+
+import os
+import sys
+from argparse import ArgumentParser
+
+from rich.table import Table
+from rich.box import SIMPLE
+
+from ..console import console
+from ..base import Command
+
+
+class BenchCommand(Command):
+    """
+    Bench 命令
+
+    加载已安装的模块（不启动适配器），依次运行事件分发、命令、存储、SQL 构建器、
+    HTTP/WebSocket 路由与日志场景，输出吞吐量与延迟百分位
+
+    {!--< tips >!--}
+    1. 使用 --save 写出基线，使用 --baseline 与历史基线比较
+    2. 任一场景吞吐量下降超过 --threshold 或场景失败时以退出码 1 结束，便于在 CI 中使用
+    {!--< /tips >!--}
+    """
+
+    name = "bench"
+    description = "运行内置基准测试，并与历史基线比较"
+
+    def add_arguments(self, parser: ArgumentParser):
+        from ...Core.benchmark import SCENARIOS
+
+        parser.add_argument(
+            '--scenario', '-s',
+            action='append',
+            choices=list(SCENARIOS),
+            default=None,
+            dest='scenarios',
+            help='要运行的场景，可重复指定 (默认: 全部场景)'
+        )
+        parser.add_argument(
+            '--iterations', '-n',
+            type=int,
+            default=1000,
+            metavar='N',
+            help='每个场景的计时操作次数 (默认: 1000)'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=100,
+            metavar='N',
+            help='每个场景的预热操作次数 (默认: 100)'
+        )
+        parser.add_argument(
+            '--save',
+            default=None,
+            metavar='FILE',
+            help='将本次结果写入基线 JSON 文件'
+        )
+        parser.add_argument(
+            '--baseline', '-b',
+            default=None,
+            metavar='FILE',
+            help='与指定的基线 JSON 文件比较'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.1,
+            help='判定回归的吞吐量下降比例 (默认: 0.1，即 10%%)'
+        )
+        parser.add_argument(
+            '--loop',
+            choices=['asyncio', 'uvloop'],
+            default=None,
+            help='事件循环实现 (默认读取配置 ErisPulse.loop.implementation)'
+        )
+
+    def execute(self, args):
+        from ...Core.benchmark import compare_baseline, load_baseline, save_baseline
+        from ...runtime import run_event_loop
+
+        if args.iterations < 1:
+            console.print("[error]--iterations 必须大于 0[/]")
+            return
+        if not 0 < args.threshold < 1:
+            console.print("[error]--threshold 必须在 0 到 1 之间[/]")
+            return
+
+        baseline = None
+        if args.baseline:
+            if not os.path.exists(args.baseline):
+                console.print(f"[error]基线文件 [path]{args.baseline}[/] 不存在[/]")
+                return
+            try:
+                baseline = load_baseline(args.baseline)
+            except ValueError as e:
+                console.print(f"[error]{e}[/]")
+                return
+
+        result = run_event_loop(self._bench(args), args.loop)
+        if result is None:
+            sys.exit(1)
+
+        comparison = (
+            compare_baseline(result, baseline, args.threshold) if baseline else None
+        )
+        self._print_result(result, comparison)
+
+        if args.save:
+            save_baseline(result, args.save)
+            console.print(f"[success]基线已写入 [path]{args.save}[/][/]")
+
+        failed = [name for name, stats in result["scenarios"].items() if "error" in stats]
+        regressed = [item["name"] for item in comparison or [] if item["regressed"]]
+        if regressed:
+            console.print(
+                f"[error]检测到性能回归 (阈值 {args.threshold:.0%}): {', '.join(regressed)}[/]"
+            )
+        elif failed:
+            console.print(f"[error]场景运行失败: {', '.join(failed)}[/]")
+        if regressed or failed:
+            sys.exit(1)
+
+    async def _bench(self, args) -> dict | None:
+        """
+        初始化 SDK（仅加载模块）并运行基准测试
+        """
+        from ... import sdk
+        from ...Core.benchmark import BenchmarkSuite
+
+        # 复用多进程工作进程角色：只加载模块，不加载适配器
+        sdk._cluster_role = "worker"
+        try:
+            if not await sdk.init():
+                console.print("[error]SDK 初始化失败[/]")
+                return None
+            suite = BenchmarkSuite(
+                iterations=args.iterations,
+                warmup=args.warmup,
+                adapter_manager=sdk.adapter,
+                router=sdk.router,
+            )
+            return await suite.run(
+                args.scenarios,
+                on_result=lambda name, stats: console.print(
+                    f"[info]{name}: "
+                    + (stats["error"] if "error" in stats else f"{stats['ops_per_sec']:.1f} ops/s")
+                    + "[/]"
+                ),
+            )
+        finally:
+            await sdk.uninit()
+            sdk._cluster_role = None
+
+    def _print_result(self, result: dict, comparison: list[dict] | None):
+        """
+        打印基准测试结果
+        """
+        env = result["environment"]
+        table = Table(
+            title=(
+                f"基准测试 (ErisPulse {env['erispulse']}, Python {env['python']}, "
+                f"{env['loop']}, {result['iterations']} 次/场景)"
+            ),
+            box=SIMPLE,
+        )
+        table.add_column("场景")
+        table.add_column("ops/s", justify="right")
+        for key in ("p50", "p95", "p99"):
+            table.add_column(f"{key} (ms)", justify="right")
+        if comparison is not None:
+            table.add_column("吞吐量变化", justify="right")
+            table.add_column("p99 变化", justify="right")
+
+        changes = {item["name"]: item for item in comparison or []}
+        for name, stats in result["scenarios"].items():
+            if "error" in stats:
+                row = [name, f"[error]{stats['error']}[/]", "-", "-", "-"]
+            else:
+                row = [
+                    name,
+                    f"{stats['ops_per_sec']:.1f}",
+                    f"{stats['p50_ms']:.4f}",
+                    f"{stats['p95_ms']:.4f}",
+                    f"{stats['p99_ms']:.4f}",
+                ]
+            if comparison is not None:
+                item = changes.get(name, {})
+                if item.get("ops_change") is None:
+                    row += ["-", "-"]
+                else:
+                    style = "error" if item["regressed"] else "success" if item["ops_change"] > 0 else "default"
+                    row += [
+                        f"[{style}]{item['ops_change']:+.1%}[/]",
+                        f"{item['p99_change']:+.1%}",
+                    ]
+            table.add_row(*row)
+        console.print(table)
@@ -0,0 +1,152 @@
+"""
+Replay 命令实现
+
+将录制的事件回放到已安装的模块，报告吞吐量与延迟百分位
+"""
+
+import json
+import os
+from argparse import ArgumentParser
+from itertools import islice
+
+from rich.table import Table
+from rich.box import SIMPLE
+
+from ..console import console
+from ..base import Command
+
+
+class ReplayCommand(Command):
+    """
+    Replay 命令
+
+    加载已安装的模块（不启动适配器），以桩适配器接收发送，按指定倍速回放录制的事件
+
+    {!--< tips >!--}
+    录制文件由事件录制器生成（配置 ErisPulse.recorder.enabled），可以是单个分段文件或分段目录
+    {!--< /tips >!--}
+    """
+
+    name = "replay"
+    description = "回放录制的事件，用于压测与性能回归"
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.add_argument(
+            'file',
+            help='录制文件或录制目录'
+        )
+        parser.add_argument(
+            '--speed',
+            default='max',
+            help='回放速度：max（尽可能快）或倍速，如 10x (默认: max)'
+        )
+        parser.add_argument(
+            '--platform',
+            default=None,
+            help='将事件平台改写为指定平台，如 mock (默认保持录制时的平台)'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            metavar='N',
+            help='最多回放的事件数'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=64,
+            metavar='N',
+            help='max 速度下的最大并发事件数 (默认: 64)'
+        )
+        parser.add_argument(
+            '--output', '-o',
+            default=None,
+            help='将回放报告写入 JSON 文件'
+        )
+        parser.add_argument(
+            '--loop',
+            choices=['asyncio', 'uvloop'],
+            default=None,
+            help='事件循环实现 (默认读取配置 ErisPulse.loop.implementation)'
+        )
+
+    def execute(self, args):
+        from ...Core.recorder import parse_speed, read_recording
+
+        if not os.path.exists(args.file):
+            console.print(f"[error]录制文件 [path]{args.file}[/] 不存在[/]")
+            return
+        try:
+            parse_speed(args.speed)
+        except ValueError as e:
+            console.print(f"[error]{e}[/]")
+            return
+        if args.concurrency < 1:
+            console.print("[error]--concurrency 必须大于 0[/]")
+            return
+
+        records = list(islice(read_recording(args.file), args.limit))
+        if not records:
+            console.print("[warning]录制文件中没有事件[/]")
+            return
+
+        from ...runtime import run_event_loop
+
+        report = run_event_loop(self._replay(records, args), args.loop)
+        if report is None:
+            return
+
+        self._print_report(report)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            console.print(f"[success]回放报告已写入 [path]{args.output}[/][/]")
+
+    async def _replay(self, records: list, args) -> dict | None:
+        """
+        初始化 SDK（仅加载模块）并执行回放
+        """
+        from ... import sdk
+        from ...Core.recorder import EventReplayer
+
+        # 复用多进程工作进程角色：只加载模块，不加载适配器
+        sdk._cluster_role = "worker"
+        try:
+            if not await sdk.init():
+                console.print("[error]SDK 初始化失败[/]")
+                return None
+            replayer = EventReplayer(
+                records,
+                speed=args.speed,
+                platform=args.platform,
+                concurrency=args.concurrency,
+                adapter_manager=sdk.adapter,
+            )
+            console.print(
+                f"[info]回放 {len(records)} 个事件 (速度: {args.speed})...[/]"
+            )
+            return await replayer.run()
+        finally:
+            await sdk.uninit()
+            sdk._cluster_role = None
+
+    def _print_report(self, report: dict):
+        """
+        打印回放报告
+        """
+        table = Table(title="回放报告", box=SIMPLE)
+        table.add_column("指标")
+        table.add_column("值", justify="right")
+
+        latency = report["latency_ms"]
+        table.add_row("事件数", str(report["events"]))
+        table.add_row("失败数", str(report["errors"]))
+        table.add_row("速度", report["speed"])
+        table.add_row("耗时", f"{report['duration_s']:.3f}s")
+        table.add_row("吞吐量", f"{report['throughput']:.1f} 事件/秒")
+        for key in ("avg", "p50", "p95", "p99", "max"):
+            table.add_row(f"延迟 {key}", f"{latency[key]:.3f}ms")
+        table.add_row("发送消息数", str(report["sends"]))
+        table.add_row("API 调用数", str(report["api_calls"]))
+        console.print(table)
@@ -1,7 +1,7 @@
 """
 Run 命令实现
 
-直接运行主程序，支持热重载模式
+直接运行主程序，支持热重载模式、多进程分片模式与事件循环实现选择
 """
 
 import os
@@ -77,21 +77,46 @@ class RunCommand(Command):
             default=False,
             help='启用热重载模式'
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            metavar='N',
+            help='工作进程数，大于 1 时按会话分片到多个进程运行 (不支持热重载)'
+        )
+        parser.add_argument(
+            '--loop',
+            choices=['asyncio', 'uvloop'],
+            default=None,
+            help='事件循环实现 (默认读取配置 ErisPulse.loop.implementation)'
+        )
     
     def execute(self, args):
         script = args.script
         reload_mode = args.reload
+        workers = args.workers
+        loop_implementation = args.loop
+
+        if workers < 1:
+            console.print("[error]--workers 必须大于 0[/]")
+            return
+        if workers > 1:
+            if reload_mode:
+                console.print("[error]多进程模式不支持热重载，请去掉 --reload[/]")
+                return
+            self._run_cluster(workers, loop_implementation)
+            return
         
         if script:
             if not os.path.exists(script):
                 console.print(f"[error]脚本 [path]{script}[/] 不存在[/]")
                 console.print("[info]使用 [cyan]epsdk init[/cyan] 创建新项目[/]")
                 return
-            self._run_script(script, reload_mode)
+            self._run_script(script, reload_mode, loop_implementation)
         else:
-            self._run_internal(reload_mode)
+            self._run_internal(reload_mode, loop_implementation)
 
-    def _run_internal(self, reload_mode: bool):
+    def _run_internal(self, reload_mode: bool, loop_implementation: str | None = None):
         """
         直接运行 SDK（不指定脚本时）
         """
@@ -104,8 +129,10 @@ class RunCommand(Command):
 
             await sdk.run(keep_running=True)
 
+        from ...runtime import run_event_loop
+
         try:
-            asyncio.run(_run())
+            run_event_loop(_run(), loop_implementation)
         except KeyboardInterrupt:
             pass
         finally:
@@ -113,7 +140,24 @@ class RunCommand(Command):
                 self._observer.stop()
                 self._observer.join()
 
-    def _run_script(self, script_path: str, reload_mode: bool):
+    def _run_cluster(self, workers: int, loop_implementation: str | None = None):
+        """
+        以多进程分片模式运行 SDK
+        """
+        from ...Core.cluster import run_cluster
+        from ...runtime import run_event_loop
+
+        console.print(Panel(
+            f"[bold]多进程分片模式[/]\n工作进程数: {workers}",
+            title="集群运行",
+            border_style="info"
+        ))
+        try:
+            run_event_loop(run_cluster(workers, loop_implementation), loop_implementation)
+        except KeyboardInterrupt:
+            pass
+
+    def _run_script(self, script_path: str, reload_mode: bool, loop_implementation: str | None = None):
         """
         运行指定脚本文件
         """
@@ -127,8 +171,10 @@ class RunCommand(Command):
 
             await sdk.run(keep_running=True)
 
+        from ...runtime import run_event_loop
+
         try:
-            asyncio.run(_run())
+            run_event_loop(_run(), loop_implementation)
         except KeyboardInterrupt:
             pass
         finally:
@@ -10,10 +10,18 @@ ErisPulse 适配器基础模块
 """
 
 import asyncio
+import inspect
 from abc import ABC, abstractmethod
 from typing import Any
 from collections.abc import Awaitable
 
+from ..balancer import balance_send_method
+from ..outbox import outbox_send_method
+from ..tracing import trace_call_api, trace_send_method
+
+# 不需要追踪的链式配置方法
+_SEND_CHAIN_METHODS = frozenset(("To", "Using", "Account"))
+
 
 class SendDSL:
     """
@@ -48,6 +56,24 @@ class SendDSL:
         self._target_to = target_id
         self._account_id = account_id
 
+    def __init_subclass__(cls, **kwargs):
+        """
+        {!--< internal-use >!--}
+        为子类实现的发送方法添加追踪插桩、发件箱拦截与多账号选择
+        """
+        super().__init_subclass__(**kwargs)
+        for name, value in list(cls.__dict__.items()):
+            if (
+                name.startswith("_")
+                or name in _SEND_CHAIN_METHODS
+                or not inspect.isfunction(value)
+                or getattr(value, "__erispulse_traced__", False)
+            ):
+                continue
+            # 账号选择在发件箱之内：补发时按当时在线的账号重新选择
+            wrapped = outbox_send_method(balance_send_method(value, name), name)
+            setattr(cls, name, trace_send_method(wrapped, name))
+
     def __getattr__(self, name: str):
         """
         动态属性访问处理，实现大小写不敏感调用
@@ -308,6 +334,20 @@ class BaseAdapter(ABC):
 
             return asyncio.create_task(_send_raw())
 
+    _MEDIA_SEGMENT_TYPES = frozenset(("image", "audio", "video", "file"))
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        {!--< internal-use >!--}
+        为子类实现的 call_api 添加追踪插桩
+        """
+        super().__init_subclass__(**kwargs)
+        call_api = cls.__dict__.get("call_api")
+        if inspect.iscoroutinefunction(call_api) and not getattr(
+            call_api, "__erispulse_traced__", False
+        ):
+            cls.call_api = trace_call_api(call_api)
+
     def __init__(self):
         self.Send = self.__class__.Send(self)
 
@@ -341,6 +381,120 @@ class BaseAdapter(ABC):
         """
         raise NotImplementedError("适配器必须实现shutdown方法")
 
+    async def health(self) -> bool:
+        """
+        健康检查（可选实现）
+
+        适配器启动后，AdapterManager 会按 supervisor.health_interval 周期调用此方法，
+        返回 False、抛出异常或超时均视为一次失败，连续失败达到阈值时自动重启适配器。
+        未重写此方法的适配器不会被探活。
+
+        :return: 适配器是否健康（如连接是否仍然存活）
+
+        :example:
+        >>> async def health(self) -> bool:
+        >>>     return self._ws is not None and not self._ws.closed
+        """
+        return True
+
+    # ==================== 媒体上传 ====================
+
+    async def upload_media(self, media_type: str, file: Any, **kwargs: Any) -> str:
+        """
+        上传媒体并返回平台文件ID或URL（可选实现）
+
+        实现后即可通过 resolve_media() / resolve_media_segments() 获得自动的上传缓存
+
+        {!--< tips >!--}
+        file 可能是 MediaSource，推荐使用 file.as_payload() 流式上传（如 aiohttp.FormData），
+        仅在平台要求完整字节时才调用 await file.read()
+        {!--< /tips >!--}
+
+        :param media_type: 媒体类型（image/audio/video/file）
+        :param file: 媒体内容（字节数据、本地文件路径或 MediaSource）
+        :param kwargs: 平台特定参数
+        :return: 平台文件ID或URL
+        :raises NotImplementedError: 适配器未实现媒体上传时抛出
+        """
+        raise NotImplementedError(f"适配器 {self.__class__.__name__} 未实现 upload_media 方法")
+
+    def _media_scope(self) -> str:
+        """
+        {!--< internal-use >!--}
+        获取媒体缓存作用域（优先使用注册的平台名）
+        """
+        from ..adapter import adapter
+
+        for platform, instance in adapter._adapters.items():
+            if instance is self:
+                return platform
+        return self.__class__.__name__
+
+    async def resolve_media(
+        self,
+        media_type: str,
+        file: Any,
+        *,
+        ttl: float | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """
+        获取媒体对应的平台文件ID，相同内容只会上传一次
+
+        :param media_type: 媒体类型（image/audio/video/file）
+        :param file: 媒体内容（字节数据、本地文件路径或 MediaSource）
+        :param ttl: 缓存有效期(秒)，None 表示使用配置中的 media.cache_ttl
+        :param kwargs: 透传给 upload_media 的参数
+        :return: 平台文件ID或URL
+
+        :example:
+        >>> # 适配器 Send 实现中
+        >>> file_id = await self._adapter.resolve_media("image", image_bytes)
+        """
+        from ..media import media_cache
+
+        async def _upload(f):
+            return await self.upload_media(media_type, f, **kwargs)
+
+        return await media_cache.get_or_upload(
+            self._media_scope(), file, _upload, media_type=media_type, ttl=ttl
+        )
+
+    async def resolve_media_segments(
+        self, message: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """
+        将 OneBot12 消息段中的字节数据/本地文件/MediaSource 替换为平台文件ID
+
+        适用于 Raw_ob12 实现：MessageBuilder 构建的 image/audio/video/file 消息段
+        在发送前统一经过缓存上传，URL 等字符串内容保持原样
+
+        :param message: OneBot12 消息段列表
+        :return: 替换后的新消息段列表（不修改原列表）
+        """
+        from ..media import MediaCache, MediaSource
+
+        resolved = []
+        for segment in message:
+            data = segment.get("data") or {}
+            file = data.get("file")
+            # URL、平台文件ID等字符串 make_key 返回 None，保持原样
+            if (
+                segment.get("type") in self._MEDIA_SEGMENT_TYPES
+                and (
+                    isinstance(file, (bytes, bytearray, memoryview, MediaSource))
+                    or (isinstance(file, str) and MediaCache.make_key(file) is not None)
+                )
+            ):
+                try:
+                    file_id = await self.resolve_media(segment["type"], file)
+                except NotImplementedError:
+                    resolved.append(segment)
+                    continue
+                segment = {**segment, "data": {**data, "file": file_id}}
+            resolved.append(segment)
+        return resolved
+
     async def emit(self, *args, **kwargs):
         raise NotImplementedError(
             "适配器的 emit 方法已被弃用。请使用 adapter.emit() 通过 AdapterManager 提交事件。"
@@ -25,8 +25,13 @@ from .wrapper import (
     unregister_event_method,
     unregister_platform_event_methods,
     get_platform_event_methods,
+    get_event_class,
 )
 from .message_builder import MessageBuilder
+from .record import EventRecord, LazyRaw
+from .filters import EventFilter
+from .base import get_handler_stats
+from .metrics import LatencyHistogram
 from .session_type import (
     # 标准类型常量
     RECEIVE_TYPES,
@@ -41,6 +46,11 @@ from .session_type import (
     get_receive_type,
     convert_to_send_type,
     convert_to_receive_type,
+    resolve_session_type,
+    
+    # 会话键
+    SessionKey,
+    get_session_key,
     
     # 自动推断方法
     infer_receive_type,
@@ -76,6 +86,11 @@ __all__ = [
     "request",
     "meta",
     "Event",
+    "EventRecord",
+    "LazyRaw",
+    "EventFilter",
+    "LatencyHistogram",
+    "get_handler_stats",
     "Conversation",
     "CONFIRM_YES_WORDS",
     "CONFIRM_NO_WORDS",
@@ -89,6 +104,9 @@ __all__ = [
     "get_receive_type",
     "convert_to_send_type",
     "convert_to_receive_type",
+    "resolve_session_type",
+    "SessionKey",
+    "get_session_key",
     "infer_receive_type",
     "get_target_id",
     "get_send_type_and_target_id",
@@ -103,4 +121,5 @@ __all__ = [
     "unregister_event_method",
     "unregister_platform_event_methods",
     "get_platform_event_methods",
+    "get_event_class",
 ]
@@ -10,34 +10,247 @@ ErisPulse 事件处理基础模块
 """
 
 from .. import adapter, logger
-from ...runtime import get_event_config
+from ..executor import executor
+from ..quota import quota, ModuleQuota
+from ..tracing import tracer
+from ...runtime import get_event_config, get_handler_config
 from typing import Any
 from collections.abc import Callable
 import asyncio
+import heapq
 import inspect
+import time
+import weakref
 from itertools import groupby
+from .filters import EventFilter
+from .metrics import LatencyHistogram
+from .triggers import KeywordTrigger, RegexTrigger, TriggerEngine
 from .wrapper import Event
 
 
 _sentinel = object()
 
+# 装饰器关键字参数中属于处理器选项的键，其余视为过滤字段
+HANDLER_OPTIONS = ("timeout", "offload", "executor")
 
-async def _invoke_handler(handler_info: dict, event: Event) -> None:
+# 处理器可声明的执行方式
+HANDLER_EXECUTORS = ("inline", "thread", "process")
+
+# 所有事件处理器实例，用于汇总耗时统计
+_handler_registry: "weakref.WeakSet[BaseEventHandler]" = weakref.WeakSet()
+
+
+def handler_options(options: dict[str, Any], **fixed_filters) -> dict[str, Any]:
+    """
+    {!--< internal-use >!--}
+    将装饰器关键字参数拆分为 register() 的参数：处理器选项原样传递，其余作为过滤字段
+
+    :param options: 装饰器关键字参数
+    :param fixed_filters: 装饰器固定的过滤字段（如 detail_type），可被 options 覆盖
+    :return: register() 关键字参数
+    """
+    kwargs = {key: options[key] for key in HANDLER_OPTIONS if key in options}
+    kwargs["filters"] = {
+        **fixed_filters,
+        **{key: value for key, value in options.items() if key not in HANDLER_OPTIONS},
+    }
+    return kwargs
+
+
+def resolve_executor_option(
+    func: Callable, executor_name: str | None, offload: bool | None
+) -> bool | None:
+    """
+    {!--< internal-use >!--}
+    校验处理器声明的执行方式，并换算为 offload 选项
+
+    :param func: 处理器函数
+    :param executor_name: 执行方式（inline / thread / process），None 表示未声明
+    :param offload: 处理器声明的 offload 选项
+    :return: 换算后的 offload 选项
+    :raises ValueError: 执行方式无效，或异步函数声明了 executor="process"
+    """
+    if executor_name is None:
+        return offload
+    if executor_name not in HANDLER_EXECUTORS:
+        raise ValueError(
+            f"executor 必须是 {HANDLER_EXECUTORS} 之一，收到: {executor_name!r}"
+        )
+    if executor_name == "process":
+        if inspect.iscoroutinefunction(func):
+            raise ValueError(f"异步函数无法在进程池中执行: {_handler_name(func)}")
+        executor.process_requested = True
+        return offload
+    return executor_name == "thread"
+
+
+async def reply_result(event: Event, result: Any) -> None:
+    """
+    {!--< internal-use >!--}
+    将进程池中处理器的返回值回复到事件来源
+
+    :param event: 事件对象
+    :param result: 返回值：字符串按文本回复，列表/字典按 OneBot12 消息段回复，None 不回复
+    """
+    if result is None:
+        return
+    if isinstance(result, str):
+        await event.reply(result)
+    elif isinstance(result, (list, dict)):
+        await event.reply_ob12(result)
+    else:
+        logger.warning(f"进程池处理器返回了无法回复的结果类型: {type(result).__name__}")
+
+
+async def _run_in_process(handler: Callable, event: Event) -> None:
+    """
+    {!--< internal-use >!--}
+    在进程池中执行处理器并回复其返回值
+    """
+    await reply_result(event, await executor.run_with_event(handler, event))
+
+
+def _handler_name(handler: Callable) -> str:
+    """
+    {!--< internal-use >!--}
+    获取处理器的限定名称（模块.限定名）
+    """
+    module = getattr(handler, "__module__", None) or "?"
+    qualname = getattr(handler, "__qualname__", None) or repr(handler)
+    return f"{module}.{qualname}"
+
+
+async def _invoke_handler(
+    handler_info: dict,
+    event: Event,
+    timeout: float | None = None,
+    slow_threshold: float = 0,
+) -> None:
     """
     {!--< internal-use >!--}
     执行单个事件处理器
 
+    同步处理器按执行器策略在事件循环或线程池中执行；超时的处理器停止等待（异步处理器会被取消）；
+    超过慢处理阈值时输出带处理器名称和所属模块的告警；每次执行的耗时记录到处理器的延迟直方图；
+    启用模块配额时先获取所属模块的执行名额（不占用配额的分发器除外），排队已满时丢弃本次调用
+
     :param handler_info: 处理器信息字典
     :param event: 事件对象
+    :param timeout: 默认超时（秒），处理器注册时指定的 timeout 优先
+    :param slow_threshold: 慢处理器告警阈值（秒），0 表示不告警
     """
-    handler = handler_info["func"]
+    owner = handler_info.get("owner")
+    if not quota.enabled or owner is None:
+        await _run_handler(handler_info, event, timeout, slow_threshold, None)
+        return
+
+    module_quota = quota.get(owner)
+    if not await module_quota.acquire():
+        quota.on_shed(module_quota, event.get("type", "unknown"))
+        return
+    start = time.perf_counter()
     try:
-        if inspect.iscoroutinefunction(handler):
-            await handler(event)
-        else:
-            handler(event)
-    except Exception as e:
-        logger.error(f"事件处理器执行错误: {e}")
+        await _run_handler(handler_info, event, timeout, slow_threshold, module_quota)
+    finally:
+        module_quota.release(time.perf_counter() - start)
+
+
+async def _run_handler(
+    handler_info: dict,
+    event: Event,
+    timeout: float | None,
+    slow_threshold: float,
+    module_quota: ModuleQuota | None,
+) -> None:
+    """
+    {!--< internal-use >!--}
+    执行单个事件处理器并记录耗时，module_quota 不为 None 且启用 CPU 统计时记录 CPU 时间
+    """
+    handler = handler_info["func"]
+    accounted = module_quota is not None and quota.cpu_accounting
+    if (handler_timeout := handler_info.get("timeout")) is not None:
+        timeout = handler_timeout
+    stats = handler_info.get("stats")
+    start = time.perf_counter()
+    with tracer.span(
+        "handler", "handler", handler=handler, module=handler_info.get("module"),
+        priority=handler_info.get("priority"),
+    ) as span:
+        try:
+            if inspect.iscoroutinefunction(handler):
+                call = handler(event)
+                if accounted:
+                    call = module_quota.accounted(call)
+            elif handler_info.get("executor") == "process":
+                call = _run_in_process(handler, event)
+            elif executor.should_offload(handler_info.get("offload")):
+                call = executor.run_in_thread(
+                    module_quota.timed(handler) if accounted else handler, event
+                )
+            elif accounted:
+                call = None
+                module_quota.timed(handler)(event)
+            else:
+                call = None
+                handler(event)
+            if call is not None:
+                if timeout:
+                    await asyncio.wait_for(call, timeout)
+                else:
+                    await call
+        except asyncio.TimeoutError as e:
+            if span is not None:
+                span.set_error(e)
+            if stats is not None:
+                stats.timeouts += 1
+            logger.warning(
+                f"事件处理器执行超时（{timeout}s），已停止等待: {_handler_name(handler)} "
+                f"(模块: {handler_info.get('module')})"
+            )
+        except Exception as e:
+            if span is not None:
+                span.set_error(e)
+            if stats is not None:
+                stats.errors += 1
+            logger.error(f"事件处理器执行错误: {e}")
+        finally:
+            elapsed = time.perf_counter() - start
+            if stats is not None:
+                stats.record(elapsed)
+            if slow_threshold and elapsed >= slow_threshold:
+                logger.warning(
+                    f"事件处理器执行缓慢（{elapsed:.3f}s）: {_handler_name(handler)} "
+                    f"(模块: {handler_info.get('module')})"
+                )
+
+
+def get_handler_stats(sort_by: str = "p99_ms") -> list[dict[str, Any]]:
+    """
+    获取所有事件处理器的耗时统计
+
+    :param sort_by: 排序字段（降序），如 p99_ms / avg_ms / count / timeouts
+    :return: 统计列表，每项包含处理器名称、事件类型、所属模块及耗时分布（毫秒）
+
+    :example:
+    >>> for item in get_handler_stats()[:5]:
+    >>>     print(item["handler"], item["module"], item["p99_ms"])
+    """
+    result = []
+    for event_handler in list(_handler_registry):
+        for handler_info in event_handler.handlers:
+            if (stats := handler_info.get("stats")) is None:
+                continue
+            result.append(
+                {
+                    "handler": _handler_name(handler_info["func"]),
+                    "event_type": event_handler.event_type,
+                    "module": handler_info.get("module"),
+                    "priority": handler_info["priority"],
+                    **stats.to_dict(),
+                }
+            )
+    result.sort(key=lambda item: item.get(sort_by, 0), reverse=True)
+    return result
 
 class BaseEventHandler:
     """
@@ -61,6 +274,22 @@ class BaseEventHandler:
         self.handlers: list[dict] = []
         self._handler_map = {}  # 用于快速查找处理器
 
+        # 过滤条件索引：{字段: {值: [(顺序, 处理器信息)]}}，None 表示需要重建
+        self._filter_index: dict[str, dict[str, list[tuple[int, dict]]]] | None = None
+        # 没有可索引过滤条件的处理器，每个事件都需要检查
+        self._unindexed: list[tuple[int, dict]] = []
+        # 关键词/正则触发引擎及其处理器 {顺序: 处理器信息}
+        self._trigger_engine: TriggerEngine | None = None
+        self._trigger_handlers: dict[int, dict] = {}
+
+        # 从配置获取处理器默认超时与慢处理告警阈值
+        handler_config = get_handler_config()
+        self.default_timeout = handler_config.get("timeout", 0)
+        self.slow_threshold = handler_config.get("slow_threshold", 1.0)
+
+        _handler_registry.add(self)
+        self._indexed_count = 0
+
         # 是否已将 self._process_event 挂载到适配器事件总线（adapter._onebot_handlers）。
         #
         # 当 adapter.shutdown() 或 adapter.clear() 清空事件总线后，
@@ -69,7 +298,16 @@ class BaseEventHandler:
         self._linked_to_adapter_bus: bool = False
 
     def register(
-        self, handler: Callable, priority: int = 0, condition: Callable = None
+        self,
+        handler: Callable,
+        priority: int = 0,
+        condition: Callable = None,
+        filters: EventFilter | dict[str, Any] | None = None,
+        trigger: KeywordTrigger | RegexTrigger | None = None,
+        timeout: float | None = None,
+        offload: bool | None = None,
+        executor: str | None = None,
+        quota_exempt: bool = False,
     ):
         """
         注册事件处理器
@@ -77,17 +315,34 @@ class BaseEventHandler:
         :param handler: 事件处理器函数
         :param priority: 处理器优先级，数值越小优先级越高
         :param condition: 处理器条件函数，返回True时才会执行处理器
+        :param filters: 声明式过滤条件（EventFilter 或字段字典），会被索引，先于 condition 检查
+        :param trigger: 关键词/正则触发条件，所有处理器的触发条件合并为一次文本扫描
+        :param timeout: 超时时间（秒），超时后停止等待（异步处理器会被取消）；None 使用全局默认值，0 表示不限制
+        :param offload: 同步处理器及条件函数是否投递到线程池执行；None 遵循执行器策略
+        :param executor: 处理器执行方式：inline / thread / process；
+                         process 表示在进程池中以事件快照执行同步处理器，返回值作为回复发送
+        :param quota_exempt: 不占用模块配额（供自行按实际处理函数计算配额的框架分发器使用，如命令分发器）
+        :raises ValueError: 执行方式无效
         """
+        offload = resolve_executor_option(handler, executor, offload)
         handler_info = {
             "func": handler,
             "priority": priority,
             "condition": condition,
+            "filter": EventFilter.coerce(filters),
+            "trigger": trigger,
+            "timeout": timeout,
+            "offload": offload,
+            "executor": executor,
+            "stats": LatencyHistogram(),
             "module": self.module_name,
+            "owner": None if quota_exempt else quota.owner_of(handler),
         }
         self.handlers.append(handler_info)
         self._handler_map[id(handler)] = handler_info
         # 按优先级排序
         self.handlers.sort(key=lambda x: x["priority"])
+        self._filter_index = None
 
         # 注册到适配器
         if self.event_type and not self._linked_to_adapter_bus:
@@ -108,24 +363,125 @@ class BaseEventHandler:
         if handler_id in self._handler_map:
             self.handlers = [h for h in self.handlers if h["func"] != handler]
             del self._handler_map[handler_id]
+            self._filter_index = None
             return True
         return False
 
-    def __call__(self, priority: int = 0, condition: Callable = None):
+    def __call__(
+        self,
+        priority: int = 0,
+        condition: Callable = None,
+        filters: EventFilter | dict[str, Any] | None = None,
+        timeout: float | None = None,
+        offload: bool | None = None,
+        executor: str | None = None,
+    ):
         """
         装饰器方式注册事件处理器
 
         :param priority: 处理器优先级
         :param condition: 处理器条件函数
+        :param filters: 声明式过滤条件
+        :param timeout: 超时时间（秒）
+        :param offload: 是否投递到线程池执行
+        :param executor: 处理器执行方式（inline / thread / process）
         :return: 装饰器函数
         """
 
         def decorator(func: Callable):
-            self.register(func, priority, condition)
+            self.register(
+                func,
+                priority,
+                condition,
+                filters,
+                timeout=timeout,
+                offload=offload,
+                executor=executor,
+            )
             return func
 
         return decorator
 
+    # ==================== 过滤条件索引 ====================
+
+    def _build_filter_index(self):
+        """
+        {!--< internal-use >!--}
+        按处理器的过滤条件建立索引
+
+        每个处理器只按其最具选择性的字段索引一次，桶内保持优先级顺序；
+        带触发条件的处理器由触发引擎索引
+        """
+        index: dict[str, dict[str, list[tuple[int, dict]]]] = {}
+        unindexed: list[tuple[int, dict]] = []
+        engine = TriggerEngine()
+        trigger_handlers: dict[int, dict] = {}
+        for order, handler_info in enumerate(self.handlers):
+            if (trigger := handler_info.get("trigger")) is not None:
+                engine.add(order, trigger)
+                trigger_handlers[order] = handler_info
+                continue
+            event_filter = handler_info.get("filter")
+            field = event_filter.index_field() if event_filter else None
+            if field is None:
+                unindexed.append((order, handler_info))
+                continue
+            buckets = index.setdefault(field, {})
+            for value in getattr(event_filter, field):
+                buckets.setdefault(value, []).append((order, handler_info))
+
+        if engine:
+            engine.build()
+        self._filter_index = index
+        self._unindexed = unindexed
+        self._trigger_engine = engine if engine else None
+        self._trigger_handlers = trigger_handlers
+        self._indexed_count = len(self.handlers)
+
+    def _candidate_handlers(
+        self, event: Event, trigger_hits: dict[int, dict] | None = None
+    ) -> list[dict]:
+        """
+        {!--< internal-use >!--}
+        获取可能匹配事件的处理器（按优先级排序）
+
+        过滤条件不可能匹配、触发条件未命中的处理器不会出现在结果中，开销与匹配的处理器数量相关
+
+        :param event: 事件数据
+        :param trigger_hits: 用于接收触发信息的字典 {id(处理器信息): 触发信息}
+        :return: 候选处理器列表
+        """
+        if self._filter_index is None or self._indexed_count != len(self.handlers):
+            self._build_filter_index()
+        if not self._filter_index and self._trigger_engine is None:
+            return self.handlers
+
+        sources = [self._unindexed] if self._unindexed else []
+        for field, buckets in self._filter_index.items():
+            value = event.get(field)
+            if value is not None and (bucket := buckets.get(str(value))):
+                sources.append(bucket)
+
+        # 关键词/正则触发：单次扫描事件文本
+        if self._trigger_engine is not None and (text := event.get_text()):
+            if hits := self._trigger_engine.match(text):
+                matched = []
+                for order in sorted(hits):
+                    handler_info = self._trigger_handlers[order]
+                    matched.append((order, handler_info))
+                    if trigger_hits is not None:
+                        trigger_hits[id(handler_info)] = hits[order]
+                sources.append(matched)
+
+        if not sources:
+            return []
+        if len(sources) == 1:
+            return [handler_info for _, handler_info in sources[0]]
+        return [
+            handler_info
+            for _, handler_info in heapq.merge(*sources, key=lambda item: item[0])
+        ]
+
     async def _process_event(self, event: dict[str, Any]):
         """
         处理事件
@@ -147,29 +503,52 @@ class BaseEventHandler:
                 if ignore_self:
                     return
 
-        for _priority, group_iter in groupby(self.handlers, key=lambda h: h["priority"]):
-            group = list(group_iter)
-
-            # 过滤出满足条件的处理器
-            active = [
-                h for h in group
-                if not h.get("condition") or h["condition"](event)
-            ]
+        trigger_hits: dict[int, dict] = {}
+        candidates = self._candidate_handlers(event, trigger_hits)
+        timeout, slow_threshold = self.default_timeout, self.slow_threshold
+        for _priority, group_iter in groupby(candidates, key=lambda h: h["priority"]):
+            # 过滤出满足条件的处理器：先检查声明式过滤条件，再执行条件函数
+            active = []
+            for h in group_iter:
+                if (f := h.get("filter")) and not f.matches(event):
+                    continue
+                if (condition := h.get("condition")) is not None:
+                    if executor.should_offload(h.get("offload")):
+                        matched = await executor.run_in_thread(condition, event)
+                    else:
+                        matched = condition(event)
+                    if not matched:
+                        continue
+                active.append(h)
             if not active:
                 continue
 
             # 单个处理器：直接传原事件（零拷贝）
             if len(active) == 1:
-                await _invoke_handler(active[0], event)
+                # 触发信息只对命中的处理器可见，不写入事件数据
+                event._trigger = trigger_hits.get(id(active[0]))
+                try:
+                    await _invoke_handler(active[0], event, timeout, slow_threshold)
+                finally:
+                    event._trigger = None
                 if event.is_processed():
                     break
                 continue
 
             # 多个同优先级处理器：各自独立副本并行执行
             copies = [Event(dict(event)) for _ in active]
-            await asyncio.gather(
-                *(_invoke_handler(h, c) for h, c in zip(active, copies))
-            )
+            for h, c in zip(active, copies):
+                c._trigger = trigger_hits.get(id(h))
+            with tracer.span(
+                "priority_group", "handler", event_type=self.event_type,
+                priority=_priority, handlers=len(active),
+            ):
+                await asyncio.gather(
+                    *(
+                        _invoke_handler(h, c, timeout, slow_threshold)
+                        for h, c in zip(active, copies)
+                    )
+                )
 
             # 合并修改（后者覆盖前者）
             for copy in copies:
@@ -195,5 +574,6 @@ class BaseEventHandler:
         count = len(self.handlers)
         self.handlers.clear()
         self._handler_map.clear()
+        self._filter_index = None
         self._linked_to_adapter_bus = False
         return count
@@ -11,14 +11,29 @@ ErisPulse 命令处理模块
 {!--< /tips >!--}
 """
 
-from .base import BaseEventHandler
+from .base import BaseEventHandler, reply_result, resolve_executor_option
 from .. import adapter, logger
+from ..executor import executor
+from ..quota import quota, ModuleQuota
+from ..tracing import tracer
 from ...runtime import get_event_config
-from .session_type import get_send_type_and_target_id, infer_receive_type
+from .wrapper import Event
 from typing import Any
 from collections.abc import Callable, Awaitable
 import asyncio
 import inspect
+import time
+
+
+def _as_event(event: dict[str, Any]) -> Event:
+    """
+    {!--< internal-use >!--}
+    获取事件的 Event 视图，以复用其派生字段缓存
+
+    :param event: 事件数据
+    :return: Event 实例（原事件已是 Event 时直接返回）
+    """
+    return event if isinstance(event, Event) else Event(event)
 
 
 class CommandHandler:
@@ -50,7 +65,18 @@ class CommandHandler:
 
         # 将命令分发器 _handle_message 挂载到适配器消息事件总线
         if not self.handler._linked_to_adapter_bus:
-            self.handler.register(self._handle_message)
+            self._register_dispatcher()
+
+    def _register_dispatcher(self):
+        """
+        {!--< internal-use >!--}
+        注册命令分发器
+
+        分发器不占用模块配额，配额在执行命令时按命令处理函数所属模块获取；
+        分发器也不受全局处理器超时限制（命令中的 wait_reply 等交互可能长时间等待），
+        超时由命令的 timeout 选项单独控制
+        """
+        self.handler.register(self._handle_message, timeout=0, quota_exempt=True)
 
     def __call__(
         self,
@@ -62,6 +88,9 @@ class CommandHandler:
         help: str = None,
         usage: str = None,
         hidden: bool = False,
+        offload: bool | None = None,
+        executor: str | None = None,
+        timeout: float | None = None,
     ):
         """
         命令装饰器
@@ -74,12 +103,24 @@ class CommandHandler:
         :param help: 命令帮助信息
         :param usage: 命令使用方法
         :param hidden: 是否在帮助中隐藏命令
+        :param offload: 同步的命令处理函数及权限检查函数是否投递到线程池执行；None 遵循执行器策略
+        :param executor: 命令处理函数执行方式（inline / thread / process）；
+                         process 表示在进程池中以事件快照执行，返回值作为回复发送
+        :param timeout: 命令处理函数超时时间（秒），超时后停止等待并回复错误；None 或 0 表示不限制，
+                        不使用全局处理器超时（包含 wait_reply 等交互的命令通常需要更长时间）
         :return: 装饰器函数
+        :raises ValueError: 执行方式无效
+
+        :example:
+        >>> @command("render", executor="process")
+        >>> def render(event):
+        >>>     return draw_chart(event["command"]["args"])
         """
 
         def decorator(func: Callable):
+            cmd_offload = resolve_executor_option(func, executor, offload)
             if not self.handler._linked_to_adapter_bus:
-                self.handler.register(self._handle_message)
+                self._register_dispatcher()
 
             cmd_names = []
             if isinstance(name, str):
@@ -106,7 +147,11 @@ class CommandHandler:
                     "group": group,
                     "permission": permission,
                     "hidden": hidden,
+                    "offload": cmd_offload,
+                    "executor": executor,
+                    "timeout": timeout,
                     "main_name": main_name,
+                    "owner": quota.owner_of(func),
                 }
 
                 # 注册别名映射（name列表中的额外名称）
@@ -192,10 +237,10 @@ class CommandHandler:
         :return: 用户回复的事件数据，如果超时则返回None
         """
         platform = event.get("platform")
-        user_id = event.get("user_id")
+        view = _as_event(event)
 
-        # 使用会话类型管理模块获取发送类型和目标ID
-        send_type, target_id = get_send_type_and_target_id(event, platform)
+        # 使用事件缓存的会话信息获取发送类型和目标ID
+        send_type, target_id = view.get_send_target()
 
         # 发送提示消息（如果提供）
         if prompt and platform:
@@ -210,7 +255,7 @@ class CommandHandler:
         future = loop.create_future()
 
         # 存储等待信息
-        wait_key = f"{platform}:{user_id}:{target_id}"
+        wait_key = view.get_user_session_key()
         self._waiting_replies[wait_key] = {
             "future": future,
             "callback": callback,
@@ -220,7 +265,8 @@ class CommandHandler:
 
         try:
             # 等待回复或超时
-            result = await asyncio.wait_for(future, timeout=timeout)
+            with tracer.span("wait_reply", "wait", timeout=timeout):
+                result = await asyncio.wait_for(future, timeout=timeout)
 
             # 如果提供了回调函数，则执行
             if callback:
@@ -289,22 +335,10 @@ class CommandHandler:
 
             # 检查是否必须@机器人
             if self.must_at_bot:
-                detail_type = infer_receive_type(event)
+                view = _as_event(event)
                 # 一对一场景（private或user）不需要检查@
-                if detail_type not in ("private", "user"):
-                    message_segments = event.get("message", [])
-                    self_id = event.get("self", {}).get("user_id")
-
-                    has_mention = False
-                    for segment in message_segments:
-                        if (
-                            segment.get("type") == "mention"
-                            and segment.get("data", {}).get("user_id") == self_id
-                        ):
-                            has_mention = True
-                            break
-
-                    if not has_mention:
+                if view.get_receive_type() not in ("private", "user"):
+                    if not view.has_mention():
                         return False
 
             # 尝试执行命令
@@ -379,10 +413,8 @@ class CommandHandler:
             )
             if permission_func:
                 try:
-                    has_permission = (
-                        permission_func(event)
-                        if not inspect.iscoroutinefunction(permission_func)
-                        else await permission_func(event)
+                    has_permission = await executor.call(
+                        permission_func, event, offload=cmd_info.get("offload")
                     )
                     if not has_permission:
                         await self._send_permission_denied(event)
@@ -408,14 +440,37 @@ class CommandHandler:
             # 标记事件已被处理
             event["_processed"] = True
 
+            # 命令经由框架的消息处理器分发，模块配额按命令函数所属模块计算
+            module_quota = quota.get(cmd_info.get("owner") or "unknown") if quota.enabled else None
+            if module_quota is not None and not await module_quota.acquire():
+                quota.on_shed(module_quota, "command")
+                return True
+
+            start = time.perf_counter()
             try:
-                if inspect.iscoroutinefunction(handler):
-                    await handler(event)
-                else:
-                    handler(event)
-            except Exception as e:
-                logger.error(f"命令执行错误: {e}")
-                await self._send_command_error(event, str(e))
+                with tracer.span(
+                    "command", "command", command=actual_cmd_name, handler=handler
+                ) as span:
+                    timeout = cmd_info.get("timeout")
+                    try:
+                        call = self._execute_handler(handler, cmd_info, event, module_quota)
+                        if timeout:
+                            await asyncio.wait_for(call, timeout)
+                        else:
+                            await call
+                    except asyncio.TimeoutError as e:
+                        if span is not None:
+                            span.set_error(e)
+                        logger.warning(f"命令执行超时（{timeout}s），已停止等待: {actual_cmd_name}")
+                        await self._send_command_error(event, f"执行超时（{timeout}s）")
+                    except Exception as e:
+                        if span is not None:
+                            span.set_error(e)
+                        logger.error(f"命令执行错误: {e}")
+                        await self._send_command_error(event, str(e))
+            finally:
+                if module_quota is not None:
+                    module_quota.release(time.perf_counter() - start)
 
             return True
 
@@ -427,13 +482,7 @@ class CommandHandler:
 
         :param event: 消息事件数据
         """
-        platform = event.get("platform")
-        user_id = event.get("user_id")
-
-        # 使用会话类型管理模块获取发送类型和目标ID
-        send_type, target_id = get_send_type_and_target_id(event, platform)
-
-        wait_key = f"{platform}:{user_id}:{target_id}"
+        wait_key = _as_event(event).get_user_session_key()
 
         # 检查是否有等待的处理器
         if wait_key in self._waiting_replies:
@@ -468,8 +517,7 @@ class CommandHandler:
         try:
             platform = event.get("platform")
 
-            # 使用会话类型管理模块获取发送类型和目标ID
-            send_type, target_id = get_send_type_and_target_id(event, platform)
+            send_type, target_id = _as_event(event).get_send_target()
 
             if platform and hasattr(adapter, platform):
                 adapter_instance = getattr(adapter, platform)
@@ -479,6 +527,29 @@ class CommandHandler:
         except Exception as e:
             logger.error(f"发送权限拒绝消息失败: {e}")
 
+    async def _execute_handler(
+        self,
+        handler: Callable,
+        cmd_info: dict[str, Any],
+        event: dict[str, Any],
+        module_quota: ModuleQuota | None,
+    ) -> None:
+        """
+        {!--< internal-use >!--}
+        按命令的执行方式调用命令处理函数，module_quota 不为 None 且启用 CPU 统计时记录 CPU 时间
+        """
+        if cmd_info.get("executor") == "process":
+            await reply_result(_as_event(event), await executor.run_with_event(handler, event))
+        elif module_quota is not None and quota.cpu_accounting:
+            if inspect.iscoroutinefunction(handler):
+                await module_quota.accounted(handler(event))
+            else:
+                await executor.call(
+                    module_quota.timed(handler), event, offload=cmd_info.get("offload")
+                )
+        else:
+            await executor.call(handler, event, offload=cmd_info.get("offload"))
+
     async def _send_command_error(self, event: dict[str, Any], error: str):
         """
         发送命令错误消息
@@ -492,8 +563,7 @@ class CommandHandler:
         try:
             platform = event.get("platform")
 
-            # 使用会话类型管理模块获取发送类型和目标ID
-            send_type, target_id = get_send_type_and_target_id(event, platform)
+            send_type, target_id = _as_event(event).get_send_target()
 
             if platform and hasattr(adapter, platform):
                 adapter_instance = getattr(adapter, platform)
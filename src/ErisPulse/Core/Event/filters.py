@@ -0,0 +1,120 @@
+"""
+ErisPulse 声明式事件过滤
+
+提供可被事件处理器索引的过滤条件，替代 ``lambda e: e.get("detail_type") == "private"`` 一类的条件函数
+
+{!--< tips >!--}
+1. 每个字段接受单个值或值的集合，ID 统一按字符串比较
+2. BaseEventHandler 按过滤条件中最具选择性的字段建立索引，分发时只检查可能匹配的处理器
+3. 条件函数（condition）仍然支持，在过滤条件匹配后执行
+{!--< /tips >!--}
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+# 可过滤的字段，按索引选择性从高到低排列
+FILTER_FIELDS = ("group_id", "user_id", "detail_type", "sub_type", "platform")
+
+
+def _normalize(value: Any) -> frozenset[str] | None:
+    """
+    {!--< internal-use >!--}
+    将过滤值统一为字符串集合
+    """
+    if value is None:
+        return None
+    if isinstance(value, (str, int)):
+        return frozenset((str(value),))
+    if isinstance(value, Iterable):
+        return frozenset(str(v) for v in value)
+    return frozenset((str(value),))
+
+
+class EventFilter:
+    """
+    声明式事件过滤条件
+
+    所有指定的字段都匹配时事件才通过；同一字段的多个值之间为"或"关系
+
+    :example:
+    >>> EventFilter(detail_type="group", group_id={"123", "456"})
+    >>> @message.on_message(platform="onebot11", user_id="10001")
+    >>> async def handler(event): ...
+    """
+
+    __slots__ = (*FILTER_FIELDS, "_checks")
+
+    def __init__(
+        self,
+        *,
+        detail_type: str | Iterable[str] | None = None,
+        platform: str | Iterable[str] | None = None,
+        user_id: str | int | Iterable[str | int] | None = None,
+        group_id: str | int | Iterable[str | int] | None = None,
+        sub_type: str | Iterable[str] | None = None,
+    ):
+        """
+        :param detail_type: 详细类型
+        :param platform: 平台名称
+        :param user_id: 发送者ID
+        :param group_id: 群组ID
+        :param sub_type: 子类型
+        """
+        self.detail_type = _normalize(detail_type)
+        self.platform = _normalize(platform)
+        self.user_id = _normalize(user_id)
+        self.group_id = _normalize(group_id)
+        self.sub_type = _normalize(sub_type)
+        self._checks = tuple(
+            (field, allowed)
+            for field in FILTER_FIELDS
+            if (allowed := getattr(self, field)) is not None
+        )
+
+    @classmethod
+    def coerce(
+        cls, spec: "EventFilter | dict[str, Any] | None"
+    ) -> "EventFilter | None":
+        """
+        将过滤描述转换为 EventFilter
+
+        :param spec: EventFilter、字段字典或 None
+        :return: EventFilter，没有任何条件时返回 None
+        """
+        if spec is None or isinstance(spec, cls):
+            return spec or None
+        return cls(**spec) or None
+
+    def index_field(self) -> str | None:
+        """
+        获取用于建立索引的字段（最具选择性的已指定字段）
+
+        :return: 字段名，没有任何条件时返回 None
+        """
+        return self._checks[0][0] if self._checks else None
+
+    def matches(self, event: dict[str, Any]) -> bool:
+        """
+        检查事件是否满足过滤条件
+
+        :param event: 事件数据
+        :return: 是否匹配
+        """
+        for field, allowed in self._checks:
+            value = event.get(field)
+            if value is None or str(value) not in allowed:
+                return False
+        return True
+
+    def __bool__(self) -> bool:
+        return bool(self._checks)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(
+            f"{field}={sorted(allowed)!r}" for field, allowed in self._checks
+        )
+        return f"EventFilter({fields})"
+
+
+__all__ = ["EventFilter", "FILTER_FIELDS"]
@@ -6,13 +6,16 @@ ErisPulse 消息处理模块
 {!--< tips >!--}
 1. 支持私聊、群聊消息分类处理
 2. 支持@消息特殊处理
-3. 支持自定义条件过滤
+3. 支持声明式过滤条件（会被索引）与自定义条件函数
+4. 支持关键词/正则触发，所有触发条件合并为一次文本扫描
 {!--< /tips >!--}
 """
 
-from .base import BaseEventHandler
-from typing import Any
-from collections.abc import Callable
+from .base import BaseEventHandler, handler_options
+from .triggers import KeywordTrigger, RegexTrigger
+from .wrapper import Event
+from collections.abc import Callable, Iterable
+import re
 
 
 class MessageHandler:
@@ -25,16 +28,17 @@ class MessageHandler:
     def __init__(self):
         self.handler = BaseEventHandler("message", "message")
 
-    def on_message(self, priority: int = 0):
+    def on_message(self, priority: int = 0, **options):
         """
         消息事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 声明式过滤条件（detail_type/platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
         def decorator(func: Callable):
-            self.handler.register(func, priority)
+            self.handler.register(func, priority, **handler_options(options))
             return func
 
         return decorator
@@ -57,19 +61,19 @@ class MessageHandler:
         """
         return self.handler.unregister(handler)
 
-    def on_private_message(self, priority: int = 0):
+    def on_private_message(self, priority: int = 0, **options):
         """
         私聊消息事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 额外的声明式过滤条件（platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
-        def condition(event: dict[str, Any]) -> bool:
-            return event.get("detail_type") == "private"
-
         def decorator(func: Callable):
-            self.handler.register(func, priority, condition)
+            self.handler.register(
+                func, priority, **handler_options(options, detail_type="private")
+            )
             return func
 
         return decorator
@@ -83,19 +87,19 @@ class MessageHandler:
         """
         return self.handler.unregister(handler)
 
-    def on_group_message(self, priority: int = 0):
+    def on_group_message(self, priority: int = 0, **options):
         """
         群聊消息事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 额外的声明式过滤条件（platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
-        def condition(event: dict[str, Any]) -> bool:
-            return event.get("detail_type") == "group"
-
         def decorator(func: Callable):
-            self.handler.register(func, priority, condition)
+            self.handler.register(
+                func, priority, **handler_options(options, detail_type="group")
+            )
             return func
 
         return decorator
@@ -109,29 +113,21 @@ class MessageHandler:
         """
         return self.handler.unregister(handler)
 
-    def on_at_message(self, priority: int = 0):
+    def on_at_message(self, priority: int = 0, **options):
         """
         @消息事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 额外的声明式过滤条件（detail_type/platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
-        def condition(event: dict[str, Any]) -> bool:
-            # 检查消息中是否有@机器人
-            message_segments = event.get("message", [])
-            self_id = event.get("self", {}).get("user_id")
-
-            for segment in message_segments:
-                if (
-                    segment.get("type") == "mention"
-                    and segment.get("data", {}).get("user_id") == self_id
-                ):
-                    return True
-            return False
+        def condition(event: Event) -> bool:
+            # 检查消息中是否有@机器人（使用事件缓存的@集合）
+            return event.has_mention()
 
         def decorator(func: Callable):
-            self.handler.register(func, priority, condition)
+            self.handler.register(func, priority, condition, **handler_options(options))
             return func
 
         return decorator
@@ -145,6 +141,83 @@ class MessageHandler:
         """
         return self.handler.unregister(handler)
 
+    def on_keyword(
+        self,
+        keywords: str | Iterable[str],
+        priority: int = 0,
+        *,
+        ignore_case: bool = False,
+        **options,
+    ):
+        """
+        关键词消息事件装饰器
+
+        消息文本（event.get_text()）包含任一关键词时触发，命中信息可通过 event.get_trigger() 获取
+
+        :param keywords: 关键词或关键词列表
+        :param priority: 处理器优先级
+        :param ignore_case: 是否忽略大小写
+        :param options: 额外的声明式过滤条件（detail_type/platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
+        :return: 装饰器函数
+
+        :example:
+        >>> @message.on_keyword(["你好", "hello"], ignore_case=True)
+        >>> async def greet(event):
+        >>>     await event.reply(f"收到关键词: {event.get_trigger()['keyword']}")
+        """
+        trigger = KeywordTrigger(keywords, ignore_case)
+
+        def decorator(func: Callable):
+            self.handler.register(
+                func, priority, trigger=trigger, **handler_options(options)
+            )
+            return func
+
+        return decorator
+
+    def on_regex(
+        self,
+        pattern: str | re.Pattern | Iterable[str | re.Pattern],
+        priority: int = 0,
+        *,
+        flags: int = 0,
+        **options,
+    ):
+        """
+        正则消息事件装饰器
+
+        任一表达式在消息文本中匹配（re.search 语义）时触发，匹配信息可通过 event.get_trigger() 获取
+
+        :param pattern: 正则表达式（字符串或已编译对象）或其列表
+        :param priority: 处理器优先级
+        :param flags: 字符串表达式的编译标志
+        :param options: 额外的声明式过滤条件（detail_type/platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
+        :return: 装饰器函数
+
+        :example:
+        >>> @message.on_regex(r"^roll (\\d+)d(\\d+)$")
+        >>> async def roll(event):
+        >>>     count, sides = event.get_trigger()["groups"]
+        """
+        trigger = RegexTrigger(pattern, flags)
+
+        def decorator(func: Callable):
+            self.handler.register(
+                func, priority, trigger=trigger, **handler_options(options)
+            )
+            return func
+
+        return decorator
+
+    def remove_keyword_handler(self, handler: Callable) -> bool:
+        """
+        取消注册关键词/正则消息事件处理器
+
+        :param handler: 要取消注册的处理器
+        :return: 是否成功取消注册
+        """
+        return self.handler.unregister(handler)
+
     def _clear_message_handlers(self):
         """
         {!--< internal-use >!--}
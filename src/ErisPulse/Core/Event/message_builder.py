@@ -7,11 +7,30 @@ ErisPulse 消息构建器
 1. 用于构建 OneBot12 标准消息段列表（list[dict]）
 2. 配合 Raw_ob12 使用，是反向转换的搭档工具
 3. 支持链式调用和快速构建两种模式
+4. 媒体消息段的文件对象与异步迭代器会被包装为 MediaSource 流式传递给适配器，不会整体读入内存；
+   str、bytes、Path、bytearray、memoryview 等其他输入原样传递，与现有适配器保持兼容
 {!--< /tips >!--}
 """
 
 import types
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..media import MediaSource
+
+
+def _wrap_media(file: Any) -> Any:
+    """
+    {!--< internal-use >!--}
+    文件对象与异步迭代器包装为 MediaSource，其余输入原样返回（适配器可能已按 Path/bytes 等类型处理）
+
+    本模块保持无包内依赖，仅在需要时才导入 media 模块
+    """
+    if not (hasattr(file, "read") or hasattr(file, "__aiter__")):
+        return file
+    from ..media import MediaSource
+
+    return MediaSource.wrap(file)
 
 
 class _DualMethod:
@@ -57,22 +76,22 @@ class MessageBuilder:
         self._segments.append({"type": "text", "data": {"text": text}})
         return self
 
-    def _image_inst(self, file: str | bytes) -> "MessageBuilder":
-        self._segments.append({"type": "image", "data": {"file": file}})
+    def _image_inst(self, file: "str | bytes | MediaSource") -> "MessageBuilder":
+        self._segments.append({"type": "image", "data": {"file": _wrap_media(file)}})
         return self
 
-    def _audio_inst(self, file: str | bytes) -> "MessageBuilder":
-        self._segments.append({"type": "audio", "data": {"file": file}})
+    def _audio_inst(self, file: "str | bytes | MediaSource") -> "MessageBuilder":
+        self._segments.append({"type": "audio", "data": {"file": _wrap_media(file)}})
         return self
 
-    def _video_inst(self, file: str | bytes) -> "MessageBuilder":
-        self._segments.append({"type": "video", "data": {"file": file}})
+    def _video_inst(self, file: "str | bytes | MediaSource") -> "MessageBuilder":
+        self._segments.append({"type": "video", "data": {"file": _wrap_media(file)}})
         return self
 
     def _file_inst(
-        self, file: str | bytes, filename: str | None = None
+        self, file: "str | bytes | MediaSource", filename: str | None = None
     ) -> "MessageBuilder":
-        data: dict[str, Any] = {"file": file}
+        data: dict[str, Any] = {"file": _wrap_media(file)}
         if filename is not None:
             data["filename"] = filename
         self._segments.append({"type": "file", "data": data})
@@ -106,22 +125,22 @@ class MessageBuilder:
         return [{"type": "text", "data": {"text": text}}]
 
     @staticmethod
-    def _image_static(file: str | bytes) -> list[dict[str, Any]]:
-        return [{"type": "image", "data": {"file": file}}]
+    def _image_static(file: "str | bytes | MediaSource") -> list[dict[str, Any]]:
+        return [{"type": "image", "data": {"file": _wrap_media(file)}}]
 
     @staticmethod
-    def _audio_static(file: str | bytes) -> list[dict[str, Any]]:
-        return [{"type": "audio", "data": {"file": file}}]
+    def _audio_static(file: "str | bytes | MediaSource") -> list[dict[str, Any]]:
+        return [{"type": "audio", "data": {"file": _wrap_media(file)}}]
 
     @staticmethod
-    def _video_static(file: str | bytes) -> list[dict[str, Any]]:
-        return [{"type": "video", "data": {"file": file}}]
+    def _video_static(file: "str | bytes | MediaSource") -> list[dict[str, Any]]:
+        return [{"type": "video", "data": {"file": _wrap_media(file)}}]
 
     @staticmethod
     def _file_static(
-        file: str | bytes, filename: str | None = None
+        file: "str | bytes | MediaSource", filename: str | None = None
     ) -> list[dict[str, Any]]:
-        data: dict[str, Any] = {"file": file}
+        data: dict[str, Any] = {"file": _wrap_media(file)}
         if filename is not None:
             data["filename"] = filename
         return [{"type": "file", "data": data}]
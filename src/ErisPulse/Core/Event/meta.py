@@ -9,8 +9,7 @@ ErisPulse 元事件处理模块
 {!--< /tips >!--}
 """
 
-from .base import BaseEventHandler
-from typing import Any
+from .base import BaseEventHandler, handler_options
 from collections.abc import Callable
 
 
@@ -24,16 +23,17 @@ class MetaHandler:
     def __init__(self):
         self.handler = BaseEventHandler("meta", "meta")
 
-    def on_meta(self, priority: int = 0):
+    def on_meta(self, priority: int = 0, **options):
         """
         通用元事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 声明式过滤条件（detail_type/platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
         def decorator(func: Callable):
-            self.handler.register(func, priority)
+            self.handler.register(func, priority, **handler_options(options))
             return func
 
         return decorator
@@ -56,19 +56,19 @@ class MetaHandler:
         """
         return self.handler.unregister(handler)
 
-    def on_connect(self, priority: int = 0):
+    def on_connect(self, priority: int = 0, **options):
         """
         连接事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 额外的声明式过滤条件（platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
-        def condition(event: dict[str, Any]) -> bool:
-            return event.get("detail_type") == "connect"
-
         def decorator(func: Callable):
-            self.handler.register(func, priority, condition)
+            self.handler.register(
+                func, priority, **handler_options(options, detail_type="connect")
+            )
             return func
 
         return decorator
@@ -82,19 +82,19 @@ class MetaHandler:
         """
         return self.handler.unregister(handler)
 
-    def on_disconnect(self, priority: int = 0):
+    def on_disconnect(self, priority: int = 0, **options):
         """
         断开连接事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 额外的声明式过滤条件（platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
-        def condition(event: dict[str, Any]) -> bool:
-            return event.get("detail_type") == "disconnect"
-
         def decorator(func: Callable):
-            self.handler.register(func, priority, condition)
+            self.handler.register(
+                func, priority, **handler_options(options, detail_type="disconnect")
+            )
             return func
 
         return decorator
@@ -108,19 +108,19 @@ class MetaHandler:
         """
         return self.handler.unregister(handler)
 
-    def on_heartbeat(self, priority: int = 0):
+    def on_heartbeat(self, priority: int = 0, **options):
         """
         心跳事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 额外的声明式过滤条件（platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
-        def condition(event: dict[str, Any]) -> bool:
-            return event.get("detail_type") == "heartbeat"
-
         def decorator(func: Callable):
-            self.handler.register(func, priority, condition)
+            self.handler.register(
+                func, priority, **handler_options(options, detail_type="heartbeat")
+            )
             return func
 
         return decorator
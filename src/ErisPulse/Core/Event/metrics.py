@@ -0,0 +1,125 @@
+"""
+ErisPulse 事件处理器耗时统计
+
+为每个事件处理器维护运行时延迟直方图，用于定位拖慢 p99 的模块
+
+{!--< tips >!--}
+1. 直方图使用固定的对数分桶，记录开销为常数，内存不随事件数量增长
+2. 百分位为所在分桶的上界估计值
+{!--< /tips >!--}
+"""
+
+import math
+from bisect import bisect_left
+from typing import Any
+
+# 分桶上界（秒），最后一个桶为 +inf
+_BUCKET_BOUNDS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def percentile_rank(count: int, p: float) -> int:
+    """
+    计算百分位在样本中的名次（最近邻，从 1 开始）
+
+    :param count: 样本数
+    :param p: 百分位（0~100）
+    :return: 名次，样本为空时为 0
+    """
+    if count <= 0:
+        return 0
+    return min(count, max(1, math.ceil(count * p / 100)))
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    """
+    计算有序样本的百分位（最近邻）
+
+    :param ordered: 升序排列的样本
+    :param p: 百分位（0~100）
+    :return: 百分位值，样本为空时为 0.0
+    """
+    if not ordered:
+        return 0.0
+    return ordered[percentile_rank(len(ordered), p) - 1]
+
+
+class LatencyHistogram:
+    """
+    延迟直方图
+
+    :example:
+    >>> hist = LatencyHistogram()
+    >>> hist.record(0.012)
+    >>> hist.percentile(99)
+    0.025
+    """
+
+    __slots__ = ("buckets", "count", "total", "max", "timeouts", "errors")
+
+    BOUNDS = _BUCKET_BOUNDS
+
+    def __init__(self):
+        self.buckets = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+        self.errors = 0
+
+    def record(self, seconds: float) -> None:
+        """
+        记录一次耗时
+
+        :param seconds: 耗时（秒）
+        """
+        self.buckets[bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p: float) -> float:
+        """
+        估算百分位耗时
+
+        :param p: 百分位（0~100）
+        :return: 耗时上界（秒），落在最后一个桶时返回记录到的最大值
+        """
+        if not self.count:
+            return 0.0
+        rank = percentile_rank(self.count, p)
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                if index < len(_BUCKET_BOUNDS):
+                    return min(_BUCKET_BOUNDS[index], self.max)
+                return self.max
+        return self.max
+
+    def reset(self) -> None:
+        """
+        清空统计
+        """
+        self.__init__()
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        :return: 统计摘要（耗时单位为毫秒）
+        """
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+
+
+__all__ = ["LatencyHistogram", "percentile", "percentile_rank"]
@@ -9,8 +9,7 @@ ErisPulse 通知处理模块
 {!--< /tips >!--}
 """
 
-from .base import BaseEventHandler
-from typing import Any
+from .base import BaseEventHandler, handler_options
 from collections.abc import Callable
 
 
@@ -24,16 +23,17 @@ class NoticeHandler:
     def __init__(self):
         self.handler = BaseEventHandler("notice", "notice")
 
-    def on_notice(self, priority: int = 0):
+    def on_notice(self, priority: int = 0, **options):
         """
         通用通知事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 声明式过滤条件（detail_type/platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
         def decorator(func: Callable):
-            self.handler.register(func, priority)
+            self.handler.register(func, priority, **handler_options(options))
             return func
 
         return decorator
@@ -56,19 +56,19 @@ class NoticeHandler:
         """
         return self.handler.unregister(handler)
 
-    def on_friend_add(self, priority: int = 0):
+    def on_friend_add(self, priority: int = 0, **options):
         """
         好友添加通知事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 额外的声明式过滤条件（platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
-        def condition(event: dict[str, Any]) -> bool:
-            return event.get("detail_type") == "friend_increase"
-
         def decorator(func: Callable):
-            self.handler.register(func, priority, condition)
+            self.handler.register(
+                func, priority, **handler_options(options, detail_type="friend_increase")
+            )
             return func
 
         return decorator
@@ -82,19 +82,19 @@ class NoticeHandler:
         """
         return self.handler.unregister(handler)
 
-    def on_friend_remove(self, priority: int = 0):
+    def on_friend_remove(self, priority: int = 0, **options):
         """
         好友删除通知事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 额外的声明式过滤条件（platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
-        def condition(event: dict[str, Any]) -> bool:
-            return event.get("detail_type") == "friend_decrease"
-
         def decorator(func: Callable):
-            self.handler.register(func, priority, condition)
+            self.handler.register(
+                func, priority, **handler_options(options, detail_type="friend_decrease")
+            )
             return func
 
         return decorator
@@ -108,19 +108,19 @@ class NoticeHandler:
         """
         return self.handler.unregister(handler)
 
-    def on_group_increase(self, priority: int = 0):
+    def on_group_increase(self, priority: int = 0, **options):
         """
         群成员增加通知事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 额外的声明式过滤条件（platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
-        def condition(event: dict[str, Any]) -> bool:
-            return event.get("detail_type") == "group_member_increase"
-
         def decorator(func: Callable):
-            self.handler.register(func, priority, condition)
+            self.handler.register(
+                func, priority, **handler_options(options, detail_type="group_member_increase")
+            )
             return func
 
         return decorator
@@ -134,19 +134,19 @@ class NoticeHandler:
         """
         return self.handler.unregister(handler)
 
-    def on_group_decrease(self, priority: int = 0):
+    def on_group_decrease(self, priority: int = 0, **options):
         """
         群成员减少通知事件装饰器
 
         :param priority: 处理器优先级
+        :param options: 额外的声明式过滤条件（platform/user_id/group_id/sub_type）与处理器选项（timeout/offload/executor）
         :return: 装饰器函数
         """
 
-        def condition(event: dict[str, Any]) -> bool:
-            return event.get("detail_type") == "group_member_decrease"
-
         def decorator(func: Callable):
-            self.handler.register(func, priority, condition)
+            self.handler.register(
+                func, priority, **handler_options(options, detail_type="group_member_decrease")
+            )
             return func
 
         return decorator
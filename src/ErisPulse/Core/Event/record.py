@@ -0,0 +1,294 @@
+"""
+ErisPulse 紧凑事件记录
+
+为高吞吐平台提供可选的紧凑事件表示：
+
+- ``EventRecord`` 使用 ``__slots__`` 保存 OneBot12 核心字段，以只读映射的形式提交给 ``adapter.emit``
+- ``LazyRaw`` 保存未解码的平台原生数据（bytes/str 形式的 JSON 或返回原生数据的函数），
+  仅在存在匹配的原生事件处理器或调用 ``event.get_raw()`` 时才解码
+
+{!--< tips >!--}
+1. 这是可选的事件模型，适配器继续提交普通 dict 完全兼容
+2. EventRecord 是只读映射；中间件或 Event 包装时才会按需转换为 dict，且不包含值为 None 的字段
+3. 普通 dict 事件中的 ``{platform}_raw`` 字段同样可以使用 LazyRaw 延迟解码
+{!--< /tips >!--}
+"""
+
+import json
+from collections.abc import Callable, Iterator, Mapping
+from typing import Any
+
+_UNRESOLVED = object()
+
+
+class LazyRaw(Mapping):
+    """
+    延迟解码的平台原生数据
+
+    首次访问时解码并缓存结果，同一事件的多个 Event 副本共享同一份解码结果
+
+    :example:
+    >>> raw = LazyRaw(b'{"msg_type": "text"}')
+    >>> raw.decoded
+    False
+    >>> raw["msg_type"]
+    'text'
+    """
+
+    __slots__ = ("_source", "_value")
+
+    def __init__(self, source: bytes | bytearray | memoryview | str | Callable[[], Any]):
+        """
+        :param source: JSON 文本（bytes/str）或返回原生数据的无参函数
+        """
+        self._source = source
+        self._value = _UNRESOLVED
+
+    @classmethod
+    def wrap(cls, value: Any) -> Any:
+        """
+        将可延迟解码的数据包装为 LazyRaw，其余数据原样返回
+
+        :param value: 原生数据
+        :return: LazyRaw 或原始值
+        """
+        if isinstance(value, (bytes, bytearray, memoryview, str)) or callable(value):
+            return cls(value)
+        return value
+
+    @property
+    def decoded(self) -> bool:
+        """
+        是否已解码
+        """
+        return self._value is not _UNRESOLVED
+
+    def resolve(self) -> Any:
+        """
+        解码并返回原生数据（只解码一次）
+
+        :return: 解码后的原生数据
+        """
+        if self._value is _UNRESOLVED:
+            source = self._source
+            if isinstance(source, memoryview):
+                source = source.tobytes()
+            if isinstance(source, (bytes, bytearray, str)):
+                self._value = json.loads(source)
+            else:
+                self._value = source()
+            self._source = None
+        return self._value
+
+    def __getitem__(self, key):
+        return self.resolve()[key]
+
+    def __iter__(self) -> Iterator:
+        return iter(self.resolve())
+
+    def __len__(self) -> int:
+        return len(self.resolve())
+
+    def __reduce__(self):
+        # 序列化时传递解码结果，避免依赖不可序列化的函数
+        return (_decoded_raw, (self.resolve(),))
+
+    def __repr__(self) -> str:
+        if self.decoded:
+            return f"LazyRaw({self._value!r})"
+        return f"LazyRaw(<undecoded {type(self._source).__name__}>)"
+
+
+def _decoded_raw(value: Any) -> "LazyRaw":
+    """
+    {!--< internal-use >!--}
+    反序列化已解码的 LazyRaw
+    """
+    raw = LazyRaw.__new__(LazyRaw)
+    raw._source = None
+    raw._value = value
+    return raw
+
+
+def resolve_raw(value: Any) -> Any:
+    """
+    返回原生数据的解码结果，非 LazyRaw 原样返回
+
+    :param value: 原生数据或 LazyRaw
+    :return: 解码后的原生数据
+    """
+    return value.resolve() if isinstance(value, LazyRaw) else value
+
+
+# 映射键 -> slot 名称；"self" 为保留字，对应 self_info
+_CORE_FIELDS = (
+    ("id", "id"),
+    ("time", "time"),
+    ("type", "type"),
+    ("detail_type", "detail_type"),
+    ("sub_type", "sub_type"),
+    ("platform", "platform"),
+    ("self", "self_info"),
+    ("user_id", "user_id"),
+    ("user_nickname", "user_nickname"),
+    ("group_id", "group_id"),
+    ("channel_id", "channel_id"),
+    ("guild_id", "guild_id"),
+    ("message_id", "message_id"),
+    ("message", "message"),
+    ("alt_message", "alt_message"),
+)
+_CORE_SLOTS = dict(_CORE_FIELDS)
+
+
+class EventRecord(Mapping):
+    """
+    紧凑事件记录
+
+    使用 ``__slots__`` 保存 OneBot12 核心字段，原生数据以 LazyRaw 延迟解码，
+    其余扩展字段放在 extra 字典中（仅在存在时分配）
+
+    :example:
+    >>> await sdk.adapter.emit(EventRecord(
+    >>>     "message", "private", "myplatform",
+    >>>     id="123", time=1620000000,
+    >>>     self_info={"platform": "myplatform", "user_id": "bot"},
+    >>>     user_id="u1",
+    >>>     message=[{"type": "text", "data": {"text": "Hello"}}],
+    >>>     alt_message="Hello",
+    >>>     raw=body_bytes, raw_type="text_message",
+    >>> ))
+    """
+
+    __slots__ = (*(slot for _, slot in _CORE_FIELDS), "raw", "raw_type", "extra")
+
+    def __init__(
+        self,
+        type: str,
+        detail_type: str,
+        platform: str,
+        *,
+        id: str | None = None,
+        time: int | float | None = None,
+        sub_type: str | None = None,
+        self_info: dict[str, Any] | None = None,
+        user_id: str | None = None,
+        user_nickname: str | None = None,
+        group_id: str | None = None,
+        channel_id: str | None = None,
+        guild_id: str | None = None,
+        message_id: str | None = None,
+        message: list[dict[str, Any]] | None = None,
+        alt_message: str | None = None,
+        raw: Any = None,
+        raw_type: str | None = None,
+        **extra: Any,
+    ):
+        """
+        :param type: 事件类型
+        :param detail_type: 详细类型
+        :param platform: 平台名称
+        :param self_info: 机器人信息（映射为 "self" 字段）
+        :param raw: 平台原生数据，bytes/str/函数会被包装为 LazyRaw
+        :param raw_type: 原生事件类型
+        :param extra: 其他扩展字段
+        """
+        self.type = type
+        self.detail_type = detail_type
+        self.platform = platform
+        self.id = id
+        self.time = time
+        self.sub_type = sub_type
+        self.self_info = self_info
+        self.user_id = user_id
+        self.user_nickname = user_nickname
+        self.group_id = group_id
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.message_id = message_id
+        self.message = message
+        self.alt_message = alt_message
+        self.raw = LazyRaw.wrap(raw)
+        self.raw_type = raw_type
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "EventRecord":
+        """
+        从普通事件字典创建记录
+
+        :param data: OneBot12 事件字典
+        :return: EventRecord 实例
+        """
+        data = dict(data)
+        platform = data.pop("platform", "")
+        fields = {
+            slot: data.pop(key)
+            for key, slot in _CORE_FIELDS
+            if key in data and key != "platform"
+        }
+        raw = data.pop(f"{platform}_raw", None)
+        raw_type = data.pop(f"{platform}_raw_type", None)
+        fields.setdefault("type", "")
+        fields.setdefault("detail_type", "")
+        return cls(platform=platform, raw=raw, raw_type=raw_type, **fields, **data)
+
+    def _raw_keys(self) -> tuple[str, str]:
+        return f"{self.platform}_raw", f"{self.platform}_raw_type"
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        转换为普通事件字典（原生数据保持未解码）
+
+        :return: 事件字典
+        """
+        result = {
+            key: value
+            for key, slot in _CORE_FIELDS
+            if (value := getattr(self, slot)) is not None
+        }
+        if self.raw is not None:
+            raw_key, raw_type_key = self._raw_keys()
+            result[raw_key] = self.raw
+            if self.raw_type is not None:
+                result[raw_type_key] = self.raw_type
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def get_raw(self) -> Any:
+        """
+        获取解码后的平台原生数据
+
+        :return: 原生数据，不存在时返回 None
+        """
+        return resolve_raw(self.raw)
+
+    def __getitem__(self, key: str) -> Any:
+        slot = _CORE_SLOTS.get(key)
+        if slot is not None:
+            value = getattr(self, slot)
+        elif self.raw is not None and key in (raw_keys := self._raw_keys()):
+            value = self.raw if key == raw_keys[0] else self.raw_type
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        else:
+            raise KeyError(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __repr__(self) -> str:
+        return (
+            f"EventRecord(type={self.type!r}, detail_type={self.detail_type!r}, "
+            f"platform={self.platform!r}, id={self.id!r})"
+        )
+
+
+__all__ = ["EventRecord", "LazyRaw", "resolve_raw"]
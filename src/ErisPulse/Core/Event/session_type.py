@@ -8,9 +8,11 @@ ErisPulse 会话类型管理模块
 2. 提供接收类型到发送类型的自动转换（如 private → user）
 3. 支持根据ID字段自动推断会话类型
 4. 允许适配器注册自定义类型映射
+5. 每个平台的解析表在首次使用时编译，注册表变化时失效重建
 {!--< /tips >!--}
 """
 
+import weakref
 from enum import StrEnum
 from typing import TypeAlias
 
@@ -89,6 +91,9 @@ SEND_TO_RECEIVE_TYPE: dict[str, str] = {
     "thread": "thread",
 }
 
+# 未知接收类型的默认解析结果 (发送类型, ID字段)
+_DEFAULT_RESOLUTION: tuple[str, str] = ("user", "user_id")
+
 # ==================== 自定义类型扩展 ====================
 
 # 自定义类型映射（由适配器注册）
@@ -122,6 +127,7 @@ def register_custom_type(
         _custom_id_field_to_type[id_field] = receive_type_key
         _custom_receive_to_send[receive_type_key] = send_type
         _custom_send_to_receive[send_type] = receive_type_key
+        _resolvers.clear()
 
         logger.debug(
             f"已注册自定义会话类型: {receive_type_key} → {send_type} (ID字段: {id_field})"
@@ -154,6 +160,7 @@ def unregister_custom_type(receive_type: str, platform: str | None = None) -> bo
             del _custom_id_field_to_type[id_field]
             del _custom_receive_to_send[receive_type_key]
             del _custom_send_to_receive[send_type]
+            _resolvers.clear()
 
             logger.debug(f"已注销自定义会话类型: {receive_type_key}")
             return True
@@ -163,6 +170,133 @@ def unregister_custom_type(receive_type: str, platform: str | None = None) -> bo
         return False
 
 
+# ==================== 编译解析表 ====================
+
+# 平台 -> {接收类型: (发送类型, ID字段)}，None 表示未指定平台
+_resolvers: dict[str | None, dict[str, tuple[str, str]]] = {}
+
+
+def _compile_resolver(platform: str | None) -> dict[str, tuple[str, str]]:
+    """
+    {!--< internal-use >!--}
+    编译平台的会话类型解析表
+
+    优先级与逐项查找一致：平台前缀的自定义类型 > 自定义类型 > 标准类型
+
+    :param platform: 平台名称
+    :return: {接收类型: (发送类型, ID字段)}
+    """
+    table = {
+        receive_type: (
+            RECEIVE_TO_SEND_TYPE.get(receive_type, "user"),
+            RECEIVE_TYPE_TO_ID_FIELD[receive_type],
+        )
+        for receive_type in RECEIVE_TYPE_TO_ID_FIELD
+    }
+    for key, id_field in _custom_type_to_id_field.items():
+        table[key] = (_custom_receive_to_send[key], id_field)
+    if platform:
+        prefix = f"{platform}_"
+        for key, id_field in _custom_type_to_id_field.items():
+            if key.startswith(prefix):
+                table[key[len(prefix):]] = (_custom_receive_to_send[key], id_field)
+    return table
+
+
+def resolve_session_type(
+    receive_type: str, platform: str | None = None
+) -> tuple[str, str]:
+    """
+    一次查表将接收类型解析为发送类型和ID字段
+
+    :param receive_type: 接收事件类型（detail_type）
+    :param platform: 平台名称（可选）
+    :return: (发送类型, ID字段)
+
+    :example:
+    >>> resolve_session_type("private")  # 返回 ("user", "user_id")
+    >>> resolve_session_type("group", "qq")  # 返回 ("group", "group_id")
+    """
+    platform = platform or None
+    table = _resolvers.get(platform)
+    if table is None:
+        table = _resolvers[platform] = _compile_resolver(platform)
+    return table.get(receive_type, _DEFAULT_RESOLUTION)
+
+
+# ==================== 会话键 ====================
+
+
+class SessionKey:
+    """
+    会话键 (平台, 发送类型, 目标ID)
+
+    相同会话的键是同一个对象（驻留），可直接作为字典键在各子系统间复用
+
+    :example:
+    >>> key = get_session_key({"platform": "qq", "detail_type": "group", "group_id": "1"})
+    >>> key is SessionKey("qq", "group", "1")
+    True
+    >>> str(key)
+    'qq:group:1'
+    """
+
+    __slots__ = ("platform", "send_type", "target_id", "_hash", "__weakref__")
+
+    _interned: "weakref.WeakValueDictionary[tuple[str, str, str], SessionKey]" = (
+        weakref.WeakValueDictionary()
+    )
+
+    def __new__(cls, platform: str | None, send_type: str, target_id: str | None):
+        key = (platform or "", send_type, "" if target_id is None else str(target_id))
+        obj = cls._interned.get(key)
+        if obj is None:
+            obj = super().__new__(cls)
+            obj.platform, obj.send_type, obj.target_id = key
+            obj._hash = hash(key)
+            cls._interned[key] = obj
+        return obj
+
+    def as_tuple(self) -> tuple[str, str, str]:
+        """
+        :return: (平台, 发送类型, 目标ID)
+        """
+        return (self.platform, self.send_type, self.target_id)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, SessionKey):
+            return self.as_tuple() == other.as_tuple()
+        return NotImplemented
+
+    def __reduce__(self):
+        # 反序列化时重新驻留
+        return (SessionKey, self.as_tuple())
+
+    def __str__(self) -> str:
+        return f"{self.platform}:{self.send_type}:{self.target_id}"
+
+    def __repr__(self) -> str:
+        return f"SessionKey({self.platform!r}, {self.send_type!r}, {self.target_id!r})"
+
+
+def get_session_key(event: dict, platform: str | None = None) -> SessionKey:
+    """
+    获取事件所属会话的会话键
+
+    :param event: 事件数据字典
+    :param platform: 平台名称（可选，默认使用事件的 platform 字段）
+    :return: 驻留的 SessionKey
+    """
+    platform = platform or event.get("platform")
+    send_type, target_id = get_send_type_and_target_id(event, platform)
+    return SessionKey(platform, send_type, target_id)
+
+
 # ==================== 类型获取方法 ====================
 
 
@@ -174,17 +308,7 @@ def get_id_field(receive_type: str, platform: str | None = None) -> str:
     :param platform: 平台名称（可选）
     :return: ID字段名
     """
-    # 先检查自定义类型
-    if platform:
-        custom_key = f"{platform}_{receive_type}"
-        if custom_key in _custom_type_to_id_field:
-            return _custom_type_to_id_field[custom_key]
-
-    if receive_type in _custom_type_to_id_field:
-        return _custom_type_to_id_field[receive_type]
-
-    # 使用标准映射
-    return RECEIVE_TYPE_TO_ID_FIELD.get(receive_type, "user_id")
+    return resolve_session_type(receive_type, platform)[1]
 
 
 def get_receive_type(id_field: str, platform: str | None = None) -> str:
@@ -215,17 +339,7 @@ def convert_to_send_type(receive_type: str, platform: str | None = None) -> str:
     >>> convert_to_send_type("private")  # 返回 "user"
     >>> convert_to_send_type("group")   # 返回 "group"
     """
-    # 先检查自定义类型
-    if platform:
-        custom_key = f"{platform}_{receive_type}"
-        if custom_key in _custom_receive_to_send:
-            return _custom_receive_to_send[custom_key]
-
-    if receive_type in _custom_receive_to_send:
-        return _custom_receive_to_send[receive_type]
-
-    # 使用标准映射
-    return RECEIVE_TO_SEND_TYPE.get(receive_type, "user")
+    return resolve_session_type(receive_type, platform)[0]
 
 
 def convert_to_receive_type(send_type: str, platform: str | None = None) -> str:
@@ -302,8 +416,7 @@ def get_target_id(event: dict, platform: str | None = None) -> str:
     >>> event = {"detail_type": "group", "group_id": "123"}
     >>> get_target_id(event)  # 返回 "123"
     """
-    receive_type = infer_receive_type(event, platform)
-    id_field = get_id_field(receive_type, platform)
+    id_field = resolve_session_type(infer_receive_type(event, platform), platform)[1]
     return event.get(id_field, "")
 
 
@@ -321,10 +434,10 @@ def get_send_type_and_target_id(
     >>> event = {"detail_type": "private", "user_id": "123"}
     >>> get_send_type_and_target_id(event)  # 返回 ("user", "123")
     """
-    receive_type = infer_receive_type(event, platform)
-    send_type = convert_to_send_type(receive_type, platform)
-    target_id = event.get(get_id_field(receive_type, platform), "")
-    return send_type, target_id
+    send_type, id_field = resolve_session_type(
+        infer_receive_type(event, platform), platform
+    )
+    return send_type, event.get(id_field, "")
 
 
 # ==================== 工具方法 ====================
@@ -393,6 +506,7 @@ def clear_custom_types(platform: str | None = None) -> int:
             del _custom_receive_to_send[key]
             if send_type in _custom_send_to_receive:
                 del _custom_send_to_receive[send_type]
+        _resolvers.clear()
         return count
     else:
         # 清除所有自定义类型
@@ -401,6 +515,7 @@ def clear_custom_types(platform: str | None = None) -> int:
         _custom_id_field_to_type.clear()
         _custom_receive_to_send.clear()
         _custom_send_to_receive.clear()
+        _resolvers.clear()
         return count
 
 
@@ -416,6 +531,10 @@ __all__ = [
     "get_receive_type",
     "convert_to_send_type",
     "convert_to_receive_type",
+    "resolve_session_type",
+    # 会话键
+    "SessionKey",
+    "get_session_key",
     # 自动推断方法
     "infer_receive_type",
     "get_target_id",
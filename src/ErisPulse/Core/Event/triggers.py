@@ -0,0 +1,317 @@
+"""
+ErisPulse 多模式触发引擎
+
+为 ``message.on_keyword`` / ``message.on_regex`` 提供一次扫描、多处理器分发的匹配能力
+
+{!--< tips >!--}
+1. 所有关键词编译为一个 Aho-Corasick 自动机，单次扫描文本即可找出全部命中的关键词
+2. 正则按块合并为交替表达式作为预过滤，整块未命中时无需逐个匹配；
+   含反向引用、命名分组、全局内联标志等无法合并的表达式单独匹配
+3. 引擎由 BaseEventHandler 在处理器变化后惰性重建
+{!--< /tips >!--}
+"""
+
+import re
+from collections import deque
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+# 每个合并交替表达式包含的正则数量
+_REGEX_CHUNK_SIZE = 64
+
+# 可以写成作用域内联标志 (?imsx:...) 的标志
+_SCOPED_FLAGS = {
+    re.IGNORECASE: "i",
+    re.MULTILINE: "m",
+    re.DOTALL: "s",
+    re.VERBOSE: "x",
+}
+
+# 合并后会改变语义的写法：数字反向引用、命名分组/引用
+_UNCOMBINABLE = re.compile(r"\\[1-9]|\(\?P[<=]|\(\?<[^=!]")
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick 多模式字符串匹配自动机
+
+    :example:
+    >>> ac = AhoCorasick()
+    >>> ac.add("he", 1)
+    >>> ac.add("she", 2)
+    >>> ac.build()
+    >>> list(ac.iter_matches("ushers"))
+    [2, 1]
+    """
+
+    __slots__ = ("_goto", "_fail", "_out", "_built")
+
+    def __init__(self):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[Any] | tuple[Any, ...]] = [[]]
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def add(self, word: str, value: Any) -> None:
+        """
+        添加模式串
+
+        :param word: 模式串（非空）
+        :param value: 命中时产出的值
+        :raises ValueError: 模式串为空
+        :raises RuntimeError: 自动机已构建
+        """
+        if not word:
+            raise ValueError("关键词不能为空")
+        if self._built:
+            raise RuntimeError("自动机已构建，无法继续添加模式串")
+        goto = self._goto
+        node = 0
+        for ch in word:
+            nxt = goto[node].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto[node][ch] = nxt
+                goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(value)
+        self._built = False
+
+    def build(self) -> None:
+        """
+        计算失败指针并合并输出（添加完所有模式串后调用，重复调用无副作用）
+        """
+        if self._built:
+            return
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        for child in queue:
+            fail[child] = 0
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                if fail[child] == child:
+                    fail[child] = 0
+                if out[fail[child]]:
+                    out[child] = [*out[child], *out[fail[child]]]
+        self._out = [tuple(values) for values in out]
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Any]:
+        """
+        单次扫描文本，按命中位置依次产出模式串的值
+
+        :param text: 待匹配文本
+        :return: 命中值迭代器
+        """
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                yield from out[node]
+
+
+class KeywordTrigger:
+    """
+    关键词触发条件：文本中包含任一关键词即触发
+
+    :param keywords: 关键词或关键词列表
+    :param ignore_case: 是否忽略大小写
+    """
+
+    __slots__ = ("keywords", "ignore_case")
+
+    def __init__(self, keywords: str | Iterable[str], ignore_case: bool = False):
+        if isinstance(keywords, str):
+            keywords = (keywords,)
+        self.keywords = tuple(dict.fromkeys(keywords))
+        if not self.keywords or not all(self.keywords):
+            raise ValueError("关键词不能为空")
+        self.ignore_case = ignore_case
+
+    def __repr__(self) -> str:
+        return (
+            f"KeywordTrigger({list(self.keywords)!r}, ignore_case={self.ignore_case})"
+        )
+
+
+class RegexTrigger:
+    """
+    正则触发条件：任一表达式在文本中匹配（re.search 语义）即触发
+
+    :param patterns: 正则表达式（字符串或已编译对象）或其列表
+    :param flags: 字符串表达式的编译标志
+    """
+
+    __slots__ = ("patterns",)
+
+    def __init__(
+        self,
+        patterns: str | re.Pattern | Iterable[str | re.Pattern],
+        flags: int = 0,
+    ):
+        if isinstance(patterns, (str, re.Pattern)):
+            patterns = (patterns,)
+        self.patterns = tuple(
+            p if isinstance(p, re.Pattern) else re.compile(p, flags) for p in patterns
+        )
+        if not self.patterns:
+            raise ValueError("正则表达式不能为空")
+
+    def __repr__(self) -> str:
+        return f"RegexTrigger({[p.pattern for p in self.patterns]!r})"
+
+
+def _scoped_source(pattern: re.Pattern) -> str | None:
+    """
+    {!--< internal-use >!--}
+    将表达式转换为可合并的带作用域标志的源码，无法合并时返回 None
+    """
+    source = pattern.pattern
+    if not isinstance(source, str) or _UNCOMBINABLE.search(source):
+        return None
+    flags = pattern.flags & ~re.UNICODE
+    scoped = ""
+    for flag, letter in _SCOPED_FLAGS.items():
+        if flags & flag:
+            scoped += letter
+            flags &= ~flag
+    if flags:
+        return None
+    wrapped = f"(?{scoped}:{source})" if scoped else f"(?:{source})"
+    try:
+        re.compile(wrapped)
+    except re.error:
+        return None
+    return wrapped
+
+
+class TriggerEngine:
+    """
+    {!--< internal-use >!--}
+    将一组处理器的关键词/正则触发条件编译为一次扫描的匹配器
+
+    处理器以其在处理器列表中的顺序（order）标识
+    """
+
+    def __init__(self):
+        self._sensitive = AhoCorasick()
+        self._insensitive = AhoCorasick()
+        self._has_sensitive = False
+        self._has_insensitive = False
+        # [(合并表达式, [(order, pattern), ...])]
+        self._regex_chunks: list[
+            tuple[re.Pattern, list[tuple[int, re.Pattern]]]
+        ] = []
+        self._regex_single: list[tuple[int, re.Pattern]] = []
+        self._pending: list[tuple[int, re.Pattern, str]] = []
+
+    def __bool__(self) -> bool:
+        return bool(
+            self._has_sensitive
+            or self._has_insensitive
+            or self._regex_chunks
+            or self._regex_single
+            or self._pending
+        )
+
+    def add(self, order: int, trigger: KeywordTrigger | RegexTrigger) -> None:
+        """
+        添加处理器的触发条件
+
+        :param order: 处理器顺序
+        :param trigger: 触发条件
+        """
+        if isinstance(trigger, KeywordTrigger):
+            for keyword in trigger.keywords:
+                if trigger.ignore_case:
+                    self._insensitive.add(keyword.casefold(), (order, keyword))
+                    self._has_insensitive = True
+                else:
+                    self._sensitive.add(keyword, (order, keyword))
+                    self._has_sensitive = True
+            return
+        for pattern in trigger.patterns:
+            source = _scoped_source(pattern)
+            if source is None:
+                self._regex_single.append((order, pattern))
+            else:
+                self._pending.append((order, pattern, source))
+
+    def build(self) -> None:
+        """
+        编译自动机与合并正则
+        """
+        self._sensitive.build()
+        self._insensitive.build()
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), _REGEX_CHUNK_SIZE):
+            chunk = pending[start : start + _REGEX_CHUNK_SIZE]
+            combined = re.compile("|".join(source for _, _, source in chunk))
+            self._regex_chunks.append(
+                (combined, [(order, pattern) for order, pattern, _ in chunk])
+            )
+
+    def match(self, text: str) -> dict[int, dict[str, Any]]:
+        """
+        扫描文本，返回命中的处理器及其触发信息
+
+        :param text: 待匹配文本
+        :return: {处理器顺序: 触发信息}
+        """
+        hits: dict[int, dict[str, Any]] = {}
+        if not text:
+            return hits
+        if self._pending:
+            self.build()
+
+        keyword_hits: dict[int, list[str]] = {}
+        if self._has_sensitive:
+            for order, keyword in self._sensitive.iter_matches(text):
+                keyword_hits.setdefault(order, []).append(keyword)
+        if self._has_insensitive:
+            for order, keyword in self._insensitive.iter_matches(text.casefold()):
+                keyword_hits.setdefault(order, []).append(keyword)
+        for order, keywords in keyword_hits.items():
+            keywords = list(dict.fromkeys(keywords))
+            hits[order] = {
+                "type": "keyword",
+                "keyword": keywords[0],
+                "keywords": keywords,
+            }
+
+        candidates = list(self._regex_single)
+        for combined, members in self._regex_chunks:
+            if combined.search(text):
+                candidates.extend(members)
+        for order, pattern in candidates:
+            if order in hits:
+                continue
+            if (m := pattern.search(text)) is not None:
+                hits[order] = {
+                    "type": "regex",
+                    "pattern": pattern.pattern,
+                    "match": m.group(0),
+                    "groups": m.groups(),
+                    "groupdict": m.groupdict(),
+                    "span": m.span(),
+                }
+        return hits
+
+
+__all__ = ["AhoCorasick", "KeywordTrigger", "RegexTrigger", "TriggerEngine"]
@@ -8,6 +8,7 @@ ErisPulse 事件包装类
 2. 提供便捷方法简化事件处理
 3. 支持点式访问 event.platform
 4. 支持适配器通过 register_event_mixin / register_event_method 注册平台专有方法
+5. 注册了专有方法的平台会生成并缓存一个 Event 子类，Event(data) 自动构造为对应平台的子类
 {!--< /tips >!--}
 """
 
@@ -17,12 +18,31 @@ import warnings
 from typing import Any, Optional
 from collections.abc import Callable, Awaitable
 from .. import adapter, logger
+from ..tracing import tracer
+from .record import EventRecord, LazyRaw
 from .session_type import (
+    SessionKey,
     get_send_type_and_target_id,
     convert_to_send_type,
     infer_receive_type,
 )
 
+# 派生字段依赖的事件键，这些键被修改时清空派生字段缓存
+_DERIVED_SOURCE_KEYS = frozenset(
+    {
+        "platform",
+        "self",
+        "message",
+        "alt_message",
+        "detail_type",
+        "user_id",
+        "group_id",
+        "channel_id",
+        "guild_id",
+        "thread_id",
+    }
+)
+
 
 CONFIRM_YES_WORDS = frozenset(
     {
@@ -76,14 +96,74 @@ CONFIRM_NO_WORDS = frozenset(
 # 注册表: {platform: {method_name: callable}}
 _platform_event_methods: dict[str, dict[str, Callable]] = {}
 
+# 平台事件子类缓存: {platform: Event 子类}
+_platform_event_classes: dict[str, type] = {}
+
+_event_builtin_names: frozenset | None = None
 
-def _get_event_builtin_names() -> set:
-    """获取 Event 类的所有公开方法名，用于冲突检测"""
-    return {
-        name
-        for name, member in inspect.getmembers(Event, predicate=inspect.isfunction)
-        if not name.startswith("_")
-    }
+
+def _get_event_builtin_names() -> frozenset:
+    """获取 Event 类的所有公开方法名，用于冲突检测（首次调用后缓存）"""
+    global _event_builtin_names
+    if _event_builtin_names is None:
+        _event_builtin_names = frozenset(
+            name
+            for name, member in inspect.getmembers(Event, predicate=inspect.isfunction)
+            if not name.startswith("_")
+        )
+    return _event_builtin_names
+
+
+def get_event_class(platform: str) -> type:
+    """
+    获取指定平台的 Event 类
+
+    注册过扩展方法的平台返回生成的 Event 子类（扩展方法为真实的类属性），
+    否则返回 Event 本身。子类按平台缓存，注册/注销方法时原地更新。
+
+    :param platform: 平台名称
+    :return: Event 或其平台子类
+
+    :example:
+    >>> EmailEvent = get_event_class("email")
+    >>> isinstance(event, EmailEvent)
+    True
+    """
+    if not (methods := _platform_event_methods.get(platform)):
+        return Event
+
+    cls = _platform_event_classes.get(platform)
+    # 注册表被整体替换（如平台全部注销后重新注册）时重新生成
+    if cls is None or cls._platform_methods is not methods:
+        name = "".join(part[:1].upper() + part[1:] for part in platform.split("_"))
+        cls = type(
+            f"{name}Event",
+            (Event,),
+            {
+                "__module__": __name__,
+                "_platform": platform,
+                "_platform_methods": methods,
+                **methods,
+            },
+        )
+        _platform_event_classes[platform] = cls
+    return cls
+
+
+def _sync_event_class(platform: str, name: str, func: Callable | None) -> None:
+    """
+    {!--< internal-use >!--}
+    将单个方法的注册/注销同步到已生成的平台子类
+    """
+    if (cls := _platform_event_classes.get(platform)) is None:
+        return
+    if cls._platform_methods is not _platform_event_methods.get(platform):
+        return
+    if func is None:
+        if name in cls.__dict__:
+            delattr(cls, name)
+    else:
+        setattr(cls, name, func)
 
 
 def register_event_mixin(platform: str, mixin_cls: type) -> int:
@@ -124,6 +204,7 @@ def register_event_mixin(platform: str, mixin_cls: type) -> int:
             )
             continue
         _platform_event_methods[platform][name] = func
+        _sync_event_class(platform, name, func)
         registered += 1
 
     logger.debug(f"[Event] 平台 '{platform}' 注册了 {registered} 个扩展方法")
@@ -165,6 +246,7 @@ def register_event_method(platform: str):
             return func
 
         _platform_event_methods[platform][name] = func
+        _sync_event_class(platform, name, func)
         logger.debug(f"[Event] 平台 '{platform}' 注册了扩展方法 '{name}'")
         return func
 
@@ -184,6 +266,7 @@ def unregister_event_method(platform: str, name: str) -> bool:
         and name in _platform_event_methods[platform]
     ):
         del _platform_event_methods[platform][name]
+        _sync_event_class(platform, name, None)
         return True
     return False
 
@@ -200,6 +283,7 @@ def unregister_platform_event_methods(platform: str) -> int:
     if platform in _platform_event_methods:
         count = len(_platform_event_methods[platform])
         del _platform_event_methods[platform]
+        _platform_event_classes.pop(platform, None)
         logger.debug(f"[Event] 平台 '{platform}' 注销了 {count} 个扩展方法")
         return count
     return 0
@@ -224,18 +308,104 @@ class Event(dict):
     提供便捷的事件访问方法
 
     {!--< tips >!--}
-    所有方法都是可选的，不影响原有字典访问方式
+    1. 所有方法都是可选的，不影响原有字典访问方式
+    2. Event(data) 会根据 data["platform"] 自动构造为对应平台的子类（见 get_event_class）
     {!--< /tips >!--}
     """
 
+    _platform: str | None = None
+    _platform_methods: dict[str, Callable] | None = None
+
+    def __new__(cls, event_data: dict[str, Any] | None = None, *args, **kwargs):
+        if (
+            cls is Event
+            and _platform_event_methods
+            and isinstance(event_data, (dict, EventRecord))
+        ):
+            cls = get_event_class(event_data.get("platform", ""))
+        return super().__new__(cls)
+
     def __init__(self, event_data: dict[str, Any]):
         """
         初始化事件包装器
 
-        :param event_data: 原始事件数据
+        :param event_data: 原始事件数据（dict 或 EventRecord）
         """
+        if isinstance(event_data, EventRecord):
+            event_data = event_data.to_dict()
         super().__init__(event_data)
         self._event_data = event_data
+        # 派生字段缓存（纯文本、@集合、会话类型等），首次访问时计算
+        self._derived: dict[str, Any] = {}
+        # 当前处理器的关键词/正则触发信息，由事件处理器在调用前设置，不写入事件数据
+        self._trigger: dict[str, Any] | None = None
+
+    # ==================== 派生字段缓存 ====================
+
+    def _invalidate_derived(self, key: Any = None) -> None:
+        """
+        {!--< internal-use >!--}
+        依赖的键被修改时清空派生字段缓存
+
+        {!--< tips >!--}
+        原地修改消息段列表（如 event["message"].append(...)）不会被检测到，
+        需要重新赋值 event["message"] 使缓存失效
+        {!--< /tips >!--}
+
+        :param key: 被修改的键，None 表示无法确定（如 update/clear）
+        """
+        if self._derived and (key is None or key in _DERIVED_SOURCE_KEYS):
+            self._derived.clear()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidate_derived(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._invalidate_derived(key)
+
+    def pop(self, key, *args):
+        result = super().pop(key, *args)
+        self._invalidate_derived(key)
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._invalidate_derived()
+        return result
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._invalidate_derived(key)
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._invalidate_derived()
+
+    def clear(self):
+        super().clear()
+        self._invalidate_derived()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self._invalidate_derived()
+        return result
+
+    def _mention_ids(self) -> tuple[str, ...]:
+        """
+        {!--< internal-use >!--}
+        被@的用户ID（按消息段顺序），缓存于派生字段
+        """
+        if (mentions := self._derived.get("mentions")) is None:
+            mentions = self._derived["mentions"] = tuple(
+                user_id
+                for segment in self.get("message", [])
+                if segment.get("type") == "mention"
+                and (user_id := segment.get("data", {}).get("user_id"))
+            )
+        return mentions
 
     # ==================== 核心必填字段方法 ====================
 
@@ -327,9 +497,13 @@ class Event(dict):
         """
         获取纯文本内容
 
+        即 alt_message（结果会被缓存）
+
         :return: 纯文本内容
         """
-        return self.get_alt_message()
+        if (text := self._derived.get("text")) is None:
+            text = self._derived["text"] = self.get_alt_message()
+        return text
 
     def get_message_text(self) -> str:
         """
@@ -337,22 +511,19 @@ class Event(dict):
 
         :return: 纯文本内容
         """
-        return self.get_alt_message()
+        return self.get_text()
 
     def has_mention(self) -> bool:
         """
-        是否包含@消息
+        是否包含@机器人
 
-        :return: 是否包含@消息
+        :return: 是否包含@机器人
         """
-        message_segments = self.get_message()
-        self_id = self.get_self_user_id()
-
-        for segment in message_segments:
-            if segment.get("type") == "mention":
-                if segment.get("data", {}).get("user_id") == self_id:
-                    return True
-        return False
+        if (mentioned := self._derived.get("has_mention")) is None:
+            mentioned = self._derived["has_mention"] = (
+                self.get_self_user_id() in self.get_mention_set()
+            )
+        return mentioned
 
     def get_mentions(self) -> list[str]:
         """
@@ -360,16 +531,17 @@ class Event(dict):
 
         :return: 被@的用户ID列表
         """
-        message_segments = self.get_message()
-        mentions = []
+        return list(self._mention_ids())
 
-        for segment in message_segments:
-            if segment.get("type") == "mention":
-                user_id = segment.get("data", {}).get("user_id")
-                if user_id:
-                    mentions.append(user_id)
+    def get_mention_set(self) -> frozenset[str]:
+        """
+        获取被@的用户ID集合（结果会被缓存）
 
-        return mentions
+        :return: 被@的用户ID集合
+        """
+        if (mention_set := self._derived.get("mention_set")) is None:
+            mention_set = self._derived["mention_set"] = frozenset(self._mention_ids())
+        return mention_set
 
     def get_user_id(self) -> str:
         """
@@ -465,6 +637,72 @@ class Event(dict):
         """
         return self.has_mention()
 
+    # ==================== 会话信息 ====================
+
+    def get_receive_type(self) -> str:
+        """
+        获取接收会话类型（detail_type 或由ID字段推断，结果会被缓存）
+
+        :return: 接收类型（private/group/channel等）
+        """
+        if (receive_type := self._derived.get("receive_type")) is None:
+            receive_type = self._derived["receive_type"] = infer_receive_type(
+                self, self.get_platform() or None
+            )
+        return receive_type
+
+    def get_send_target(self) -> tuple[str, str]:
+        """
+        获取回复时使用的发送类型和目标ID（结果会被缓存）
+
+        :return: (发送类型, 目标ID)
+
+        :example:
+        >>> event.get_send_target()  # ("group", "123456")
+        """
+        if (target := self._derived.get("send_target")) is None:
+            target = self._derived["send_target"] = get_send_type_and_target_id(
+                self, self.get_platform() or None
+            )
+        return target
+
+    def get_session(self) -> SessionKey:
+        """
+        获取事件所属会话（平台, 发送类型, 目标ID）的驻留会话键，结果会被缓存
+
+        同一群聊中所有用户的消息属于同一会话；集群分片等按会话划分的子系统使用此键。
+        需要区分会话中的用户时（如等待某个用户的回复）使用 get_user_session_key()
+
+        :return: SessionKey，可在其他子系统中直接作为字典键复用
+
+        :example:
+        >>> str(event.get_session())  # "qq:group:123456"
+        """
+        if (session := self._derived.get("session")) is None:
+            session = self._derived["session"] = SessionKey(
+                self.get("platform"), *self.get_send_target()
+            )
+        return session
+
+    def get_user_session_key(self) -> str:
+        """
+        获取会话内用户的键（平台:用户ID:目标ID），结果会被缓存
+
+        在 get_session() 的基础上区分用户：同一群聊中不同用户的键不同，私聊中与会话一一对应。
+        命令的 wait_reply 等按用户等待回复的功能使用此键
+
+        :return: 会话内用户的键
+
+        :example:
+        >>> event.get_user_session_key()  # "qq:user_1:123456"
+        """
+        if (user_key := self._derived.get("user_session_key")) is None:
+            session = self.get_session()
+            user_key = self._derived["user_session_key"] = (
+                f"{session.platform}:{self.get('user_id')}:{session.target_id}"
+            )
+        return user_key
+
     # ==================== 通知事件专用方法 ====================
 
     def get_operator_id(self) -> str:
@@ -584,7 +822,7 @@ class Event(dict):
             )
 
         # 使用会话类型管理模块获取发送类型和目标ID
-        send_type, target_id = get_send_type_and_target_id(self, platform)
+        send_type, target_id = self.get_send_target()
 
         if not target_id:
             raise ValueError(
@@ -671,7 +909,8 @@ class Event(dict):
         if not send_method or not callable(send_method):
             raise ValueError(f"适配器不支持方法: {method}")
 
-        return await send_method(content)
+        with tracer.span("reply", "reply", method=method):
+            return await send_method(content)
 
     # ==================== OB12 消息回复 ====================
 
@@ -712,7 +951,8 @@ class Event(dict):
         >>> )
         """
         adapter_instance, detail_type, target_id = self._get_adapter_and_target()
-        return await adapter_instance.Send.To(detail_type, target_id).Raw_ob12(message)
+        with tracer.span("reply_ob12", "reply"):
+            return await adapter_instance.Send.To(detail_type, target_id).Raw_ob12(message)
 
     # ==================== 等待回复功能 ====================
 
@@ -1001,11 +1241,17 @@ class Event(dict):
         """
         获取原始事件数据
 
+        延迟解码的原生数据（LazyRaw）在此时解码，并替换为解码结果
+
         :return: dict - 原始事件数据字典
         """
         platform = self.get_platform()
         raw_key = f"{platform}_raw" if platform else "raw"
-        return self.get(raw_key, {})
+        raw = self.get(raw_key, {})
+        if isinstance(raw, LazyRaw):
+            raw = raw.resolve()
+            dict.__setitem__(self, raw_key, raw)
+        return raw
 
     def get_raw_type(self) -> str:
         """
@@ -1059,15 +1305,33 @@ class Event(dict):
         """
         return "command" in self and bool(self.get("command"))
 
+    # ==================== 触发信息 ====================
+
+    def get_trigger(self) -> dict[str, Any]:
+        """
+        获取关键词/正则触发信息（由 message.on_keyword / message.on_regex 设置）
+
+        :return: 触发信息字典，关键词触发包含 keyword/keywords，正则触发包含 match/groups/groupdict/span
+
+        :example:
+        >>> @message.on_regex(r"天气\\s*(\\w+)")
+        >>> async def weather(event):
+        >>>     city = event.get_trigger()["groups"][0]
+        """
+        return self._trigger if self._trigger is not None else {}
+
     # ==================== 工具方法 ====================
 
     def to_dict(self) -> dict[str, Any]:
         """
         转换为字典
 
-        :return: 事件数据字典
+        :return: 事件数据字典（延迟解码的原生数据会被解码）
         """
-        return dict(self)
+        return {
+            key: value.resolve() if isinstance(value, LazyRaw) else value
+            for key, value in self.items()
+        }
 
     def is_processed(self) -> bool:
         """
@@ -1087,24 +1351,14 @@ class Event(dict):
 
     def __getattr__(self, name: str) -> Any:
         """
-        属性查找优先级:
-        1. 平台注册的扩展方法（仅当前平台）
-        2. 字典键访问（点式访问 event.platform 等）
+        字典键的点式访问（event.platform 等）
+
+        平台扩展方法是平台子类的真实类属性，不经过此方法
 
         :param name: str - 属性名
         :return: Any - 属性值
         :raises AttributeError: 属性不存在
         """
-        # 1. 查找当前平台的扩展方法
-        platform = dict.get(self, "platform", "")
-        if (
-            platform_methods := _platform_event_methods.get(platform)
-        ) and name in platform_methods:
-            func = platform_methods[name]
-            # 使用方法描述符协议绑定 self，使 isinstance 检查和 super() 正常工作
-            return func.__get__(self, type(self))
-
-        # 2. 兜底：字典键访问
         try:
             return self[name]
         except KeyError:
@@ -1112,17 +1366,9 @@ class Event(dict):
                 f"'{self.__class__.__name__}' object has no attribute '{name}'"
             )
 
-    def __dir__(self) -> list[str]:
-        """
-        让 dir(event) 包含当前平台注册的扩展方法名
-        """
-        names = super().__dir__()
-        # 添加当前平台的扩展方法名
-        platform = dict.get(self, "platform", "")
-        platform_methods = _platform_event_methods.get(platform)
-        if platform_methods:
-            names = list(names) + list(platform_methods.keys())
-        return sorted(set(names))
+    def __reduce__(self):
+        # 平台子类为动态生成，序列化时按数据重建，反序列化后自动恢复为对应子类
+        return (Event, (dict(self),))
 
     def __repr__(self) -> str:
         """
@@ -1269,4 +1515,5 @@ __all__ = [
     "unregister_event_method",
     "unregister_platform_event_methods",
     "get_platform_event_methods",
+    "get_event_class",
 ]
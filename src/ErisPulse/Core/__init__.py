@@ -12,6 +12,16 @@ from .logger import logger, Logger, LoggerChild
 from .module import module, ModuleManager
 from .router import router, RouterManager
 from .config import config, ConfigManager
+from .media import media_cache, MediaCache, MediaSource
+from .executor import executor, ExecutorManager
+from .monitor import loop_monitor, LoopMonitor
+from .tracing import tracer, Tracer
+from .recorder import recorder, EventRecorder
+from .dedup import deduplicator, EventDeduplicator
+from .scheduler import scheduler, Scheduler
+from .outbox import outbox, Outbox
+from .balancer import balancer, AccountBalancer
+from .quota import quota, QuotaManager
 from . import Event
 from .Event.message_builder import MessageBuilder
 
@@ -38,6 +48,37 @@ __all__ = [
     'env',              # 配置管理器别名
     'ConfigManager',    # 配置管理器类
 
+    'media_cache',      # 媒体上传缓存单例
+    'MediaCache',       # 媒体上传缓存类
+    'MediaSource',      # 流式媒体数据源类
+
+    'executor',         # 同步回调执行器单例
+    'ExecutorManager',  # 同步回调执行器类
+
+    'loop_monitor',     # 事件循环延迟监控单例
+    'LoopMonitor',      # 事件循环延迟监控类
+
+    'tracer',           # 事件追踪器单例
+    'Tracer',           # 事件追踪器类
+
+    'recorder',         # 事件录制器单例
+    'EventRecorder',    # 事件录制器类
+
+    'deduplicator',     # 事件去重器单例
+    'EventDeduplicator',  # 事件去重器类
+
+    'scheduler',        # 任务调度器单例
+    'Scheduler',        # 任务调度器类
+
+    'outbox',           # 持久化发件箱单例
+    'Outbox',           # 持久化发件箱类
+
+    'balancer',         # 多账号负载均衡器单例
+    'AccountBalancer',  # 多账号负载均衡器类
+
+    'quota',            # 模块配额单例
+    'QuotaManager',     # 模块配额管理器类
+
     'router',           # 路由模块单例
     'RouterManager',    # 路由管理器类
 
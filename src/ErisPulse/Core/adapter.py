@@ -7,18 +7,154 @@ ErisPulse 适配器系统
 import functools
 import asyncio
 import inspect
+import random
 import time
 import warnings
 from typing import Any
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from collections import defaultdict
 from .logger import logger
 from .Bases.adapter import BaseAdapter
 from .config import config
 from .lifecycle import lifecycle
+from .tracing import tracer
+from .dedup import deduplicator
+from .balancer import balancer
 from .Bases.manager import ManagerBase
 
 
+class _DropEvent:
+    """
+    {!--< internal-use >!--}
+    中间件丢弃事件的哨兵类型
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "DROP_EVENT"
+
+
+# 中间件返回此哨兵时停止分发当前事件
+DROP_EVENT = _DropEvent()
+
+
+class _MiddlewareList(list):
+    """
+    {!--< internal-use >!--}
+    中间件列表：内容变化时通知管理器重新编译中间件链
+    """
+
+    def __init__(self, iterable=(), on_change: Callable[[], None] | None = None):
+        super().__init__(iterable)
+        self._on_change = on_change
+
+
+def _invalidating(name: str) -> Callable:
+    """
+    {!--< internal-use >!--}
+    包装 list 的修改方法，修改后触发变更回调
+    """
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if self._on_change is not None:
+            self._on_change()
+        return result
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in (
+    "append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+    "__setitem__", "__delitem__", "__iadd__",
+):
+    setattr(_MiddlewareList, _name, _invalidating(_name))
+del _name
+
+
+class BotState:
+    """
+    Bot 状态记录
+
+    每个 Bot 一个实例，由 AdapterManager 原地更新，仅在字段实际变化时写入
+
+    {!--< tips >!--}
+    1. 使用 __slots__，避免每个事件重新分配状态字典
+    2. last_seen 为单调时钟时间戳，仅用于心跳超时判断；对外的 last_active 由其换算为墙钟时间
+    3. 支持 state["status"] / state.get("info") 的字典式读取，兼容旧代码
+    {!--< /tips >!--}
+    """
+
+    __slots__ = ("status", "last_seen", "info", "heartbeat_interval")
+
+    _INFO_KEYS = ("user_name", "nickname", "avatar", "account_id")
+
+    def __init__(
+        self,
+        status: str = "online",
+        info: dict[str, Any] | None = None,
+        last_seen: float | None = None,
+    ):
+        self.status = status
+        self.last_seen = time.monotonic() if last_seen is None else last_seen
+        self.info: dict[str, Any] = info if info is not None else {}
+        # Bot 上报的心跳间隔（秒），None 表示从未收到心跳
+        self.heartbeat_interval: float | None = None
+
+    @property
+    def last_active(self) -> float:
+        """最近活跃时间（墙钟时间戳）"""
+        return time.time() - (time.monotonic() - self.last_seen)
+
+    def touch(self) -> None:
+        """刷新活跃时间"""
+        self.last_seen = time.monotonic()
+
+    def merge_info(self, self_info: dict[str, Any]) -> bool:
+        """
+        从事件 self 字段合并元信息，仅写入发生变化的字段
+
+        :param self_info: 事件中的self字段内容
+        :return: 元信息是否发生变化
+        """
+        changed = False
+        info = self.info
+        for key in self._INFO_KEYS:
+            if key in self_info and info.get(key) != (value := self_info[key]):
+                info[key] = value
+                changed = True
+        return changed
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        导出为字典快照
+
+        :return: {"status": str, "last_active": float, "info": dict}
+        """
+        return {
+            "status": self.status,
+            "last_active": self.last_active,
+            "info": dict(self.info),
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        if key in ("status", "last_active", "info"):
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self) -> str:
+        return f"BotState(status={self.status!r}, info={self.info!r})"
+
+
 class AdapterManager(ManagerBase):
     """
     适配器管理器
@@ -41,6 +177,10 @@ class AdapterManager(ManagerBase):
 
         # OneBot12事件处理器
         self._onebot_handlers = defaultdict(list)
+        # 中间件作用域 {中间件: (平台集合, 事件类型集合)}，None 表示不限
+        self._middleware_scopes: dict[Callable, tuple[frozenset | None, frozenset | None]] = {}
+        self._middleware_chain: Callable | None = None
+        self._middleware_chain_compiled = False
         self._onebot_middlewares = []
         # 原生事件处理器
         self._raw_handlers = defaultdict(list)
@@ -49,12 +189,18 @@ class AdapterManager(ManagerBase):
         # 后台任务追踪 - {platform: asyncio.Task}
         self._adapter_tasks: dict[str, asyncio.Task] = {}
 
-        # Bot状态存储 - {platform: {bot_id: {"status": str, "last_active": float, "info": dict}}}
-        self._bots: dict[str, dict[str, dict]] = {}
+        # Bot状态存储 - {platform: {bot_id: BotState}}
+        self._bots: dict[str, dict[str, BotState]] = {}
+
+        # 心跳超时扫描任务（所有 Bot 共用一个）
+        self._heartbeat_task: asyncio.Task | None = None
 
         # 标记是否正在关闭，避免重复提交离线事件
         self._is_being_shutdown = False
 
+        # 事件转发器（多进程运行模式下由前端进程设置，事件不在本进程分发）
+        self._event_forwarder: Callable[[Any], Awaitable[None]] | None = None
+
     def set_sdk_ref(self, sdk) -> bool:
         """
         设置 SDK 引用
@@ -178,6 +324,9 @@ class AdapterManager(ManagerBase):
         await router.start(
             host=host, port=port, ssl_certfile=ssl_cert, ssl_keyfile=ssl_key
         )
+        # 启动心跳超时扫描（所有 Bot 共用）
+        self._start_heartbeat_sweeper()
+
         # 已经被调度过的 adapter 实例集合（防止重复调度）
         scheduled_adapters = set()
 
@@ -193,15 +342,79 @@ class AdapterManager(ManagerBase):
             task = asyncio.create_task(self._run_adapter(adapter, platform))
             self._adapter_tasks[platform] = task
 
+    # ==================== 适配器守护 ====================
+
+    @staticmethod
+    def _get_supervisor_config() -> dict[str, Any]:
+        from ..runtime import get_supervisor_config
+
+        return get_supervisor_config()
+
+    @staticmethod
+    def _compute_backoff(attempt: int, supervisor_config: dict[str, Any]) -> float:
+        """
+        {!--< internal-use >!--}
+        计算第 attempt 次失败后的重试等待时间（带抖动的指数退避）
+
+        :param attempt: 连续失败次数（从 1 开始）
+        :param supervisor_config: 守护配置
+        :return: 等待秒数
+        """
+        initial = supervisor_config.get("backoff_initial", 1)
+        maximum = supervisor_config.get("backoff_max", 300)
+        multiplier = supervisor_config.get("backoff_multiplier", 2)
+        jitter = supervisor_config.get("backoff_jitter", 0.2)
+
+        delay = min(maximum, initial * multiplier ** (attempt - 1))
+        if jitter > 0:
+            delay *= random.uniform(1 - jitter, 1 + jitter)
+        return max(0.0, delay)
+
+    async def _submit_status(self, platform: str, status: str, **extra: Any) -> None:
+        """
+        {!--< internal-use >!--}
+        提交 adapter.status.change 生命周期事件
+        """
+        await lifecycle.submit_event(
+            "adapter.status.change",
+            msg=f"适配器 {platform} 状态变化: {status}",
+            data={"platform": platform, "status": status, **extra},
+        )
+
     async def _run_adapter(self, adapter: BaseAdapter, platform: str) -> None:
         """
         {!--< internal-use >!--}
-        运行适配器实例
+        运行并守护适配器实例
+
+        先以指数退避启动适配器，启动成功后若适配器实现了 health() 则周期性探活，
+        连续探活失败时重启适配器
 
         :param adapter: 适配器实例
         :param platform: 平台名称
         """
+        try:
+            if not await self._start_adapter(adapter, platform):
+                return
+            await self._supervise_adapter(adapter, platform)
+        except asyncio.CancelledError:
+            logger.info(f"适配器 {platform} 守护任务被取消")
 
+    async def _start_adapter(
+        self, adapter: BaseAdapter, platform: str, restart: bool = False
+    ) -> bool:
+        """
+        {!--< internal-use >!--}
+        启动适配器，失败时按带抖动的指数退避重试，连续失败过多时熔断
+
+        状态流转（均通过 adapter.status.change 上报）：
+        starting → started
+        starting → start_failed → (retry) → ... → circuit_open → circuit_half_open → started / circuit_open
+
+        :param adapter: 适配器实例
+        :param platform: 平台名称
+        :param restart: 是否为健康检查触发的重启
+        :return: 是否由本协程完成启动
+        """
         if not getattr(adapter, "_starting_lock", None):
             adapter._starting_lock = asyncio.Lock()
 
@@ -211,55 +424,28 @@ class AdapterManager(ManagerBase):
                 logger.info(
                     f"适配器 {platform}（实例ID: {id(adapter)}）已被其他协程启动，跳过"
                 )
-                return
+                return False
 
             retry_count = 0
-            fixed_delay = 3 * 60 * 60
-            backoff_intervals = [60, 10 * 60, 30 * 60, 60 * 60]
-
-            # 提交适配器状态变化事件（starting）
-            await lifecycle.submit_event(
-                "adapter.status.change",
-                msg=f"适配器 {platform} 状态变化: starting",
-                data={
-                    "platform": platform,
-                    "status": "starting",
-                    "retry_count": retry_count,
-                },
+            half_open = False
+            await self._submit_status(
+                platform, "restarting" if restart else "starting", retry_count=0
             )
 
             while True:
                 try:
                     await adapter.start()
                     self._started_instances.add(adapter)
-
-                    # 提交适配器状态变化事件（started）
-                    await lifecycle.submit_event(
-                        "adapter.status.change",
-                        msg=f"适配器 {platform} 状态变化: started",
-                        data={"platform": platform, "status": "started"},
-                    )
-
-                    return
+                    await self._submit_status(platform, "started", retry_count=retry_count)
+                    return True
                 except asyncio.CancelledError:
                     logger.info(f"适配器 {platform} 启动任务被取消")
-                    return
+                    raise
                 except Exception as e:
                     retry_count += 1
-                    logger.error(
-                        f"平台 {platform} 启动失败（第{retry_count}次重试）: {e}"
-                    )
-
-                    # 提交适配器状态变化事件（start_failed）
-                    await lifecycle.submit_event(
-                        "adapter.status.change",
-                        msg=f"适配器 {platform} 状态变化: start_failed",
-                        data={
-                            "platform": platform,
-                            "status": "start_failed",
-                            "retry_count": retry_count,
-                            "error": str(e),
-                        },
+                    logger.error(f"平台 {platform} 启动失败（第{retry_count}次重试）: {e}")
+                    await self._submit_status(
+                        platform, "start_failed", retry_count=retry_count, error=str(e)
                     )
 
                     try:
@@ -267,14 +453,85 @@ class AdapterManager(ManagerBase):
                     except Exception as stop_err:
                         logger.warning(f"停止适配器失败: {stop_err}")
 
-                    # 计算等待时间
-                    if retry_count <= len(backoff_intervals):
-                        wait_time = backoff_intervals[retry_count - 1]
-                    else:
-                        wait_time = fixed_delay
+                supervisor_config = self._get_supervisor_config()
+                threshold = supervisor_config.get("circuit_threshold", 8)
+
+                if half_open or (threshold and retry_count >= threshold):
+                    # 熔断：停止频繁重试，冷却后半开再试一次，半开失败立即重新熔断
+                    cooldown = supervisor_config.get("circuit_cooldown", 600)
+                    logger.warning(
+                        f"平台 {platform} 连续启动失败 {retry_count} 次，熔断 {cooldown} 秒"
+                    )
+                    await self._submit_status(
+                        platform, "circuit_open", retry_count=retry_count, cooldown=cooldown
+                    )
+                    await asyncio.sleep(cooldown)
+                    half_open = True
+                    await self._submit_status(
+                        platform, "circuit_half_open", retry_count=retry_count
+                    )
+                    continue
 
-                    logger.info(f"将在 {wait_time // 60} 分钟后再次尝试重启 {platform}")
-                    await asyncio.sleep(wait_time)
+                wait_time = self._compute_backoff(retry_count, supervisor_config)
+                logger.info(f"将在 {wait_time:.1f} 秒后再次尝试启动 {platform}")
+                await asyncio.sleep(wait_time)
+
+    async def _supervise_adapter(self, adapter: BaseAdapter, platform: str) -> None:
+        """
+        {!--< internal-use >!--}
+        周期性调用适配器的 health() 探活，连续失败达到阈值时重启适配器
+
+        未重写 BaseAdapter.health() 的适配器不进行探活
+
+        :param adapter: 适配器实例
+        :param platform: 平台名称
+        """
+        if type(adapter).health is BaseAdapter.health:
+            return
+
+        failures = 0
+        while True:
+            supervisor_config = self._get_supervisor_config()
+            await asyncio.sleep(supervisor_config.get("health_interval", 30))
+
+            if adapter not in self._started_instances:
+                # 已被关闭（如手动 shutdown），结束守护
+                return
+
+            error = None
+            try:
+                healthy = await asyncio.wait_for(
+                    adapter.health(), supervisor_config.get("health_timeout", 10)
+                )
+            except asyncio.TimeoutError:
+                healthy, error = False, "health check timeout"
+            except Exception as e:
+                healthy, error = False, str(e)
+
+            if healthy is not False:
+                failures = 0
+                continue
+
+            failures += 1
+            logger.warning(
+                f"平台 {platform} 健康检查失败（{failures}次）"
+                + (f": {error}" if error else "")
+            )
+            if failures < supervisor_config.get("unhealthy_threshold", 2):
+                continue
+
+            await self._submit_status(
+                platform, "unhealthy", failures=failures, error=error
+            )
+            self._started_instances.discard(adapter)
+            try:
+                await adapter.shutdown()
+            except Exception as stop_err:
+                logger.warning(f"停止不健康的适配器 {platform} 失败: {stop_err}")
+
+            failures = 0
+            if not await self._start_adapter(adapter, platform, restart=True):
+                return
 
     async def shutdown(self, platforms: str | list[str] | None = None) -> None:
         """
@@ -329,8 +586,8 @@ class AdapterManager(ManagerBase):
 
                 # 收集该平台下需要标记为离线的 Bot
                 if platform in self._bots:
-                    for bot_id, bot_info in self._bots[platform].items():
-                        if bot_info.get("status") != "offline":
+                    for bot_id, state in self._bots[platform].items():
+                        if state.status != "offline":
                             bots_to_offline.append((platform, bot_id))
 
             # 对每个受影响的 adapter 实例执行 shutdown（如果尚未关闭）
@@ -391,14 +648,15 @@ class AdapterManager(ManagerBase):
                         f"已清理平台 {platform} 的路由: HTTP={result['http_count']}, WebSocket={result['websocket_count']}"
                     )
 
-            # 停止路由器（仅当所有适配器都关闭时）
+            # 停止路由器和心跳扫描（仅当所有适配器都关闭时）
             if not self._started_instances:
                 await router.stop()
+                self._stop_heartbeat_sweeper()
 
             # 将相关 Bot 标记为离线
             for platform, bot_id in bots_to_offline:
                 if platform in self._bots and bot_id in self._bots[platform]:
-                    self._bots[platform][bot_id]["status"] = "offline"
+                    self._bots[platform][bot_id].status = "offline"
                     # 提交 Bot 离线事件
                     await lifecycle.submit_event(
                         "adapter.bot.offline",
@@ -458,7 +716,8 @@ class AdapterManager(ManagerBase):
                 task.cancel()
         self._adapter_tasks.clear()
 
-        # 清除Bot状态
+        # 清除Bot状态并停止心跳扫描
+        self._stop_heartbeat_sweeper()
         self._bots.clear()
 
         logger.debug("适配器管理器已完全清理")
@@ -656,21 +915,137 @@ class AdapterManager(ManagerBase):
 
         return decorator
 
-    def middleware(self, func: Callable) -> Callable:
+    def set_event_forwarder(
+        self, forwarder: Callable[[Any], Awaitable[None]] | None
+    ) -> None:
+        """
+        {!--< internal-use >!--}
+        设置事件转发器
+
+        设置后 emit() 只维护 Bot 状态，事件交由转发器处理而不在本进程分发；传入 None 恢复本地分发
+
+        :param forwarder: 异步转发函数
+        """
+        self._event_forwarder = forwarder
+
+    # ==================== 中间件 ====================
+
+    DROP = DROP_EVENT
+    """中间件返回此值时停止分发当前事件"""
+
+    @property
+    def _onebot_middlewares(self) -> list[Callable]:
+        """
+        {!--< internal-use >!--}
+        已注册的中间件列表，内容变化时中间件链会在下一次 emit 时重新编译
+        """
+        return self._middlewares
+
+    @_onebot_middlewares.setter
+    def _onebot_middlewares(self, value: list[Callable]) -> None:
+        self._middlewares = _MiddlewareList(value, self._invalidate_middleware_chain)
+        self._invalidate_middleware_chain()
+
+    def middleware(
+        self,
+        func: Callable | None = None,
+        *,
+        platform: str | list[str] | None = None,
+        event_type: str | list[str] | None = None,
+    ) -> Callable:
         """
         添加OneBot12中间件处理器
 
+        中间件接收事件字典，返回（可修改的）事件字典；返回 adapter.DROP 时停止分发该事件。
+        同步函数与异步函数均可作为中间件，同步中间件直接调用，不创建协程
+
         :param func: 中间件函数
-        :return: 中间件函数
+        :param platform: 仅处理指定平台的事件，None 表示全部平台
+        :param event_type: 仅处理指定类型（type 字段）的事件，None 表示全部类型
+        :return: 中间件函数，或指定作用域时返回装饰器
 
         :example:
         >>> @sdk.adapter.middleware
         >>> async def onebot_middleware(data):
         >>>     print("处理OneBot12数据:", data)
         >>>     return data
+        >>>
+        >>> @sdk.adapter.middleware(platform="telegram", event_type="message")
+        >>> def drop_bots(data):
+        >>>     return sdk.adapter.DROP if data.get("user_id") in BLOCKED else data
+        """
+
+        def decorator(func: Callable) -> Callable:
+            scope = (
+                frozenset([platform] if isinstance(platform, str) else platform)
+                if platform is not None else None,
+                frozenset([event_type] if isinstance(event_type, str) else event_type)
+                if event_type is not None else None,
+            )
+            if scope == (None, None):
+                self._middleware_scopes.pop(func, None)
+            else:
+                self._middleware_scopes[func] = scope
+            self._onebot_middlewares.append(func)
+            return func
+
+        if func is not None:
+            return decorator(func)
+        return decorator
+
+    def _invalidate_middleware_chain(self) -> None:
+        """
+        {!--< internal-use >!--}
+        标记中间件链需要重新编译
         """
-        self._onebot_middlewares.append(func)
-        return func
+        self._middleware_chain = None
+        self._middleware_chain_compiled = False
+
+    def _compile_middleware_chain(self) -> Callable | None:
+        """
+        {!--< internal-use >!--}
+        将中间件列表编译为单个可调用对象
+
+        预先解析每个中间件的作用域与同步/异步类型，emit 时只做集合判断与直接调用；
+        未被追踪的事件不进入追踪分支
+
+        :return: async chain(data, platform, event_type)，无中间件时返回 None
+        """
+        entries = tuple(
+            (func, inspect.iscoroutinefunction(func), *self._middleware_scopes.get(func, (None, None)))
+            for func in self._onebot_middlewares
+        )
+        self._middleware_chain_compiled = True
+        if not entries:
+            self._middleware_chain = None
+            return None
+
+        isawaitable = inspect.isawaitable
+        current_span = tracer.current_span
+
+        async def chain(data: dict, platform: str, event_type: str) -> Any:
+            traced = current_span() is not None
+            for func, is_async, platforms, event_types in entries:
+                if platforms is not None and platform not in platforms:
+                    continue
+                if event_types is not None and event_type not in event_types:
+                    continue
+                if traced:
+                    with tracer.span("middleware", "middleware", middleware=func):
+                        result = func(data)
+                        if is_async or isawaitable(result):
+                            result = await result
+                else:
+                    result = func(data)
+                    if is_async or isawaitable(result):
+                        result = await result
+                if result is DROP_EVENT:
+                    return DROP_EVENT
+                data = result
+            return data
+
+        self._middleware_chain = chain
+        return chain
 
     async def emit(self, data: Any) -> None:
         """
@@ -689,10 +1064,21 @@ class AdapterManager(ManagerBase):
         >>>     "myplatform_raw": {...平台原生事件数据...},
         >>>     "myplatform_raw_type": "text_message"
         >>> })
+
+        {!--< tips >!--}
+        1. 高吞吐平台可以提交紧凑的 EventRecord，或将 "{platform}_raw" 设为 LazyRaw，
+           原生数据仅在存在匹配的原生事件处理器或调用 event.get_raw() 时才解码
+        2. 启用事件去重（ErisPulse.dedup）后，时间窗口内重复的 (平台, 事件ID) 会被直接丢弃
+        3. 中间件返回 adapter.DROP 时该事件不再分发到任何处理器
+        {!--< /tips >!--}
         """
         platform = data.get("platform", "unknown")
+
+        # 事件去重：平台重投递、重连重放的重复事件不再分发
+        if deduplicator.is_duplicate(platform, data.get("id")):
+            return
+
         event_type = data.get("type", "unknown")
-        platform_raw = data.get(f"{platform}_raw", {})
         raw_event_type = data.get(f"{platform}_raw_type")
 
         # 处理 meta 事件：适配器通过 meta 事件提交 Bot 上下线信息
@@ -715,9 +1101,7 @@ class AdapterManager(ManagerBase):
                             data={
                                 "platform": platform,
                                 "bot_id": bot_id,
-                                "info": self._bots.get(platform, {})
-                                .get(bot_id, {})
-                                .get("info", {}),
+                                "info": dict(self._bots[platform][bot_id].info),
                                 "status": "online",
                             },
                         )
@@ -728,53 +1112,88 @@ class AdapterManager(ManagerBase):
                         )
                     case "heartbeat":
                         # 心跳，更新活跃时间
-                        self._update_bot_heartbeat(platform, self_info)
+                        self._update_bot_heartbeat(
+                            platform, self_info, data.get("interval")
+                        )
                     case _:
                         # 其他 detail_type 不做特殊处理
                         pass
             else:
                 # 普通事件：自动发现Bot并更新活跃时间
                 self._auto_register_bot(platform, self_info)
+                if balancer.enabled or balancer._platforms:
+                    balancer.observe(platform, str(self_info["user_id"]), data)
 
-        # 先执行OneBot12中间件
-        processed_data = data
-        for middleware in self._onebot_middlewares:
-            processed_data = await middleware(processed_data)
-
-        # 分发到OneBot12事件处理器
-        handlers_to_call = []
-
-        # 处理特定事件类型的处理器
-        if event_type in self._onebot_handlers:
-            handlers_to_call.extend(self._onebot_handlers[event_type])
-
-        # 处理通配符处理器
-        handlers_to_call.extend(self._onebot_handlers.get("*", []))
+        # 多进程运行模式：事件转发到工作进程分发
+        if self._event_forwarder is not None:
+            await self._event_forwarder(data)
+            return
 
-        # 调用符合条件的标准事件处理器
-        for handler_wrapper in handlers_to_call:
-            handler_platform = handler_wrapper.get("platform")
-            # 如果处理器没有指定平台，或者指定的平台与当前事件平台匹配
-            if handler_platform is None or handler_platform == platform:
-                await handler_wrapper["func"](processed_data)
+        # 事件追踪：按采样率创建追踪上下文，传递到中间件、处理器与发送调用
+        with tracer.trace(
+            "emit", platform=platform, event_type=event_type, event_id=data.get("id")
+        ):
+            # 先执行OneBot12中间件链（中间件约定接收可修改的 dict，紧凑记录在此展开）
+            chain = (
+                self._middleware_chain
+                if self._middleware_chain_compiled
+                else self._compile_middleware_chain()
+            )
+            if chain is not None:
+                if not isinstance(data, dict):
+                    data = data.to_dict()
+                processed_data = await chain(data, platform, event_type)
+                if processed_data is DROP_EVENT:
+                    return
+            else:
+                processed_data = data
 
-        # 只有当存在原生事件数据时才分发原生事件
-        if raw_event_type and (platform_raw := data.get(f"{platform}_raw")) is not None:
-            raw_handlers_to_call = []
+            # 分发到OneBot12事件处理器
+            handlers_to_call = []
 
-            # 处理特定原生事件类型的处理器
-            if raw_event_type in self._raw_handlers:
-                raw_handlers_to_call.extend(self._raw_handlers[raw_event_type])
+            # 处理特定事件类型的处理器
+            if event_type in self._onebot_handlers:
+                handlers_to_call.extend(self._onebot_handlers[event_type])
 
-            # 处理原生事件的通配符处理器
-            raw_handlers_to_call.extend(self._raw_handlers.get("*", []))
+            # 处理通配符处理器
+            handlers_to_call.extend(self._onebot_handlers.get("*", []))
 
-            # 调用符合条件的原生事件处理器
-            for handler_wrapper in raw_handlers_to_call:
+            # 调用符合条件的标准事件处理器
+            for handler_wrapper in handlers_to_call:
                 handler_platform = handler_wrapper.get("platform")
                 # 如果处理器没有指定平台，或者指定的平台与当前事件平台匹配
                 if handler_platform is None or handler_platform == platform:
-                    await handler_wrapper["func"](platform_raw)
+                    with tracer.span("dispatch", "dispatch", handler=handler_wrapper["func"]):
+                        await handler_wrapper["func"](processed_data)
+
+            # 只有当存在原生事件数据时才分发原生事件
+            if raw_event_type and (
+                self._raw_handlers.get(raw_event_type) or self._raw_handlers.get("*")
+            ):
+                # 筛选符合条件的原生事件处理器（特定类型 + 通配符）
+                raw_handlers_to_call = [
+                    handler_wrapper
+                    for handler_wrapper in (
+                        *self._raw_handlers.get(raw_event_type, ()),
+                        *self._raw_handlers.get("*", ()),
+                    )
+                    # 如果处理器没有指定平台，或者指定的平台与当前事件平台匹配
+                    if handler_wrapper.get("platform") in (None, platform)
+                ]
+
+                # 仅在存在匹配的处理器时才解码原生数据
+                if (
+                    raw_handlers_to_call
+                    and (platform_raw := data.get(f"{platform}_raw")) is not None
+                ):
+                    from .Event.record import resolve_raw
+
+                    platform_raw = resolve_raw(platform_raw)
+                    for handler_wrapper in raw_handlers_to_call:
+                        with tracer.span(
+                            "dispatch_raw", "dispatch", handler=handler_wrapper["func"]
+                        ):
+                            await handler_wrapper["func"](platform_raw)
 
     # ==================== Bot状态管理 ====================
 
@@ -789,6 +1208,10 @@ class AdapterManager(ManagerBase):
         - self.avatar (可选) - Bot头像URL
         - self.account_id (可选) - 多账户标识
 
+        {!--< tips >!--}
+        每个携带 self 字段的事件都会调用此方法，已存在的 Bot 只原地刷新活跃时间和变化的字段
+        {!--< /tips >!--}
+
         :param platform: 平台名称
         :param self_info: 事件中的self字段内容
         :return: 是否为新注册的Bot
@@ -797,38 +1220,20 @@ class AdapterManager(ManagerBase):
         if not bot_id:
             return False
 
-        if platform not in self._bots:
-            self._bots[platform] = {}
-
-        is_new = bot_id not in self._bots[platform]
-
-        # 从self字段提取元信息（ErisPulse扩展的标准字段）
-        bot_meta = {}
-        if "user_name" in self_info:
-            bot_meta["user_name"] = self_info["user_name"]
-        if "nickname" in self_info:
-            bot_meta["nickname"] = self_info["nickname"]
-        if "avatar" in self_info:
-            bot_meta["avatar"] = self_info["avatar"]
-        if "account_id" in self_info:
-            bot_meta["account_id"] = self_info["account_id"]
+        if (bots := self._bots.get(platform)) is None:
+            bots = self._bots[platform] = {}
 
-        existing = self._bots[platform].get(bot_id, {})
-
-        # 合并已有元信息（新事件可更新元信息）
-        existing_meta = existing.get("info", {})
-        existing_meta.update(bot_meta)
-
-        self._bots[platform][bot_id] = {
-            "status": "online",
-            "last_active": time.time(),
-            "info": existing_meta,
-        }
-
-        if is_new:
-            logger.debug(f"自动发现Bot: {platform}/{bot_id}")
+        if (state := bots.get(bot_id)) is not None:
+            state.last_seen = time.monotonic()
+            if state.status != "online":
+                state.status = "online"
+            state.merge_info(self_info)
+            return False
 
-        return is_new
+        state = bots[bot_id] = BotState("online")
+        state.merge_info(self_info)
+        logger.debug(f"自动发现Bot: {platform}/{bot_id}")
+        return True
 
     def _update_bot_status(self, platform: str, bot_id: str, status: str) -> None:
         """
@@ -839,22 +1244,14 @@ class AdapterManager(ManagerBase):
         :param bot_id: Bot用户ID
         :param status: 状态值（online/offline）
         """
-        if platform not in self._bots:
-            self._bots[platform] = {}
+        if (bots := self._bots.get(platform)) is None:
+            bots = self._bots[platform] = {}
 
-        if bot_id not in self._bots[platform]:
-            self._bots[platform][bot_id] = {
-                "status": status,
-                "last_active": time.time(),
-                "info": {},
-            }
-        else:
-            old_status = self._bots[platform][bot_id].get("status")
-            self._bots[platform][bot_id]["status"] = status
-            if old_status != status:
-                logger.debug(
-                    f"Bot状态变更: {platform}/{bot_id} {old_status} -> {status}"
-                )
+        if (state := bots.get(bot_id)) is None:
+            bots[bot_id] = BotState(status)
+        elif (old_status := state.status) != status:
+            state.status = status
+            logger.debug(f"Bot状态变更: {platform}/{bot_id} {old_status} -> {status}")
 
         if status == "offline":
             if not self._is_being_shutdown:
@@ -871,30 +1268,115 @@ class AdapterManager(ManagerBase):
                 except RuntimeError:
                     pass
 
-    def _update_bot_heartbeat(self, platform: str, self_info: dict) -> None:
+    def _update_bot_heartbeat(
+        self, platform: str, self_info: dict, interval: int | float | None = None
+    ) -> None:
         """
         {!--< internal-use >!--}
         更新Bot心跳（更新活跃时间和元信息）
 
         :param platform: 平台名称
         :param self_info: 事件中的self字段内容
+        :param interval: 心跳事件的 interval 字段（毫秒），用于心跳超时判断
         """
         bot_id = str(self_info.get("user_id", ""))
         if not bot_id:
             return
 
-        if platform not in self._bots:
-            self._bots[platform] = {}
+        if (state := self._bots.get(platform, {}).get(bot_id)) is None:
+            return
+
+        state.last_seen = time.monotonic()
+        if isinstance(interval, (int, float)) and interval > 0:
+            state.heartbeat_interval = interval / 1000
+        # 心跳也可更新元信息
+        state.merge_info(self_info)
+
+    # ==================== 心跳超时检测 ====================
+
+    def _start_heartbeat_sweeper(self) -> None:
+        """
+        {!--< internal-use >!--}
+        启动心跳超时扫描任务（已运行时不重复启动）
+        """
+        if self._heartbeat_task is not None and not self._heartbeat_task.done():
+            return
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_sweep_loop())
 
-        if bot_id in self._bots[platform]:
-            self._bots[platform][bot_id]["last_active"] = time.time()
-            # 心跳也可更新元信息
-            bot_meta = {}
-            for key in ("user_name", "nickname", "avatar", "account_id"):
-                if key in self_info:
-                    bot_meta[key] = self_info[key]
-            if bot_meta:
-                self._bots[platform][bot_id].setdefault("info", {}).update(bot_meta)
+    def _stop_heartbeat_sweeper(self) -> None:
+        """
+        {!--< internal-use >!--}
+        停止心跳超时扫描任务
+        """
+        if self._heartbeat_task is not None and not self._heartbeat_task.done():
+            self._heartbeat_task.cancel()
+        self._heartbeat_task = None
+
+    async def _heartbeat_sweep_loop(self) -> None:
+        """
+        {!--< internal-use >!--}
+        周期性扫描所有 Bot 的心跳超时，所有 Bot 共用一个定时任务
+        """
+        from ..runtime import get_bot_config
+
+        while True:
+            interval = get_bot_config().get("sweep_interval", 5)
+            await asyncio.sleep(interval if interval and interval > 0 else 5)
+            try:
+                await self._sweep_heartbeats()
+            except Exception as e:
+                logger.warning(f"心跳超时扫描失败: {e}")
+
+    async def _sweep_heartbeats(self, now: float | None = None) -> list[tuple[str, str]]:
+        """
+        {!--< internal-use >!--}
+        执行一次心跳超时扫描，将超时的在线 Bot 标记为离线并提交 adapter.bot.offline 事件
+
+        超时判断：
+        - 配置了 bot.heartbeat_timeout (>0) 时，所有在线 Bot 统一使用该超时
+        - 否则仅检查上报过心跳的 Bot，超时为 心跳间隔 × bot.heartbeat_multiplier
+
+        :param now: 当前单调时钟时间，None 表示使用 time.monotonic()
+        :return: 本次被标记为离线的 [(platform, bot_id), ...]
+        """
+        from ..runtime import get_bot_config
+
+        bot_config = get_bot_config()
+        fixed_timeout = bot_config.get("heartbeat_timeout", 0) or 0
+        multiplier = bot_config.get("heartbeat_multiplier", 3) or 3
+        if now is None:
+            now = time.monotonic()
+
+        expired = []
+        for platform, bots in self._bots.items():
+            for bot_id, state in bots.items():
+                if state.status != "online":
+                    continue
+                if fixed_timeout > 0:
+                    timeout = fixed_timeout
+                elif state.heartbeat_interval is not None:
+                    timeout = state.heartbeat_interval * multiplier
+                else:
+                    continue
+                if now - state.last_seen > timeout:
+                    state.status = "offline"
+                    expired.append((platform, bot_id))
+
+        for platform, bot_id in expired:
+            logger.warning(f"Bot {platform}/{bot_id} 心跳超时，标记为离线")
+            await lifecycle.submit_event(
+                "adapter.bot.offline",
+                msg=f"Bot {platform}/{bot_id} 心跳超时离线",
+                data={
+                    "platform": platform,
+                    "bot_id": bot_id,
+                    "status": "offline",
+                    "reason": "heartbeat_timeout",
+                },
+            )
+        return expired
+
+    # ==================== Bot状态查询 ====================
 
     def get_bot_info(self, platform: str, bot_id: str) -> dict | None:
         """
@@ -908,7 +1390,9 @@ class AdapterManager(ManagerBase):
         >>> info = adapter.get_bot_info("telegram", "123456")
         >>> # {"status": "online", "last_active": 1712345678.0, "info": {"nickname": "MyBot"}}
         """
-        return self._bots.get(platform, {}).get(bot_id)
+        if (state := self._bots.get(platform, {}).get(bot_id)) is None:
+            return None
+        return state.to_dict()
 
     def list_bots(self, platform: str | None = None) -> dict[str, dict[str, dict]]:
         """
@@ -924,8 +1408,18 @@ class AdapterManager(ManagerBase):
         >>> tg_bots = adapter.list_bots("telegram")
         """
         if platform is not None:
-            return {platform: dict(self._bots.get(platform, {}))}
-        return {p: dict(bots) for p, bots in self._bots.items()}
+            return {platform: self._snapshot_bots(platform)}
+        return {p: self._snapshot_bots(p) for p in self._bots}
+
+    def _snapshot_bots(self, platform: str) -> dict[str, dict]:
+        """
+        {!--< internal-use >!--}
+        导出指定平台下所有 Bot 的状态快照
+        """
+        return {
+            bot_id: state.to_dict()
+            for bot_id, state in self._bots.get(platform, {}).items()
+        }
 
     def is_bot_online(self, platform: str, bot_id: str) -> bool:
         """
@@ -939,9 +1433,9 @@ class AdapterManager(ManagerBase):
         >>> if adapter.is_bot_online("telegram", "123456"):
         ...     print("Bot在线")
         """
-        if (bot_info := self._bots.get(platform, {}).get(bot_id)) is None:
+        if (state := self._bots.get(platform, {}).get(bot_id)) is None:
             return False
-        return bot_info.get("status") == "online"
+        return state.status == "online"
 
     def get_status_summary(self) -> dict[str, Any]:
         """
@@ -978,7 +1472,7 @@ class AdapterManager(ManagerBase):
 
             adapters_summary[platform_name] = {
                 "status": adapter_status,
-                "bots": dict(self._bots.get(platform_name, {})),
+                "bots": self._snapshot_bots(platform_name),
             }
 
         return {"adapters": adapters_summary}
@@ -1189,4 +1683,4 @@ class AdapterManager(ManagerBase):
 
 adapter: AdapterManager = AdapterManager()
 
-__all__ = ["adapter"]
+__all__ = ["adapter", "BotState"]
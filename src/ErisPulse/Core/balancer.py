@@ -0,0 +1,347 @@
+"""
+ErisPulse 多账号负载均衡
+
+同一平台有多个在线 Bot 账号时，未通过 Using / Account 指定账号的发送自动选择账号
+
+{!--< tips >!--}
+1. 候选账号为 adapter 记录的在线 Bot（meta connect / 事件 self 字段自动发现，离线与心跳超时自动排除）
+2. 启用 learn_targets 时根据收到的事件记录每个目标（群、频道、用户）可由哪些账号到达，
+   有记录时只在可达账号中选择，没有记录时在全部在线账号中选择
+3. 选择策略：least_outstanding 选择未完成发送最少的账号，round_robin 轮询
+4. sticky 开启时同一目标固定使用上次选择的账号，账号离线或不可达时重新选择
+5. 只有一个在线账号时直接使用该账号，没有已知在线账号时按适配器默认账号发送
+{!--< /tips >!--}
+"""
+
+import asyncio
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .logger import logger
+from .outbox import _SEND_MODIFIERS
+
+BALANCE_POLICIES = ("least_outstanding", "round_robin")
+
+
+class _Target:
+    """
+    {!--< internal-use >!--}
+    目标的可达账号与绑定账号
+    """
+
+    __slots__ = ("accounts", "sticky", "last_used")
+
+    def __init__(self):
+        self.accounts: set[str] = set()
+        self.sticky: str | None = None
+        self.last_used = 0.0
+
+
+class AccountBalancer:
+    """
+    多账号负载均衡器
+
+    :param adapter_manager: 适配器管理器（默认全局 adapter）
+
+    :example:
+    >>> from ErisPulse import sdk
+    >>> sdk.balancer.enable("telegram")
+    >>> await sdk.adapter.telegram.Send.To("group", "123").Text("通知")  # 自动选择账号
+    >>> await sdk.adapter.telegram.Send.Using("bot2").To("group", "123").Text("通知")  # 指定账号时不参与
+    >>> sdk.balancer.get_stats()
+    {'telegram': {'enabled': True, 'accounts': {'bot1': {'online': True, 'outstanding': 0, 'sent': 512}, ...}, 'targets': 37}}
+    """
+
+    def __init__(self, adapter_manager: Any = None):
+        from ..runtime import get_balancer_config
+
+        balancer_config = get_balancer_config()
+        self.enabled: bool = balancer_config.get("enabled", False)
+        self.policy: str = balancer_config.get("policy", "least_outstanding")
+        self.sticky: bool = balancer_config.get("sticky", True)
+        self.sticky_ttl: float = balancer_config.get("sticky_ttl", 1800)
+        self.max_targets: int = balancer_config.get("max_targets", 100000)
+        self.learn_targets: bool = balancer_config.get("learn_targets", True)
+        self._platforms: dict[str, bool] = dict(balancer_config.get("platforms", {}))
+
+        if self.policy not in BALANCE_POLICIES:
+            logger.warning(f"未知的账号选择策略: {self.policy}，已回退到 least_outstanding")
+            self.policy = "least_outstanding"
+
+        self._adapter_manager = adapter_manager
+        # 平台 -> {(发送类型, 目标ID): _Target}，按最近使用排序
+        self._targets: dict[str, OrderedDict[tuple[str, str], _Target]] = {}
+        self._outstanding: dict[tuple[str, str], int] = {}
+        self._sent: dict[tuple[str, str], int] = {}
+        self._cursors: dict[str, int] = {}
+
+    # ==================== 开关 ====================
+
+    def is_enabled(self, platform: str) -> bool:
+        """
+        平台是否启用自动选择账号
+
+        :param platform: 平台名
+        :return: 是否启用
+        """
+        return self._platforms.get(platform, self.enabled)
+
+    def enable(self, platform: str | None = None, enabled: bool = True) -> None:
+        """
+        启用或关闭自动选择账号
+
+        :param platform: 平台名，None 表示全局默认
+        :param enabled: 是否启用
+        """
+        if platform is None:
+            self.enabled = enabled
+        else:
+            self._platforms[platform] = enabled
+
+    # ==================== 账号选择 ====================
+
+    def _manager(self) -> Any:
+        """
+        {!--< internal-use >!--}
+        获取适配器管理器
+        """
+        if self._adapter_manager is None:
+            from .adapter import adapter
+
+            self._adapter_manager = adapter
+        return self._adapter_manager
+
+    def _online(self, platform: str) -> list[str]:
+        """
+        {!--< internal-use >!--}
+        获取平台的在线账号
+        """
+        bots = self._manager()._bots.get(platform)
+        if not bots:
+            return []
+        return [bot_id for bot_id, state in bots.items() if state.status == "online"]
+
+    def _get_target(self, platform: str, key: tuple[str, str], create: bool) -> _Target | None:
+        """
+        {!--< internal-use >!--}
+        获取目标记录，超出 max_targets 时淘汰最久未使用的目标
+        """
+        targets = self._targets.get(platform)
+        if targets is None:
+            if not create:
+                return None
+            targets = self._targets[platform] = OrderedDict()
+        target = targets.get(key)
+        if target is not None:
+            targets.move_to_end(key)
+        elif create:
+            target = targets[key] = _Target()
+            while len(targets) > self.max_targets:
+                targets.popitem(last=False)
+        return target
+
+    def select(self, platform: str, target_type: str | None, target_id: Any) -> str | None:
+        """
+        为发送目标选择账号
+
+        :param platform: 平台名
+        :param target_type: 发送类型
+        :param target_id: 目标ID
+        :return: 账号ID，没有已知在线账号时返回 None
+        """
+        online = self._online(platform)
+        if len(online) <= 1:
+            return online[0] if online else None
+
+        key = None if target_id is None else (target_type or "", str(target_id))
+        target = self._get_target(platform, key, self.sticky) if key else None
+
+        candidates = online
+        if target is not None and target.accounts:
+            reachable = [account for account in online if account in target.accounts]
+            if reachable:
+                candidates = reachable
+
+        now = time.monotonic()
+        if (
+            target is not None
+            and target.sticky in candidates
+            and now - target.last_used <= self.sticky_ttl
+        ):
+            account = target.sticky
+        else:
+            account = self._pick(platform, candidates)
+
+        if target is not None and self.sticky:
+            target.sticky = account
+            target.last_used = now
+        return account
+
+    def _pick(self, platform: str, candidates: list[str]) -> str:
+        """
+        {!--< internal-use >!--}
+        按策略从候选账号中选择
+        """
+        cursor = self._cursors.get(platform, 0)
+        self._cursors[platform] = cursor + 1
+        count = len(candidates)
+        if self.policy == "round_robin" or count == 1:
+            return candidates[cursor % count]
+
+        # 从轮询位置开始比较，未完成数相同时依次分散到不同账号
+        outstanding = self._outstanding
+        return min(
+            (candidates[(cursor + offset) % count] for offset in range(count)),
+            key=lambda account: outstanding.get((platform, account), 0),
+        )
+
+    def observe(self, platform: str, account: str, event: dict[str, Any]) -> None:
+        """
+        根据收到的事件记录账号可达的目标
+
+        :param platform: 平台名
+        :param account: 收到事件的账号
+        :param event: 事件数据
+        """
+        if not self.learn_targets or not self.is_enabled(platform):
+            return
+        from .Event.session_type import get_send_type_and_target_id
+
+        try:
+            send_type, target_id = get_send_type_and_target_id(event, platform)
+        except Exception:
+            return
+        if target_id:
+            self._get_target(platform, (send_type, str(target_id)), True).accounts.add(account)
+
+    # ==================== 发送 ====================
+
+    def dispatch(
+        self, dsl: Any, func: Callable, args: tuple, kwargs: dict[str, Any]
+    ) -> Any:
+        """
+        {!--< internal-use >!--}
+        为未指定账号的发送选择账号并记录未完成发送数
+        """
+        adapter = dsl._adapter
+        platform = None
+        for name, instance in self._manager()._adapters.items():
+            if instance is adapter:
+                platform = name
+                break
+        if platform is None or not self.is_enabled(platform):
+            return func(dsl, *args, **kwargs)
+
+        account = self.select(platform, dsl._target_type, dsl._target_id)
+        if account is None:
+            return func(dsl, *args, **kwargs)
+
+        # 复制 DSL 以保留修饰方法（At / Reply 等）设置的状态；
+        # 不使用 copy.copy，其在实例字典为空时访问属性会进入 SendDSL.__getattr__
+        routed = object.__new__(type(dsl))
+        routed.__dict__.update(dsl.__dict__)
+        routed._account_id = account
+        key = (platform, account)
+        self._outstanding[key] = self._outstanding.get(key, 0) + 1
+        self._sent[key] = self._sent.get(key, 0) + 1
+        try:
+            result = func(routed, *args, **kwargs)
+        except BaseException:
+            self._release(key)
+            raise
+
+        if isinstance(result, asyncio.Future):
+            result.add_done_callback(lambda _: self._release(key))
+        elif inspect.isawaitable(result):
+            result = self._await_and_release(result, key)
+        else:
+            self._release(key)
+        return result
+
+    def _release(self, key: tuple[str, str]) -> None:
+        """
+        {!--< internal-use >!--}
+        发送完成，减少未完成发送数
+        """
+        self._outstanding[key] = max(0, self._outstanding.get(key, 0) - 1)
+
+    async def _await_and_release(self, awaitable: Awaitable, key: tuple[str, str]) -> Any:
+        """
+        {!--< internal-use >!--}
+        等待协程形式的发送结果后减少未完成发送数
+        """
+        try:
+            return await awaitable
+        finally:
+            self._release(key)
+
+    # ==================== 状态 ====================
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取各平台账号的在线状态、未完成发送数与累计发送数
+
+        :return: {平台: {"accounts": {账号: {...}}, "targets": 记录的目标数}}
+        """
+        stats: dict[str, Any] = {}
+        platforms = {platform for platform, _ in self._sent} | set(self._targets)
+        for platform in platforms:
+            online = set(self._online(platform))
+            accounts = {account for p, account in self._sent if p == platform} | online
+            stats[platform] = {
+                "enabled": self.is_enabled(platform),
+                "accounts": {
+                    account: {
+                        "online": account in online,
+                        "outstanding": self._outstanding.get((platform, account), 0),
+                        "sent": self._sent.get((platform, account), 0),
+                    }
+                    for account in sorted(accounts)
+                },
+                "targets": len(self._targets.get(platform, ())),
+            }
+        return stats
+
+    def reset(self) -> None:
+        """
+        清空目标记录与计数
+        """
+        self._targets.clear()
+        self._outstanding.clear()
+        self._sent.clear()
+        self._cursors.clear()
+
+
+balancer: AccountBalancer = AccountBalancer()
+
+
+def balance_send_method(func: Callable, method: str) -> Callable:
+    """
+    {!--< internal-use >!--}
+    包装 SendDSL 的发送方法：未指定账号时自动选择账号
+
+    :param func: 发送方法
+    :param method: 方法名
+    :return: 包装后的方法
+    """
+    if method.lower() in _SEND_MODIFIERS:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self._account_id is not None or not (balancer.enabled or balancer._platforms):
+            return func(self, *args, **kwargs)
+        return balancer.dispatch(self, func, args, kwargs)
+
+    return wrapper
+
+
+__all__ = [
+    "AccountBalancer",
+    "balancer",
+    "balance_send_method",
+]
@@ -0,0 +1,557 @@
+"""
+ErisPulse 基准测试套件
+
+在已安装的部署上运行标准场景矩阵，输出吞吐量与延迟百分位，并与历史基线比较
+
+{!--< tips >!--}
+1. 事件与命令场景经过完整的 adapter.emit 链路（中间件、已加载模块的处理器），
+   发送由桩适配器 ReplayAdapter 接收，不会连接真实平台
+2. 存储场景使用临时数据库，不会修改部署的数据
+3. 路由场景在进程内直接调用 ASGI 应用，度量路由与处理开销，不包含网络传输
+4. 日志场景将输出重定向到内存，度量格式化与记录开销
+5. 基线比较以吞吐量下降幅度判定回归，延迟百分位变化仅作参考
+{!--< /tips >!--}
+"""
+
+import asyncio
+import inspect
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
+
+from .Event.metrics import percentile
+from .logger import logger
+from .recorder import ReplayAdapter
+
+# 基准测试使用的平台名与路由命名空间
+BENCH_PLATFORM = "bench"
+BENCH_NAMESPACE = "bench"
+BASELINE_FORMAT = 1
+
+
+def _message_event(index: int, text: str) -> dict[str, Any]:
+    """
+    {!--< internal-use >!--}
+    构造基准测试消息事件
+    """
+    return {
+        "id": f"bench-{index}",
+        "time": int(time.time()),
+        "type": "message",
+        "detail_type": "private",
+        "platform": BENCH_PLATFORM,
+        "self": {"platform": BENCH_PLATFORM, "user_id": "bench_bot"},
+        "user_id": "bench_user",
+        "message": [{"type": "text", "data": {"text": text}}],
+        "alt_message": text,
+    }
+
+
+# ==================== 场景 ====================
+
+
+@asynccontextmanager
+async def _mock_platform(adapters: Any) -> AsyncIterator[ReplayAdapter]:
+    """
+    {!--< internal-use >!--}
+    临时安装桩适配器
+    """
+    original = adapters._adapters.get(BENCH_PLATFORM)
+    stub = ReplayAdapter()
+    adapters._adapters[BENCH_PLATFORM] = stub
+    adapters._started_instances.add(stub)
+    try:
+        yield stub
+    finally:
+        adapters._started_instances.discard(stub)
+        if original is None:
+            adapters._adapters.pop(BENCH_PLATFORM, None)
+        else:
+            adapters._adapters[BENCH_PLATFORM] = original
+        adapters._bots.pop(BENCH_PLATFORM, None)
+
+
+@asynccontextmanager
+async def _scenario_event_dispatch(suite: "BenchmarkSuite") -> AsyncIterator[Callable]:
+    """
+    事件分发：普通消息事件经过 adapter.emit 分发到所有已注册的处理器
+    """
+    adapters = suite.adapter_manager
+    counter = iter(range(sys.maxsize))
+
+    async with _mock_platform(adapters):
+        async def op():
+            await adapters.emit(_message_event(next(counter), "bench"))
+
+        yield op
+
+
+@asynccontextmanager
+async def _scenario_event_command(suite: "BenchmarkSuite") -> AsyncIterator[Callable]:
+    """
+    命令：命令消息经过命令解析并执行回复
+    """
+    from .Event import command
+
+    adapters = suite.adapter_manager
+    counter = iter(range(sys.maxsize))
+
+    async def bench_ping(event):
+        await event.reply("pong")
+
+    command("__bench_ping", hidden=True)(bench_ping)
+    text = f"{command.prefix}__bench_ping"
+    try:
+        async with _mock_platform(adapters) as stub:
+            async def op():
+                await adapters.emit(_message_event(next(counter), text))
+
+            yield op
+            if not stub.sent:
+                raise RuntimeError("命令未产生回复，命令分发可能未挂载")
+    finally:
+        command.unregister(bench_ping)
+
+
+@asynccontextmanager
+async def _scenario_storage_kv(suite: "BenchmarkSuite") -> AsyncIterator[Callable]:
+    """
+    存储键值：在临时数据库上交替执行 set / get
+    """
+    with suite.temp_storage() as storage:
+        counter = iter(range(sys.maxsize))
+
+        def op():
+            key = f"bench.key_{next(counter) % 1000}"
+            storage.set(key, {"value": key})
+            storage.get(key)
+
+        yield op
+
+
+@asynccontextmanager
+async def _scenario_storage_sql(suite: "BenchmarkSuite") -> AsyncIterator[Callable]:
+    """
+    SQL 构建器：在临时数据库上执行带条件的链式查询
+    """
+    with suite.temp_storage() as storage:
+        storage.CreateTable(
+            "bench_rows",
+            {"id": "INTEGER PRIMARY KEY", "name": "TEXT", "score": "INTEGER"},
+        )
+        storage.Table("bench_rows").InsertMulti(
+            [{"id": i, "name": f"row_{i}", "score": i % 100} for i in range(1000)]
+        ).Execute()
+        counter = iter(range(sys.maxsize))
+
+        def op():
+            index = next(counter) % 1000
+            storage.Table("bench_rows").Select("name", "score").Where(
+                "id = ?", index
+            ).ExecuteOne()
+
+        yield op
+
+
+async def _asgi_http(app: Any, method: str, path: str) -> int:
+    """
+    {!--< internal-use >!--}
+    在进程内发送一个 HTTP 请求到 ASGI 应用
+
+    :return: 响应状态码
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+@asynccontextmanager
+async def _scenario_router_http(suite: "BenchmarkSuite") -> AsyncIterator[Callable]:
+    """
+    HTTP 路由：对核心 /ping 端点发起请求
+    """
+    app = suite.router.app
+
+    async def op():
+        status = await _asgi_http(app, "GET", "/ping")
+        if status != 200:
+            raise RuntimeError(f"HTTP 请求失败: {status}")
+
+    yield op
+
+
+@asynccontextmanager
+async def _scenario_router_websocket(suite: "BenchmarkSuite") -> AsyncIterator[Callable]:
+    """
+    WebSocket 路由：在一个连接上往返回显文本消息
+    """
+    router = suite.router
+
+    async def echo(websocket):
+        while True:
+            await websocket.send_text(await websocket.receive_text())
+
+    router.register_websocket(BENCH_NAMESPACE, "/echo", echo)
+    path = router._normalize_path(BENCH_NAMESPACE, "/echo")
+    inbox: asyncio.Queue = asyncio.Queue()
+    outbox: asyncio.Queue = asyncio.Queue()
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "scheme": "ws",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+        "subprotocols": [],
+    }
+    await inbox.put({"type": "websocket.connect"})
+    session = asyncio.create_task(router.app(scope, inbox.get, outbox.put))
+    try:
+        accepted = await asyncio.wait_for(outbox.get(), timeout=5)
+        if accepted["type"] != "websocket.accept":
+            raise RuntimeError(f"WebSocket 连接失败: {accepted}")
+
+        async def op():
+            await inbox.put({"type": "websocket.receive", "text": "ping"})
+            await outbox.get()
+
+        yield op
+    finally:
+        await inbox.put({"type": "websocket.disconnect", "code": 1000})
+        try:
+            await asyncio.wait_for(session, timeout=5)
+        except (asyncio.TimeoutError, Exception):
+            session.cancel()
+        router.unregister_websocket(BENCH_NAMESPACE, "/echo")
+
+
+@asynccontextmanager
+async def _scenario_logger(suite: "BenchmarkSuite") -> AsyncIterator[Callable]:
+    """
+    日志：通过子日志记录器记录 INFO 日志，输出重定向到内存
+    """
+    from rich.console import Console
+    from rich.logging import RichHandler
+
+    bench_logger = logger.get_child("bench")
+    std_logger = logger._logger
+    handlers = list(std_logger.handlers)
+    consoles = {}
+    for handler in handlers:
+        if isinstance(handler, RichHandler):
+            consoles[handler] = handler.console
+            handler.console = Console(file=io.StringIO(), width=120)
+        else:
+            std_logger.removeHandler(handler)
+    saved_logs = {name: list(logs) for name, logs in logger._logs.items()}
+    level = std_logger.level
+    std_logger.setLevel(logging.DEBUG)
+    counter = iter(range(sys.maxsize))
+    try:
+        def op():
+            bench_logger.info(f"bench message {next(counter)}")
+
+        yield op
+    finally:
+        std_logger.setLevel(level)
+        logger._logs.clear()
+        logger._logs.update(saved_logs)
+        for handler in handlers:
+            if handler in consoles:
+                handler.console = consoles[handler]
+            elif handler not in std_logger.handlers:
+                std_logger.addHandler(handler)
+
+
+SCENARIOS: dict[str, Callable[["BenchmarkSuite"], Any]] = {
+    "event.dispatch": _scenario_event_dispatch,
+    "event.command": _scenario_event_command,
+    "storage.kv": _scenario_storage_kv,
+    "storage.sql": _scenario_storage_sql,
+    "router.http": _scenario_router_http,
+    "router.websocket": _scenario_router_websocket,
+    "logger": _scenario_logger,
+}
+
+
+# ==================== 套件 ====================
+
+
+class BenchmarkSuite:
+    """
+    基准测试套件
+
+    :param iterations: 每个场景的计时操作次数
+    :param warmup: 每个场景计时前的预热操作次数
+    :param adapter_manager: 适配器管理器（默认全局 adapter）
+    :param router: 路由管理器（默认全局 router）
+
+    :example:
+    >>> suite = BenchmarkSuite(iterations=2000)
+    >>> result = await suite.run(["event.dispatch", "storage.kv"])
+    >>> result["scenarios"]["event.dispatch"]["ops_per_sec"]
+    >>> comparison = compare_baseline(result, load_baseline("bench.json"), threshold=0.1)
+    """
+
+    def __init__(
+        self,
+        iterations: int = 1000,
+        warmup: int = 100,
+        adapter_manager: Any = None,
+        router: Any = None,
+    ):
+        if iterations < 1:
+            raise ValueError("iterations 必须大于 0")
+        if adapter_manager is None:
+            from .adapter import adapter as adapter_manager
+        if router is None:
+            from .router import router
+
+        self.iterations = iterations
+        self.warmup = max(0, warmup)
+        self.adapter_manager = adapter_manager
+        self.router = router
+
+    def temp_storage(self):
+        """
+        创建使用临时数据库的存储管理器
+
+        :return: 上下文管理器，退出时删除临时数据库
+        """
+        from .storage import StorageManager
+
+        class _BenchStorage(StorageManager):
+            _instance = None
+
+            def __init__(self, db_path: str):
+                self.db_path = db_path
+                self._init_db()
+                self._initialized = True
+
+        @contextmanager
+        def _temp():
+            with tempfile.TemporaryDirectory(prefix="erispulse-bench-") as directory:
+                yield _BenchStorage(os.path.join(directory, "bench.db"))
+
+        return _temp()
+
+    async def measure(self, op: Callable[[], Any]) -> dict[str, Any]:
+        """
+        顺序执行操作并统计吞吐量与延迟百分位
+
+        :param op: 无参操作，同步函数或协程函数
+        :return: 统计结果
+        """
+        is_async = inspect.iscoroutinefunction(op)
+        for _ in range(self.warmup):
+            if is_async:
+                await op()
+            else:
+                op()
+
+        samples = []
+        perf_counter = time.perf_counter
+        start = perf_counter()
+        for _ in range(self.iterations):
+            begin = perf_counter()
+            if is_async:
+                await op()
+            else:
+                op()
+            samples.append(perf_counter() - begin)
+        elapsed = perf_counter() - start
+
+        samples.sort()
+        return {
+            "ops": len(samples),
+            "duration_s": round(elapsed, 4),
+            "ops_per_sec": round(len(samples) / elapsed, 1) if elapsed > 0 else 0.0,
+            "avg_ms": round(sum(samples) / len(samples) * 1000, 4),
+            "p50_ms": round(percentile(samples, 50) * 1000, 4),
+            "p95_ms": round(percentile(samples, 95) * 1000, 4),
+            "p99_ms": round(percentile(samples, 99) * 1000, 4),
+            "max_ms": round(samples[-1] * 1000, 4),
+        }
+
+    async def run_scenario(self, name: str) -> dict[str, Any]:
+        """
+        运行单个场景
+
+        :param name: 场景名，见 SCENARIOS
+        :return: 统计结果，失败时包含 error 字段
+        :raises ValueError: 场景不存在
+        """
+        if name not in SCENARIOS:
+            raise ValueError(f"未知的基准测试场景: {name}，可用场景: {', '.join(SCENARIOS)}")
+        try:
+            async with SCENARIOS[name](self) as op:
+                return await self.measure(op)
+        except Exception as e:
+            logger.error(f"基准测试场景 {name} 失败: {e}")
+            return {"error": f"{type(e).__name__}: {e}"}
+
+    async def run(
+        self,
+        scenarios: list[str] | None = None,
+        on_result: Callable[[str, dict[str, Any]], Any] | None = None,
+    ) -> dict[str, Any]:
+        """
+        运行场景矩阵
+
+        :param scenarios: 场景名列表，None 表示全部场景
+        :param on_result: 每个场景完成后的回调 (name, result)
+        :return: 基线数据，可直接写入 JSON
+        """
+        names = list(scenarios or SCENARIOS)
+        for name in names:
+            if name not in SCENARIOS:
+                raise ValueError(f"未知的基准测试场景: {name}，可用场景: {', '.join(SCENARIOS)}")
+
+        from ..runtime import get_loop_info
+
+        results = {}
+        for name in names:
+            results[name] = await self.run_scenario(name)
+            if on_result is not None:
+                on_result(name, results[name])
+
+        return {
+            "format": BASELINE_FORMAT,
+            "created_at": time.time(),
+            "environment": {
+                "erispulse": _erispulse_version(),
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "loop": get_loop_info(asyncio.get_running_loop())["implementation"],
+            },
+            "iterations": self.iterations,
+            "warmup": self.warmup,
+            "scenarios": results,
+        }
+
+
+def _erispulse_version() -> str:
+    """
+    {!--< internal-use >!--}
+    获取已安装的 ErisPulse 版本
+    """
+    from .router import ERISPULSE_VERSION
+
+    return ERISPULSE_VERSION
+
+
+# ==================== 基线 ====================
+
+
+def load_baseline(path: str) -> dict[str, Any]:
+    """
+    读取基线文件
+
+    :param path: 基线 JSON 文件路径
+    :return: 基线数据
+    :raises ValueError: 文件不是基准测试基线
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("scenarios"), dict):
+        raise ValueError(f"{path} 不是有效的基准测试基线文件")
+    return data
+
+
+def save_baseline(result: dict[str, Any], path: str) -> None:
+    """
+    写入基线文件
+
+    :param result: BenchmarkSuite.run() 的结果
+    :param path: 基线 JSON 文件路径
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+def compare_baseline(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float = 0.1
+) -> list[dict[str, Any]]:
+    """
+    与基线比较
+
+    :param current: 本次运行结果
+    :param baseline: 基线数据
+    :param threshold: 吞吐量下降超过该比例即判定为回归（0.1 表示 10%）
+    :return: 每个场景的比较结果，包含 ops_change / p99_change（相对变化比例）与 regressed
+    """
+    comparison = []
+    for name, result in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if "error" in result or not base or "error" in base:
+            comparison.append({
+                "name": name, "ops_change": None, "p99_change": None,
+                "regressed": "error" in result,
+            })
+            continue
+
+        ops_change = (
+            (result["ops_per_sec"] - base["ops_per_sec"]) / base["ops_per_sec"]
+            if base["ops_per_sec"] else 0.0
+        )
+        p99_change = (
+            (result["p99_ms"] - base["p99_ms"]) / base["p99_ms"] if base["p99_ms"] else 0.0
+        )
+        comparison.append({
+            "name": name,
+            "ops_per_sec": result["ops_per_sec"],
+            "baseline_ops_per_sec": base["ops_per_sec"],
+            "ops_change": round(ops_change, 4),
+            "p99_change": round(p99_change, 4),
+            "regressed": ops_change < -threshold,
+        })
+    return comparison
+
+
+__all__ = [
+    "SCENARIOS",
+    "BenchmarkSuite",
+    "load_baseline",
+    "save_baseline",
+    "compare_baseline",
+]
@@ -0,0 +1,714 @@
+"""
+ErisPulse 多进程分片运行时
+
+``epsdk run --workers N`` 的实现：前端进程持有适配器连接与路由服务器，
+按会话键将事件哈希分发到 N 个工作进程；工作进程运行完整的模块与事件处理器，
+其发送调用经本地 IPC 代理回前端进程执行
+
+{!--< tips >!--}
+1. 进程间通过 Unix 域套接字通信，帧格式为 4 字节长度前缀 + pickle 数据，仅用于本机可信进程
+2. 同一会话的事件总是分发到同一个工作进程，并在工作进程内按到达顺序串行处理；不同会话之间并发处理
+3. 工作进程中的适配器为 ProxyAdapter：Send 链式调用（To/Using/At/Reply 等修饰方法与最终发送方法）
+   与 call_api 被序列化后发往前端，由真实适配器执行并返回结果
+4. 前端不加载模块，工作进程不加载适配器、不启动路由服务器；模块注册的 HTTP 路由不会在前端生效
+5. 工作进程异常退出时由前端按 adapter.supervisor 的退避参数延迟重启，期间分配到该分片的事件会被丢弃并记录告警；
+   连续失败达到 circuit_threshold 次（工作进程完成初始化后清零）时前端停止重启并抛出 ClusterError
+{!--< /tips >!--}
+"""
+
+import asyncio
+import inspect
+import itertools
+import multiprocessing
+import os
+import pickle
+import socket
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from typing import Any
+from collections.abc import Awaitable, Callable
+
+from .logger import logger
+
+_HEADER = struct.Struct("!I")
+
+# SendDSL 中返回新 DSL 实例的修饰方法（小写），其余方法视为最终发送方法
+_SEND_MODIFIERS = frozenset(("to", "using", "account", "at", "reply", "atall"))
+
+# 工作进程握手超时（秒）
+_HANDSHAKE_TIMEOUT = 60
+
+# 工作进程初始化失败时的退出码
+_EXIT_INIT_FAILED = 3
+
+
+class ClusterError(RuntimeError):
+    """
+    跨进程调用失败（前端执行发送时出错，或连接已断开）
+    """
+
+
+# ==================== 帧编解码 ====================
+
+
+async def write_frame(
+    writer: asyncio.StreamWriter, message: dict[str, Any], lock: asyncio.Lock | None = None
+) -> None:
+    """
+    写入一帧消息
+
+    :param writer: 流写入器
+    :param message: 消息字典（需可 pickle）
+    :param lock: 写锁，多个任务共用同一连接时使用
+    """
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    frame = _HEADER.pack(len(payload)) + payload
+    if lock is None:
+        writer.write(frame)
+        await writer.drain()
+        return
+    async with lock:
+        writer.write(frame)
+        await writer.drain()
+
+
+async def read_frame(reader: asyncio.StreamReader) -> dict[str, Any]:
+    """
+    读取一帧消息
+
+    :param reader: 流读取器
+    :return: 消息字典
+    :raises asyncio.IncompleteReadError: 连接已关闭
+    """
+    (length,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return pickle.loads(await reader.readexactly(length))
+
+
+# ==================== 分片 ====================
+
+
+def event_shard_key(event: Any) -> str:
+    """
+    获取事件的分片键（会话键）
+
+    :param event: 事件数据（dict / Event / EventRecord）
+    :return: 分片键字符串
+    """
+    from .Event.session_type import get_session_key
+
+    try:
+        return str(get_session_key(event))
+    except Exception:
+        return str(event.get("platform"))
+
+
+def shard_for(key: str, workers: int) -> int:
+    """
+    计算分片键对应的工作进程序号（跨进程稳定，不受 PYTHONHASHSEED 影响）
+
+    :param key: 分片键
+    :param workers: 工作进程数
+    :return: 工作进程序号
+    """
+    return zlib.crc32(key.encode("utf-8")) % workers
+
+
+# ==================== 连接 ====================
+
+
+class ClusterLink:
+    """
+    {!--< internal-use >!--}
+    一条前端与工作进程之间的连接，支持请求/响应
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+
+    async def send(self, message: dict[str, Any]) -> None:
+        await write_frame(self.writer, message, self._lock)
+
+    async def recv(self) -> dict[str, Any]:
+        return await read_frame(self.reader)
+
+    async def request(self, message: dict[str, Any]) -> Any:
+        """
+        发送请求并等待对端返回结果
+
+        :param message: 请求消息
+        :return: 结果值
+        :raises ClusterError: 对端执行失败或连接断开
+        """
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self.send({**message, "id": request_id})
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
+
+    def resolve(self, message: dict[str, Any]) -> None:
+        """
+        处理对端返回的结果消息
+
+        :param message: 结果消息
+        """
+        future = self._pending.get(message.get("id"))
+        if future is None or future.done():
+            return
+        if message.get("ok"):
+            future.set_result(message.get("value"))
+        else:
+            future.set_exception(ClusterError(message.get("error", "未知错误")))
+
+    def fail_pending(self, reason: str) -> None:
+        """
+        以错误结束所有等待中的请求
+
+        :param reason: 错误原因
+        """
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ClusterError(reason))
+        self._pending.clear()
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except Exception:
+            pass
+
+
+# ==================== 工作进程侧代理 ====================
+
+
+class ProxySendDSL:
+    """
+    工作进程中的发送 DSL 代理
+
+    记录链式调用，最终发送方法被调用时将整条调用链发往前端执行
+
+    {!--< tips >!--}
+    与真实 SendDSL 一致，最终发送方法返回 asyncio.Task
+    {!--< /tips >!--}
+    """
+
+    __slots__ = ("_adapter", "_chain")
+
+    def __init__(self, adapter: "ProxyAdapter", chain: tuple = ()):
+        self._adapter = adapter
+        self._chain = chain
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        if name.lower() in _SEND_MODIFIERS:
+
+            def modifier(*args: Any, **kwargs: Any) -> "ProxySendDSL":
+                return ProxySendDSL(self._adapter, (*self._chain, (name, args, kwargs)))
+
+            return modifier
+
+        def terminal(*args: Any, **kwargs: Any) -> asyncio.Task:
+            return asyncio.ensure_future(
+                self._adapter._request(
+                    {
+                        "op": "send",
+                        "chain": self._chain,
+                        "method": name,
+                        "args": args,
+                        "kwargs": kwargs,
+                    }
+                )
+            )
+
+        return terminal
+
+    def __repr__(self) -> str:
+        steps = ".".join(step[0] for step in self._chain)
+        return f"<ProxySendDSL {self._adapter.platform}{'.' + steps if steps else ''}>"
+
+
+class ProxyAdapter:
+    """
+    工作进程中的适配器代理
+
+    :param platform: 平台名称
+    :param link: 与前端进程的连接
+    """
+
+    def __init__(self, platform: str, link: ClusterLink):
+        self.platform = platform
+        self._link = link
+        self.Send = ProxySendDSL(self)
+
+    async def _request(self, message: dict[str, Any]) -> Any:
+        return await self._link.request({**message, "platform": self.platform})
+
+    async def call_api(self, endpoint: str, **params: Any) -> Any:
+        """
+        在前端进程中调用平台 API
+
+        :param endpoint: API端点
+        :param params: API参数
+        :return: API调用结果
+        """
+        return await self._request(
+            {"op": "call_api", "endpoint": endpoint, "params": params}
+        )
+
+    def send(
+        self, target_type: str, target_id: str, message: Any, **kwargs: Any
+    ) -> asyncio.Task:
+        """
+        发送消息的便捷方法（与 BaseAdapter.send 一致）
+        """
+        method_name = kwargs.pop("method", "Text")
+        return getattr(self.Send.To(target_type, target_id), method_name)(
+            message, **kwargs
+        )
+
+    async def start(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    def __repr__(self) -> str:
+        return f"<ProxyAdapter {self.platform}>"
+
+
+# ==================== 前端进程 ====================
+
+
+class ClusterFront:
+    """
+    前端进程：管理工作进程、分发事件并执行代理发送
+
+    :param workers: 工作进程数
+    :param socket_path: Unix 域套接字路径（默认在临时目录中创建）
+    :param adapter_manager: 适配器管理器（默认全局 adapter）
+    :param loop_implementation: 工作进程的事件循环实现（asyncio / uvloop），None 表示读取配置
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        socket_path: str | None = None,
+        adapter_manager: Any = None,
+        loop_implementation: str | None = None,
+    ):
+        if workers < 1:
+            raise ValueError("工作进程数必须大于 0")
+        if not hasattr(socket, "AF_UNIX"):
+            raise RuntimeError("多进程运行模式需要 Unix 域套接字支持（Linux / macOS）")
+        if adapter_manager is None:
+            from .adapter import adapter as adapter_manager
+
+        self.workers = workers
+        self.socket_path = socket_path or os.path.join(
+            tempfile.mkdtemp(prefix="erispulse-"), "bus.sock"
+        )
+        self._adapters = adapter_manager
+        self.loop_implementation = loop_implementation
+        self._server: asyncio.AbstractServer | None = None
+        self._links: dict[int, ClusterLink] = {}
+        self._ready: dict[int, asyncio.Event] = {}
+        self._processes: dict[int, multiprocessing.process.BaseProcess] = {}
+        self._monitor_task: asyncio.Task | None = None
+        self._failures: dict[int, int] = {}
+        self._respawn_at: dict[int, float] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._stopping = False
+        self.dropped = 0
+
+    # ---------- 启动与关闭 ----------
+
+    async def start(self, spawn: bool = True) -> None:
+        """
+        启动 IPC 服务器并等待所有工作进程就绪
+
+        :param spawn: 是否启动工作进程（测试时可手动连接 ClusterWorker）
+        """
+        self._ready = {index: asyncio.Event() for index in range(self.workers)}
+        self._server = await asyncio.start_unix_server(
+            self._handle_connection, path=self.socket_path
+        )
+        if spawn:
+            for index in range(self.workers):
+                self._spawn(index)
+            self._monitor_task = asyncio.create_task(self._monitor())
+            await self.wait_ready(_HANDSHAKE_TIMEOUT)
+            logger.info(f"多进程运行模式已启动 ({self.workers} 个工作进程)")
+
+    async def wait_ready(self, timeout: float | None = None) -> None:
+        """
+        等待所有工作进程完成握手
+
+        :param timeout: 超时时间（秒）
+        """
+        await asyncio.wait_for(
+            asyncio.gather(*(ready.wait() for ready in self._ready.values())), timeout
+        )
+
+    def _spawn(self, index: int) -> None:
+        """
+        {!--< internal-use >!--}
+        启动一个工作进程（spawn 方式，避免继承前端的事件循环与连接）
+        """
+        process = multiprocessing.get_context("spawn").Process(
+            target=worker_main,
+            args=(self.socket_path, index, self.loop_implementation),
+            name=f"ErisPulse-worker-{index}",
+        )
+        process.start()
+        self._processes[index] = process
+
+    async def join(self) -> None:
+        """
+        等待工作进程监控结束
+
+        :raises ClusterError: 工作进程连续异常退出次数达到熔断阈值
+        """
+        if self._monitor_task is not None:
+            await self._monitor_task
+
+    async def _monitor(self) -> None:
+        """
+        {!--< internal-use >!--}
+        监控工作进程，异常退出时退避重启
+        """
+        while not self._stopping:
+            await asyncio.sleep(1)
+            self._check_workers()
+
+    def _check_workers(self) -> None:
+        """
+        {!--< internal-use >!--}
+        检查工作进程存活状态：首次发现退出时按退避计划安排重启，到期后再启动
+
+        :raises ClusterError: 连续异常退出次数达到熔断阈值
+        """
+        from .adapter import AdapterManager
+
+        now = time.monotonic()
+        for index, process in list(self._processes.items()):
+            if self._stopping or process.is_alive():
+                continue
+            if index in self._respawn_at:
+                if now >= self._respawn_at[index]:
+                    del self._respawn_at[index]
+                    self._ready[index].clear()
+                    self._spawn(index)
+                continue
+
+            failures = self._failures.get(index, 0) + 1
+            self._failures[index] = failures
+            supervisor_config = AdapterManager._get_supervisor_config()
+            threshold = supervisor_config.get("circuit_threshold", 8)
+            if threshold and failures >= threshold:
+                raise ClusterError(
+                    f"工作进程 {index} 连续 {failures} 次异常退出 "
+                    f"(exitcode={process.exitcode})，停止重启"
+                )
+            delay = AdapterManager._compute_backoff(failures, supervisor_config)
+            logger.error(
+                f"工作进程 {index} 异常退出 (exitcode={process.exitcode})，"
+                f"{delay:.1f} 秒后重启（第 {failures} 次）"
+            )
+            self._respawn_at[index] = now + delay
+
+    async def stop(self, timeout: float = 10) -> None:
+        """
+        通知工作进程退出并清理资源
+
+        :param timeout: 等待工作进程退出的时间（秒），超时后强制终止
+        """
+        self._stopping = True
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+        for link in list(self._links.values()):
+            try:
+                await link.send({"op": "stop"})
+            except Exception:
+                pass
+        loop = asyncio.get_running_loop()
+        for process in self._processes.values():
+            await loop.run_in_executor(None, process.join, timeout)
+            if process.is_alive():
+                process.terminate()
+        for link in list(self._links.values()):
+            link.fail_pending("集群已关闭")
+            await link.close()
+        self._links.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    # ---------- 事件分发 ----------
+
+    async def forward(self, event: Any) -> None:
+        """
+        将事件分发到其会话所属的工作进程
+
+        :param event: 事件数据
+        """
+        index = shard_for(event_shard_key(event), self.workers)
+        link = self._links.get(index)
+        if link is None:
+            self.dropped += 1
+            logger.warning(f"工作进程 {index} 未就绪，事件已丢弃")
+            return
+        try:
+            await link.send({"op": "event", "data": event})
+        except (ConnectionError, RuntimeError) as e:
+            self.dropped += 1
+            logger.warning(f"向工作进程 {index} 分发事件失败: {e}")
+
+    # ---------- 连接处理 ----------
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        link = ClusterLink(reader, writer)
+        try:
+            hello = await link.recv()
+            index = hello["worker"]
+        except Exception as e:
+            logger.error(f"工作进程握手失败: {e}")
+            await link.close()
+            return
+
+        self._links[index] = link
+        await link.send({"op": "hello", "platforms": list(self._adapters.platforms)})
+        self._ready[index].set()
+        logger.debug(f"工作进程 {index} 已连接")
+
+        try:
+            while True:
+                message = await link.recv()
+                if message.get("op") == "ready":
+                    # 工作进程完成初始化，清零连续失败计数
+                    self._failures.pop(index, None)
+                elif message.get("op") in ("send", "call_api"):
+                    task = asyncio.create_task(self._execute(link, message))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if self._links.get(index) is link:
+                del self._links[index]
+            link.fail_pending("工作进程连接已断开")
+            await link.close()
+            if not self._stopping:
+                logger.warning(f"工作进程 {index} 连接已断开")
+
+    async def _execute(self, link: ClusterLink, message: dict[str, Any]) -> None:
+        """
+        {!--< internal-use >!--}
+        在真实适配器上执行工作进程发来的发送/API 调用
+        """
+        reply: dict[str, Any] = {"op": "result", "id": message["id"]}
+        try:
+            target = self._adapters.get(message["platform"])
+            if target is None:
+                raise ClusterError(f"平台 {message['platform']} 不存在")
+            if message["op"] == "call_api":
+                result = await target.call_api(message["endpoint"], **message["params"])
+            else:
+                dsl = target.Send
+                for name, args, kwargs in message["chain"]:
+                    dsl = getattr(dsl, name)(*args, **kwargs)
+                result = getattr(dsl, message["method"])(
+                    *message["args"], **message["kwargs"]
+                )
+                if inspect.isawaitable(result):
+                    result = await result
+            try:
+                pickle.dumps(result)
+            except Exception:
+                result = repr(result)
+            reply.update(ok=True, value=result)
+        except Exception as e:
+            reply.update(ok=False, error=f"{type(e).__name__}: {e}")
+        try:
+            await link.send(reply)
+        except Exception as e:
+            logger.warning(f"返回代理调用结果失败: {e}")
+
+
+# ==================== 工作进程 ====================
+
+
+class ClusterWorker:
+    """
+    工作进程：接收事件并按会话顺序分发到本进程的事件处理器
+
+    :param socket_path: 前端 Unix 域套接字路径
+    :param index: 工作进程序号
+    :param dispatch: 事件分发函数（默认 adapter.emit）
+    :param adapter_manager: 安装代理适配器的适配器管理器（默认全局 adapter）
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        index: int,
+        dispatch: Callable[[Any], Awaitable[Any]] | None = None,
+        adapter_manager: Any = None,
+    ):
+        if adapter_manager is None:
+            from .adapter import adapter as adapter_manager
+
+        self.socket_path = socket_path
+        self.index = index
+        self._adapters = adapter_manager
+        self._dispatch = dispatch or adapter_manager.emit
+        self._link: ClusterLink | None = None
+        # 每个会话最后一个处理任务，新事件等待其完成后再处理
+        self._tails: dict[str, asyncio.Task] = {}
+        self.platforms: list[str] = []
+
+    async def connect(self) -> None:
+        """
+        连接前端进程并安装代理适配器
+        """
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        self._link = ClusterLink(reader, writer)
+        await self._link.send({"op": "hello", "worker": self.index, "pid": os.getpid()})
+        hello = await self._link.recv()
+        self.platforms = hello.get("platforms", [])
+        for platform in self.platforms:
+            proxy = ProxyAdapter(platform, self._link)
+            self._adapters._adapters[platform] = proxy
+            self._adapters._started_instances.add(proxy)
+
+    async def serve(self) -> None:
+        """
+        处理前端消息直至收到停止指令或连接断开
+        """
+        link = self._link
+        try:
+            await link.send({"op": "ready"})
+            while True:
+                message = await link.recv()
+                op = message.get("op")
+                if op == "event":
+                    self._schedule(message["data"])
+                elif op == "result":
+                    link.resolve(message)
+                elif op == "stop":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            logger.warning("与前端进程的连接已断开")
+        finally:
+            if self._tails:
+                await asyncio.gather(*self._tails.values(), return_exceptions=True)
+            link.fail_pending("与前端进程的连接已断开")
+            await link.close()
+
+    def _schedule(self, event: Any) -> None:
+        """
+        {!--< internal-use >!--}
+        调度事件：同一会话串行，不同会话并发
+        """
+        key = event_shard_key(event)
+        task = asyncio.create_task(self._run(self._tails.get(key), event))
+        self._tails[key] = task
+        task.add_done_callback(
+            lambda t, k=key: self._tails.pop(k, None) if self._tails.get(k) is t else None
+        )
+
+    async def _run(self, previous: asyncio.Task | None, event: Any) -> None:
+        if previous is not None:
+            await asyncio.wait((previous,))
+        try:
+            await self._dispatch(event)
+        except Exception as e:
+            logger.error(f"工作进程 {self.index} 处理事件失败: {e}")
+
+
+def worker_main(
+    socket_path: str, index: int, loop_implementation: str | None = None
+) -> None:
+    """
+    {!--< internal-use >!--}
+    工作进程入口
+    """
+    from ..runtime import run_event_loop
+
+    try:
+        initialized = run_event_loop(_worker_async(socket_path, index), loop_implementation)
+    except KeyboardInterrupt:
+        return
+    if initialized is False:
+        sys.exit(_EXIT_INIT_FAILED)
+
+
+async def _worker_async(socket_path: str, index: int) -> bool:
+    from .. import sdk
+
+    sdk._cluster_role = "worker"
+    worker = ClusterWorker(socket_path, index)
+    await worker.connect()
+    try:
+        if not await sdk.init():
+            logger.error(f"工作进程 {index} 初始化失败")
+            return False
+        await worker.serve()
+        return True
+    finally:
+        await sdk.uninit()
+
+
+async def run_cluster(workers: int, loop_implementation: str | None = None) -> None:
+    """
+    以多进程分片模式运行 ErisPulse（前端进程入口）
+
+    :param workers: 工作进程数
+    :param loop_implementation: 工作进程的事件循环实现（asyncio / uvloop），None 表示读取配置
+
+    :example:
+    >>> asyncio.run(run_cluster(4))
+    """
+    from .. import sdk
+
+    sdk._cluster_role = "front"
+    front = ClusterFront(workers, loop_implementation=loop_implementation)
+    try:
+        if not await sdk.init():
+            logger.error("ErisPulse 初始化失败，请检查日志")
+            return
+        await front.start()
+        sdk.adapter.set_event_forwarder(front.forward)
+        await sdk.adapter.startup()
+        await front.join()
+    finally:
+        sdk.adapter.set_event_forwarder(None)
+        await front.stop()
+        await sdk.uninit()
+
+
+__all__ = [
+    "ClusterError",
+    "ClusterFront",
+    "ClusterWorker",
+    "ProxyAdapter",
+    "ProxySendDSL",
+    "event_shard_key",
+    "shard_for",
+    "run_cluster",
+]
@@ -0,0 +1,267 @@
+"""
+ErisPulse 事件去重
+
+Webhook 平台的重投递与 WebSocket 重连后的事件重放会让同一事件多次到达 adapter.emit，
+事件去重在分发前丢弃时间窗口内重复的 (平台, 事件ID)
+
+{!--< tips >!--}
+1. lru 策略：精确去重，按时间窗口与 max_entries 淘汰，内存上限为 max_entries 个事件 ID
+2. bloom 策略：两代轮转的布隆过滤器，每代在写满 bloom_capacity 或经过 window 秒后轮转，
+   内存固定为两代位数组，与流量无关；存在 bloom_error_rate 量级的误判（新事件被当作重复）
+3. 默认关闭，可全局启用或通过 platforms 按平台启用/关闭
+4. 未携带事件 ID 的事件不参与去重
+{!--< /tips >!--}
+"""
+
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .logger import logger
+
+DEDUP_STRATEGIES = ("lru", "bloom")
+
+
+class LRUWindow:
+    """
+    按时间与数量淘汰的精确去重窗口
+
+    :param window: 时间窗口（秒）
+    :param max_entries: 最多记录的键数
+    """
+
+    def __init__(self, window: float, max_entries: int):
+        self.window = window
+        self.max_entries = max_entries
+        # 键 -> 过期时间，窗口固定，插入顺序即过期顺序
+        self._entries: OrderedDict[str, float] = OrderedDict()
+
+    def check_and_add(self, key: str) -> bool:
+        """
+        检查键是否在窗口内出现过，未出现则记录
+
+        :param key: 去重键
+        :return: 是否重复
+        """
+        now = time.monotonic()
+        entries = self._entries
+        while entries:
+            oldest, expires = next(iter(entries.items()))
+            if expires > now:
+                break
+            del entries[oldest]
+
+        if key in entries:
+            return True
+
+        entries[key] = now + self.window
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RotatingBloomWindow:
+    """
+    两代轮转的布隆过滤器去重窗口
+
+    :param window: 每一代的最长存活时间（秒）
+    :param capacity: 每一代的容量（键数）
+    :param error_rate: 目标误判率
+    """
+
+    def __init__(self, window: float, capacity: int, error_rate: float):
+        if not 0 < error_rate < 1:
+            raise ValueError("bloom_error_rate 必须在 0 到 1 之间")
+        self.window = window
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.bits = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / self.capacity * math.log(2)))
+
+        self._current = bytearray((self.bits + 7) // 8)
+        self._previous = bytearray((self.bits + 7) // 8)
+        self._count = 0
+        self._rotated_at = time.monotonic()
+
+    def _positions(self, key: str) -> list[int]:
+        """
+        {!--< internal-use >!--}
+        双重哈希计算位位置
+        """
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        bits = self.bits
+        return [(h1 + i * h2) % bits for i in range(self.hashes)]
+
+    def _rotate(self) -> None:
+        """
+        {!--< internal-use >!--}
+        当前代转为上一代，清空当前代
+        """
+        self._previous, self._current = self._current, self._previous
+        self._current[:] = bytes(len(self._current))
+        self._count = 0
+        self._rotated_at = time.monotonic()
+
+    def check_and_add(self, key: str) -> bool:
+        """
+        检查键是否出现过，未出现则记录
+
+        :param key: 去重键
+        :return: 是否重复（可能误判）
+        """
+        if self._count >= self.capacity or time.monotonic() - self._rotated_at >= self.window:
+            self._rotate()
+
+        positions = self._positions(key)
+        current, previous = self._current, self._previous
+        if all(current[p >> 3] & (1 << (p & 7)) for p in positions):
+            return True
+        # 上一代中出现过的键同样写入当前代，使其在下一次轮转后仍能被识别
+        duplicate = all(previous[p >> 3] & (1 << (p & 7)) for p in positions)
+        for p in positions:
+            current[p >> 3] |= 1 << (p & 7)
+        self._count += 1
+        return duplicate
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def memory_bytes(self) -> int:
+        """
+        两代位数组占用的字节数
+        """
+        return len(self._current) + len(self._previous)
+
+
+class EventDeduplicator:
+    """
+    事件去重器
+
+    :example:
+    >>> from ErisPulse.Core import deduplicator
+    >>> deduplicator.enable("telegram")
+    >>> deduplicator.get_stats()
+    {'telegram': {'enabled': True, 'checked': 1024, 'duplicates': 3, 'tracked': 1021}, ...}
+    """
+
+    def __init__(self):
+        from ..runtime import get_dedup_config
+
+        dedup_config = get_dedup_config()
+        self.enabled: bool = dedup_config.get("enabled", False)
+        self.strategy: str = dedup_config.get("strategy", "lru")
+        self.window: float = dedup_config.get("window", 300)
+        self.max_entries: int = dedup_config.get("max_entries", 100000)
+        self.bloom_capacity: int = dedup_config.get("bloom_capacity", 1000000)
+        self.bloom_error_rate: float = dedup_config.get("bloom_error_rate", 0.001)
+        self._platforms: dict[str, bool] = dict(dedup_config.get("platforms", {}))
+
+        if self.strategy not in DEDUP_STRATEGIES:
+            logger.warning(f"未知的事件去重策略: {self.strategy}，已回退到 lru")
+            self.strategy = "lru"
+
+        self._windows: dict[str, LRUWindow | RotatingBloomWindow] = {}
+        self._checked: dict[str, int] = {}
+        self._duplicates: dict[str, int] = {}
+
+    def is_enabled(self, platform: str) -> bool:
+        """
+        平台是否启用事件去重
+
+        :param platform: 平台名
+        :return: 是否启用
+        """
+        return self._platforms.get(platform, self.enabled)
+
+    def enable(self, platform: str | None = None, enabled: bool = True) -> None:
+        """
+        启用或关闭事件去重
+
+        :param platform: 平台名，None 表示全局默认
+        :param enabled: 是否启用
+        """
+        if platform is None:
+            self.enabled = enabled
+        else:
+            self._platforms[platform] = enabled
+
+    def is_duplicate(self, platform: str, event_id: Any) -> bool:
+        """
+        检查事件是否为重复事件，非重复事件会被记录
+
+        :param platform: 平台名
+        :param event_id: 事件 ID，为空时不参与去重
+        :return: 是否为时间窗口内的重复事件
+        """
+        if not event_id or not self._platforms.get(platform, self.enabled):
+            return False
+
+        window = self._windows.get(platform)
+        if window is None:
+            window = self._windows[platform] = self._create_window()
+            self._checked[platform] = 0
+            self._duplicates[platform] = 0
+
+        self._checked[platform] += 1
+        if window.check_and_add(str(event_id)):
+            self._duplicates[platform] += 1
+            logger.debug(f"丢弃重复事件: {platform}/{event_id}")
+            return True
+        return False
+
+    def _create_window(self) -> LRUWindow | RotatingBloomWindow:
+        """
+        {!--< internal-use >!--}
+        按配置创建平台的去重窗口
+        """
+        if self.strategy == "bloom":
+            return RotatingBloomWindow(self.window, self.bloom_capacity, self.bloom_error_rate)
+        return LRUWindow(self.window, self.max_entries)
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        获取各平台的去重统计
+
+        :return: {平台: {enabled, checked, duplicates, tracked}}
+        """
+        platforms = set(self._windows) | set(self._platforms)
+        return {
+            platform: {
+                "enabled": self.is_enabled(platform),
+                "strategy": self.strategy,
+                "checked": self._checked.get(platform, 0),
+                "duplicates": self._duplicates.get(platform, 0),
+                "tracked": len(self._windows[platform]) if platform in self._windows else 0,
+            }
+            for platform in sorted(platforms)
+        }
+
+    def reset(self, platform: str | None = None) -> None:
+        """
+        清空去重记录与计数
+
+        :param platform: 平台名，None 表示全部平台
+        """
+        platforms = [platform] if platform is not None else list(self._windows)
+        for name in platforms:
+            self._windows.pop(name, None)
+            self._checked.pop(name, None)
+            self._duplicates.pop(name, None)
+
+
+deduplicator: EventDeduplicator = EventDeduplicator()
+
+__all__ = [
+    "EventDeduplicator",
+    "LRUWindow",
+    "RotatingBloomWindow",
+    "deduplicator",
+]
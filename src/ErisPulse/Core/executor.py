@@ -0,0 +1,396 @@
+"""
+ErisPulse 同步回调执行器
+
+为事件处理器、条件函数、命令权限检查和生命周期处理器中的同步回调提供统一的执行策略，
+避免阻塞型同步代码（数据库查询、图片渲染等）冻结事件循环
+
+{!--< tips >!--}
+1. 执行策略由配置 ErisPulse.executor.mode 决定：
+   - inline：同步回调直接在事件循环中执行（原有行为）
+   - thread：所有同步回调投递到有界线程池执行
+   - per_handler：仅声明 offload=True 的回调投递到线程池（默认）
+2. 协程函数始终在事件循环中执行，不受执行策略影响
+3. 调用方等待回调完成后再继续，处理器之间原有的优先级顺序不变
+4. 线程中执行的回调运行在调用时的上下文副本中（contextvars）
+5. CPU 密集型回调可通过 executor="process" 或 run_in_process() 在进程池中执行，
+   函数与参数必须可被 pickle（模块顶层定义的函数），事件以普通字典快照传递
+{!--< /tips >!--}
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+from collections.abc import Callable
+
+from .logger import logger
+
+EXECUTOR_MODES = ("inline", "thread", "per_handler")
+
+_DEFAULT = object()
+
+
+def _warmup() -> int:
+    """
+    {!--< internal-use >!--}
+    预热工作进程：预先导入事件模块，避免首个任务承担导入开销
+
+    :return: 工作进程 PID
+    """
+    from .Event import wrapper  # noqa: F401
+
+    return os.getpid()
+
+
+def call_with_event(
+    func: Callable, snapshot: dict[str, Any], trigger: dict[str, Any] | None = None
+) -> Any:
+    """
+    {!--< internal-use >!--}
+    在工作进程中以事件快照调用处理器
+
+    :param func: 处理器函数
+    :param snapshot: 事件字典快照
+    :param trigger: 处理器的触发信息
+    :return: 处理器返回值
+    """
+    from .Event.wrapper import Event
+
+    event = Event(snapshot)
+    event._trigger = trigger
+    return func(event)
+
+
+class ExecutorManager:
+    """
+    同步回调执行器
+
+    :example:
+    >>> from ErisPulse.Core import executor
+    >>> result = await executor.call(blocking_query, event, offload=True)
+    >>> executor.get_stats()
+    {'mode': 'per_handler', 'max_workers': 12, 'active': 0, 'queued': 0, ...}
+    """
+
+    def __init__(self):
+        from ..runtime import get_executor_config
+
+        executor_config = get_executor_config()
+        self.mode: str = executor_config.get("mode", "per_handler")
+        if self.mode not in EXECUTOR_MODES:
+            logger.warning(f"未知的执行器模式 {self.mode!r}，使用 per_handler")
+            self.mode = "per_handler"
+        self.max_workers: int = (
+            executor_config.get("max_workers", 0) or min(32, (os.cpu_count() or 1) + 4)
+        )
+
+        self.process_workers: int = (
+            executor_config.get("process_workers", 0) or os.cpu_count() or 1
+        )
+        self.process_timeout: float = executor_config.get("process_timeout", 60)
+        self.process_prestart: bool = executor_config.get("process_prestart", False)
+        # 是否有处理器声明了 executor="process"
+        self.process_requested = False
+
+        self._pool: ThreadPoolExecutor | None = None
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+        # 统计信息
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._queued = 0
+        self._active = 0
+        self._peak_queued = 0
+        self._process_stats = {
+            "submitted": 0,
+            "pending": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "crashes": 0,
+        }
+
+    # ==================== 配置 ====================
+
+    def configure(self, mode: str | None = None, max_workers: int | None = None) -> None:
+        """
+        修改执行策略或线程池大小
+
+        {!--< tips >!--}
+        修改 max_workers 会在下一次投递时以新的大小重建线程池，已提交的任务继续在旧线程池中完成
+        {!--< /tips >!--}
+
+        :param mode: 执行策略（inline / thread / per_handler）
+        :param max_workers: 线程池最大线程数，0 表示自动
+        :raises ValueError: 执行策略无效
+        """
+        if mode is not None:
+            if mode not in EXECUTOR_MODES:
+                raise ValueError(f"执行器模式必须是 {EXECUTOR_MODES} 之一，收到: {mode!r}")
+            self.mode = mode
+        if max_workers is not None:
+            self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+            self.shutdown(wait=False)
+
+    def should_offload(self, offload: bool | None = None) -> bool:
+        """
+        判断同步回调是否应投递到线程池
+
+        :param offload: 回调声明的 offload 选项，None 表示未声明
+        :return: 是否投递到线程池
+        """
+        if self.mode == "thread":
+            return offload is not False
+        if self.mode == "per_handler":
+            return bool(offload)
+        return False
+
+    # ==================== 执行 ====================
+
+    async def call(self, func: Callable, *args: Any, offload: bool | None = None) -> Any:
+        """
+        按执行策略调用回调
+
+        :param func: 回调函数（同步或协程函数）
+        :param args: 位置参数
+        :param offload: 回调声明的 offload 选项
+        :return: 回调返回值
+        """
+        if inspect.iscoroutinefunction(func):
+            return await func(*args)
+        if self.should_offload(offload):
+            return await self.run_in_thread(func, *args)
+        return func(*args)
+
+    async def run_in_thread(self, func: Callable, *args: Any) -> Any:
+        """
+        在线程池中执行同步函数并等待结果
+
+        :param func: 同步函数
+        :param args: 位置参数
+        :return: 函数返回值
+        """
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        with self._lock:
+            self._submitted += 1
+            self._queued += 1
+            if self._queued > self._peak_queued:
+                self._peak_queued = self._queued
+        return await loop.run_in_executor(
+            self._get_pool(), functools.partial(ctx.run, self._run, func, *args)
+        )
+
+    def _run(self, func: Callable, *args: Any) -> Any:
+        """
+        {!--< internal-use >!--}
+        线程池中的执行包装，维护排队/执行中计数
+        """
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            result = func(*args)
+        except BaseException:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+        return result
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """
+        {!--< internal-use >!--}
+        获取（必要时创建）线程池
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="ErisPulse-worker"
+            )
+        return self._pool
+
+    # ==================== 进程池 ====================
+
+    async def start_process_pool(self, warmup: bool = True) -> None:
+        """
+        启动进程池并预热工作进程
+
+        :param warmup: 是否预热（让每个工作进程预先完成导入）
+        """
+        pool = self._get_process_pool()
+        if warmup:
+            loop = asyncio.get_running_loop()
+            pids = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, _warmup)
+                    for _ in range(self.process_workers)
+                ),
+                return_exceptions=True,
+            )
+            failed = [e for e in pids if isinstance(e, BaseException)]
+            if failed:
+                logger.warning(f"进程池预热失败: {failed[0]}")
+        logger.info(f"进程池已启动 (工作进程数: {self.process_workers})")
+
+    async def run_in_process(
+        self, func: Callable, *args: Any, timeout: float | None = _DEFAULT
+    ) -> Any:
+        """
+        在进程池中执行函数并等待结果
+
+        {!--< tips >!--}
+        1. func 必须是模块顶层定义的函数，func 与 args 会被 pickle 发送到工作进程
+        2. 超时后停止等待并抛出 asyncio.TimeoutError，已开始执行的任务会继续占用工作进程直至完成
+        3. 工作进程异常退出时抛出 BrokenProcessPool，进程池会被重建，后续任务不受影响
+        {!--< /tips >!--}
+
+        :param func: 可 pickle 的函数
+        :param args: 可 pickle 的位置参数
+        :param timeout: 结果超时（秒），默认使用配置 process_timeout，0 或 None 表示不限制
+        :return: 函数返回值
+        :raises TypeError: 函数无法被 pickle
+
+        :example:
+        >>> result = await executor.run_in_process(render_markdown, text, timeout=10)
+        """
+        try:
+            pickle.dumps(func)
+        except Exception as e:
+            raise TypeError(
+                f"进程池执行的函数必须是模块顶层定义的可序列化函数: {func!r} ({e})"
+            ) from e
+        if timeout is _DEFAULT:
+            timeout = self.process_timeout
+
+        pool = self._get_process_pool()
+        loop = asyncio.get_running_loop()
+        stats = self._process_stats
+        stats["submitted"] += 1
+        stats["pending"] += 1
+        try:
+            future = loop.run_in_executor(pool, functools.partial(func, *args))
+            result = await (asyncio.wait_for(future, timeout) if timeout else future)
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            raise
+        except BrokenProcessPool:
+            stats["crashes"] += 1
+            logger.error("进程池工作进程异常退出，进程池将被重建")
+            self._discard_process_pool(pool)
+            raise
+        except BaseException:
+            stats["failed"] += 1
+            raise
+        finally:
+            stats["pending"] -= 1
+        stats["completed"] += 1
+        return result
+
+    async def run_with_event(
+        self, func: Callable, event: dict[str, Any], timeout: float | None = _DEFAULT
+    ) -> Any:
+        """
+        在进程池中以事件快照调用处理器
+
+        :param func: 处理器函数
+        :param event: 事件数据，以普通字典快照发送到工作进程（修改不会回传）
+        :param timeout: 结果超时（秒）
+        :return: 处理器返回值
+        """
+        to_dict = getattr(event, "to_dict", None)
+        snapshot = to_dict() if to_dict is not None else dict(event)
+        return await self.run_in_process(
+            call_with_event, func, snapshot, getattr(event, "_trigger", None), timeout=timeout
+        )
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """
+        {!--< internal-use >!--}
+        获取（必要时创建）进程池
+        """
+        if self._process_pool is None:
+            # 事件循环与线程池所在进程中 fork 不安全，优先使用 forkserver
+            start_method = (
+                "forkserver"
+                if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=multiprocessing.get_context(start_method),
+            )
+        return self._process_pool
+
+    def _discard_process_pool(self, pool: ProcessPoolExecutor) -> None:
+        """
+        {!--< internal-use >!--}
+        丢弃损坏的进程池，下次投递时重建
+        """
+        if self._process_pool is pool:
+            self._process_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown_process_pool(self) -> None:
+        """
+        关闭进程池，取消尚未开始的任务
+
+        关闭后再次投递时会自动创建新的进程池
+        """
+        pool, self._process_pool = self._process_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # ==================== 状态与清理 ====================
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取执行器状态
+
+        :return: 执行策略、线程池大小、当前排队/执行中任务数及累计计数
+        """
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "max_workers": self.max_workers,
+                "threads": len(self._pool._threads) if self._pool else 0,
+                "active": self._active,
+                "queued": self._queued,
+                "peak_queued": self._peak_queued,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "process": {
+                    "running": self._process_pool is not None,
+                    "workers": self.process_workers,
+                    **self._process_stats,
+                },
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        关闭线程池
+
+        关闭后再次投递时会自动创建新的线程池
+
+        :param wait: 是否等待已提交的任务完成
+        """
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+executor: ExecutorManager = ExecutorManager()
+
+__all__ = ["ExecutorManager", "executor", "EXECUTOR_MODES", "call_with_event"]
@@ -14,11 +14,11 @@ ErisPulse 生命周期管理模块
 """
 
 import asyncio
-import inspect
 import time
 from typing import Any
 from collections.abc import Callable
 from .logger import logger
+from .executor import executor
 
 
 class LifecycleManager:
@@ -39,6 +39,7 @@ class LifecycleManager:
 
     def __init__(self):
         self._handlers: dict[str, list[Callable]] = {}
+        self._offload: dict[Callable, bool] = {}  # 处理器声明的 offload 选项
         self._timers: dict[str, float] = {}  # 用于存储计时器
 
     def _validate_event(self, event_data: dict[str, Any]) -> bool:
@@ -80,11 +81,12 @@ class LifecycleManager:
 
         return True
 
-    def on(self, event: str) -> Callable:
+    def on(self, event: str, offload: bool | None = None) -> Callable:
         """
         注册生命周期事件处理器
 
         :param event: 事件名称，支持点式结构如 module.init
+        :param offload: 同步处理器是否投递到线程池执行；None 遵循执行器策略
         :return: 装饰器函数
 
         :raises ValueError: 当事件名无效时抛出
@@ -96,6 +98,8 @@ class LifecycleManager:
             if event not in self._handlers:
                 self._handlers[event] = []
             self._handlers[event].append(func)
+            if offload is not None:
+                self._offload[func] = offload
             return func
 
         return decorator
@@ -197,10 +201,9 @@ class LifecycleManager:
         logger.debug(f"触发生命周期事件: {event}")
         for handler in self._handlers[event]:
             try:
-                if inspect.iscoroutinefunction(handler):
-                    await handler(event_data)
-                else:
-                    handler(event_data)
+                await executor.call(
+                    handler, event_data, offload=self._offload.get(handler)
+                )
             except Exception as e:
                 logger.error(f"生命周期事件处理器执行错误 {event}: {e}")
 
@@ -0,0 +1,654 @@
+"""
+ErisPulse 媒体管理模块
+
+提供流式媒体数据源 MediaSource 与媒体上传结果缓存，
+避免大文件被整体读入内存，以及同一份图片/音频/视频/文件被反复上传
+
+{!--< tips >!--}
+1. MediaSource 统一封装文件路径、文件对象、异步迭代器和 memoryview，按块流式读取
+2. 字节内容按 SHA-256 内容哈希作为缓存键
+3. 本地文件路径按 "绝对路径 + 修改时间 + 文件大小" 作为缓存键，文件被修改后自动失效
+4. 缓存的是适配器上传后返回的平台文件ID或URL，按平台（scope）隔离
+5. 缓存映射持久化到 storage 的 media_cache 表，重启后仍然有效
+{!--< /tips >!--}
+"""
+
+import os
+import io
+import stat
+import time
+import asyncio
+import hashlib
+import mimetypes
+from pathlib import Path
+from collections import OrderedDict
+from typing import Any, BinaryIO
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+
+from .logger import logger
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class MediaSource:
+    """
+    流式媒体数据源
+
+    统一封装各种形式的媒体内容，按块读取，内存占用与文件大小无关
+
+    {!--< tips >!--}
+    1. 支持的输入：本地文件路径（str/Path/file://）、二进制文件对象、异步字节迭代器、memoryview/bytes
+    2. iter_chunks() 按块产出数据；memoryview 按切片产出，不发生复制
+    3. as_payload() 返回可直接交给 aiohttp 流式上传的对象（文件句柄/异步生成器/内存视图）
+    4. read() 仅作为不支持流式上传的适配器的兜底，会把完整内容读入内存
+    5. 异步迭代器与不可回绕的文件对象只能被消费一次
+    {!--< /tips >!--}
+
+    :example:
+    >>> source = MediaSource("./video.mp4")
+    >>> form = aiohttp.FormData()
+    >>> form.add_field("video", source.as_payload(), filename=source.filename)
+    >>> await session.post(url, data=form)
+    """
+
+    __slots__ = (
+        "kind",
+        "_source",
+        "_path",
+        "filename",
+        "content_type",
+        "_size",
+        "_offset",
+        "_consumed",
+    )
+
+    def __init__(
+        self,
+        source: "str | os.PathLike | BinaryIO | AsyncIterable[bytes] | memoryview | bytes | bytearray",
+        *,
+        filename: str | None = None,
+        content_type: str | None = None,
+        size: int | None = None,
+    ):
+        """
+        :param source: 媒体内容
+        :param filename: 文件名，None 时尝试从路径或文件对象推断
+        :param content_type: MIME 类型，None 时按文件名推断
+        :param size: 内容大小(字节)，None 时尽量自动获取
+        :raises TypeError: 不支持的输入类型
+        """
+        self._source: Any = source
+        self._path: str | None = None
+        self._size = size
+        # 文件对象包装时的读取位置，回绕与 size 均以此为起点
+        self._offset = 0
+        self._consumed = False
+
+        if isinstance(source, (str, os.PathLike)):
+            path = os.fspath(source)
+            if path.startswith("file://"):
+                path = path[7:]
+            self.kind = "path"
+            self._path = os.path.abspath(path)
+            filename = filename or os.path.basename(path)
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self.kind = "memory"
+            self._source = memoryview(source).cast("B")
+            self._size = self._source.nbytes
+        elif hasattr(source, "read"):
+            self.kind = "file"
+            try:
+                self._offset = source.tell()
+            except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+                self._offset = 0
+            name = getattr(source, "name", None)
+            if filename is None and isinstance(name, str):
+                filename = os.path.basename(name)
+        elif isinstance(source, AsyncIterable):
+            self.kind = "stream"
+        else:
+            raise TypeError(f"不支持的媒体数据源类型: {type(source).__name__}")
+
+        self.filename = filename
+        self.content_type = content_type or (
+            mimetypes.guess_type(filename)[0] if filename else None
+        ) or "application/octet-stream"
+
+    @classmethod
+    def wrap(cls, file: Any) -> Any:
+        """
+        将非 str/bytes 的媒体输入包装为 MediaSource
+
+        str（URL/路径/平台文件ID）与 bytes 保持原样以兼容现有适配器，
+        Path、文件对象、异步迭代器、memoryview 等包装为 MediaSource
+
+        :param file: 媒体输入
+        :return: 原值或 MediaSource
+        """
+        if isinstance(file, (str, bytes, cls)):
+            return file
+        return cls(file)
+
+    # ==================== 元信息 ====================
+
+    @property
+    def path(self) -> str | None:
+        """本地文件绝对路径（仅 path 类型）"""
+        return self._path
+
+    @property
+    def size(self) -> int | None:
+        """
+        内容大小(字节)，无法预知时返回 None（如异步迭代器）
+        """
+        if self._size is not None:
+            return self._size
+        if self.kind == "path":
+            try:
+                return os.stat(self._path).st_size
+            except OSError:
+                return None
+        if self.kind == "file":
+            try:
+                return max(0, os.fstat(self._source.fileno()).st_size - self._offset)
+            except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+                return None
+        return None
+
+    @property
+    def reusable(self) -> bool:
+        """是否可以被多次读取（路径、内存视图以及可回绕的文件对象，从包装时的位置重新读取）"""
+        if self.kind in ("path", "memory"):
+            return True
+        if self.kind == "file":
+            try:
+                return self._source.seekable()
+            except (AttributeError, ValueError):
+                return False
+        return False
+
+    # ==================== 读取 ====================
+
+    def _mark_consumed(self) -> None:
+        """
+        {!--< internal-use >!--}
+        标记一次性数据源已被消费，重复读取时抛出异常
+        """
+        if self.reusable:
+            return
+        if self._consumed:
+            raise RuntimeError(f"媒体数据源 ({self.kind}) 只能被读取一次")
+        self._consumed = True
+
+    async def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes | memoryview]:
+        """
+        按块异步读取媒体内容
+
+        文件读取在线程池中进行，不阻塞事件循环
+
+        :param chunk_size: 每块的最大字节数
+        :return: 异步迭代器，产出 bytes 或 memoryview 切片
+
+        :example:
+        >>> async for chunk in MediaSource("./video.mp4").iter_chunks():
+        >>>     await ws.send_bytes(chunk)
+        """
+        self._mark_consumed()
+
+        if self.kind == "memory":
+            view = self._source
+            for offset in range(0, view.nbytes, chunk_size):
+                yield view[offset:offset + chunk_size]
+            return
+
+        if self.kind == "stream":
+            async for chunk in self._source:
+                yield chunk
+            return
+
+        if self.kind == "path":
+            f = await asyncio.to_thread(open, self._path, "rb")
+            close = True
+        else:
+            f = self._source
+            close = False
+            if self.reusable:
+                f.seek(self._offset)
+
+        try:
+            while chunk := await asyncio.to_thread(f.read, chunk_size):
+                yield chunk
+        finally:
+            if close:
+                await asyncio.to_thread(f.close)
+
+    async def read(self) -> bytes:
+        """
+        读取完整内容为 bytes
+
+        {!--< tips >!--}
+        会把完整内容读入内存，仅用于必须提交完整字节（如 base64 编码）的适配器
+        {!--< /tips >!--}
+
+        :return: 完整的字节内容
+        """
+        if self.kind == "memory":
+            self._mark_consumed()
+            return self._source.tobytes()
+        if self.kind == "path":
+            return await asyncio.to_thread(Path(self._path).read_bytes)
+
+        buffer = bytearray()
+        async for chunk in self.iter_chunks():
+            buffer += chunk
+        return bytes(buffer)
+
+    def as_payload(self) -> Any:
+        """
+        获取可直接用于 aiohttp 请求体/表单字段的流式对象
+
+        - path：新打开的文件句柄（由 aiohttp 负责分块读取并关闭）
+        - file：原文件对象（可回绕时先回到包装时的位置）
+        - stream：异步生成器
+        - memory：memoryview 本身（不复制）
+
+        :return: aiohttp 可接受的 payload 对象
+
+        :example:
+        >>> form = aiohttp.FormData()
+        >>> form.add_field("file", source.as_payload(), filename=source.filename,
+        ...                content_type=source.content_type)
+        """
+        if self.kind == "path":
+            return open(self._path, "rb")
+        if self.kind == "memory":
+            return self._source
+        if self.kind == "file":
+            self._mark_consumed()
+            if self.reusable:
+                self._source.seek(self._offset)
+            return self._source
+        return self.iter_chunks()
+
+    def __repr__(self) -> str:
+        target = self._path if self.kind == "path" else type(self._source).__name__
+        return f"MediaSource(kind={self.kind!r}, source={target!r}, size={self.size})"
+
+
+class MediaCache:
+    """
+    媒体上传缓存
+
+    记录 "媒体内容 → 平台文件ID/URL" 的映射，并在有效期内自动复用
+
+    {!--< tips >!--}
+    1. 内存中保留一个有界的 LRU 索引，未命中时按 scope 从 storage 懒加载
+    2. 写入时同步落盘到 storage 的 media_cache 表
+    3. 适配器一般通过 BaseAdapter.resolve_media() 间接使用，无需直接操作本类
+    {!--< /tips >!--}
+    """
+
+    TABLE_NAME = "media_cache"
+
+    def __init__(self):
+        # {(scope, cache_key): (file_id, expires_at)}
+        self._entries: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        self._loaded_scopes: set[str] = set()
+        self._table_ready = False
+        self._storage = None
+        self._hits = 0
+        self._misses = 0
+
+    # ==================== 配置与存储 ====================
+
+    @staticmethod
+    def _get_config() -> dict[str, Any]:
+        from ..runtime import get_media_config
+
+        return get_media_config()
+
+    def _get_storage(self):
+        """
+        {!--< internal-use >!--}
+        获取持久化使用的存储后端（默认使用全局 storage）
+        """
+        if self._storage is None:
+            from .storage import storage
+
+            self._storage = storage
+        return self._storage
+
+    def _ensure_table(self) -> bool:
+        """
+        {!--< internal-use >!--}
+        确保 media_cache 表存在
+        """
+        if self._table_ready:
+            return True
+        self._table_ready = self._get_storage().CreateTable(
+            self.TABLE_NAME,
+            {
+                "cache_id": "TEXT PRIMARY KEY",
+                "scope": "TEXT NOT NULL",
+                "file_id": "TEXT NOT NULL",
+                "expires_at": "REAL NOT NULL",
+            },
+        )
+        return self._table_ready
+
+    def _load_scope(self, scope: str) -> None:
+        """
+        {!--< internal-use >!--}
+        从 storage 懒加载指定 scope 下仍然有效的缓存条目
+        """
+        if scope in self._loaded_scopes:
+            return
+        self._loaded_scopes.add(scope)
+
+        if not self._ensure_table():
+            return
+
+        try:
+            rows = (
+                self._get_storage()
+                .Table(self.TABLE_NAME)
+                .Select("cache_id", "file_id", "expires_at")
+                .Where("scope = ?", scope)
+                .Where("expires_at > ?", time.time())
+                .OrderBy("expires_at")
+                .Execute()
+            )
+        except Exception as e:
+            logger.warning(f"加载媒体缓存失败 (scope={scope}): {e}")
+            return
+
+        prefix_len = len(scope) + 1
+        for cache_id, file_id, expires_at in rows:
+            self._remember((scope, cache_id[prefix_len:]), file_id, expires_at)
+
+    def _remember(self, entry_key: tuple[str, str], file_id: str, expires_at: float) -> None:
+        """
+        {!--< internal-use >!--}
+        写入内存索引并按 LRU 淘汰超出上限的条目
+        """
+        self._entries[entry_key] = (file_id, expires_at)
+        self._entries.move_to_end(entry_key)
+
+        max_entries = self._get_config().get("cache_max_entries", 4096)
+        while len(self._entries) > max_entries:
+            self._entries.popitem(last=False)
+
+    # ==================== 缓存键 ====================
+
+    @staticmethod
+    def make_key(file: "str | bytes | bytearray | memoryview | MediaSource") -> str | None:
+        """
+        计算媒体内容的缓存键
+
+        :param file: 媒体内容（字节数据、本地文件路径或 MediaSource）
+        :return: 缓存键；URL、平台文件ID等无法判断内容的输入返回 None
+
+        :example:
+        >>> MediaCache.make_key(b"...")          # "sha256:9f86d0..."
+        >>> MediaCache.make_key("./banner.png")  # "path:/abs/banner.png:1712345678000000000:2048"
+        >>> MediaCache.make_key("https://...")   # None
+        """
+        if isinstance(file, MediaSource):
+            if file.kind == "memory":
+                file = file._source
+            elif file.kind == "path":
+                file = file.path
+            else:
+                # 文件对象与异步迭代器无法在不消费的情况下计算内容哈希
+                return None
+
+        if isinstance(file, (bytes, bytearray, memoryview)):
+            return f"sha256:{hashlib.sha256(file).hexdigest()}"
+
+        if isinstance(file, str):
+            path = file[7:] if file.startswith("file://") else file
+            try:
+                st = os.stat(path)
+            except (OSError, ValueError):
+                return None
+            if not stat.S_ISREG(st.st_mode):
+                return None
+            return f"path:{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}"
+
+        return None
+
+    # ==================== 缓存读写 ====================
+
+    def get(
+        self, scope: str, file: str | bytes, media_type: str = "file"
+    ) -> str | None:
+        """
+        查询缓存的平台文件ID
+
+        :param scope: 缓存作用域（通常为平台名）
+        :param file: 媒体内容（字节数据或本地文件路径）
+        :param media_type: 媒体类型（image/audio/video/file）
+        :return: 缓存的文件ID或URL，未命中或已过期返回 None
+        """
+        if not self._get_config().get("cache_enabled", True):
+            return None
+        if (content_key := self.make_key(file)) is None:
+            return None
+        return self._lookup(scope, f"{media_type}:{content_key}")
+
+    def _lookup(self, scope: str, cache_key: str) -> str | None:
+        """
+        {!--< internal-use >!--}
+        按已计算好的缓存键查询
+        """
+        self._load_scope(scope)
+        entry_key = (scope, cache_key)
+
+        if (entry := self._entries.get(entry_key)) is None:
+            self._misses += 1
+            return None
+
+        file_id, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[entry_key]
+            self._delete_persisted(scope, cache_key)
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(entry_key)
+        self._hits += 1
+        return file_id
+
+    def put(
+        self,
+        scope: str,
+        file: str | bytes,
+        file_id: str,
+        media_type: str = "file",
+        ttl: float | None = None,
+    ) -> bool:
+        """
+        写入缓存
+
+        :param scope: 缓存作用域（通常为平台名）
+        :param file: 媒体内容（字节数据或本地文件路径）
+        :param file_id: 适配器上传后得到的平台文件ID或URL
+        :param media_type: 媒体类型（image/audio/video/file）
+        :param ttl: 有效期(秒)，None 表示使用配置中的 cache_ttl
+        :return: 是否写入成功（无法计算缓存键时返回 False）
+        """
+        if not file_id or not self._get_config().get("cache_enabled", True):
+            return False
+        if (content_key := self.make_key(file)) is None:
+            return False
+        return self._store(scope, f"{media_type}:{content_key}", str(file_id), ttl)
+
+    def _store(
+        self, scope: str, cache_key: str, file_id: str, ttl: float | None
+    ) -> bool:
+        """
+        {!--< internal-use >!--}
+        按已计算好的缓存键写入内存索引并持久化
+        """
+        if ttl is None:
+            ttl = self._get_config().get("cache_ttl", 7 * 24 * 60 * 60)
+        expires_at = time.time() + ttl
+
+        self._load_scope(scope)
+        self._remember((scope, cache_key), file_id, expires_at)
+
+        if not self._ensure_table():
+            return True
+
+        storage = self._get_storage()
+        cache_id = f"{scope}:{cache_key}"
+        try:
+            with storage.transaction():
+                storage.Table(self.TABLE_NAME).Delete().Where(
+                    "cache_id = ?", cache_id
+                ).Execute()
+                storage.Table(self.TABLE_NAME).Insert(
+                    {
+                        "cache_id": cache_id,
+                        "scope": scope,
+                        "file_id": file_id,
+                        "expires_at": expires_at,
+                    }
+                ).Execute()
+        except Exception as e:
+            logger.warning(f"持久化媒体缓存失败 ({cache_id}): {e}")
+        return True
+
+    async def get_or_upload(
+        self,
+        scope: str,
+        file: str | bytes,
+        uploader: Callable[[str | bytes], Awaitable[Any]],
+        media_type: str = "file",
+        ttl: float | None = None,
+    ) -> Any:
+        """
+        命中缓存时直接返回文件ID，否则调用上传函数并缓存其结果
+
+        :param scope: 缓存作用域（通常为平台名）
+        :param file: 媒体内容（字节数据或本地文件路径）
+        :param uploader: 上传函数，接收 file 并返回平台文件ID或URL
+        :param media_type: 媒体类型（image/audio/video/file）
+        :param ttl: 有效期(秒)，None 表示使用配置中的 cache_ttl
+        :return: 平台文件ID或URL
+
+        :example:
+        >>> file_id = await media_cache.get_or_upload(
+        ...     "telegram", image_bytes, lambda f: self._upload("photo", f), media_type="image"
+        ... )
+        """
+        cache_key = None
+        if self._get_config().get("cache_enabled", True):
+            if (content_key := self.make_key(file)) is not None:
+                cache_key = f"{media_type}:{content_key}"
+                if (cached := self._lookup(scope, cache_key)) is not None:
+                    return cached
+
+        file_id = await uploader(file)
+
+        if cache_key is not None and file_id:
+            self._store(scope, cache_key, str(file_id), ttl)
+        return file_id
+
+    def invalidate(
+        self, scope: str, file: str | bytes | None = None, media_type: str = "file"
+    ) -> int:
+        """
+        使缓存失效
+
+        平台端文件被删除或过期时，适配器可调用此方法强制下次重新上传
+
+        :param scope: 缓存作用域
+        :param file: 媒体内容，None 表示清除该 scope 下全部缓存
+        :param media_type: 媒体类型
+        :return: 被清除的内存条目数量
+        """
+        if file is None:
+            keys = [k for k in self._entries if k[0] == scope]
+            for key in keys:
+                del self._entries[key]
+            if self._ensure_table():
+                try:
+                    self._get_storage().Table(self.TABLE_NAME).Delete().Where(
+                        "scope = ?", scope
+                    ).Execute()
+                except Exception as e:
+                    logger.warning(f"清除媒体缓存失败 (scope={scope}): {e}")
+            return len(keys)
+
+        if (content_key := self.make_key(file)) is None:
+            return 0
+        cache_key = f"{media_type}:{content_key}"
+        removed = 1 if self._entries.pop((scope, cache_key), None) else 0
+        self._delete_persisted(scope, cache_key)
+        return removed
+
+    def _delete_persisted(self, scope: str, cache_key: str) -> None:
+        """
+        {!--< internal-use >!--}
+        删除持久化的单个缓存条目
+        """
+        if not self._ensure_table():
+            return
+        try:
+            self._get_storage().Table(self.TABLE_NAME).Delete().Where(
+                "cache_id = ?", f"{scope}:{cache_key}"
+            ).Execute()
+        except Exception as e:
+            logger.warning(f"删除媒体缓存失败 ({scope}:{cache_key}): {e}")
+
+    def purge_expired(self) -> int:
+        """
+        清理所有已过期的缓存条目（内存与持久化存储）
+
+        :return: 从持久化存储中删除的条目数量
+        """
+        now = time.time()
+        for key in [k for k, (_, exp) in self._entries.items() if exp <= now]:
+            del self._entries[key]
+
+        if not self._ensure_table():
+            return 0
+        try:
+            return self._get_storage().Table(self.TABLE_NAME).Delete().Where(
+                "expires_at <= ?", now
+            ).Execute()
+        except Exception as e:
+            logger.warning(f"清理过期媒体缓存失败: {e}")
+            return 0
+
+    def get_stats(self) -> dict[str, int]:
+        """
+        获取缓存统计信息
+
+        :return: {"entries": 内存条目数, "hits": 命中次数, "misses": 未命中次数}
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+    def clear(self) -> None:
+        """
+        清空内存索引（不影响持久化数据，下次访问时重新加载）
+
+        {!--< internal-use >!--}
+        用于反初始化时重置状态
+        {!--< /internal-use >!--}
+        """
+        self._entries.clear()
+        self._loaded_scopes.clear()
+        self._table_ready = False
+        self._hits = 0
+        self._misses = 0
+
+
+media_cache: MediaCache = MediaCache()
+
+__all__ = ["MediaSource", "MediaCache", "media_cache"]
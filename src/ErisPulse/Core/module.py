@@ -514,11 +514,14 @@ class ModuleManager(ManagerBase):
         >>> #         "MyModule": {
         >>> #             "status": "loaded",
         >>> #             "enabled": True,
-        >>> #             "is_base_module": True
+        >>> #             "is_base_module": True,
+        >>> #             "usage": {"active": 1, "waiting": 0, "shed": 0, "cpu_ms": 12.5, ...}
         >>> #         }
         >>> #     }
         >>> # }
         """
+        from .quota import quota
+
         modules_summary = {}
         for name in self._module_classes:
             module_class = self._module_classes[name]
@@ -526,6 +529,7 @@ class ModuleManager(ManagerBase):
                 "status": "loaded" if name in self._loaded_modules else "registered",
                 "enabled": self.is_enabled(name),
                 "is_base_module": issubclass(module_class, BaseModule),
+                "usage": quota.get_usage(name),
             }
         return {"modules": modules_summary}
 
@@ -0,0 +1,282 @@
+"""
+ErisPulse 事件循环延迟监控
+
+周期性采样事件循环的调度延迟，定位阻塞事件循环的同步代码
+
+{!--< tips >!--}
+1. 采样协程按固定间隔休眠，实际唤醒时间与预期时间之差即为调度延迟
+2. 看门狗线程在事件循环停止响应超过阈值时记录事件循环线程的调用栈与正在执行的 Task，
+   因此能定位到阻塞期间正在运行的代码，而不是阻塞结束之后的位置
+3. 延迟超过阈值时提交 core.loop.lag 生命周期事件（按 event_cooldown 限流）
+4. 由 sdk.run() 自动启动，可通过配置 ErisPulse.monitor.enabled 关闭
+{!--< /tips >!--}
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any
+
+from .Event.metrics import LatencyHistogram, percentile
+from .logger import logger
+
+# 阻塞调用栈保留的最大帧数
+_STACK_LIMIT = 20
+
+
+class LoopMonitor:
+    """
+    事件循环延迟监控器
+
+    :example:
+    >>> from ErisPulse.Core import loop_monitor
+    >>> loop_monitor.get_stats()
+    {'running': True, 'lag_ms': 0.4, 'p50_ms': 0.3, 'p99_ms': 12.1, ...}
+    >>> @lifecycle.on("core.loop.lag")
+    ... async def on_lag(event):
+    ...     print(event["data"]["lag_ms"], event["data"]["blocked"])
+    """
+
+    def __init__(self):
+        from ..runtime import get_monitor_config
+
+        monitor_config = get_monitor_config()
+        self.enabled: bool = monitor_config.get("enabled", True)
+        self.interval: float = monitor_config.get("interval", 0.5)
+        self.lag_threshold: float = monitor_config.get("lag_threshold", 0.25)
+        self.event_cooldown: float = monitor_config.get("event_cooldown", 10)
+        self.window: int = monitor_config.get("window", 120)
+
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+
+        # 采样协程最近一次唤醒的时间（time.monotonic），看门狗线程据此判断阻塞
+        self._heartbeat = 0.0
+        self._blocked: dict[str, Any] | None = None
+        self._last_event = 0.0
+
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        """
+        {!--< internal-use >!--}
+        清空采样统计
+        """
+        self.histogram = LatencyHistogram()
+        self._recent: deque[float] = deque(maxlen=self.window)
+        self._current = 0.0
+        self._lag_events = 0
+        self._last_block: dict[str, Any] | None = None
+
+    # ==================== 启停 ====================
+
+    def start(self) -> bool:
+        """
+        在当前事件循环中启动监控
+
+        :return: 是否启动（未启用或已在运行时返回 False）
+        """
+        if not self.enabled or self.is_running:
+            return False
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._blocked = None
+        self._stop.clear()
+        self._task = self._loop.create_task(self._sample(), name="ErisPulse-loop-monitor")
+        if self.lag_threshold:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="ErisPulse-loop-watchdog", daemon=True
+            )
+            self._watchdog.start()
+        logger.debug(
+            f"事件循环延迟监控已启动 (间隔: {self.interval}s, 阈值: {self.lag_threshold}s)"
+        )
+        return True
+
+    async def stop(self) -> None:
+        """
+        停止监控
+        """
+        self._stop.set()
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        watchdog, self._watchdog = self._watchdog, None
+        if watchdog is not None:
+            watchdog.join(timeout=1)
+        self._loop = None
+
+    @property
+    def is_running(self) -> bool:
+        """
+        监控是否在运行
+        """
+        return self._task is not None and not self._task.done()
+
+    # ==================== 采样 ====================
+
+    async def _sample(self) -> None:
+        """
+        {!--< internal-use >!--}
+        采样协程：测量每次唤醒的调度延迟
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._heartbeat = time.monotonic()
+            self.record(lag)
+            if self.lag_threshold and lag >= self.lag_threshold:
+                await self._report(lag)
+
+    def record(self, lag: float) -> None:
+        """
+        记录一次调度延迟采样
+
+        :param lag: 调度延迟（秒）
+        """
+        self._current = lag
+        self._recent.append(lag)
+        self.histogram.record(lag)
+
+    def _watch(self) -> None:
+        """
+        {!--< internal-use >!--}
+        看门狗线程：事件循环停止响应超过阈值时记录阻塞位置
+        """
+        poll = min(self.interval, self.lag_threshold) / 2
+        captured_for = None
+        while not self._stop.wait(poll):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled >= self.lag_threshold and captured_for != heartbeat:
+                captured_for = heartbeat
+                self._blocked = self._capture(stalled)
+
+    def _capture(self, stalled: float) -> dict[str, Any] | None:
+        """
+        {!--< internal-use >!--}
+        获取事件循环线程当前的调用栈与正在执行的 Task
+
+        :param stalled: 已阻塞时长（秒）
+        :return: 阻塞信息，事件循环线程不存在时返回 None
+        """
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        stack = traceback.format_stack(frame)[-_STACK_LIMIT:]
+        del frame
+
+        task_name = coroutine = None
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        if task is not None:
+            task_name = task.get_name()
+            coro = task.get_coro()
+            coroutine = getattr(coro, "__qualname__", repr(coro))
+
+        return {
+            "task": task_name,
+            "coroutine": coroutine,
+            "stalled_ms": round(stalled * 1000, 3),
+            "stack": [line.rstrip() for line in stack],
+            "captured_at": time.time(),
+        }
+
+    async def _report(self, lag: float) -> None:
+        """
+        {!--< internal-use >!--}
+        记录超过阈值的延迟，按冷却时间提交 core.loop.lag 事件
+        """
+        blocked, self._blocked = self._blocked, None
+        if blocked is not None:
+            self._last_block = blocked
+            location = blocked["stack"][-1].strip().splitlines()[0] if blocked["stack"] else "?"
+            logger.warning(
+                f"事件循环阻塞 {lag * 1000:.0f}ms (Task: {blocked['task']}, "
+                f"协程: {blocked['coroutine']})，阻塞位置: {location}"
+            )
+        else:
+            logger.warning(f"事件循环调度延迟 {lag * 1000:.0f}ms，事件循环可能过载")
+
+        now = time.monotonic()
+        if now - self._last_event < self.event_cooldown:
+            return
+        self._last_event = now
+        self._lag_events += 1
+
+        from .lifecycle import lifecycle
+
+        await lifecycle.submit_event(
+            "core.loop.lag",
+            msg="事件循环延迟超过阈值",
+            data={
+                "lag_ms": round(lag * 1000, 3),
+                "threshold_ms": round(self.lag_threshold * 1000, 3),
+                **self._percentiles(),
+                "blocked": blocked,
+            },
+            timestamp=time.time(),
+        )
+
+    # ==================== 状态 ====================
+
+    def _percentiles(self) -> dict[str, float]:
+        """
+        {!--< internal-use >!--}
+        最近采样窗口内的延迟百分位
+        """
+        ordered = sorted(self._recent)
+        return {
+            "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+            "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+            "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+            "max_ms": round((ordered[-1] if ordered else 0.0) * 1000, 3),
+        }
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取事件循环延迟状态
+
+        :return: 当前延迟、最近窗口百分位、累计统计与最近一次阻塞信息
+        """
+        total = self.histogram.to_dict()
+        return {
+            "running": self.is_running,
+            "interval": self.interval,
+            "threshold_ms": round(self.lag_threshold * 1000, 3),
+            "lag_ms": round(self._current * 1000, 3),
+            **self._percentiles(),
+            "samples": total["count"],
+            "total": {
+                key: total[key] for key in ("avg_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+            },
+            "lag_events": self._lag_events,
+            "last_block": self._last_block,
+        }
+
+    def reset(self) -> None:
+        """
+        清空采样统计
+        """
+        self._reset_stats()
+
+
+loop_monitor: LoopMonitor = LoopMonitor()
+
+__all__ = ["LoopMonitor", "loop_monitor"]
@@ -0,0 +1,585 @@
+"""
+ErisPulse 持久化发件箱
+
+适配器不可用（启动失败退避、熔断、健康检查重启或进程重启）期间的发送写入存储表，
+适配器通过 adapter.status.change 上报 started 后按平台顺序补发
+
+{!--< tips >!--}
+1. 默认关闭，通过配置 ErisPulse.outbox.enabled 启用
+2. 发送时适配器未启动、发送因连接错误（ConnectionError）失败、发送期间适配器停止，
+   或该平台仍有待补发的消息（保证同平台顺序）时，发送被写入发件箱，返回 {"status": "queued", ...} 响应；
+   适配器仍在运行时的其他异常（文件不存在、请求超时等）照常抛出，不进入发件箱
+3. 补发时重放完整的 Send 调用链（To / Using / At / Reply 等修饰方法与最终发送方法），
+   参数需可 JSON 序列化（bytes 会被编码保存），无法序列化的发送按原方式直接执行
+4. 超过 ttl 的消息被丢弃；补发因连接错误失败时按 retry_interval 重试，超过 max_attempts 次标记为 failed；
+   适配器运行中补发因其他异常失败的消息直接标记为 failed，不阻塞后续消息。failed 消息保留在表中
+{!--< /tips >!--}
+"""
+
+import asyncio
+import base64
+import functools
+import inspect
+import json
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
+from .logger import logger
+
+# 返回 SendDSL 的修饰方法（小写，与多进程运行时一致），To / Using / Account 不经过包装
+_SEND_MODIFIERS = frozenset(("at", "reply", "atall"))
+
+# 视为适配器不可用的发送异常（OSError / TimeoutError 可能来自消息本身或已送达的请求，不包含在内）
+_OUTAGE_ERRORS = (ConnectionError,)
+
+# 补发过程中的发送不再进入发件箱
+_replaying: ContextVar[bool] = ContextVar("erispulse_outbox_replaying", default=False)
+
+
+def _encode(value: Any) -> Any:
+    """
+    {!--< internal-use >!--}
+    将 bytes 编码为可 JSON 序列化的结构
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    return value
+
+
+def _decode(obj: dict[str, Any]) -> Any:
+    """
+    {!--< internal-use >!--}
+    JSON object_hook：还原 bytes
+    """
+    if len(obj) == 1 and "__bytes__" in obj:
+        return base64.b64decode(obj["__bytes__"])
+    return obj
+
+
+class Outbox:
+    """
+    持久化发件箱
+
+    :param storage: 使用的存储（默认全局 storage）
+    :param adapter_manager: 适配器管理器（默认全局 adapter）
+
+    :example:
+    >>> from ErisPulse import sdk
+    >>> result = await sdk.adapter.telegram.Send.To("user", "123").Text("通知")
+    >>> if result.get("status") == "queued":
+    >>>     sdk.logger.info("适配器暂不可用，消息将在恢复后补发")
+    >>> sdk.outbox.get_stats()
+    """
+
+    def __init__(self, storage: Any = None, adapter_manager: Any = None):
+        from ..runtime import get_outbox_config
+
+        outbox_config = get_outbox_config()
+        self.enabled: bool = outbox_config.get("enabled", False)
+        self.table: str = outbox_config.get("table", "erispulse_outbox")
+        self.batch_size: int = outbox_config.get("batch_size", 50)
+        self.ttl: float = outbox_config.get("ttl", 3600)
+        self.max_attempts: int = outbox_config.get("max_attempts", 5)
+        self.retry_interval: float = outbox_config.get("retry_interval", 30)
+
+        self._storage = storage
+        self._adapter_manager = adapter_manager
+        self._table_ready = False
+        # 各平台待补发的消息数，非 0 时同平台的新发送也进入发件箱以保证顺序
+        self._pending: dict[str, int] | None = None
+        self._drains: dict[str, asyncio.Task] = {}
+        self._retry_handles: dict[str, asyncio.TimerHandle] = {}
+        self._subscribed = False
+        self._stats = {"queued": 0, "sent": 0, "expired": 0, "failed": 0}
+
+    # ==================== 发送拦截 ====================
+
+    def _manager(self) -> Any:
+        """
+        {!--< internal-use >!--}
+        获取适配器管理器
+        """
+        if self._adapter_manager is None:
+            from .adapter import adapter
+
+            self._adapter_manager = adapter
+        return self._adapter_manager
+
+    def _platform_of(self, adapter: Any) -> str | None:
+        """
+        {!--< internal-use >!--}
+        获取适配器实例注册的平台名，未注册到管理器的实例返回 None
+        """
+        for platform, instance in self._manager()._adapters.items():
+            if instance is adapter:
+                return platform
+        return None
+
+    def _is_available(self, adapter: Any) -> bool:
+        """
+        {!--< internal-use >!--}
+        适配器是否已启动
+        """
+        return adapter in self._manager()._started_instances
+
+    def _build_record(
+        self, dsl: Any, platform: str, method: str, args: tuple, kwargs: dict[str, Any]
+    ) -> str | None:
+        """
+        {!--< internal-use >!--}
+        序列化发送调用，无法序列化时返回 None
+        """
+        record = {
+            "target_type": dsl._target_type,
+            "target_id": dsl._target_id,
+            "account_id": dsl._account_id,
+            "chain": getattr(dsl, "_outbox_chain", ()),
+            "method": method,
+            "args": args,
+            "kwargs": kwargs,
+        }
+        try:
+            return json.dumps(_encode(record), ensure_ascii=False)
+        except (TypeError, ValueError):
+            logger.debug(f"平台 {platform} 的 {method} 发送参数无法序列化，不进入发件箱")
+            return None
+
+    def intercept(self, dsl: Any, func: Callable, method: str, args: tuple, kwargs: dict[str, Any]) -> Any:
+        """
+        {!--< internal-use >!--}
+        拦截 SendDSL 的发送方法
+        """
+        if method.lower() in _SEND_MODIFIERS:
+            result = func(dsl, *args, **kwargs)
+            if hasattr(result, "_adapter"):
+                try:
+                    result._outbox_chain = (
+                        *getattr(dsl, "_outbox_chain", ()), (method, args, kwargs)
+                    )
+                except AttributeError:
+                    pass
+            return result
+
+        adapter = dsl._adapter
+        platform = self._platform_of(adapter)
+        payload = self._build_record(dsl, platform, method, args, kwargs) if platform else None
+        if payload is None:
+            return func(dsl, *args, **kwargs)
+
+        if not self._is_available(adapter):
+            return self._queued_task(platform, payload, "适配器未启动")
+        if self.pending(platform):
+            return self._queued_task(platform, payload, "该平台仍有待补发的消息")
+
+        result = func(dsl, *args, **kwargs)
+        if not inspect.isawaitable(result):
+            return result
+        return asyncio.ensure_future(self._guard(result, adapter, platform, payload))
+
+    async def _guard(self, awaitable: Any, adapter: Any, platform: str, payload: str) -> Any:
+        """
+        {!--< internal-use >!--}
+        等待发送结果，适配器在发送期间不可用时将发送写入发件箱
+        """
+        try:
+            result = await awaitable
+        except _OUTAGE_ERRORS as e:
+            reason = f"{type(e).__name__}: {e}"
+        except Exception:
+            if self._is_available(adapter):
+                raise
+            reason = "适配器在发送期间停止"
+        else:
+            if (
+                not isinstance(result, dict)
+                or result.get("status") != "failed"
+                or self._is_available(adapter)
+            ):
+                return result
+            reason = result.get("message") or "适配器在发送期间停止"
+
+        response = self._enqueue(platform, payload, reason)
+        if self._is_available(adapter):
+            # 连接错误但适配器仍处于启动状态时不会再收到 started 事件，按重试间隔补发
+            self._schedule_drain(platform, self.retry_interval)
+        return response
+
+    def _queued_task(self, platform: str, payload: str, reason: str) -> asyncio.Future:
+        """
+        {!--< internal-use >!--}
+        写入发件箱并返回已完成的 Future，与适配器发送方法的返回值保持一致
+        """
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(self._enqueue(platform, payload, reason))
+        return future
+
+    # ==================== 存储 ====================
+
+    def _get_storage(self) -> Any:
+        """
+        {!--< internal-use >!--}
+        获取存储并确保发件箱表存在
+        """
+        if self._storage is None:
+            from .storage import storage
+
+            self._storage = storage
+        if not self._table_ready:
+            self._table_ready = self._storage.CreateTable(self.table, {
+                "id": "INTEGER PRIMARY KEY AUTOINCREMENT",
+                "platform": "TEXT NOT NULL",
+                "payload": "TEXT NOT NULL",
+                "status": "TEXT NOT NULL DEFAULT 'pending'",
+                "attempts": "INTEGER NOT NULL DEFAULT 0",
+                "last_error": "TEXT",
+                "created_at": "REAL NOT NULL",
+                "expires_at": "REAL",
+            })
+        return self._storage
+
+    def _load_pending(self) -> dict[str, int]:
+        """
+        {!--< internal-use >!--}
+        统计各平台待补发的消息数
+        """
+        if self._pending is None:
+            pending: dict[str, int] = {}
+            try:
+                rows = self._get_storage().Table(self.table).Select("platform").Where(
+                    "status = ?", "pending"
+                ).Execute()
+            except Exception as e:
+                logger.error(f"读取发件箱失败: {e}")
+                rows = []
+            for (platform,) in rows:
+                pending[platform] = pending.get(platform, 0) + 1
+            self._pending = pending
+        return self._pending
+
+    def _enqueue(self, platform: str, payload: str, reason: str) -> dict[str, Any]:
+        """
+        {!--< internal-use >!--}
+        写入发件箱
+
+        :return: queued 响应，写入失败时返回 failed 响应
+        """
+        now = time.time()
+        pending = self._load_pending()
+        try:
+            self._get_storage().Table(self.table).Insert({
+                "platform": platform,
+                "payload": payload,
+                "status": "pending",
+                "attempts": 0,
+                "last_error": reason,
+                "created_at": now,
+                "expires_at": now + self.ttl if self.ttl else None,
+            }).Execute()
+        except Exception as e:
+            logger.error(f"写入发件箱失败，消息丢失: {e}")
+            return {
+                "status": "failed",
+                "retcode": 34000,
+                "data": None,
+                "message_id": "",
+                "message": f"适配器 {platform} 不可用且写入发件箱失败: {e}",
+            }
+        pending[platform] = pending.get(platform, 0) + 1
+        self._stats["queued"] += 1
+        logger.debug(f"发送已写入发件箱 ({platform}): {reason}")
+        return {
+            "status": "queued",
+            "retcode": 0,
+            "data": None,
+            "message_id": "",
+            "message": f"适配器 {platform} 暂不可用，消息已写入发件箱: {reason}",
+        }
+
+    def _delete_rows(self, row_ids: list[int]) -> None:
+        """
+        {!--< internal-use >!--}
+        批量删除已处理的消息
+        """
+        if not row_ids:
+            return
+        placeholders = ", ".join("?" * len(row_ids))
+        self._get_storage().Table(self.table).Delete().Where(
+            f"id IN ({placeholders})", *row_ids
+        ).Execute()
+
+    # ==================== 补发 ====================
+
+    def pending(self, platform: str | None = None) -> int:
+        """
+        获取待补发的消息数
+
+        :param platform: 平台名称，None 表示全部平台
+        :return: 消息数
+        """
+        pending = self._load_pending()
+        if platform is None:
+            return sum(pending.values())
+        return pending.get(platform, 0)
+
+    async def _replay(self, adapter: Any, payload: str) -> Any:
+        """
+        {!--< internal-use >!--}
+        在适配器上重放发送调用链
+        """
+        record = json.loads(payload, object_hook=_decode)
+        dsl = adapter.Send
+        if record["target_type"] is not None or record["target_id"] is not None:
+            dsl = dsl.To(record["target_type"], record["target_id"])
+        if record["account_id"] is not None:
+            dsl = dsl.Using(record["account_id"])
+        for name, args, kwargs in record["chain"]:
+            dsl = getattr(dsl, name)(*args, **kwargs)
+        result = getattr(dsl, record["method"])(*record["args"], **record["kwargs"])
+        if inspect.isawaitable(result):
+            result = await result
+        if isinstance(result, dict) and result.get("status") == "failed":
+            raise RuntimeError(result.get("message") or "发送失败")
+        return result
+
+    async def drain(self, platform: str) -> int:
+        """
+        按写入顺序补发指定平台的消息，直到发件箱为空、适配器不可用或补发失败
+
+        :param platform: 平台名称
+        :return: 成功补发的消息数
+        """
+        adapter = self._manager().get(platform)
+        sent = 0
+        token = _replaying.set(True)
+        try:
+            while adapter is not None and self._is_available(adapter):
+                rows = self._get_storage().Table(self.table).Select(
+                    "id", "payload", "attempts", "expires_at"
+                ).Where("platform = ? AND status = ?", platform, "pending").OrderBy("id").Limit(
+                    self.batch_size
+                ).Execute()
+                if not rows:
+                    self._load_pending()[platform] = 0
+                    break
+
+                done: list[int] = []
+                stopped = False
+                for row_id, payload, attempts, expires_at in rows:
+                    if expires_at is not None and expires_at < time.time():
+                        done.append(row_id)
+                        self._stats["expired"] += 1
+                        continue
+                    try:
+                        await self._replay(adapter, payload)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        if not self._is_available(adapter):
+                            # 补发期间适配器停止，不计入失败次数，等待下次 started
+                            break
+                        if not isinstance(e, _OUTAGE_ERRORS):
+                            # 适配器可用时的其他错误来自消息本身，重试无意义，放弃该消息继续补发
+                            self._record_failure(platform, row_id, attempts + 1, e, give_up=True)
+                            continue
+                        stopped = not self._record_failure(platform, row_id, attempts + 1, e)
+                        if stopped:
+                            break
+                        continue
+                    done.append(row_id)
+                    sent += 1
+                    self._stats["sent"] += 1
+
+                self._delete_rows(done)
+                pending = self._load_pending()
+                pending[platform] = max(0, pending.get(platform, 0) - len(done))
+                if stopped:
+                    self._schedule_drain(platform, self.retry_interval)
+                    break
+        finally:
+            _replaying.reset(token)
+
+        if sent:
+            logger.info(f"发件箱已向 {platform} 补发 {sent} 条消息")
+        return sent
+
+    def _record_failure(
+        self, platform: str, row_id: int, attempts: int, error: Exception, give_up: bool = False
+    ) -> bool:
+        """
+        {!--< internal-use >!--}
+        记录补发失败
+
+        :param give_up: 不再重试，直接标记为 failed
+        :return: 消息是否已被标记为 failed（可以继续补发后续消息）
+        """
+        failed = give_up or attempts >= self.max_attempts
+        self._get_storage().Table(self.table).Update({
+            "attempts": attempts,
+            "status": "failed" if failed else "pending",
+            "last_error": f"{type(error).__name__}: {error}",
+        }).Where("id = ?", row_id).Execute()
+        if failed:
+            pending = self._load_pending()
+            pending[platform] = max(0, pending.get(platform, 0) - 1)
+            self._stats["failed"] += 1
+            logger.error(f"发件箱消息 {row_id} ({platform}) 第{attempts}次补发失败，已放弃: {error}")
+        else:
+            logger.warning(
+                f"发件箱消息 {row_id} ({platform}) 补发失败（第{attempts}次），"
+                f"{self.retry_interval} 秒后重试: {error}"
+            )
+        return failed
+
+    def _schedule_drain(self, platform: str, delay: float = 0) -> None:
+        """
+        {!--< internal-use >!--}
+        在后台补发指定平台的消息（同一平台同时只有一个补发任务）
+        """
+        loop = asyncio.get_running_loop()
+        if delay:
+            if platform not in self._retry_handles:
+                self._retry_handles[platform] = loop.call_later(
+                    delay, functools.partial(self._retry_due, platform)
+                )
+            return
+
+        task = self._drains.get(platform)
+        if task is not None and not task.done():
+            return
+        task = loop.create_task(self._run_drain(platform), name=f"ErisPulse-outbox-{platform}")
+        self._drains[platform] = task
+
+    def _retry_due(self, platform: str) -> None:
+        """
+        {!--< internal-use >!--}
+        重试定时器到期
+        """
+        self._retry_handles.pop(platform, None)
+        self._schedule_drain(platform)
+
+    async def _run_drain(self, platform: str) -> None:
+        """
+        {!--< internal-use >!--}
+        后台补发任务
+        """
+        try:
+            await self.drain(platform)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"发件箱补发 {platform} 失败: {e}")
+            self._schedule_drain(platform, self.retry_interval)
+        finally:
+            if self._drains.get(platform) is asyncio.current_task():
+                self._drains.pop(platform, None)
+
+    async def _on_status_change(self, event: dict[str, Any]) -> None:
+        """
+        {!--< internal-use >!--}
+        adapter.status.change 处理器：适配器启动后补发
+        """
+        data = event.get("data") or {}
+        platform = data.get("platform")
+        if self.enabled and data.get("status") == "started" and platform and self.pending(platform):
+            self._schedule_drain(platform)
+
+    # ==================== 启停 ====================
+
+    def start(self) -> None:
+        """
+        订阅适配器状态事件，已启动的适配器立即补发
+        """
+        if not self._subscribed:
+            from .lifecycle import lifecycle
+
+            lifecycle.on("adapter.status.change")(self._on_status_change)
+            self._subscribed = True
+
+        pending = self._load_pending()
+        for platform, count in pending.items():
+            adapter = self._manager().get(platform)
+            if count and adapter is not None and self._is_available(adapter):
+                self._schedule_drain(platform)
+        if pending:
+            logger.info(f"发件箱中有 {sum(pending.values())} 条待补发消息")
+
+    async def stop(self) -> None:
+        """
+        停止补发任务（未补发的消息保留在存储中）
+        """
+        for handle in self._retry_handles.values():
+            handle.cancel()
+        self._retry_handles.clear()
+
+        tasks = [task for task in self._drains.values() if not task.done()]
+        self._drains.clear()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._pending = None
+
+    def purge(self, status: str = "failed", platform: str | None = None) -> int:
+        """
+        删除发件箱中的消息
+
+        :param status: 消息状态：failed / pending
+        :param platform: 平台名称，None 表示全部平台
+        :return: 删除的消息数
+        """
+        query = self._get_storage().Table(self.table).Delete()
+        if platform is None:
+            query = query.Where("status = ?", status)
+        else:
+            query = query.Where("status = ? AND platform = ?", status, platform)
+        removed = query.Execute()
+        if status == "pending":
+            self._pending = None
+        return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取发件箱状态
+
+        :return: 开关状态、各平台待补发数与累计计数
+        """
+        return {
+            "enabled": self.enabled,
+            "pending": {p: n for p, n in self._load_pending().items() if n},
+            **self._stats,
+        }
+
+
+outbox: Outbox = Outbox()
+
+
+def outbox_send_method(func: Callable, method: str) -> Callable:
+    """
+    {!--< internal-use >!--}
+    包装 SendDSL 的发送方法：发件箱启用时拦截发送
+
+    :param func: 发送方法
+    :param method: 方法名
+    :return: 包装后的方法
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not outbox.enabled or _replaying.get():
+            return func(self, *args, **kwargs)
+        return outbox.intercept(self, func, method, args, kwargs)
+
+    return wrapper
+
+
+__all__ = [
+    "Outbox",
+    "outbox",
+    "outbox_send_method",
+]
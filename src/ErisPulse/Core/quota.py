@@ -0,0 +1,288 @@
+"""
+ErisPulse 模块配额
+
+所有模块的事件处理器共享一个事件循环，模块配额按处理器所属模块限制同时执行的处理器数与排队长度，
+并统计各模块处理器占用的 CPU 时间，避免单个模块拖垮其他模块
+
+{!--< tips >!--}
+1. 处理器所属模块在注册时按处理器所在的顶层包与已注册模块类匹配，未匹配时使用顶层包名
+2. 达到 max_concurrency 的模块，其后续处理器调用排队等待；排队数达到 max_queue 时该模块丢弃新事件，
+   其他模块的处理器不受影响
+3. CPU 时间按事件循环线程（或线程池线程）实际占用统计，异步处理器只统计其自身各执行片段，不含等待时间
+4. 默认关闭，通过配置 ErisPulse.quota 启用；module.get_status_summary() 中的 usage 字段为各模块当前用量
+{!--< /tips >!--}
+"""
+
+import asyncio
+import functools
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from .logger import logger
+
+
+class _CPUAccounted:
+    """
+    {!--< internal-use >!--}
+    逐步驱动协程，统计每个执行片段占用的线程 CPU 时间
+    """
+
+    __slots__ = ("_coro", "_quota")
+
+    def __init__(self, coro: Any, quota: "ModuleQuota"):
+        self._coro = coro
+        self._quota = quota
+
+    def __await__(self):
+        coro, quota, clock = self._coro, self._quota, time.thread_time
+        value, error = None, None
+        while True:
+            start = clock()
+            try:
+                yielded = coro.send(value) if error is None else coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                quota.cpu_time += clock() - start
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:
+                value, error = None, e
+
+
+class ModuleQuota:
+    """
+    单个模块的配额与用量
+
+    :param name: 模块名
+    :param max_concurrency: 同时执行的处理器数上限，0 表示不限制
+    :param max_queue: 等待执行的处理器数上限，0 表示不限制
+    """
+
+    __slots__ = (
+        "name", "max_concurrency", "max_queue", "_semaphore", "active", "waiting",
+        "peak_active", "invocations", "shed", "cpu_time", "wall_time",
+    )
+
+    def __init__(self, name: str, max_concurrency: int = 0, max_queue: int = 0):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.active = 0
+        self.waiting = 0
+        self.peak_active = 0
+        self.invocations = 0
+        self.shed = 0
+        self.cpu_time = 0.0
+        self.wall_time = 0.0
+
+    async def acquire(self) -> bool:
+        """
+        获取执行名额，达到并发上限时排队等待
+
+        :return: 是否获得名额（排队已满时返回 False，调用应被丢弃）
+        """
+        semaphore = self._semaphore
+        if semaphore is not None and semaphore.locked():
+            if self.max_queue and self.waiting >= self.max_queue:
+                self.shed += 1
+                return False
+            self.waiting += 1
+            try:
+                await semaphore.acquire()
+            finally:
+                self.waiting -= 1
+        elif semaphore is not None:
+            await semaphore.acquire()
+
+        self.active += 1
+        self.invocations += 1
+        if self.active > self.peak_active:
+            self.peak_active = self.active
+        return True
+
+    def release(self, elapsed: float = 0.0) -> None:
+        """
+        释放执行名额
+
+        :param elapsed: 本次调用的耗时（秒）
+        """
+        self.active -= 1
+        self.wall_time += elapsed
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def accounted(self, coro: Awaitable) -> Awaitable:
+        """
+        包装协程以统计 CPU 时间
+
+        :param coro: 处理器返回的协程
+        :return: 可等待对象
+        """
+        return _CPUAccounted(coro, self)
+
+    def timed(self, func: Callable) -> Callable:
+        """
+        包装同步函数以统计其所在线程的 CPU 时间（用于线程池执行）
+
+        :param func: 同步函数
+        :return: 包装后的函数
+        """
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.thread_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.cpu_time += time.thread_time() - start
+
+        return wrapper
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        转换为字典
+
+        :return: 配额与用量
+        """
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "peak_active": self.peak_active,
+            "invocations": self.invocations,
+            "shed": self.shed,
+            "cpu_ms": round(self.cpu_time * 1000, 3),
+            "wall_ms": round(self.wall_time * 1000, 3),
+        }
+
+
+class QuotaManager:
+    """
+    模块配额管理器
+
+    :example:
+    >>> from ErisPulse import sdk
+    >>> sdk.quota.set_limit("MyModule", max_concurrency=4, max_queue=100)
+    >>> sdk.module.get_status_summary()["modules"]["MyModule"]["usage"]
+    {'max_concurrency': 4, 'max_queue': 100, 'active': 1, 'waiting': 0, ..., 'cpu_ms': 12.5, ...}
+    """
+
+    def __init__(self):
+        from ..runtime import get_quota_config
+
+        quota_config = get_quota_config()
+        self.enabled: bool = quota_config.get("enabled", False)
+        self.max_concurrency: int = quota_config.get("max_concurrency", 0)
+        self.max_queue: int = quota_config.get("max_queue", 0)
+        self.cpu_accounting: bool = quota_config.get("cpu_accounting", True)
+        self._limits: dict[str, dict[str, int]] = {
+            name: dict(limits) for name, limits in quota_config.get("modules", {}).items()
+        }
+
+        self._quotas: dict[str, ModuleQuota] = {}
+        # 顶层包名 -> 模块名，模块注册表变化时重建
+        self._owners: dict[str, str] = {}
+        self._owners_size = -1
+
+    def owner_of(self, handler: Callable) -> str:
+        """
+        获取处理器所属模块
+
+        :param handler: 处理器函数
+        :return: 模块名，未匹配已注册模块时为处理器所在的顶层包名
+        """
+        package = (getattr(handler, "__module__", None) or "").partition(".")[0]
+        from .module import module
+
+        classes = module._module_classes
+        if len(classes) != self._owners_size:
+            self._owners = {
+                module_class.__module__.partition(".")[0]: name
+                for name, module_class in classes.items()
+            }
+            self._owners_size = len(classes)
+        return self._owners.get(package, package or "unknown")
+
+    def get(self, name: str) -> ModuleQuota:
+        """
+        获取模块的配额对象（不存在时按配置创建）
+
+        :param name: 模块名
+        :return: 配额对象
+        """
+        module_quota = self._quotas.get(name)
+        if module_quota is None:
+            limits = self._limits.get(name, {})
+            module_quota = self._quotas[name] = ModuleQuota(
+                name,
+                limits.get("max_concurrency", self.max_concurrency),
+                limits.get("max_queue", self.max_queue),
+            )
+        return module_quota
+
+    def set_limit(
+        self, name: str, max_concurrency: int | None = None, max_queue: int | None = None
+    ) -> None:
+        """
+        设置模块配额（对之后开始的调用生效，累计用量保留）
+
+        :param name: 模块名
+        :param max_concurrency: 同时执行的处理器数上限，0 表示不限制，None 表示不修改
+        :param max_queue: 等待执行的处理器数上限，0 表示不限制，None 表示不修改
+        """
+        limits = self._limits.setdefault(name, {})
+        if max_concurrency is not None:
+            limits["max_concurrency"] = max_concurrency
+        if max_queue is not None:
+            limits["max_queue"] = max_queue
+
+        old = self._quotas.pop(name, None)
+        if old is not None:
+            new = self.get(name)
+            new.peak_active, new.invocations, new.shed = old.peak_active, old.invocations, old.shed
+            new.cpu_time, new.wall_time = old.cpu_time, old.wall_time
+
+    def on_shed(self, module_quota: ModuleQuota, event_type: str) -> None:
+        """
+        {!--< internal-use >!--}
+        记录被丢弃的处理器调用（首次及每 100 次输出一次告警）
+        """
+        if module_quota.shed == 1 or module_quota.shed % 100 == 0:
+            logger.warning(
+                f"模块 {module_quota.name} 排队的处理器已达上限 ({module_quota.max_queue})，"
+                f"丢弃 {event_type} 事件（累计 {module_quota.shed} 次）"
+            )
+
+    def get_usage(self, name: str | None = None) -> dict[str, Any] | None:
+        """
+        获取模块用量
+
+        :param name: 模块名，None 表示全部模块
+        :return: 单个模块的用量（不存在时为 None），或 {模块名: 用量}
+        """
+        if name is not None:
+            module_quota = self._quotas.get(name)
+            return module_quota.to_dict() if module_quota is not None else None
+        return {name: module_quota.to_dict() for name, module_quota in self._quotas.items()}
+
+    def reset(self) -> None:
+        """
+        清空所有模块的用量（正在执行的调用不受影响）
+        """
+        self._quotas = {name: q for name, q in self._quotas.items() if q.active or q.waiting}
+        for module_quota in self._quotas.values():
+            module_quota.invocations = module_quota.shed = module_quota.peak_active = 0
+            module_quota.cpu_time = module_quota.wall_time = 0.0
+
+
+quota: QuotaManager = QuotaManager()
+
+__all__ = [
+    "ModuleQuota",
+    "QuotaManager",
+    "quota",
+]
@@ -0,0 +1,502 @@
+"""
+ErisPulse 事件录制与回放
+
+录制经过 adapter.emit 的真实事件，并以指定倍速回放到模块，用于压测与性能回归
+
+{!--< tips >!--}
+1. 录制器以中间件形式挂载在中间件链最前端，写入 gzip 压缩的 JSONL 分段文件
+2. 每行格式为 {"t": 相对录制开始的秒数, "event": 事件数据}，回放时据此还原事件间隔
+3. redact 中的字段（任意层级）替换为稳定哈希，相同的值脱敏后仍相同，会话分组关系得以保留
+4. 回放使用桩适配器 ReplayAdapter 接收模块的发送与 API 调用，不会连接真实平台
+{!--< /tips >!--}
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from .Bases.adapter import BaseAdapter, SendDSL
+from .Event.metrics import percentile
+from .Event.record import resolve_raw
+from .logger import logger
+
+SEGMENT_SUFFIX = ".jsonl.gz"
+
+
+def _redact(value: Any, fields: frozenset[str]) -> Any:
+    """
+    {!--< internal-use >!--}
+    递归替换指定字段的值为稳定哈希
+    """
+    if isinstance(value, dict):
+        return {
+            key: (
+                "redacted:" + hashlib.sha1(str(item).encode()).hexdigest()[:12]
+                if key in fields
+                else _redact(item, fields)
+            )
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(item, fields) for item in value]
+    return value
+
+
+def read_recording(path: str) -> Iterator[dict[str, Any]]:
+    """
+    读取录制文件
+
+    支持单个分段文件（.jsonl / .jsonl.gz）或包含分段文件的目录（按文件名顺序读取）；
+    未包含 "event" 包装的行视为事件本身，末尾被截断的压缩分段会读取到可用部分为止
+
+    :param path: 文件或目录路径
+    :return: 录制记录迭代器，每项为 {"t": float, "event": dict}
+    """
+    if os.path.isdir(path):
+        files = sorted(
+            os.path.join(path, name)
+            for name in os.listdir(path)
+            if name.endswith((SEGMENT_SUFFIX, ".jsonl"))
+        )
+    else:
+        files = [path]
+
+    for file_path in files:
+        opener = gzip.open if file_path.endswith(".gz") else open
+        with opener(file_path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if "event" not in record:
+                        record = {"t": 0.0, "event": record}
+                    yield record
+            except (EOFError, gzip.BadGzipFile):
+                logger.warning(f"录制文件 {file_path} 不完整，已读取到可用部分")
+
+
+# ==================== 录制 ====================
+
+
+class EventRecorder:
+    """
+    事件录制器
+
+    :param directory: 录制文件目录，None 表示使用配置
+    :param segment_events: 单个分段的最大事件数，None 表示使用配置
+    :param redact: 需要脱敏的字段名，None 表示使用配置
+    :param include_raw: 是否录制平台原生数据，None 表示使用配置
+
+    :example:
+    >>> from ErisPulse.Core import recorder
+    >>> recorder.start()
+    >>> ...
+    >>> recorder.stop()
+    >>> # 或单独创建
+    >>> rec = EventRecorder("recordings/today", redact=["user_id", "user_name"])
+    >>> rec.start(sdk.adapter)
+    """
+
+    def __init__(
+        self,
+        directory: str | None = None,
+        segment_events: int | None = None,
+        redact: Iterable[str] | None = None,
+        include_raw: bool | None = None,
+    ):
+        from ..runtime import get_recorder_config
+
+        recorder_config = get_recorder_config()
+        self.enabled: bool = recorder_config.get("enabled", False)
+        self.directory: str = directory or recorder_config.get("directory", "recordings")
+        self.segment_events: int = segment_events or recorder_config.get("segment_events", 10000)
+        self.redact: frozenset[str] = frozenset(
+            redact if redact is not None else recorder_config.get("redact", [])
+        )
+        self.include_raw: bool = (
+            include_raw if include_raw is not None else recorder_config.get("include_raw", False)
+        )
+
+        self._adapters: Any = None
+        self._file: Any = None
+        self._segment = 0
+        self._segment_count = 0
+        self._prefix = ""
+        self._started_at = 0.0
+        self.recorded = 0
+        self.segments: list[str] = []
+
+    @property
+    def is_recording(self) -> bool:
+        """
+        是否正在录制
+        """
+        return self._adapters is not None
+
+    def start(self, adapter_manager: Any = None) -> None:
+        """
+        开始录制：将录制中间件挂载到中间件链最前端
+
+        :param adapter_manager: 适配器管理器（默认全局 adapter）
+        """
+        if self.is_recording:
+            return
+        if adapter_manager is None:
+            from .adapter import adapter as adapter_manager
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._prefix = time.strftime("events-%Y%m%d-%H%M%S")
+        self._segment = 0
+        self._segment_count = 0
+        self._started_at = time.monotonic()
+        self.recorded = 0
+        self.segments = []
+        self._adapters = adapter_manager
+        adapter_manager._onebot_middlewares.insert(0, self.middleware)
+        logger.info(f"事件录制已开始: {self.directory}")
+
+    def stop(self) -> None:
+        """
+        停止录制并关闭当前分段文件
+        """
+        if self._adapters is not None:
+            try:
+                self._adapters._onebot_middlewares.remove(self.middleware)
+            except ValueError:
+                pass
+            self._adapters = None
+            logger.info(f"事件录制已停止，共录制 {self.recorded} 个事件")
+        self._close_segment()
+
+    async def middleware(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        录制中间件：写入事件后原样返回
+
+        :param data: 事件数据
+        :return: 原事件数据
+        """
+        try:
+            self.write(data)
+        except Exception as e:
+            logger.warning(f"事件录制失败: {e}")
+        return data
+
+    def write(self, event: dict[str, Any]) -> None:
+        """
+        写入一个事件
+
+        :param event: 事件数据
+        """
+        platform = event.get("platform")
+        raw_key = f"{platform}_raw"
+        if not self.include_raw:
+            event = {
+                key: value
+                for key, value in event.items()
+                if key not in (raw_key, f"{platform}_raw_type")
+            }
+        elif raw_key in event:
+            event = dict(event)
+            event[raw_key] = resolve_raw(event[raw_key])
+        if self.redact:
+            event = _redact(event, self.redact)
+
+        if self._file is None or self._segment_count >= self.segment_events:
+            self._open_segment()
+
+        record = {"t": round(time.monotonic() - self._started_at, 6), "event": event}
+        self._file.write(json.dumps(record, ensure_ascii=False, default=repr) + "\n")
+        self._segment_count += 1
+        self.recorded += 1
+
+    def _open_segment(self) -> None:
+        """
+        {!--< internal-use >!--}
+        关闭当前分段并打开下一个分段文件
+        """
+        self._close_segment()
+        self._segment += 1
+        path = os.path.join(self.directory, f"{self._prefix}-{self._segment:04d}{SEGMENT_SUFFIX}")
+        self._file = gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+        self._segment_count = 0
+        self.segments.append(path)
+
+    def _close_segment(self) -> None:
+        """
+        {!--< internal-use >!--}
+        关闭当前分段文件
+        """
+        file, self._file = self._file, None
+        if file is not None:
+            file.close()
+
+
+# ==================== 回放 ====================
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    回放桩适配器
+
+    接收模块的发送与 API 调用并记录，立即返回成功响应
+    """
+
+    class Send(SendDSL):
+        def _capture(self, method: str, content: Any) -> asyncio.Task:
+            self._adapter.sent.append({
+                "method": method,
+                "target_type": self._target_type,
+                "target_id": self._target_id,
+                "content": content,
+            })
+            return asyncio.create_task(self._adapter._respond())
+
+        def Text(self, text: str, **kwargs):
+            return self._capture("Text", text)
+
+        def Image(self, file: Any, **kwargs):
+            return self._capture("Image", file)
+
+        def Voice(self, file: Any, **kwargs):
+            return self._capture("Voice", file)
+
+        def Video(self, file: Any, **kwargs):
+            return self._capture("Video", file)
+
+        def File(self, file: Any, **kwargs):
+            return self._capture("File", file)
+
+        def Markdown(self, text: str, **kwargs):
+            return self._capture("Markdown", text)
+
+        def Raw_ob12(self, message, **kwargs):
+            return self._capture("Raw_ob12", message)
+
+        def At(self, user_id: str | None = None, **kwargs):
+            return self
+
+        def AtAll(self, **kwargs):
+            return self
+
+        def Reply(self, message_id: str | None = None, **kwargs):
+            return self
+
+    def __init__(self):
+        super().__init__()
+        self.sent: list[dict[str, Any]] = []
+        self.api_calls: list[tuple[str, dict[str, Any]]] = []
+
+    async def _respond(self) -> dict[str, Any]:
+        return {
+            "status": "ok",
+            "retcode": 0,
+            "data": None,
+            "message_id": f"replay-{len(self.sent)}",
+            "message": "",
+        }
+
+    async def call_api(self, endpoint: str, **params: Any) -> Any:
+        self.api_calls.append((endpoint, params))
+        return {"status": "ok", "retcode": 0, "data": None, "message_id": "", "message": ""}
+
+    async def start(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+
+def parse_speed(value: str | float) -> float | None:
+    """
+    解析回放速度
+
+    :param value: "max" 或倍速（如 "10x" / "0.5" / 10）
+    :return: 倍速，None 表示不等待、尽可能快
+    :raises ValueError: 格式无效
+    """
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text == "max":
+            return None
+        value = text.removesuffix("x")
+    try:
+        speed = float(value)
+    except ValueError:
+        raise ValueError(f"回放速度必须是 max 或倍速（如 10x），收到: {value!r}") from None
+    if speed <= 0:
+        raise ValueError("回放速度必须大于 0")
+    return speed
+
+
+class EventReplayer:
+    """
+    事件回放器
+
+    :param records: 录制记录（read_recording() 的结果）
+    :param speed: 回放速度，"max" 或倍速（如 "10x"）
+    :param platform: 将事件平台改写为此平台，None 表示保持录制时的平台
+    :param concurrency: max 速度下的最大并发事件数
+    :param adapter_manager: 适配器管理器（默认全局 adapter）
+
+    :example:
+    >>> replayer = EventReplayer(read_recording("recordings"), speed="10x", platform="mock")
+    >>> report = await replayer.run()
+    >>> report["throughput"], report["latency_ms"]["p99"]
+    """
+
+    def __init__(
+        self,
+        records: Iterable[dict[str, Any]],
+        speed: str | float = "max",
+        platform: str | None = None,
+        concurrency: int = 64,
+        adapter_manager: Any = None,
+    ):
+        if adapter_manager is None:
+            from .adapter import adapter as adapter_manager
+
+        self.records = list(records)
+        self.speed = parse_speed(speed)
+        self.platform = platform
+        self.concurrency = concurrency
+        self._adapters = adapter_manager
+        self.stubs: dict[str, ReplayAdapter] = {}
+        self._latencies: list[float] = []
+        self._errors = 0
+
+    def _prepare(self, event: dict[str, Any]) -> dict[str, Any]:
+        """
+        {!--< internal-use >!--}
+        改写事件平台
+        """
+        if self.platform is None or event.get("platform") == self.platform:
+            return event
+        old = event.get("platform")
+        event = {
+            (f"{self.platform}{key[len(old):]}" if old and key.startswith(f"{old}_raw") else key): value
+            for key, value in event.items()
+        }
+        event["platform"] = self.platform
+        if isinstance(event.get("self"), dict) and "platform" in event["self"]:
+            event["self"] = dict(event["self"], platform=self.platform)
+        return event
+
+    def _install_stubs(self, events: list[dict[str, Any]]) -> dict[str, BaseAdapter | None]:
+        """
+        {!--< internal-use >!--}
+        为事件涉及的平台安装桩适配器，返回被替换的原适配器
+        """
+        replaced = {}
+        for platform in {event.get("platform", "unknown") for event in events}:
+            replaced[platform] = self._adapters._adapters.get(platform)
+            stub = ReplayAdapter()
+            self.stubs[platform] = stub
+            self._adapters._adapters[platform] = stub
+            self._adapters._started_instances.add(stub)
+        return replaced
+
+    def _restore(self, replaced: dict[str, BaseAdapter | None]) -> None:
+        """
+        {!--< internal-use >!--}
+        移除桩适配器并恢复原适配器
+        """
+        for platform, original in replaced.items():
+            self._adapters._started_instances.discard(self.stubs[platform])
+            if original is None:
+                self._adapters._adapters.pop(platform, None)
+            else:
+                self._adapters._adapters[platform] = original
+
+    async def _emit(self, event: dict[str, Any]) -> None:
+        """
+        {!--< internal-use >!--}
+        提交单个事件并记录端到端耗时
+        """
+        start = time.perf_counter()
+        try:
+            await self._adapters.emit(event)
+        except Exception as e:
+            self._errors += 1
+            logger.error(f"回放事件 {event.get('id')} 处理失败: {e}")
+        finally:
+            self._latencies.append(time.perf_counter() - start)
+
+    async def run(self) -> dict[str, Any]:
+        """
+        执行回放
+
+        :return: 回放报告，包含事件数、耗时、吞吐量、延迟百分位与发送统计
+        """
+        events = [self._prepare(record["event"]) for record in self.records]
+        offsets = [record.get("t", 0.0) for record in self.records]
+        self._latencies = []
+        self._errors = 0
+        replaced = self._install_stubs(events)
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            if self.speed is None:
+                semaphore = asyncio.Semaphore(self.concurrency)
+
+                async def _bounded(event):
+                    async with semaphore:
+                        await self._emit(event)
+
+                await asyncio.gather(*(_bounded(event) for event in events))
+            else:
+                tasks = []
+                base = offsets[0] if offsets else 0.0
+                begin = loop.time()
+                for event, offset in zip(events, offsets):
+                    delay = begin + (offset - base) / self.speed - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    tasks.append(asyncio.create_task(self._emit(event)))
+                await asyncio.gather(*tasks)
+        finally:
+            duration = time.perf_counter() - start
+            self._restore(replaced)
+
+        return self._report(duration)
+
+    def _report(self, duration: float) -> dict[str, Any]:
+        """
+        {!--< internal-use >!--}
+        生成回放报告
+        """
+        ordered = sorted(self._latencies)
+        count = len(ordered)
+        return {
+            "events": count,
+            "errors": self._errors,
+            "speed": "max" if self.speed is None else f"{self.speed:g}x",
+            "duration_s": round(duration, 3),
+            "throughput": round(count / duration, 1) if duration > 0 else 0.0,
+            "latency_ms": {
+                "avg": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+                "p50": round(percentile(ordered, 50) * 1000, 3),
+                "p95": round(percentile(ordered, 95) * 1000, 3),
+                "p99": round(percentile(ordered, 99) * 1000, 3),
+                "max": round((ordered[-1] if ordered else 0.0) * 1000, 3),
+            },
+            "sends": sum(len(stub.sent) for stub in self.stubs.values()),
+            "api_calls": sum(len(stub.api_calls) for stub in self.stubs.values()),
+        }
+
+
+recorder: EventRecorder = EventRecorder()
+
+__all__ = [
+    "EventRecorder",
+    "EventReplayer",
+    "ReplayAdapter",
+    "read_recording",
+    "parse_speed",
+    "recorder",
+]
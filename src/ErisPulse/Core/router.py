@@ -98,18 +98,25 @@ class RouterManager:
         """
 
         @self.app.get("/health")
-        async def health_check() -> dict[str, str]:
+        async def health_check() -> dict[str, Any]:
             """
             健康检查端点
 
             :return:
-                dict[str, str]: 包含服务状态和版本信息的字典
+                dict[str, Any]: 包含服务状态、版本信息与事件循环延迟的字典
             """
+            from .monitor import loop_monitor
+
+            loop_stats = loop_monitor.get_stats()
             return {
                 "status": "ok",
                 "service": "ErisPulse Router",
                 "version": ERISPULSE_VERSION,
                 "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
+                "loop": {
+                    key: loop_stats[key]
+                    for key in ("running", "lag_ms", "p50_ms", "p99_ms", "max_ms")
+                },
             }
 
         @self.app.get("/ping")
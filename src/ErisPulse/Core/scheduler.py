@@ -0,0 +1,925 @@
+"""
+ErisPulse 任务调度器
+
+为模块提供 cron、固定间隔与一次性任务，替代每个提醒一个 asyncio.sleep 任务的写法
+
+{!--< tips >!--}
+1. 所有任务保存在一个最小堆中，由单个调度协程按最近的执行时间休眠，任务数量不影响协程数量
+2. persistent=True 的任务写入存储表，sdk.restart() 或进程重启后自动恢复，
+   持久化任务的函数需通过 scheduler.task 注册名称，或是可导入的模块级函数，参数需可 JSON 序列化
+3. 错过执行时间（超过 misfire_grace）时按 misfire 策略处理：run_once / skip / run_all
+4. 同时执行的任务数受 max_concurrency 限制，单个任务的并行实例数受 max_instances 限制
+5. 由 sdk.run() 启动，sdk.uninit() 时停止并等待正在执行的任务
+{!--< /tips >!--}
+"""
+
+import asyncio
+import functools
+import heapq
+import importlib
+import inspect
+import itertools
+import json
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from .executor import executor
+from .logger import logger
+
+TRIGGERS = ("cron", "interval", "once")
+MISFIRE_POLICIES = ("run_once", "skip", "run_all")
+
+# 调度协程的最长休眠时间，用于容忍系统时钟调整
+_MAX_SLEEP = 60.0
+
+
+# ==================== Cron 表达式 ====================
+
+_CRON_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+_MONTH_NAMES = {
+    name: index + 1
+    for index, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+    )
+}
+_DAY_NAMES = {name: index for index, name in enumerate(("sun", "mon", "tue", "wed", "thu", "fri", "sat"))}
+
+
+def _parse_cron_field(text: str, low: int, high: int, names: dict[str, int]) -> set[int]:
+    """
+    {!--< internal-use >!--}
+    解析 cron 表达式的单个字段
+    """
+
+    def value(token: str) -> int:
+        return names[token] if token in names else int(token)
+
+    values: set[int] = set()
+    for part in text.lower().split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"cron 步长必须大于 0: {text}")
+        if part in ("*", "?"):
+            start, end = low, high
+        elif "-" in part:
+            first, last = part.split("-", 1)
+            start, end = value(first), value(last)
+        else:
+            start = value(part)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"cron 字段超出范围 [{low}, {high}]: {text}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronExpression:
+    """
+    五段式 cron 表达式（分 时 日 月 周）
+
+    支持 * / , - 语法、月份与星期英文缩写，以及 @daily / @hourly 等别名；
+    日与周同时限定时满足其一即可（与 crontab 一致），时间按本地时区计算
+
+    :param expression: cron 表达式
+
+    :example:
+    >>> CronExpression("30 9 * * mon-fri").next_after(datetime(2024, 1, 6))
+    datetime.datetime(2024, 1, 8, 9, 30)
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = _CRON_ALIASES.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 表达式需要 5 个字段（分 时 日 月 周）: {expression!r}")
+        try:
+            self.minutes = _parse_cron_field(fields[0], 0, 59, {})
+            self.hours = _parse_cron_field(fields[1], 0, 23, {})
+            self.days = _parse_cron_field(fields[2], 1, 31, {})
+            self.months = _parse_cron_field(fields[3], 1, 12, _MONTH_NAMES)
+            self.weekdays = {day % 7 for day in _parse_cron_field(fields[4], 0, 7, _DAY_NAMES)}
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"无效的 cron 表达式 {expression!r}: {e}") from None
+        self._day_any = fields[2] in ("*", "?")
+        self._weekday_any = fields[4] in ("*", "?")
+
+    def _day_matches(self, moment: datetime) -> bool:
+        """
+        {!--< internal-use >!--}
+        日期是否匹配日/周字段
+        """
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._day_any:
+            return weekday_ok
+        if self._weekday_any:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        计算给定时间之后的下一次执行时间
+
+        :param moment: 起始时间（不含）
+        :return: 下一次执行时间
+        :raises ValueError: 五年内没有匹配的时间
+        """
+        current = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = current.year + 5
+        while current.year <= limit:
+            if current.month not in self.months:
+                year, month = divmod(current.month, 12)
+                current = current.replace(year=current.year + year, month=month + 1, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(current):
+                current = (current + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if current.hour not in self.hours:
+                current = (current + timedelta(hours=1)).replace(minute=0)
+                continue
+            if current.minute not in self.minutes:
+                current += timedelta(minutes=1)
+                continue
+            return current
+        raise ValueError(f"cron 表达式 {self.expression!r} 没有可执行的时间")
+
+
+# ==================== 任务 ====================
+
+
+class Job:
+    """
+    调度任务
+
+    由 Scheduler 创建，请勿直接实例化
+    """
+
+    __slots__ = (
+        "id", "func", "func_ref", "trigger", "spec", "args", "kwargs", "persistent",
+        "misfire", "misfire_grace", "max_instances", "next_run", "created_at",
+        "running", "runs", "last_run", "last_error", "version", "_cron",
+    )
+
+    def __init__(
+        self,
+        job_id: str,
+        func: Callable | None,
+        func_ref: str,
+        trigger: str,
+        spec: dict[str, Any],
+        args: tuple = (),
+        kwargs: dict[str, Any] | None = None,
+        persistent: bool = False,
+        misfire: str = "run_once",
+        misfire_grace: float | None = None,
+        max_instances: int = 1,
+    ):
+        self.id = job_id
+        self.func = func
+        self.func_ref = func_ref
+        self.trigger = trigger
+        self.spec = spec
+        self.args = tuple(args)
+        self.kwargs = dict(kwargs or {})
+        self.persistent = persistent
+        self.misfire = misfire
+        self.misfire_grace = misfire_grace
+        self.max_instances = max_instances
+        self.next_run: float | None = None
+        self.created_at = time.time()
+        self.running = 0
+        self.runs = 0
+        self.last_run: float | None = None
+        self.last_error: str | None = None
+        self.version = 0
+        self._cron = CronExpression(spec["cron"]) if trigger == "cron" else None
+
+    def next_fire_after(self, moment: float) -> float | None:
+        """
+        计算给定时间之后的下一次执行时间
+
+        :param moment: 起始时间戳（不含）
+        :return: 下一次执行时间戳，一次性任务返回 None
+        """
+        if self.trigger == "interval":
+            seconds = self.spec["seconds"]
+            base = self.next_run if self.next_run is not None else moment
+            if base > moment:
+                return base
+            return base + (int((moment - base) // seconds) + 1) * seconds
+        if self.trigger == "cron":
+            return self._cron.next_after(datetime.fromtimestamp(moment)).timestamp()
+        return None
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        转换为字典
+
+        :return: 任务信息
+        """
+        return {
+            "id": self.id,
+            "func": self.func_ref,
+            "trigger": self.trigger,
+            **self.spec,
+            "persistent": self.persistent,
+            "misfire": self.misfire,
+            "max_instances": self.max_instances,
+            "next_run": self.next_run,
+            "running": self.running,
+            "runs": self.runs,
+            "last_run": self.last_run,
+            "last_error": self.last_error,
+        }
+
+    def __repr__(self) -> str:
+        return f"Job(id={self.id!r}, trigger={self.trigger!r}, next_run={self.next_run!r})"
+
+
+# ==================== 调度器 ====================
+
+
+class Scheduler:
+    """
+    任务调度器
+
+    :param storage: 持久化任务使用的存储（默认全局 storage）
+
+    :example:
+    >>> from ErisPulse import sdk
+    >>>
+    >>> @sdk.scheduler.cron("0 9 * * *", job_id="daily_report", persistent=True)
+    >>> async def daily_report():
+    >>>     await sdk.adapter.qq.Send.To("group", "123").Text("早上好")
+    >>>
+    >>> @sdk.scheduler.task("remind")
+    >>> async def remind(platform, user_id, text):
+    >>>     await sdk.adapter.get(platform).Send.To("user", user_id).Text(text)
+    >>>
+    >>> sdk.scheduler.once("remind", delay=600, args=("qq", "10001", "该喝水了"), persistent=True)
+    """
+
+    def __init__(self, storage: Any = None):
+        from ..runtime import get_scheduler_config
+
+        scheduler_config = get_scheduler_config()
+        self.enabled: bool = scheduler_config.get("enabled", True)
+        self.table: str = scheduler_config.get("table", "erispulse_scheduler_jobs")
+        self.max_concurrency: int = scheduler_config.get("max_concurrency", 32)
+        self.misfire: str = scheduler_config.get("misfire", "run_once")
+        self.misfire_grace: float = scheduler_config.get("misfire_grace", 60)
+        self.max_catchup: int = scheduler_config.get("max_catchup", 100)
+        self.shutdown_timeout: float = scheduler_config.get("shutdown_timeout", 5.0)
+        if self.misfire not in MISFIRE_POLICIES:
+            logger.warning(f"未知的错过执行策略: {self.misfire}，已回退到 run_once")
+            self.misfire = "run_once"
+
+        self._storage = storage
+        self._table_ready = False
+        self._jobs: dict[str, Job] = {}
+        # 最小堆：(执行时间, 序号, 任务ID, 任务版本)，任务重新调度或移除后旧条目按版本失效
+        self._heap: list[tuple[float, int, str, int]] = []
+        self._seq = itertools.count()
+        self._tasks: dict[str, Callable] = {}
+        self._task_names: dict[Callable, str] = {}
+
+        self._runner: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._running: set[asyncio.Task] = set()
+        self._stats = {"fired": 0, "succeeded": 0, "failed": 0, "skipped": 0, "misfired": 0}
+
+    # ==================== 注册 ====================
+
+    def task(self, name: str | None = None) -> Callable:
+        """
+        注册可被持久化任务按名称引用的函数
+
+        :param name: 任务名称，默认使用函数名
+        :return: 装饰器
+        """
+
+        def decorator(func: Callable) -> Callable:
+            self.register_task(name or func.__name__, func)
+            return func
+
+        return decorator
+
+    def register_task(self, name: str, func: Callable) -> None:
+        """
+        注册可被持久化任务按名称引用的函数
+
+        :param name: 任务名称
+        :param func: 任务函数（同步或协程函数）
+        """
+        self._tasks[name] = func
+        self._task_names[func] = name
+
+    def add_job(
+        self,
+        func: Callable | str,
+        trigger: str,
+        *,
+        cron: str | None = None,
+        seconds: float | None = None,
+        run_at: float | datetime | None = None,
+        delay: float | None = None,
+        job_id: str | None = None,
+        args: tuple | list = (),
+        kwargs: dict[str, Any] | None = None,
+        persistent: bool = False,
+        misfire: str | None = None,
+        misfire_grace: float | None = None,
+        max_instances: int = 1,
+        replace: bool = False,
+    ) -> Job:
+        """
+        添加任务
+
+        :param func: 任务函数，或通过 scheduler.task 注册的任务名称
+        :param trigger: 触发方式：cron / interval / once
+        :param cron: cron 表达式（trigger="cron"）
+        :param seconds: 执行间隔秒数（trigger="interval"）
+        :param run_at: 执行时间，时间戳或 datetime（trigger="once"，interval 的首次执行时间）
+        :param delay: 距现在的延迟秒数（trigger="once"，interval 的首次执行延迟）
+        :param job_id: 任务ID，默认随机生成
+        :param args: 位置参数
+        :param kwargs: 关键字参数
+        :param persistent: 是否持久化到存储，重启后恢复
+        :param misfire: 错过执行时间的策略，None 表示使用配置
+        :param misfire_grace: 视为按时执行的最大延迟秒数，None 表示使用配置
+        :param max_instances: 同一任务同时执行的最大实例数
+        :param replace: 任务ID已存在时是否替换
+        :return: 任务对象
+        :raises ValueError: 参数无效、任务ID已存在或持久化任务无法引用
+        """
+        if trigger not in TRIGGERS:
+            raise ValueError(f"未知的触发方式: {trigger}，可用: {', '.join(TRIGGERS)}")
+        misfire = misfire or self.misfire
+        if misfire not in MISFIRE_POLICIES:
+            raise ValueError(f"未知的错过执行策略: {misfire}，可用: {', '.join(MISFIRE_POLICIES)}")
+        if max_instances < 1:
+            raise ValueError("max_instances 必须大于 0")
+
+        job_id = job_id or uuid.uuid4().hex
+        if job_id in self._jobs and not replace:
+            raise ValueError(f"任务 {job_id} 已存在")
+
+        if isinstance(run_at, datetime):
+            run_at = run_at.timestamp()
+        if delay is not None:
+            run_at = time.time() + delay
+
+        if trigger == "cron":
+            if not cron:
+                raise ValueError("cron 任务需要 cron 表达式")
+            spec: dict[str, Any] = {"cron": cron}
+        elif trigger == "interval":
+            if not seconds or seconds <= 0:
+                raise ValueError("interval 任务需要大于 0 的 seconds")
+            spec = {"seconds": float(seconds)}
+        else:
+            if run_at is None:
+                raise ValueError("once 任务需要 run_at 或 delay")
+            spec = {}
+
+        if isinstance(func, str):
+            job_func, func_ref = None, func
+        else:
+            job_func, func_ref = func, self._func_ref(func, required=persistent)
+
+        job = Job(
+            job_id, job_func, func_ref, trigger, spec, args, kwargs,
+            persistent, misfire, misfire_grace, max_instances,
+        )
+
+        now = time.time()
+        if trigger == "once":
+            next_run = run_at
+        elif trigger == "interval":
+            next_run = run_at if run_at is not None else now + spec["seconds"]
+        else:
+            next_run = job.next_fire_after(now)
+
+        if persistent:
+            try:
+                json.dumps([job.args, job.kwargs])
+            except TypeError:
+                raise ValueError("持久化任务的参数必须可以 JSON 序列化") from None
+            # 重启后重新注册同一任务时沿用存储中的执行时间，停机期间错过的执行按 misfire 策略处理
+            stored = self._load_row(job_id)
+            if stored is not None and (stored["trigger"], stored["spec"]) == (trigger, spec):
+                next_run = stored["next_run"]
+
+        if job_id in self._jobs:
+            self._jobs.pop(job_id).version += 1
+        self._jobs[job_id] = job
+        self._schedule(job, next_run)
+        if persistent:
+            self._save(job)
+        return job
+
+    def cron(self, expression: str, **options: Any) -> Callable:
+        """
+        以装饰器方式添加 cron 任务
+
+        :param expression: cron 表达式（分 时 日 月 周）
+        :param options: 其他 add_job 参数
+        :return: 装饰器
+        """
+
+        def decorator(func: Callable) -> Callable:
+            options.setdefault("job_id", f"{func.__module__}.{func.__qualname__}")
+            self.add_job(func, "cron", cron=expression, **options)
+            return func
+
+        return decorator
+
+    def interval(self, seconds: float, **options: Any) -> Callable:
+        """
+        以装饰器方式添加固定间隔任务
+
+        :param seconds: 执行间隔秒数
+        :param options: 其他 add_job 参数
+        :return: 装饰器
+        """
+
+        def decorator(func: Callable) -> Callable:
+            options.setdefault("job_id", f"{func.__module__}.{func.__qualname__}")
+            self.add_job(func, "interval", seconds=seconds, **options)
+            return func
+
+        return decorator
+
+    def once(
+        self,
+        func: Callable | str,
+        *,
+        run_at: float | datetime | None = None,
+        delay: float | None = None,
+        **options: Any,
+    ) -> Job:
+        """
+        添加一次性任务（如提醒）
+
+        :param func: 任务函数或已注册的任务名称
+        :param run_at: 执行时间，时间戳或 datetime
+        :param delay: 距现在的延迟秒数
+        :param options: 其他 add_job 参数
+        :return: 任务对象
+        """
+        return self.add_job(func, "once", run_at=run_at, delay=delay, **options)
+
+    def remove_job(self, job_id: str) -> bool:
+        """
+        移除任务（持久化任务同时从存储删除）
+
+        :param job_id: 任务ID
+        :return: 是否存在并已移除
+        """
+        job = self._jobs.pop(job_id, None)
+        if job is not None:
+            job.version += 1
+        removed = self._delete(job_id) if job is None or job.persistent else False
+        return job is not None or removed
+
+    def get_job(self, job_id: str) -> Job | None:
+        """
+        获取任务
+
+        :param job_id: 任务ID
+        :return: 任务对象，不存在时返回 None
+        """
+        return self._jobs.get(job_id)
+
+    def get_jobs(self) -> list[dict[str, Any]]:
+        """
+        获取所有任务，按下一次执行时间排序
+
+        :return: 任务信息列表
+        """
+        jobs = sorted(self._jobs.values(), key=lambda job: job.next_run or float("inf"))
+        return [job.to_dict() for job in jobs]
+
+    def _func_ref(self, func: Callable, required: bool) -> str:
+        """
+        {!--< internal-use >!--}
+        生成任务函数的持久化引用
+        """
+        name = self._task_names.get(func)
+        if name is not None:
+            return name
+        module = getattr(func, "__module__", None)
+        qualname = getattr(func, "__qualname__", "")
+        if module and qualname and "<" not in qualname and not inspect.ismethod(func):
+            return f"{module}:{qualname}"
+        if required:
+            raise ValueError(
+                f"持久化任务的函数 {qualname or func!r} 无法在重启后找到，"
+                "请使用 scheduler.task 注册名称，或使用模块级函数"
+            )
+        return qualname or repr(func)
+
+    def _resolve(self, job: Job) -> Callable | None:
+        """
+        {!--< internal-use >!--}
+        获取任务函数：优先使用已注册的名称，其次导入模块级函数
+        """
+        if job.func is not None:
+            return job.func
+        func = self._tasks.get(job.func_ref)
+        if func is not None or ":" not in job.func_ref:
+            return func
+        module_name, qualname = job.func_ref.split(":", 1)
+        try:
+            func = importlib.import_module(module_name)
+            for attr in qualname.split("."):
+                func = getattr(func, attr)
+        except (ImportError, AttributeError):
+            return None
+        return func
+
+    # ==================== 调度 ====================
+
+    def _schedule(self, job: Job, next_run: float | None) -> None:
+        """
+        {!--< internal-use >!--}
+        设置任务的下一次执行时间并加入堆
+        """
+        job.next_run = next_run
+        job.version += 1
+        if next_run is None:
+            return
+        heapq.heappush(self._heap, (next_run, next(self._seq), job.id, job.version))
+        if self._wakeup is not None and self._heap[0][2] == job.id:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        """
+        {!--< internal-use >!--}
+        调度协程：执行到期任务后休眠到下一个任务的执行时间
+        """
+        while True:
+            self._fire_due(time.time())
+            delay = _MAX_SLEEP
+            if self._heap:
+                delay = min(max(self._heap[0][0] - time.time(), 0), _MAX_SLEEP)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire_due(self, now: float) -> None:
+        """
+        {!--< internal-use >!--}
+        执行所有到期的任务
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, job_id, version = heapq.heappop(heap)
+            job = self._jobs.get(job_id)
+            if job is None or job.version != version:
+                continue
+            self._fire(job, now)
+
+    def _fire(self, job: Job, now: float) -> None:
+        """
+        {!--< internal-use >!--}
+        按错过执行策略执行任务并计算下一次执行时间
+        """
+        scheduled = job.next_run
+        runs = 1
+        grace = job.misfire_grace if job.misfire_grace is not None else self.misfire_grace
+        if now - scheduled > grace:
+            self._stats["misfired"] += 1
+            if job.misfire == "skip":
+                runs = 0
+            elif job.misfire == "run_all":
+                runs = min(self._missed_count(job, scheduled, now), self.max_catchup)
+            logger.info(
+                f"定时任务 {job.id} 错过执行时间 {now - scheduled:.0f}s，按 {job.misfire} 策略执行 {runs} 次"
+            )
+
+        func = self._resolve(job)
+        if func is None:
+            logger.warning(f"定时任务 {job.id} 的函数 {job.func_ref} 未注册，本次不执行")
+            if job.trigger == "once":
+                # 保留存储中的记录，模块重新加载后仍可执行
+                self._jobs.pop(job.id, None)
+                return
+            runs = 0
+
+        if runs:
+            self._dispatch(job, func, runs)
+        else:
+            self._stats["skipped"] += 1
+
+        if job.trigger == "once":
+            self._jobs.pop(job.id, None)
+            if job.persistent:
+                self._delete(job.id)
+            return
+
+        self._schedule(job, job.next_fire_after(max(now, scheduled)))
+        if job.persistent:
+            self._update_next_run(job)
+
+    def _missed_count(self, job: Job, scheduled: float, now: float) -> int:
+        """
+        {!--< internal-use >!--}
+        计算从 scheduled 到 now 之间错过的执行次数
+        """
+        if job.trigger == "interval":
+            return int((now - scheduled) // job.spec["seconds"]) + 1
+        if job.trigger == "cron":
+            count, moment = 1, datetime.fromtimestamp(scheduled)
+            while count < self.max_catchup:
+                moment = job._cron.next_after(moment)
+                if moment.timestamp() > now:
+                    break
+                count += 1
+            return count
+        return 1
+
+    def _dispatch(self, job: Job, func: Callable, runs: int = 1) -> None:
+        """
+        {!--< internal-use >!--}
+        创建任务执行协程，runs 大于 1 时（run_all 补执行）在同一实例中依次执行
+        """
+        if job.running >= job.max_instances:
+            self._stats["skipped"] += runs
+            logger.debug(f"定时任务 {job.id} 仍在执行，跳过本次执行")
+            return
+        job.running += 1
+        task = asyncio.get_running_loop().create_task(
+            self._execute(job, func, runs), name=f"ErisPulse-job-{job.id}"
+        )
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _execute(self, job: Job, func: Callable, runs: int = 1) -> None:
+        """
+        {!--< internal-use >!--}
+        在并发限制内执行任务，依次执行 runs 次（单次失败不影响后续补执行）
+        """
+        call = functools.partial(func, **job.kwargs) if job.kwargs else func
+        try:
+            for _ in range(runs):
+                self._stats["fired"] += 1
+                try:
+                    async with self._semaphore:
+                        await executor.call(call, *job.args)
+                    job.runs += 1
+                    job.last_error = None
+                    self._stats["succeeded"] += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    job.last_error = f"{type(e).__name__}: {e}"
+                    self._stats["failed"] += 1
+                    logger.error(f"定时任务 {job.id} 执行失败: {e}")
+                finally:
+                    job.last_run = time.time()
+        finally:
+            job.running -= 1
+
+    # ==================== 启停 ====================
+
+    @property
+    def is_running(self) -> bool:
+        """
+        调度器是否在运行
+        """
+        return self._runner is not None and not self._runner.done()
+
+    def start(self) -> bool:
+        """
+        在当前事件循环中启动调度器，并恢复存储中的持久化任务
+
+        :return: 是否启动（已在运行时返回 False）
+        """
+        if self.is_running:
+            return False
+
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        restored = self._restore()
+        self._runner = asyncio.get_running_loop().create_task(
+            self._run(), name="ErisPulse-scheduler"
+        )
+        logger.info(f"任务调度器已启动 (任务: {len(self._jobs)}, 恢复: {restored})")
+        return True
+
+    async def stop(self, clear: bool = True) -> None:
+        """
+        停止调度器，等待正在执行的任务（超过 shutdown_timeout 后取消）
+
+        :param clear: 是否清空内存中的任务与任务名称注册（持久化任务保留在存储中，下次启动时恢复）
+        """
+        runner, self._runner = self._runner, None
+        if runner is not None and not runner.done():
+            runner.cancel()
+            try:
+                await runner
+            except asyncio.CancelledError:
+                pass
+
+        if self._running:
+            running = list(self._running)
+            _, pending = await asyncio.wait(running, timeout=self.shutdown_timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning(f"{len(pending)} 个定时任务在停止时仍未完成，已取消")
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        self._wakeup = None
+        if clear:
+            for job in self._jobs.values():
+                job.version += 1
+            self._jobs.clear()
+            self._heap.clear()
+            self._tasks.clear()
+            self._task_names.clear()
+
+    # ==================== 持久化 ====================
+
+    def _get_storage(self) -> Any:
+        """
+        {!--< internal-use >!--}
+        获取存储并确保任务表存在
+        """
+        if self._storage is None:
+            from .storage import storage
+
+            self._storage = storage
+        if not self._table_ready:
+            self._table_ready = self._storage.CreateTable(self.table, {
+                "id": "TEXT PRIMARY KEY",
+                "func": "TEXT NOT NULL",
+                "trigger_type": "TEXT NOT NULL",
+                "spec": "TEXT NOT NULL",
+                "args": "TEXT NOT NULL",
+                "kwargs": "TEXT NOT NULL",
+                "misfire": "TEXT NOT NULL",
+                "misfire_grace": "REAL",
+                "max_instances": "INTEGER NOT NULL",
+                "next_run": "REAL",
+                "created_at": "REAL NOT NULL",
+            })
+        return self._storage
+
+    _COLUMNS = (
+        "id", "func", "trigger_type", "spec", "args", "kwargs", "misfire",
+        "misfire_grace", "max_instances", "next_run", "created_at",
+    )
+
+    def _row_to_dict(self, row: tuple) -> dict[str, Any]:
+        """
+        {!--< internal-use >!--}
+        将存储行转换为字典
+        """
+        data = dict(zip(self._COLUMNS, row))
+        data["trigger"] = data.pop("trigger_type")
+        for key in ("spec", "args", "kwargs"):
+            data[key] = json.loads(data[key])
+        return data
+
+    def _load_row(self, job_id: str) -> dict[str, Any] | None:
+        """
+        {!--< internal-use >!--}
+        读取单个持久化任务
+        """
+        try:
+            row = self._get_storage().Table(self.table).Select(*self._COLUMNS).Where(
+                "id = ?", job_id
+            ).ExecuteOne()
+        except Exception as e:
+            logger.warning(f"读取持久化任务 {job_id} 失败: {e}")
+            return None
+        return self._row_to_dict(row) if row else None
+
+    def _save(self, job: Job) -> None:
+        """
+        {!--< internal-use >!--}
+        写入持久化任务
+        """
+        storage = self._get_storage()
+        try:
+            with storage.transaction():
+                storage.Table(self.table).Delete().Where("id = ?", job.id).Execute()
+                storage.Table(self.table).Insert({
+                    "id": job.id,
+                    "func": job.func_ref,
+                    "trigger_type": job.trigger,
+                    "spec": json.dumps(job.spec),
+                    "args": json.dumps(list(job.args), ensure_ascii=False),
+                    "kwargs": json.dumps(job.kwargs, ensure_ascii=False),
+                    "misfire": job.misfire,
+                    "misfire_grace": job.misfire_grace,
+                    "max_instances": job.max_instances,
+                    "next_run": job.next_run,
+                    "created_at": job.created_at,
+                }).Execute()
+        except Exception as e:
+            logger.error(f"保存持久化任务 {job.id} 失败: {e}")
+
+    def _update_next_run(self, job: Job) -> None:
+        """
+        {!--< internal-use >!--}
+        更新持久化任务的下一次执行时间
+        """
+        try:
+            self._get_storage().Table(self.table).Update({"next_run": job.next_run}).Where(
+                "id = ?", job.id
+            ).Execute()
+        except Exception as e:
+            logger.error(f"更新持久化任务 {job.id} 失败: {e}")
+
+    def _delete(self, job_id: str) -> bool:
+        """
+        {!--< internal-use >!--}
+        删除持久化任务
+        """
+        try:
+            return bool(
+                self._get_storage().Table(self.table).Delete().Where("id = ?", job_id).Execute()
+            )
+        except Exception as e:
+            logger.error(f"删除持久化任务 {job_id} 失败: {e}")
+            return False
+
+    def _restore(self) -> int:
+        """
+        {!--< internal-use >!--}
+        恢复存储中尚未注册的持久化任务
+
+        :return: 恢复的任务数
+        """
+        try:
+            rows = self._get_storage().Table(self.table).Select(*self._COLUMNS).Execute()
+        except Exception as e:
+            logger.error(f"读取持久化任务失败: {e}")
+            return 0
+
+        restored = 0
+        for row in rows:
+            data = self._row_to_dict(row)
+            if data["id"] in self._jobs:
+                continue
+            try:
+                job = Job(
+                    data["id"], None, data["func"], data["trigger"], data["spec"],
+                    data["args"], data["kwargs"], True, data["misfire"],
+                    data["misfire_grace"], data["max_instances"],
+                )
+            except ValueError as e:
+                logger.warning(f"持久化任务 {data['id']} 无效，已跳过: {e}")
+                continue
+            job.created_at = data["created_at"]
+            self._jobs[job.id] = job
+            self._schedule(job, data["next_run"])
+            restored += 1
+        return restored
+
+    # ==================== 状态 ====================
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取调度器状态
+
+        :return: 运行状态、任务数与执行计数
+        """
+        return {
+            "running": self.is_running,
+            "jobs": len(self._jobs),
+            "persistent": sum(1 for job in self._jobs.values() if job.persistent),
+            "executing": len(self._running),
+            "max_concurrency": self.max_concurrency,
+            **self._stats,
+        }
+
+
+scheduler: Scheduler = Scheduler()
+
+__all__ = [
+    "CronExpression",
+    "Job",
+    "Scheduler",
+    "scheduler",
+]
@@ -0,0 +1,457 @@
+"""
+ErisPulse 事件追踪
+
+为单个事件记录从 adapter.emit 到中间件、处理器、命令、回复与平台 API 调用的完整耗时链路，
+用于定位慢回复的原因
+
+{!--< tips >!--}
+1. 追踪上下文在 adapter.emit 中按采样率创建，通过 contextvars 传递到处理器、命令与发送调用，
+   线程池与 asyncio.create_task 创建的任务会自动继承
+2. 未被采样的事件不创建任何 Span，开销仅为一次 ContextVar 读取
+3. Span 记录在有界的内存队列中，可导出为 JSONL 或 Chrome Trace（chrome://tracing / Perfetto）
+4. 采样率由配置 ErisPulse.tracing.sample_rate 决定，也可通过 tracer.configure() 运行时修改
+{!--< /tips >!--}
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import random
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Any
+from collections.abc import Awaitable, Callable
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "erispulse_current_span", default=None
+)
+
+# 未采样时返回的空上下文管理器
+_NOOP = nullcontext()
+
+
+def _qualname(value: Any) -> str:
+    """
+    {!--< internal-use >!--}
+    获取可调用对象的完整名称
+    """
+    func = getattr(value, "__func__", value)
+    module = getattr(func, "__module__", None) or "?"
+    return f"{module}.{getattr(func, '__qualname__', repr(func))}"
+
+
+class Span:
+    """
+    追踪片段
+
+    记录一段操作的开始时间、耗时与属性，属性中的可调用对象在导出时转换为完整名称
+    """
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "name", "category",
+        "start", "duration", "attrs", "error", "_t0",
+    )
+
+    def __init__(
+        self,
+        trace_id: str,
+        span_id: int,
+        parent_id: int | None,
+        name: str,
+        category: str,
+        attrs: dict[str, Any],
+    ):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.error: str | None = None
+        self.duration: float | None = None
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+
+    def set_error(self, error: BaseException) -> None:
+        """
+        记录 Span 内被捕获处理的异常
+
+        :param error: 异常
+        """
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        :return: 可 JSON 序列化的 Span 字典（时间单位为毫秒）
+        """
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "category": self.category,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "error": self.error,
+            "attrs": {
+                key: _qualname(value) if callable(value) else value
+                for key, value in self.attrs.items()
+            },
+        }
+
+
+class _SpanScope:
+    """
+    {!--< internal-use >!--}
+    Span 上下文管理器：进入时设为当前 Span，退出时记录耗时与异常
+    """
+
+    __slots__ = ("_tracer", "span", "_token")
+
+    def __init__(self, tracer: "Tracer", span: Span):
+        self._tracer = tracer
+        self.span = span
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current_span.reset(self._token)
+        self._tracer.finish_span(self.span, exc)
+
+
+class Tracer:
+    """
+    事件追踪器
+
+    :example:
+    >>> from ErisPulse.Core import tracer
+    >>> tracer.configure(sample_rate=0.1)
+    >>> with tracer.span("render", category="module", size=len(text)):
+    ...     image = await render(text)
+    >>> tracer.export("trace.json", format="chrome")
+    """
+
+    def __init__(self):
+        from ..runtime import get_tracing_config
+
+        tracing_config = get_tracing_config()
+        self.sample_rate: float = tracing_config.get("sample_rate", 0.0)
+        self.max_spans: int = tracing_config.get("max_spans", 10000)
+        self._spans: deque[Span] = deque(maxlen=self.max_spans)
+        self._ids = itertools.count(1)
+        self._sampled = 0
+
+    def configure(self, sample_rate: float | None = None, max_spans: int | None = None) -> None:
+        """
+        修改采样率或 Span 存储上限
+
+        :param sample_rate: 采样率（0~1），0 表示关闭
+        :param max_spans: 内存中保留的最大 Span 数量
+        :raises ValueError: 采样率不在 0~1 之间
+        """
+        if sample_rate is not None:
+            if not 0 <= sample_rate <= 1:
+                raise ValueError(f"采样率必须在 0~1 之间，收到: {sample_rate}")
+            self.sample_rate = sample_rate
+        if max_spans is not None:
+            self.max_spans = max_spans
+            self._spans = deque(self._spans, maxlen=max_spans)
+
+    # ==================== 记录 ====================
+
+    def trace(self, name: str, category: str = "event", **attrs: Any):
+        """
+        按采样率开始一次追踪
+
+        已处于追踪中时作为子 Span 记录；未被采样时返回空上下文管理器
+
+        :param name: 根 Span 名称
+        :param category: 分类
+        :param attrs: Span 属性
+        :return: 上下文管理器
+        """
+        if _current_span.get() is not None:
+            return self.span(name, category, **attrs)
+        rate = self.sample_rate
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return _NOOP
+        self._sampled += 1
+        trace_id = os.urandom(8).hex()
+        return _SpanScope(self, Span(trace_id, next(self._ids), None, name, category, attrs))
+
+    def span(self, name: str, category: str = "span", **attrs: Any):
+        """
+        在当前追踪中记录一个子 Span
+
+        当前不在追踪中时返回空上下文管理器
+
+        :param name: Span 名称
+        :param category: 分类
+        :param attrs: Span 属性（可调用对象在导出时转换为完整名称）
+        :return: 上下文管理器
+        """
+        if (parent := _current_span.get()) is None:
+            return _NOOP
+        return _SpanScope(
+            self,
+            Span(parent.trace_id, next(self._ids), parent.span_id, name, category, attrs),
+        )
+
+    def start_span(self, name: str, category: str = "span", **attrs: Any) -> Span | None:
+        """
+        手动开始一个子 Span（不改变当前 Span），需调用 finish_span() 结束
+
+        :param name: Span 名称
+        :param category: 分类
+        :param attrs: Span 属性
+        :return: Span 对象，当前不在追踪中时返回 None
+        """
+        if (parent := _current_span.get()) is None:
+            return None
+        return Span(parent.trace_id, next(self._ids), parent.span_id, name, category, attrs)
+
+    def finish_span(self, span: Span, error: BaseException | None = None) -> None:
+        """
+        结束 Span 并写入存储
+
+        :param span: Span 对象
+        :param error: 异常（可选）
+        """
+        span.duration = time.perf_counter() - span._t0
+        if error is not None:
+            span.set_error(error)
+        self._spans.append(span)
+
+    @staticmethod
+    def current_span() -> Span | None:
+        """
+        获取当前 Span
+
+        :return: 当前 Span，不在追踪中时返回 None
+        """
+        return _current_span.get()
+
+    # ==================== 查询与导出 ====================
+
+    def get_spans(self, trace_id: str | None = None) -> list[dict[str, Any]]:
+        """
+        获取已记录的 Span
+
+        :param trace_id: 只返回指定追踪的 Span
+        :return: Span 字典列表（按结束顺序）
+        """
+        return [
+            span.to_dict()
+            for span in list(self._spans)
+            if trace_id is None or span.trace_id == trace_id
+        ]
+
+    def get_traces(self, limit: int = 50) -> list[dict[str, Any]]:
+        """
+        获取最近的追踪摘要
+
+        :param limit: 最多返回的追踪数量
+        :return: 追踪摘要列表（最新在前），包含根 Span 名称、总耗时、Span 数量与最慢的子 Span
+        """
+        traces: dict[str, dict[str, Any]] = {}
+        for span in reversed(list(self._spans)):
+            item = traces.setdefault(
+                span.trace_id,
+                {"trace_id": span.trace_id, "name": None, "duration_ms": None,
+                 "spans": 0, "slowest": None},
+            )
+            item["spans"] += 1
+            duration_ms = round(span.duration * 1000, 3)
+            if span.parent_id is None:
+                item["name"] = span.name
+                item["duration_ms"] = duration_ms
+                item["attrs"] = span.to_dict()["attrs"]
+            elif item["slowest"] is None or duration_ms > item["slowest"]["duration_ms"]:
+                item["slowest"] = {
+                    "name": span.name,
+                    "category": span.category,
+                    "duration_ms": duration_ms,
+                }
+        return list(traces.values())[:limit]
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """
+        转换为 Chrome Trace 格式
+
+        每个追踪占用一条时间线（tid），可在 chrome://tracing 或 Perfetto 中打开
+
+        :return: Chrome Trace 字典
+        """
+        lanes: dict[str, int] = {}
+        events = []
+        for span in list(self._spans):
+            data = span.to_dict()
+            tid = lanes.setdefault(span.trace_id, len(lanes) + 1)
+            args = dict(data["attrs"], trace_id=span.trace_id)
+            if span.error:
+                args["error"] = span.error
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": int(span.start * 1_000_000),
+                "dur": int(span.duration * 1_000_000),
+                "pid": os.getpid(),
+                "tid": tid,
+                "args": args,
+            })
+        # 同一时刻开始的 Span 父级在前
+        events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: str, format: str = "jsonl") -> int:
+        """
+        导出已记录的 Span 到文件
+
+        :param path: 文件路径
+        :param format: 导出格式（jsonl / chrome）
+        :return: 导出的 Span 数量
+        :raises ValueError: 格式无效
+
+        :example:
+        >>> tracer.export("spans.jsonl")
+        >>> tracer.export("trace.json", format="chrome")
+        """
+        if format == "jsonl":
+            spans = self.get_spans()
+            with open(path, "w", encoding="utf-8") as f:
+                for span in spans:
+                    f.write(json.dumps(span, ensure_ascii=False, default=repr) + "\n")
+            return len(spans)
+        if format == "chrome":
+            data = self.to_chrome_trace()
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, default=repr)
+            return len(data["traceEvents"])
+        raise ValueError(f"导出格式必须是 jsonl 或 chrome，收到: {format!r}")
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        获取追踪器状态
+
+        :return: 采样率、已采样事件数与当前存储的 Span 数量
+        """
+        return {
+            "sample_rate": self.sample_rate,
+            "sampled": self._sampled,
+            "spans": len(self._spans),
+            "max_spans": self.max_spans,
+        }
+
+    def clear(self) -> None:
+        """
+        清空已记录的 Span
+        """
+        self._spans.clear()
+        self._sampled = 0
+
+
+tracer: Tracer = Tracer()
+
+
+# ==================== 发送与 API 调用插桩 ====================
+
+
+def trace_send_method(func: Callable, method: str) -> Callable:
+    """
+    {!--< internal-use >!--}
+    包装 SendDSL 的发送方法：追踪中调用时记录从调用到发送任务完成的 Span
+
+    修饰方法（返回 SendDSL）不记录
+
+    :param func: 发送方法
+    :param method: 方法名
+    :return: 包装后的方法
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if _current_span.get() is None:
+            return func(self, *args, **kwargs)
+
+        span = tracer.start_span(
+            f"send.{method}",
+            "send",
+            adapter=type(self._adapter).__name__,
+            target_type=self._target_type,
+            target_id=self._target_id,
+            account_id=self._account_id,
+        )
+        token = _current_span.set(span)
+        try:
+            result = func(self, *args, **kwargs)
+        except BaseException as e:
+            tracer.finish_span(span, e)
+            raise
+        finally:
+            _current_span.reset(token)
+
+        if isinstance(result, asyncio.Future):
+            result.add_done_callback(
+                lambda fut: tracer.finish_span(
+                    span, None if fut.cancelled() else fut.exception()
+                )
+            )
+        elif inspect.isawaitable(result):
+            # 协程在被等待时才执行，需在 Span 上下文中运行
+            result = _await_in_span(span, result)
+        elif not hasattr(result, "_adapter"):
+            tracer.finish_span(span)
+        # 返回 SendDSL 的修饰方法（At / Reply 等）不记录
+        return result
+
+    wrapper.__erispulse_traced__ = True
+    return wrapper
+
+
+async def _await_in_span(span: Span, awaitable: Awaitable) -> Any:
+    """
+    {!--< internal-use >!--}
+    在指定 Span 上下文中等待协程
+    """
+    token = _current_span.set(span)
+    try:
+        result = await awaitable
+    except BaseException as e:
+        tracer.finish_span(span, e)
+        raise
+    finally:
+        _current_span.reset(token)
+    tracer.finish_span(span)
+    return result
+
+
+def trace_call_api(func: Callable) -> Callable:
+    """
+    {!--< internal-use >!--}
+    包装适配器的 call_api：追踪中调用时记录平台 API 调用耗时
+
+    :param func: call_api 协程函数
+    :return: 包装后的协程函数
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self, endpoint: str, **params: Any) -> Any:
+        if _current_span.get() is None:
+            return await func(self, endpoint, **params)
+        with tracer.span("call_api", "api", adapter=type(self).__name__, endpoint=endpoint):
+            return await func(self, endpoint, **params)
+
+    wrapper.__erispulse_traced__ = True
+    return wrapper
+
+
+__all__ = ["Span", "Tracer", "tracer", "trace_send_method", "trace_call_api"]
@@ -24,9 +24,31 @@ from .frame_config import (
     get_logger_config,
     get_storage_config,
     get_event_config,
+    get_media_config,
+    get_bot_config,
+    get_supervisor_config,
+    get_handler_config,
+    get_executor_config,
+    get_loop_config,
+    get_monitor_config,
+    get_tracing_config,
+    get_recorder_config,
+    get_dedup_config,
+    get_scheduler_config,
+    get_outbox_config,
+    get_balancer_config,
+    get_quota_config,
     get_framework_config
 )
 
+from .event_loop import (
+    LOOP_IMPLEMENTATIONS,
+    get_loop_factory,
+    tune_event_loop,
+    get_loop_info,
+    run_event_loop
+)
+
 __all__ = [
     # 异常处理
     'ExceptionHandler',
@@ -43,5 +65,26 @@ __all__ = [
     'get_logger_config',
     'get_storage_config',
     'get_event_config',
+    'get_media_config',
+    'get_bot_config',
+    'get_supervisor_config',
+    'get_handler_config',
+    'get_executor_config',
+    'get_loop_config',
+    'get_monitor_config',
+    'get_tracing_config',
+    'get_recorder_config',
+    'get_dedup_config',
+    'get_scheduler_config',
+    'get_outbox_config',
+    'get_balancer_config',
+    'get_quota_config',
     'get_framework_config',
+
+    # 事件循环
+    'LOOP_IMPLEMENTATIONS',
+    'get_loop_factory',
+    'tune_event_loop',
+    'get_loop_info',
+    'run_event_loop',
 ]
@@ -0,0 +1,149 @@
+"""
+ErisPulse 事件循环配置
+
+提供事件循环实现的选择（asyncio / uvloop）与运行参数调优
+
+{!--< tips >!--}
+1. 事件循环实现由配置 ErisPulse.loop.implementation 或 epsdk run --loop 决定，
+   必须在事件循环创建之前选择，因此只能通过 run_event_loop() 或命令行生效
+2. uvloop 不可用（未安装或 Windows 平台）时记录警告并回退到 asyncio
+3. 默认线程池大小与调试模式在事件循环启动后应用，sdk.run() 会自动调用 tune_event_loop()
+4. uvloop 的慢回调告警仅在其调试构建中生效
+{!--< /tips >!--}
+"""
+
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from collections.abc import Callable, Coroutine
+
+from .frame_config import get_loop_config
+
+LOOP_IMPLEMENTATIONS = ("asyncio", "uvloop")
+
+# 已调优的事件循环，避免重复设置默认线程池
+_tuned_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _logger():
+    from ..Core.logger import logger
+
+    return logger
+
+
+def get_loop_factory(
+    implementation: str | None = None,
+) -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """
+    获取事件循环工厂函数
+
+    :param implementation: 事件循环实现（asyncio / uvloop），None 表示读取配置
+    :return: 事件循环工厂函数，None 表示使用 asyncio 默认实现
+    :raises ValueError: 事件循环实现无效
+    """
+    if implementation is None:
+        implementation = get_loop_config().get("implementation", "asyncio")
+    if implementation not in LOOP_IMPLEMENTATIONS:
+        raise ValueError(
+            f"事件循环实现必须是 {LOOP_IMPLEMENTATIONS} 之一，收到: {implementation!r}"
+        )
+    if implementation == "asyncio":
+        return None
+
+    try:
+        import uvloop
+    except ImportError:
+        _logger().warning("uvloop 不可用，使用 asyncio 默认事件循环（pip install uvloop）")
+        return None
+    return uvloop.new_event_loop
+
+
+def tune_event_loop(loop: asyncio.AbstractEventLoop | None = None) -> None:
+    """
+    按配置调优正在运行的事件循环
+
+    设置默认线程池大小、调试模式与慢回调阈值，同一事件循环只调优一次
+
+    :param loop: 事件循环，None 表示当前正在运行的事件循环
+    """
+    global _tuned_loop
+
+    loop = loop or asyncio.get_running_loop()
+    if loop is _tuned_loop:
+        return
+    _tuned_loop = loop
+
+    loop_config = get_loop_config()
+    workers = loop_config.get("default_executor_workers", 0)
+    if workers:
+        loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ErisPulse-loop")
+        )
+    if loop_config.get("debug", False):
+        loop.set_debug(True)
+        loop.slow_callback_duration = loop_config.get("slow_callback_duration", 0.1)
+        _logger().info(
+            f"事件循环调试模式已启用 (慢回调阈值: {loop.slow_callback_duration}s)"
+        )
+
+
+def get_loop_info(loop: asyncio.AbstractEventLoop | None = None) -> dict[str, Any]:
+    """
+    获取事件循环信息
+
+    :param loop: 事件循环，None 表示当前正在运行的事件循环
+    :return: 事件循环实现、调试模式与慢回调阈值
+    """
+    loop = loop or asyncio.get_running_loop()
+    module = type(loop).__module__.split(".")[0]
+    return {
+        "implementation": "uvloop" if module == "uvloop" else "asyncio",
+        "class": type(loop).__name__,
+        "debug": loop.get_debug(),
+        "slow_callback_duration": loop.slow_callback_duration,
+    }
+
+
+def run_event_loop(main: Coroutine, implementation: str | None = None) -> Any:
+    """
+    在按配置创建与调优的事件循环中运行协程
+
+    用于替代 asyncio.run()，命令行 epsdk run 通过此函数启动
+
+    :param main: 要运行的协程
+    :param implementation: 事件循环实现（asyncio / uvloop），None 表示读取配置
+    :return: 协程返回值
+
+    :example:
+    >>> from ErisPulse.runtime import run_event_loop
+    >>> run_event_loop(sdk.run(), "uvloop")
+    """
+    try:
+        factory = get_loop_factory(implementation)
+    except ValueError:
+        main.close()
+        raise
+
+    async def _main():
+        tune_event_loop()
+        return await main
+
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=factory) as runner:
+            return runner.run(_main())
+
+    if factory is not None:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(_main())
+
+
+__all__ = [
+    "LOOP_IMPLEMENTATIONS",
+    "get_loop_factory",
+    "tune_event_loop",
+    "get_loop_info",
+    "run_event_loop",
+]
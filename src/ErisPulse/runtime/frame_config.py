@@ -37,6 +37,104 @@ DEFAULT_ERISPULSE_CONFIG = {
         },
 
     },
+    "media": {                          # 媒体配置
+        "cache_enabled": True,          # 是否启用媒体上传缓存
+        "cache_ttl": 604800,            # 缓存有效期（秒），默认 7 天
+        "cache_max_entries": 4096,      # 内存中最多保留的缓存条目数
+    },
+    "bot": {                            # Bot 状态配置
+        "heartbeat_timeout": 0,         # 心跳超时（秒），0 表示按 Bot 上报的心跳间隔自动判断
+        "heartbeat_multiplier": 3,      # 自动判断时的超时倍数（心跳间隔 × 倍数）
+        "sweep_interval": 5,            # 心跳超时扫描间隔（秒）
+    },
+    "supervisor": {                     # 适配器守护配置
+        "health_interval": 30,          # 健康检查间隔（秒），仅对实现了 health() 的适配器生效
+        "health_timeout": 10,           # 单次健康检查超时（秒）
+        "unhealthy_threshold": 2,       # 连续失败多少次判定为不健康并重启
+        "backoff_initial": 1,           # 启动失败后首次重试等待（秒）
+        "backoff_max": 300,             # 重试等待上限（秒）
+        "backoff_multiplier": 2,        # 指数退避倍数
+        "backoff_jitter": 0.2,          # 退避抖动比例（0~1）
+        "circuit_threshold": 8,         # 连续启动失败多少次后熔断
+        "circuit_cooldown": 600,        # 熔断冷却时间（秒），之后进入半开状态再尝试一次
+    },
+    "handler": {                        # 事件处理器执行配置
+        "timeout": 0,                   # 处理器默认超时（秒），超时后取消执行，0 表示不限制
+        "slow_threshold": 1.0,          # 慢处理器告警阈值（秒），0 表示不告警
+    },
+    "executor": {                       # 同步回调执行器配置
+        "mode": "per_handler",          # 同步回调执行策略：inline（事件循环内）/ thread（全部投递线程池）/ per_handler（仅 offload=True）
+        "max_workers": 0,               # 线程池最大线程数，0 表示自动（min(32, CPU 数 + 4)）
+        "process_workers": 0,           # 进程池工作进程数，0 表示 CPU 核心数
+        "process_timeout": 60,          # 进程池任务默认结果超时（秒），0 表示不限制
+        "process_prestart": False,      # 是否在 sdk.init 时启动并预热进程池（有处理器声明 executor="process" 时总会启动）
+    },
+    "loop": {                           # 事件循环配置
+        "implementation": "asyncio",    # 事件循环实现：asyncio（标准库）/ uvloop（需安装 uvloop，不可用时回退到 asyncio）
+        "default_executor_workers": 0,  # 事件循环默认线程池（run_in_executor(None, ...)）大小，0 表示保持 asyncio 默认
+        "debug": False,                 # 是否启用事件循环调试模式（用于性能分析，会降低运行速度）
+        "slow_callback_duration": 0.1,  # 调试模式下慢回调告警阈值（秒）
+    },
+    "monitor": {                        # 事件循环延迟监控配置
+        "enabled": True,                # 是否在 sdk.run 时启动事件循环延迟监控
+        "interval": 0.5,                # 事件循环延迟采样间隔（秒）
+        "lag_threshold": 0.25,          # 延迟告警阈值（秒），超过时记录阻塞调用栈并提交 core.loop.lag 事件，0 表示只采样不告警
+        "event_cooldown": 10,           # 两次 core.loop.lag 事件之间的最小间隔（秒）
+        "window": 120,                  # 计算当前延迟百分位使用的最近采样数
+    },
+    "tracing": {                        # 事件追踪配置
+        "sample_rate": 0.0,             # 事件追踪采样率（0~1），0 表示关闭，1 表示追踪全部事件
+        "max_spans": 10000,             # 内存中保留的最大 Span 数量，超出后丢弃最早的记录
+    },
+    "recorder": {                       # 事件录制配置
+        "enabled": False,               # 是否在 sdk.run 时启动事件录制
+        "directory": "recordings",      # 录制文件目录
+        "segment_events": 10000,        # 单个分段文件的最大事件数，超出后切换到新分段
+        "redact": [],                   # 需要脱敏的字段名（任意层级），值替换为稳定的哈希，相同的值脱敏后仍相同
+        "include_raw": False,           # 是否录制平台原生数据（{platform}_raw 字段）
+    },
+    "dedup": {                          # 事件去重配置
+        "enabled": False,               # 是否对所有平台启用事件去重（按平台覆盖见 platforms）
+        "platforms": {},                # 按平台覆盖是否启用，如 {"telegram": True}
+        "strategy": "lru",              # 去重策略：lru（精确，按时间与数量淘汰）/ bloom（轮转布隆过滤器，适合极高吞吐，存在极低误判率）
+        "window": 300,                  # 去重时间窗口（秒），窗口内重复的 (平台, 事件ID) 被丢弃
+        "max_entries": 100000,          # lru 策略每个平台最多记录的事件 ID 数
+        "bloom_capacity": 1000000,      # bloom 策略每一代过滤器的容量（事件数），内存约为 2 × capacity × 1.8 字节
+        "bloom_error_rate": 0.001,      # bloom 策略的目标误判率
+    },
+    "scheduler": {                      # 任务调度配置
+        "enabled": True,                # 是否在 sdk.run 时启动任务调度器
+        "table": "erispulse_scheduler_jobs",  # 持久化任务的存储表名
+        "max_concurrency": 32,          # 同时执行的任务数上限
+        "misfire": "run_once",          # 错过执行时间的默认策略：run_once（补执行一次）/ skip（跳过）/ run_all（逐次补执行）
+        "misfire_grace": 60,            # 延迟不超过该秒数时视为按时执行，不触发错过策略
+        "max_catchup": 100,             # run_all 策略单次最多补执行的次数
+        "shutdown_timeout": 5.0,        # 停止调度器时等待正在执行任务的最长秒数，超时后取消
+    },
+    "outbox": {                         # 持久化发件箱配置
+        "enabled": False,               # 是否启用持久化发件箱（适配器不可用时暂存发送，恢复后按序补发）
+        "table": "erispulse_outbox",    # 存储表名
+        "batch_size": 50,               # 补发时每批读取的消息数
+        "ttl": 3600,                    # 消息有效期（秒），过期未发送的消息被丢弃，0 表示不过期
+        "max_attempts": 5,              # 单条消息最大补发次数，超过后标记为 failed
+        "retry_interval": 30,           # 补发失败后重试的间隔（秒）
+    },
+    "balancer": {                       # 多账号负载均衡配置
+        "enabled": False,               # 是否对所有平台启用多账号自动选择（按平台覆盖见 platforms）
+        "platforms": {},                # 按平台覆盖是否启用，如 {"telegram": True}
+        "policy": "least_outstanding",  # 选择策略：least_outstanding（未完成发送最少）/ round_robin（轮询）
+        "sticky": True,                 # 同一目标是否固定使用同一账号（账号离线或不可达时重新选择）
+        "sticky_ttl": 1800,             # 目标与账号的绑定在无发送多少秒后失效
+        "max_targets": 100000,          # 每个平台最多记录的目标数（绑定与可达账号），超出后淘汰最久未使用的目标
+        "learn_targets": True,          # 是否根据收到的事件记录账号可达的目标（群、频道、用户）
+    },
+    "quota": {                          # 模块配额配置
+        "enabled": False,               # 是否启用模块配额（按处理器所属模块限制并发与排队长度）
+        "max_concurrency": 0,           # 每个模块默认同时执行的处理器数上限，0 表示不限制
+        "max_queue": 0,                 # 每个模块默认等待执行的处理器数上限，超出后该模块丢弃新事件，0 表示不限制
+        "cpu_accounting": True,         # 是否统计各模块处理器占用的 CPU 时间
+        "modules": {},                  # 按模块覆盖配额，如 {"MyModule": {"max_concurrency": 4, "max_queue": 100}}
+    },
     "framework": {                      # 框架配置
         "enable_lazy_loading": True     # 是否启用延迟加载
     }
@@ -166,6 +264,132 @@ def get_event_config() -> Dict[str, Any]:
     return get_config("event")
 
 
+def get_media_config() -> Dict[str, Any]:
+    """
+    获取媒体配置
+
+    :return: 媒体配置字典
+    """
+    return get_config("media")
+
+
+def get_bot_config() -> Dict[str, Any]:
+    """
+    获取Bot状态配置
+
+    :return: Bot状态配置字典
+    """
+    return get_config("bot")
+
+
+def get_supervisor_config() -> Dict[str, Any]:
+    """
+    获取适配器守护配置
+
+    :return: 适配器守护配置字典
+    """
+    return get_config("supervisor")
+
+
+def get_handler_config() -> Dict[str, Any]:
+    """
+    获取事件处理器执行配置
+
+    :return: 事件处理器执行配置字典
+    """
+    return get_config("handler")
+
+
+def get_executor_config() -> Dict[str, Any]:
+    """
+    获取同步回调执行器配置
+
+    :return: 同步回调执行器配置字典
+    """
+    return get_config("executor")
+
+
+def get_loop_config() -> Dict[str, Any]:
+    """
+    获取事件循环配置
+
+    :return: 事件循环配置字典
+    """
+    return get_config("loop")
+
+
+def get_monitor_config() -> Dict[str, Any]:
+    """
+    获取事件循环延迟监控配置
+
+    :return: 事件循环延迟监控配置字典
+    """
+    return get_config("monitor")
+
+
+def get_tracing_config() -> Dict[str, Any]:
+    """
+    获取事件追踪配置
+
+    :return: 事件追踪配置字典
+    """
+    return get_config("tracing")
+
+
+def get_recorder_config() -> Dict[str, Any]:
+    """
+    获取事件录制配置
+
+    :return: 事件录制配置字典
+    """
+    return get_config("recorder")
+
+
+def get_dedup_config() -> Dict[str, Any]:
+    """
+    获取事件去重配置
+
+    :return: 事件去重配置字典
+    """
+    return get_config("dedup")
+
+
+def get_scheduler_config() -> Dict[str, Any]:
+    """
+    获取任务调度配置
+
+    :return: 任务调度配置字典
+    """
+    return get_config("scheduler")
+
+
+def get_outbox_config() -> Dict[str, Any]:
+    """
+    获取持久化发件箱配置
+
+    :return: 持久化发件箱配置字典
+    """
+    return get_config("outbox")
+
+
+def get_balancer_config() -> Dict[str, Any]:
+    """
+    获取多账号负载均衡配置
+
+    :return: 多账号负载均衡配置字典
+    """
+    return get_config("balancer")
+
+
+def get_quota_config() -> Dict[str, Any]:
+    """
+    获取模块配额配置
+
+    :return: 模块配额配置字典
+    """
+    return get_config("quota")
+
+
 def get_framework_config() -> Dict[str, Any]:
     """
     获取框架配置
@@ -185,5 +409,19 @@ __all__ = [
     'get_logger_config',
     'get_storage_config',
     'get_event_config',
+    'get_media_config',
+    'get_bot_config',
+    'get_supervisor_config',
+    'get_handler_config',
+    'get_executor_config',
+    'get_loop_config',
+    'get_monitor_config',
+    'get_tracing_config',
+    'get_recorder_config',
+    'get_dedup_config',
+    'get_scheduler_config',
+    'get_outbox_config',
+    'get_balancer_config',
+    'get_quota_config',
     'get_framework_config',
 ]
@@ -16,13 +16,14 @@ from __future__ import annotations
 import asyncio
 import sys
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+from collections.abc import Callable
 
 # 导入核心模块
 from .Core import Event, lifecycle, logger
 from .Core import storage, env, config
 from .Core import adapter, BaseAdapter, SendDSL, BaseStorage, BaseQueryBuilder
-from .Core import module, router
+from .Core import module, router, executor, loop_monitor, tracer, recorder, deduplicator, scheduler, outbox, balancer, quota
 from .Core.lifecycle import LifecycleManager
 from .Core.adapter import AdapterManager
 from .Core.storage import StorageManager
@@ -32,6 +33,15 @@ from .Core.logger import Logger
 from .Core.module import ModuleManager
 from .Core.router import RouterManager
 from .Core.config import ConfigManager
+from .Core.executor import ExecutorManager
+from .Core.monitor import LoopMonitor
+from .Core.tracing import Tracer
+from .Core.recorder import EventRecorder
+from .Core.dedup import EventDeduplicator
+from .Core.scheduler import Scheduler
+from .Core.outbox import Outbox
+from .Core.balancer import AccountBalancer
+from .Core.quota import QuotaManager
 
 # 导入懒加载模块类
 from .loaders.module import LazyModule
@@ -62,6 +72,15 @@ class SDK:
     - SendDSL: DSL 发送接口基类
     - module: 模块管理器
     - router: 路由管理器
+    - executor: 同步回调执行器
+    - loop_monitor: 事件循环延迟监控
+    - tracer: 事件追踪器
+    - recorder: 事件录制器
+    - deduplicator: 事件去重器
+    - scheduler: 任务调度器
+    - outbox: 持久化发件箱
+    - balancer: 多账号负载均衡器
+    - quota: 模块配额
     {!--< /tips >!--}
     """
     
@@ -105,6 +124,33 @@ class SDK:
     
     router: RouterManager
     """路由管理器"""
+
+    executor: ExecutorManager
+    """同步回调执行器"""
+
+    loop_monitor: LoopMonitor
+    """事件循环延迟监控"""
+
+    tracer: Tracer
+    """事件追踪器"""
+
+    recorder: EventRecorder
+    """事件录制器"""
+
+    deduplicator: EventDeduplicator
+    """事件去重器"""
+
+    scheduler: Scheduler
+    """任务调度器"""
+
+    outbox: Outbox
+    """持久化发件箱"""
+
+    balancer: AccountBalancer
+    """多账号负载均衡器"""
+
+    quota: QuotaManager
+    """模块配额"""
     
     def __init__(self):
         """
@@ -136,10 +182,23 @@ class SDK:
         module.set_sdk_ref(self)
         
         self.router = router
+
+        self.executor = executor
+        self.loop_monitor = loop_monitor
+        self.tracer = tracer
+        self.recorder = recorder
+        self.deduplicator = deduplicator
+        self.scheduler = scheduler
+        self.outbox = outbox
+        self.balancer = balancer
+        self.quota = quota
         
         # 初始化协调器（在需要时创建）
         self._initializer: SDK.Initializer | None = None
         self._initialized: bool = False
+
+        # 多进程运行模式下的进程角色：None（单进程）/ "front"（前端）/ "worker"（工作进程）
+        self._cluster_role: str | None = None
     
     def __getattribute__(self, name: str):
         try:
@@ -191,6 +250,14 @@ class SDK:
             self._adapter_loader = AdapterLoader()
             self._module_loader = ModuleLoader()
         
+        @staticmethod
+        async def _skip_loading() -> tuple[dict[str, Any], list[str], list[str]]:
+            """
+            {!--< internal-use >!--}
+            跳过加载（多进程运行模式下不属于本进程角色的部分）
+            """
+            return {}, [], []
+
         async def init(self) -> bool:
             """
             初始化所有模块和适配器
@@ -217,9 +284,15 @@ class SDK:
                 # 适配器发现阶段
                 logger.print_section_header("适配器发现阶段")
                 
+                # 多进程运行模式：前端只加载适配器，工作进程只加载模块
+                cluster_role = self._sdk._cluster_role
                 (adapter_result, module_result) = await asyncio.gather(
-                    self._adapter_loader.load(adapter_manager),
-                    self._module_loader.load(module_manager),
+                    self._adapter_loader.load(adapter_manager)
+                    if cluster_role != "worker"
+                    else self._skip_loading(),
+                    self._module_loader.load(module_manager)
+                    if cluster_role != "front"
+                    else self._skip_loading(),
                     return_exceptions=True
                 )
                 
@@ -258,6 +331,11 @@ class SDK:
                     )
                 else:
                     success = True
+
+                # 5. 启动进程池（配置预启动或有处理器声明了 executor="process"）
+                executor_manager = self._sdk.executor
+                if executor_manager.process_prestart or executor_manager.process_requested:
+                    await executor_manager.start_process_pool()
                 
                 # 获取加载耗时
                 load_duration = lifecycle.stop_timer("core.init")
@@ -351,7 +429,7 @@ class SDK:
             执行反初始化
             
             执行步骤:
-            1. 关闭所有适配器
+            1. 停止任务调度器与发件箱补发，关闭所有适配器
             2. 卸载所有模块
             3. 清理事件处理器
             4. 清理管理器
@@ -365,7 +443,9 @@ class SDK:
                 adapter_manager = self._sdk.adapter
                 module_manager = self._sdk.module
                 
-                # 1. 关闭所有适配器
+                # 1. 停止任务调度器（等待执行中的任务）与发件箱补发，再关闭所有适配器
+                await self._sdk.scheduler.stop()
+                await self._sdk.outbox.stop()
                 registered_adapters = adapter_manager.list_registered()
                 if registered_adapters:
                     await adapter_manager.shutdown()
@@ -459,6 +539,11 @@ class SDK:
 
                 # 9. 清理生命周期事件处理器（在所有事件完成之后）
                 lifecycle._handlers.clear()
+                lifecycle._offload.clear()
+
+                # 10. 关闭同步回调线程池与进程池（下次投递时自动重建）
+                self._sdk.executor.shutdown(wait=False)
+                self._sdk.executor.shutdown_process_pool()
 
                 logger.info(f"SDK反初始化成功 (耗时: {duration_str})")
                 return True
@@ -480,6 +565,7 @@ class SDK:
 
                 # 清理生命周期事件处理器（即使在失败时也要清理）
                 lifecycle._handlers.clear()
+                lifecycle._offload.clear()
 
                 if "attached to a different loop" in str(e):
                     # 这是一个常见的错误，通常是由于SDK在另一个事件循环中运行而导致的。
@@ -490,6 +576,20 @@ class SDK:
 
     # ==================== SDK 逻辑方法 ====================
 
+    async def run_in_process(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        在 SDK 管理的进程池中执行 CPU 密集型函数
+
+        :param func: 模块顶层定义的可序列化函数
+        :param args: 可序列化的位置参数
+        :param kwargs: 传递给 executor.run_in_process 的选项（如 timeout）
+        :return: 函数返回值
+
+        :example:
+        >>> image = await sdk.run_in_process(render_chart, data, timeout=10)
+        """
+        return await self.executor.run_in_process(func, *args, **kwargs)
+
     async def init(self) -> bool:
         """
         SDK 初始化入口
@@ -628,20 +728,33 @@ class SDK:
     async def run(self, keep_running: bool = True) -> None:
         """
         无头模式运行 ErisPulse
+
+        运行前按配置调优当前事件循环（默认线程池大小、调试模式），并启动事件循环延迟监控
         
         :param keep_running: bool 是否保持运行
         
         :example:
         >>> await sdk.run(keep_running=True)
         """
+        from .runtime import tune_event_loop
+
         try:
+            tune_event_loop()
+
             isInit = await self.init()
             
             if not isInit:
                 logger.error("ErisPulse 初始化失败，请检查日志")
                 return
             
+            if self.recorder.enabled:
+                self.recorder.start(self.adapter)
+            if self.outbox.enabled:
+                self.outbox.start()
             await self.adapter.startup()
+            if self.scheduler.enabled:
+                self.scheduler.start()
+            self.loop_monitor.start()
             
             if keep_running:
                 # 保持程序运行
@@ -650,6 +763,8 @@ class SDK:
             logger.error(e)
         finally:
             try:
+                await self.loop_monitor.stop()
+                self.recorder.stop()
                 await self.uninit()
             except Exception:
                 pass
@@ -668,6 +783,9 @@ class SDK:
             # 获取所有已加载包的顶层 Python 模块名
             top_level_modules = self._collect_top_level_modules()
             
+            # uninit 会清空适配器中间件链，先停止录制，重新初始化后再挂载
+            resume_recording = self.recorder.is_recording or self.recorder.enabled
+            self.recorder.stop()
             await self.uninit()
             
             # 清除所有已加载包的缓存
@@ -677,8 +795,14 @@ class SDK:
                 logger.error("[Reload] 初始化失败，请检查日志")
                 return False
             
-            # 重新启动适配器
+            # 重新启动事件录制、发件箱、适配器与任务调度器
+            if resume_recording:
+                self.recorder.start(self.adapter)
+            if self.outbox.enabled:
+                self.outbox.start()
             await self.adapter.startup()
+            if self.scheduler.enabled:
+                self.scheduler.start()
             
             logger.info("[Reload] 重新加载完成")
             logger.info(
@@ -408,6 +408,24 @@ def mock_storage_db(tmp_path: Path):
     return db_file
 
 
+@pytest.fixture
+def temp_storage(tmp_path: Path):
+    """
+    创建使用临时数据库的独立 StorageManager（不复用全局单例）
+    """
+    from ErisPulse.Core.storage import StorageManager
+
+    class _TempStorage(StorageManager):
+        _instance = None
+
+        def __init__(self, db_path: str):
+            self.db_path = db_path
+            self._init_db()
+            self._initialized = True
+
+    return _TempStorage(str(tmp_path / "temp_storage.db"))
+
+
 # ==================== 日志测试夹具 ====================
 
 
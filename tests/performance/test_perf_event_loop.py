@@ -0,0 +1,109 @@
+"""
+事件循环实现性能测试
+
+对比 asyncio 默认事件循环与 uvloop 下的事件分发吞吐量，
+以及 call_soon 调度与 Task 创建的开销。
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.runtime import event_loop
+from ErisPulse.runtime.event_loop import run_event_loop
+
+try:
+    import uvloop  # noqa: F401
+    LOOPS = ["asyncio", "uvloop"]
+except ImportError:
+    LOOPS = ["asyncio"]
+
+_EVENTS = 5000
+
+
+def _make_event(event_id):
+    return {
+        "id": f"loop_{event_id}",
+        "time": 1712345678,
+        "type": "message",
+        "detail_type": "group",
+        "platform": "bench",
+        "self": {"platform": "bench", "user_id": "bot_bench"},
+        "user_id": f"u{event_id % 50}",
+        "group_id": f"g{event_id % 10}",
+        "message": [{"type": "text", "data": {"text": "bench"}}],
+        "alt_message": "bench",
+    }
+
+
+def _run(main, implementation):
+    with patch.object(event_loop, "get_loop_config", return_value={}):
+        result = run_event_loop(main, implementation)
+    event_loop._tuned_loop = None
+    return result
+
+
+class TestEventLoopThroughput:
+    @pytest.mark.parametrize("implementation", LOOPS)
+    def test_emit_throughput(self, bench_adapter, implementation):
+        """5000 个事件并发分发到 3 个 handler"""
+        received = []
+
+        for _ in range(3):
+
+            @bench_adapter.on("message")
+            async def handler(data):
+                await asyncio.sleep(0)
+                received.append(1)
+
+        events = [_make_event(i) for i in range(_EVENTS)]
+
+        async def main():
+            start = time.perf_counter()
+            await asyncio.gather(*(bench_adapter.emit(e) for e in events))
+            return time.perf_counter() - start
+
+        elapsed = _run(main(), implementation)
+        print(
+            f"\n[{implementation}] emit x{_EVENTS}: {elapsed * 1000:.1f}ms "
+            f"({_EVENTS / elapsed:.0f} events/s)"
+        )
+
+        assert len(received) == _EVENTS * 3
+
+    @pytest.mark.parametrize("implementation", LOOPS)
+    def test_call_soon_and_tasks(self, implementation):
+        """10000 次 call_soon 调度与 Task 创建"""
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            done = loop.create_future()
+            remaining = [10000]
+
+            def tick():
+                remaining[0] -= 1
+                if remaining[0]:
+                    loop.call_soon(tick)
+                else:
+                    done.set_result(None)
+
+            start = time.perf_counter()
+            loop.call_soon(tick)
+            await done
+            callbacks = time.perf_counter() - start
+
+            async def noop():
+                pass
+
+            start = time.perf_counter()
+            await asyncio.gather(*(asyncio.create_task(noop()) for _ in range(10000)))
+            tasks = time.perf_counter() - start
+            return callbacks, tasks
+
+        callbacks, tasks = _run(main(), implementation)
+        print(
+            f"\n[{implementation}] call_soon x10000: {callbacks * 1000:.1f}ms, "
+            f"tasks x10000: {tasks * 1000:.1f}ms"
+        )
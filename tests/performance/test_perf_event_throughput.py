@@ -217,3 +217,28 @@ class TestEventThroughputPerformance:
         assert len(received) == 1
         for i in range(5):
             assert received[0].get(f"mw{i}") is True
+
+    @pytest.mark.asyncio
+    async def test_sync_middleware_chain_1000_events(self, perf_adapter):
+        """5 个同步 middleware + 1 个作用域外 middleware，1000 个事件"""
+        for i in range(5):
+
+            @perf_adapter.middleware
+            def mw(data, _i=i):
+                data[f"mw{_i}"] = True
+                return data
+
+        @perf_adapter.middleware(platform="other")
+        def drop_other(data):
+            return perf_adapter.DROP
+
+        received = []
+
+        @perf_adapter.on("message")
+        async def handler(data):
+            received.append(1)
+
+        for i in range(1000):
+            await perf_adapter.emit(_make_event(i))
+
+        assert len(received) == 1000
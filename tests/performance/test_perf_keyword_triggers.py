@@ -0,0 +1,80 @@
+"""
+关键词/正则触发引擎性能测试
+
+模式数量从 10 增长到 10000，对比触发引擎的单次扫描
+与逐个 ``if keyword in text`` / ``re.search`` 的开销。
+"""
+
+import re
+import time
+
+import pytest
+
+from ErisPulse.Core.Event.triggers import KeywordTrigger, RegexTrigger, TriggerEngine
+
+PATTERN_COUNTS = [10, 100, 1000, 10000]
+
+# 常见场景：大多数消息不命中任何触发条件
+_TEXT = "今天的会议改到下午三点，请大家准时参加，顺便带上 kw_target 的资料" * 2
+_ROUNDS = 200
+
+
+def _keywords(count):
+    return [f"kw{i:05d}" for i in range(count)] + ["kw_target"]
+
+
+def _timeit(func, rounds=_ROUNDS):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds
+
+
+class TestKeywordTriggerScaling:
+    @pytest.mark.parametrize("count", PATTERN_COUNTS)
+    def test_keyword_engine_vs_naive(self, count):
+        """关键词：自动机单次扫描 vs 逐个 in 判断"""
+        keywords = _keywords(count)
+        engine = TriggerEngine()
+        for order, keyword in enumerate(keywords):
+            engine.add(order, KeywordTrigger(keyword))
+        engine.build()
+
+        def naive():
+            return [i for i, kw in enumerate(keywords) if kw in _TEXT]
+
+        assert set(engine.match(_TEXT)) == set(naive()) == {count}
+
+        engine_time = _timeit(lambda: engine.match(_TEXT))
+        naive_time = _timeit(naive)
+        print(
+            f"\n[keyword x{count}] engine={engine_time * 1e6:.1f}us "
+            f"naive={naive_time * 1e6:.1f}us"
+        )
+
+        if count >= 1000:
+            assert engine_time < naive_time
+
+    @pytest.mark.parametrize("count", PATTERN_COUNTS)
+    def test_regex_engine_vs_naive(self, count):
+        """正则：分块合并预过滤 vs 逐个 re.search"""
+        patterns = [re.compile(rf"cmd{i}:(\d+)") for i in range(count)]
+        engine = TriggerEngine()
+        for order, pattern in enumerate(patterns):
+            engine.add(order, RegexTrigger(pattern))
+        engine.build()
+
+        text = _TEXT + f" cmd{count - 1}:42"
+
+        def naive():
+            return [i for i, p in enumerate(patterns) if p.search(text)]
+
+        assert set(engine.match(text)) == set(naive()) == {count - 1}
+
+        rounds = max(5, _ROUNDS * 10 // count)
+        engine_time = _timeit(lambda: engine.match(text), rounds)
+        naive_time = _timeit(naive, rounds)
+        print(
+            f"\n[regex x{count}] engine={engine_time * 1e6:.1f}us "
+            f"naive={naive_time * 1e6:.1f}us"
+        )
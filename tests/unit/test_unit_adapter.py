@@ -9,7 +9,7 @@ import asyncio
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from typing import Dict, Any
 
-from ErisPulse.Core.adapter import AdapterManager
+from ErisPulse.Core.adapter import AdapterManager, BotState
 from ErisPulse.Core.Bases import BaseAdapter, SendDSL
 from ErisPulse.Core.config import config
 from ErisPulse.Core.lifecycle import lifecycle
@@ -1136,8 +1136,8 @@ class TestBotStatusTracking:
     def test_list_bots_all(self, manager):
         """测试列出所有 Bot"""
         manager._bots = {
-            "tg": {"bot1": {"status": "online", "last_active": 1.0, "info": {}}},
-            "dc": {"bot2": {"status": "offline", "last_active": 2.0, "info": {}}}
+            "tg": {"bot1": BotState("online", {})},
+            "dc": {"bot2": BotState("offline", {})}
         }
         result = manager.list_bots()
         assert "tg" in result
@@ -1148,8 +1148,8 @@ class TestBotStatusTracking:
     def test_list_bots_by_platform(self, manager):
         """测试列出指定平台的 Bot"""
         manager._bots = {
-            "tg": {"bot1": {"status": "online", "last_active": 1.0, "info": {}}},
-            "dc": {"bot2": {"status": "offline", "last_active": 2.0, "info": {}}}
+            "tg": {"bot1": BotState("online", {})},
+            "dc": {"bot2": BotState("offline", {})}
         }
         result = manager.list_bots("tg")
         assert "tg" in result
@@ -1164,8 +1164,8 @@ class TestBotStatusTracking:
         """测试检查 Bot 是否在线"""
         manager._bots = {
             "tg": {
-                "bot1": {"status": "online", "last_active": 1.0, "info": {}},
-                "bot2": {"status": "offline", "last_active": 2.0, "info": {}}
+                "bot1": BotState("online", {}),
+                "bot2": BotState("offline", {})
             }
         }
         assert manager.is_bot_online("tg", "bot1") is True
@@ -1178,7 +1178,7 @@ class TestBotStatusTracking:
         manager.register("tg", test_adapter_class)
         manager._bots = {
             "tg": {
-                "bot1": {"status": "online", "last_active": 1.0, "info": {"user_name": "Bot1"}}
+                "bot1": BotState("online", {"user_name": "Bot1"})
             }
         }
         summary = manager.get_status_summary()
@@ -1198,8 +1198,8 @@ class TestBotStatusTracking:
         # 模拟 Bot 上线
         manager._bots = {
             "tg": {
-                "bot1": {"status": "online", "last_active": 1.0, "info": {}},
-                "bot2": {"status": "online", "last_active": 2.0, "info": {}}
+                "bot1": BotState("online", {}),
+                "bot2": BotState("online", {})
             }
         }
 
@@ -1215,7 +1215,7 @@ class TestBotStatusTracking:
     def test_clear_clears_bot_state(self, manager):
         """测试 clear 清理 Bot 状态"""
         manager._bots = {
-            "tg": {"bot1": {"status": "online", "last_active": 1.0, "info": {}}}
+            "tg": {"bot1": BotState("online", {})}
         }
         manager.clear()
         assert len(manager._bots) == 0
@@ -1257,3 +1257,266 @@ class TestBotStatusTracking:
 
         assert manager.is_bot_online("telegram", "tg_bot1") is False
         assert manager.is_bot_online("discord", "dc_bot1") is True
+
+    # ==================== BotState 原地更新测试 ====================
+
+    @pytest.mark.asyncio
+    async def test_repeated_events_update_state_in_place(self, manager):
+        """测试重复事件原地更新同一个 BotState"""
+        event = {
+            "id": "1", "time": 1, "type": "message",
+            "detail_type": "private", "platform": "tg",
+            "self": {"platform": "tg", "user_id": "bot1", "user_name": "Bot1"},
+            "message": []
+        }
+        await manager.emit(event)
+        state = manager._bots["tg"]["bot1"]
+        info = state.info
+        first_seen = state.last_seen
+
+        await manager.emit(event)
+
+        assert manager._bots["tg"]["bot1"] is state
+        assert state.info is info
+        assert state.last_seen >= first_seen
+
+    def test_bot_info_returns_snapshot(self, manager):
+        """测试查询接口返回快照，修改不影响内部状态"""
+        manager._bots = {"tg": {"bot1": BotState("online", {"user_name": "Bot1"})}}
+
+        info = manager.get_bot_info("tg", "bot1")
+        info["info"]["user_name"] = "Changed"
+
+        assert manager._bots["tg"]["bot1"].info["user_name"] == "Bot1"
+        assert isinstance(info["last_active"], float)
+
+    # ==================== 心跳超时测试 ====================
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_interval_recorded(self, manager):
+        """测试心跳事件记录心跳间隔"""
+        with patch.object(lifecycle, 'submit_event', new_callable=AsyncMock):
+            await manager.emit({
+                "id": "1", "time": 1, "type": "meta",
+                "detail_type": "connect", "platform": "tg",
+                "self": {"platform": "tg", "user_id": "bot1"}
+            })
+        await manager.emit({
+            "id": "2", "time": 2, "type": "meta",
+            "detail_type": "heartbeat", "platform": "tg", "interval": 5000,
+            "self": {"platform": "tg", "user_id": "bot1"}
+        })
+
+        assert manager._bots["tg"]["bot1"].heartbeat_interval == 5
+
+    @pytest.mark.asyncio
+    async def test_sweep_marks_timed_out_bots_offline(self, manager):
+        """测试心跳扫描将超时 Bot 标记离线并提交事件"""
+        state = BotState("online", last_seen=100.0)
+        state.heartbeat_interval = 5
+        fresh = BotState("online", last_seen=112.0)
+        fresh.heartbeat_interval = 5
+        manager._bots = {"tg": {"bot1": state, "bot2": fresh}}
+
+        with patch.object(lifecycle, 'submit_event', new_callable=AsyncMock) as mock_submit:
+            expired = await manager._sweep_heartbeats(now=120.0)
+
+        assert expired == [("tg", "bot1")]
+        assert manager.is_bot_online("tg", "bot1") is False
+        assert manager.is_bot_online("tg", "bot2") is True
+        mock_submit.assert_called_once()
+        assert mock_submit.call_args[0][0] == "adapter.bot.offline"
+        assert mock_submit.call_args[1]["data"]["reason"] == "heartbeat_timeout"
+
+    @pytest.mark.asyncio
+    async def test_sweep_skips_bots_without_heartbeat(self, manager):
+        """测试未上报心跳的 Bot 在未配置固定超时时不会被判定离线"""
+        manager._bots = {"tg": {"bot1": BotState("online", last_seen=0.0)}}
+
+        with patch.object(lifecycle, 'submit_event', new_callable=AsyncMock):
+            assert await manager._sweep_heartbeats(now=10_000.0) == []
+
+        assert manager.is_bot_online("tg", "bot1") is True
+
+    @pytest.mark.asyncio
+    async def test_sweep_fixed_timeout(self, manager):
+        """测试配置固定心跳超时时对所有在线 Bot 生效"""
+        manager._bots = {"tg": {"bot1": BotState("online", last_seen=0.0)}}
+
+        with patch("ErisPulse.runtime.get_bot_config", return_value={"heartbeat_timeout": 30}), \
+                patch.object(lifecycle, 'submit_event', new_callable=AsyncMock):
+            assert await manager._sweep_heartbeats(now=31.0) == [("tg", "bot1")]
+
+    @pytest.mark.asyncio
+    async def test_clear_stops_heartbeat_sweeper(self, manager):
+        """测试 clear 停止心跳扫描任务"""
+        manager._start_heartbeat_sweeper()
+        task = manager._heartbeat_task
+
+        manager.clear()
+        await asyncio.sleep(0)
+
+        assert manager._heartbeat_task is None
+        assert task.cancelled()
+
+
+class TestAdapterSupervisor:
+    """适配器守护（退避、熔断、健康检查）测试类"""
+
+    FAST_CONFIG = {
+        "health_interval": 0.01,
+        "health_timeout": 0.05,
+        "unhealthy_threshold": 2,
+        "backoff_initial": 0.001,
+        "backoff_max": 0.01,
+        "backoff_multiplier": 2,
+        "backoff_jitter": 0,
+        "circuit_threshold": 3,
+        "circuit_cooldown": 0.01,
+    }
+
+    @pytest.fixture
+    def manager(self):
+        manager = AdapterManager()
+        manager._adapters.clear()
+        manager._started_instances.clear()
+        manager._adapter_tasks.clear()
+        manager._get_supervisor_config = lambda: self.FAST_CONFIG
+        return manager
+
+    @staticmethod
+    def _make_adapter(fail_times=0, healthy=True, probe=True):
+        class FlakyAdapter(BaseAdapter):
+            def __init__(self):
+                super().__init__()
+                self.start_calls = 0
+                self.shutdown_calls = 0
+                self.healthy = healthy
+
+            async def start(self):
+                self.start_calls += 1
+                if self.start_calls <= fail_times:
+                    raise RuntimeError("connect failed")
+
+            async def shutdown(self):
+                self.shutdown_calls += 1
+
+            async def call_api(self, endpoint: str, **params):
+                return {}
+
+            async def health(self):
+                return self.healthy
+
+        if not probe:
+            del FlakyAdapter.health
+        return FlakyAdapter()
+
+    @staticmethod
+    def _statuses(mock_submit):
+        return [
+            c[1]["data"]["status"]
+            for c in mock_submit.call_args_list
+            if c[0][0] == "adapter.status.change"
+        ]
+
+    def test_backoff_starts_in_seconds_and_is_capped(self):
+        config = {"backoff_initial": 1, "backoff_max": 300, "backoff_multiplier": 2, "backoff_jitter": 0}
+        delays = [AdapterManager._compute_backoff(i, config) for i in range(1, 12)]
+        assert delays[:4] == [1, 2, 4, 8]
+        assert delays[-1] == 300
+
+    def test_backoff_jitter_range(self):
+        config = {"backoff_initial": 10, "backoff_max": 300, "backoff_multiplier": 2, "backoff_jitter": 0.2}
+        for _ in range(50):
+            assert 8 <= AdapterManager._compute_backoff(1, config) <= 12
+
+    @pytest.mark.asyncio
+    async def test_retry_with_backoff_until_started(self, manager):
+        adapter = self._make_adapter(fail_times=2, probe=False)
+
+        with patch.object(lifecycle, 'submit_event', new_callable=AsyncMock) as mock_submit:
+            await manager._run_adapter(adapter, "flaky")
+
+        assert adapter.start_calls == 3
+        assert adapter in manager._started_instances
+        assert self._statuses(mock_submit) == [
+            "starting", "start_failed", "start_failed", "started"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_opens_and_half_opens(self, manager):
+        adapter = self._make_adapter(fail_times=4, probe=False)
+
+        with patch.object(lifecycle, 'submit_event', new_callable=AsyncMock) as mock_submit:
+            await manager._run_adapter(adapter, "flaky")
+
+        assert self._statuses(mock_submit) == [
+            "starting",
+            "start_failed", "start_failed", "start_failed",
+            "circuit_open", "circuit_half_open",
+            "start_failed",
+            "circuit_open", "circuit_half_open",
+            "started",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_adapter_is_restarted(self, manager):
+        adapter = self._make_adapter(healthy=False)
+
+        with patch.object(lifecycle, 'submit_event', new_callable=AsyncMock) as mock_submit:
+            task = asyncio.create_task(manager._run_adapter(adapter, "flaky"))
+            for _ in range(200):
+                await asyncio.sleep(0.005)
+                if adapter.start_calls >= 2:
+                    break
+            adapter.healthy = True
+            await asyncio.sleep(0.03)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        statuses = self._statuses(mock_submit)
+        assert statuses[:5] == ["starting", "started", "unhealthy", "restarting", "started"]
+        assert adapter.shutdown_calls == 1
+        assert adapter in manager._started_instances
+
+    @pytest.mark.asyncio
+    async def test_health_exception_counts_as_failure(self, manager):
+        adapter = self._make_adapter()
+
+        async def broken_health():
+            raise ConnectionError("socket closed")
+
+        adapter.health = broken_health
+
+        with patch.object(lifecycle, 'submit_event', new_callable=AsyncMock) as mock_submit:
+            task = asyncio.create_task(manager._run_adapter(adapter, "flaky"))
+            for _ in range(200):
+                await asyncio.sleep(0.005)
+                if "unhealthy" in self._statuses(mock_submit):
+                    break
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        unhealthy = [
+            c[1]["data"] for c in mock_submit.call_args_list
+            if c[1]["data"].get("status") == "unhealthy"
+        ]
+        assert unhealthy[0]["error"] == "socket closed"
+
+    @pytest.mark.asyncio
+    async def test_adapter_without_health_is_not_probed(self, manager):
+        class PlainAdapter(BaseAdapter):
+            async def start(self):
+                pass
+
+            async def shutdown(self):
+                pass
+
+            async def call_api(self, endpoint: str, **params):
+                return {}
+
+        adapter = PlainAdapter()
+        with patch.object(lifecycle, 'submit_event', new_callable=AsyncMock):
+            await asyncio.wait_for(manager._run_adapter(adapter, "plain"), 1)
+
+        assert adapter in manager._started_instances
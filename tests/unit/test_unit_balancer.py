@@ -0,0 +1,197 @@
+"""
+多账号负载均衡单元测试
+
+测试轮询与最少未完成发送策略、目标粘滞、离线回退、可达目标学习，以及 SendDSL 发送时的自动选择
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.Core.adapter import AdapterManager, BotState
+from ErisPulse.Core.balancer import AccountBalancer
+from ErisPulse.Core.Bases.adapter import BaseAdapter, SendDSL
+
+
+class BalancedAdapter(BaseAdapter):
+    class Send(SendDSL):
+        def Reply(self, message_id):
+            self._reply = message_id
+            return self
+
+        def Text(self, text):
+            adapter = self._adapter
+            record = (self._account_id, self._target_type, self._target_id, getattr(self, "_reply", None), text)
+
+            async def _send():
+                await adapter.gate.wait()
+                adapter.sent.append(record)
+                return {"status": "ok", "retcode": 0}
+
+            return asyncio.create_task(_send())
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def call_api(self, endpoint, **params):
+        return {}
+
+    async def start(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
+@pytest.fixture
+def manager():
+    manager = AdapterManager()
+    manager._bots["mock"] = {bot_id: BotState("online") for bot_id in ("a", "b", "c")}
+    return manager
+
+
+@pytest.fixture
+def balancer(manager):
+    balancer = AccountBalancer(adapter_manager=manager)
+    balancer.enabled = True
+    balancer._platforms = {}
+    return balancer
+
+
+# ==================== 选择策略 ====================
+
+
+class TestSelect:
+    def test_round_robin(self, balancer):
+        balancer.policy = "round_robin"
+        balancer.sticky = False
+
+        assert [balancer.select("mock", "group", "1") for _ in range(6)] == list("abcabc")
+
+    def test_least_outstanding(self, balancer):
+        balancer.sticky = False
+        balancer._outstanding = {("mock", "a"): 3, ("mock", "b"): 1, ("mock", "c"): 2}
+
+        assert balancer.select("mock", "group", "1") == "b"
+
+    def test_sticky_per_target(self, balancer):
+        first = balancer.select("mock", "group", "1")
+
+        assert all(balancer.select("mock", "group", "1") == first for _ in range(5))
+        assert balancer.select("mock", "group", "2") != first
+
+    def test_sticky_expires(self, balancer):
+        balancer.policy = "round_robin"
+        balancer.sticky_ttl = 10
+        with patch("ErisPulse.Core.balancer.time.monotonic", side_effect=[100.0, 105.0, 200.0]):
+            assert balancer.select("mock", "group", "1") == "a"
+            assert balancer.select("mock", "group", "1") == "a"
+            assert balancer.select("mock", "group", "1") == "b"
+
+    def test_fallback_when_offline(self, balancer, manager):
+        first = balancer.select("mock", "group", "1")
+        manager._bots["mock"][first].status = "offline"
+
+        second = balancer.select("mock", "group", "1")
+        assert second != first
+        assert balancer.select("mock", "group", "1") == second
+
+    def test_single_and_no_account(self, balancer, manager):
+        manager._bots["mock"] = {"only": BotState("online"), "down": BotState("offline")}
+
+        assert balancer.select("mock", "group", "1") == "only"
+        assert balancer.select("unknown", "group", "1") is None
+
+    def test_learned_reachability(self, balancer):
+        balancer.observe("mock", "c", {"type": "message", "detail_type": "group", "group_id": "g1"})
+
+        assert balancer.select("mock", "group", "g1") == "c"
+        # 未学习过的目标在全部在线账号中选择
+        balancer.sticky = False
+        assert {balancer.select("mock", "group", "g2") for _ in range(3)} == {"a", "b", "c"}
+
+    def test_max_targets(self, balancer):
+        balancer.max_targets = 2
+        for target in ("1", "2", "3"):
+            balancer.select("mock", "group", target)
+
+        assert list(balancer._targets["mock"]) == [("group", "2"), ("group", "3")]
+
+
+# ==================== 发送 ====================
+
+
+class TestDispatch:
+    @pytest.fixture
+    def adapter(self, manager, balancer):
+        instance = BalancedAdapter()
+        manager._adapters["mock"] = instance
+        with patch("ErisPulse.Core.balancer.balancer", balancer):
+            yield instance
+
+    @pytest.mark.asyncio
+    async def test_account_selected_and_state_kept(self, adapter, balancer):
+        balancer.policy = "round_robin"
+        balancer.sticky = False
+        for i in range(3):
+            await adapter.Send.To("group", "1").Reply("m1").Text(f"t{i}")
+
+        assert [s[0] for s in adapter.sent] == ["a", "b", "c"]
+        assert all(s[1:4] == ("group", "1", "m1") for s in adapter.sent)
+        assert balancer.get_stats()["mock"]["accounts"]["a"] == {
+            "online": True, "outstanding": 0, "sent": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_explicit_account_untouched(self, adapter, balancer):
+        await adapter.Send.Using("z").To("group", "1").Text("hi")
+
+        assert adapter.sent[0][0] == "z"
+        assert balancer.get_stats() == {}
+
+    @pytest.mark.asyncio
+    async def test_outstanding_spreads_load(self, adapter, balancer):
+        balancer.sticky = False
+        adapter.gate.clear()
+        tasks = [adapter.Send.To("group", str(i)).Text("x") for i in range(6)]
+
+        assert balancer._outstanding == {("mock", "a"): 2, ("mock", "b"): 2, ("mock", "c"): 2}
+        adapter.gate.set()
+        await asyncio.gather(*tasks)
+        assert set(balancer._outstanding.values()) == {0}
+
+    @pytest.mark.asyncio
+    async def test_disabled_platform(self, adapter, balancer):
+        balancer.enable("mock", False)
+        await adapter.Send.To("group", "1").Text("hi")
+
+        assert adapter.sent[0][0] is None
+
+
+# ==================== 事件学习 ====================
+
+
+class TestObserve:
+    @pytest.mark.asyncio
+    async def test_emit_records_reachability(self, balancer):
+        event = {
+            "id": "1",
+            "type": "message",
+            "detail_type": "group",
+            "platform": "balancemock",
+            "group_id": "g1",
+            "user_id": "u1",
+            "self": {"platform": "balancemock", "user_id": "b2"},
+            "message": [],
+        }
+        from ErisPulse.Core import adapter
+
+        with patch("ErisPulse.Core.adapter.balancer", balancer):
+            await adapter.emit(event)
+
+        assert balancer._targets["balancemock"][("group", "g1")].accounts == {"b2"}
+        adapter._bots.pop("balancemock", None)
@@ -0,0 +1,135 @@
+"""
+基准测试套件单元测试
+
+测试场景运行与资源清理、统计结果格式，以及基线读写与回归判定
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.Core import adapter, logger, router
+from ErisPulse.Core.Event import command
+from ErisPulse.Core.benchmark import (
+    SCENARIOS,
+    BenchmarkSuite,
+    compare_baseline,
+    load_baseline,
+    save_baseline,
+)
+
+
+@pytest.fixture
+def suite():
+    return BenchmarkSuite(iterations=20, warmup=2)
+
+
+def _result(**scenarios):
+    return {"scenarios": {
+        name: {"ops_per_sec": ops, "p99_ms": p99} for name, (ops, p99) in scenarios.items()
+    }}
+
+
+# ==================== 运行 ====================
+
+
+class TestBenchmarkSuite:
+    @pytest.mark.asyncio
+    async def test_measure_sync_and_async(self, suite):
+        calls = []
+
+        async def async_op():
+            calls.append("async")
+
+        stats = await suite.measure(async_op)
+        assert stats["ops"] == 20
+        assert len(calls) == 22
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+        assert stats["ops_per_sec"] > 0
+
+        stats = await suite.measure(lambda: calls.append("sync"))
+        assert stats["ops"] == 20
+        assert calls.count("sync") == 22
+
+    @pytest.mark.asyncio
+    async def test_run_all_scenarios(self, suite):
+        handlers = list(logger._logger.handlers)
+        routes = len(router.app.router.routes)
+
+        result = await suite.run()
+
+        assert set(result["scenarios"]) == set(SCENARIOS)
+        for name, stats in result["scenarios"].items():
+            assert "error" not in stats, name
+            assert stats["ops"] == 20
+        assert result["iterations"] == 20
+        assert result["environment"]["loop"] in ("asyncio", "uvloop")
+        json.dumps(result)
+
+        # 场景结束后恢复全局状态
+        assert adapter.get("bench") is None
+        assert "bench" not in adapter._bots
+        assert command.get_command("__bench_ping") is None
+        assert len(router.app.router.routes) == routes
+        assert logger._logger.handlers == handlers
+
+    @pytest.mark.asyncio
+    async def test_failed_scenario_reported(self, suite):
+        router.register_websocket("bench", "/echo", lambda ws: None)
+        try:
+            with patch("ErisPulse.Core.benchmark.logger"):
+                stats = await suite.run_scenario("router.websocket")
+        finally:
+            router.unregister_websocket("bench", "/echo")
+
+        assert stats["error"].startswith("ValueError")
+
+    @pytest.mark.asyncio
+    async def test_unknown_scenario(self, suite):
+        with pytest.raises(ValueError):
+            await suite.run(["nope"])
+
+    def test_invalid_iterations(self):
+        with pytest.raises(ValueError):
+            BenchmarkSuite(iterations=0)
+
+
+# ==================== 基线 ====================
+
+
+class TestBaseline:
+    def test_save_and_load(self, tmp_path):
+        path = str(tmp_path / "baselines" / "bench.json")
+        save_baseline(_result(logger=(100.0, 1.0)), path)
+
+        assert load_baseline(path)["scenarios"]["logger"]["ops_per_sec"] == 100.0
+
+    def test_load_invalid(self, tmp_path):
+        path = tmp_path / "bad.json"
+        path.write_text("[]", encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            load_baseline(str(path))
+
+    def test_regression_threshold(self):
+        baseline = _result(a=(1000.0, 1.0), b=(1000.0, 1.0), c=(1000.0, 1.0))
+        current = _result(a=(950.0, 2.0), b=(850.0, 1.0), c=(1200.0, 0.5))
+        current["scenarios"]["d"] = {"ops_per_sec": 10.0, "p99_ms": 1.0}
+
+        comparison = {item["name"]: item for item in compare_baseline(current, baseline, 0.1)}
+
+        assert comparison["a"]["regressed"] is False
+        assert comparison["a"]["ops_change"] == -0.05
+        assert comparison["a"]["p99_change"] == 1.0
+        assert comparison["b"]["regressed"] is True
+        assert comparison["c"]["ops_change"] == 0.2
+        assert comparison["d"]["ops_change"] is None
+        assert comparison["d"]["regressed"] is False
+
+    def test_failed_scenario_is_regression(self):
+        baseline = _result(a=(1000.0, 1.0))
+        current = {"scenarios": {"a": {"error": "RuntimeError: x"}}}
+
+        (item,) = compare_baseline(current, baseline)
+        assert item["regressed"] is True
@@ -0,0 +1,295 @@
+"""
+多进程分片运行时单元测试
+
+在同一进程内通过真实的 Unix 域套接字连接前端与工作进程，
+使用模拟适配器验证事件分片、会话内顺序与发送代理
+"""
+
+import asyncio
+import random
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.Core.adapter import AdapterManager
+from ErisPulse.Core.Bases.adapter import BaseAdapter, SendDSL
+from ErisPulse.Core.cluster import (
+    ClusterError,
+    ClusterFront,
+    ClusterWorker,
+    ProxyAdapter,
+    event_shard_key,
+    shard_for,
+    worker_main,
+)
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="多进程运行模式需要 Unix 域套接字"
+)
+
+
+class MockAdapter(BaseAdapter):
+    class Send(SendDSL):
+        def Text(self, text: str):
+            self._adapter.sent.append((self._target_type, self._target_id, text))
+
+            async def _send():
+                return {"status": "ok", "message_id": f"m{len(self._adapter.sent)}"}
+
+            return asyncio.create_task(_send())
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+
+    async def call_api(self, endpoint: str, **params):
+        if endpoint == "fail":
+            raise RuntimeError("api failed")
+        return {"endpoint": endpoint, **params}
+
+    async def start(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
+def _event(group_id, seq):
+    return {
+        "id": f"{group_id}-{seq}",
+        "type": "message",
+        "detail_type": "group",
+        "platform": "mock",
+        "self": {"user_id": "bot"},
+        "user_id": "u1",
+        "group_id": group_id,
+        "message_id": seq,
+        "alt_message": f"msg {seq}",
+    }
+
+
+# ==================== 分片 ====================
+
+
+class TestSharding:
+    def test_shard_stable_and_bounded(self):
+        key = event_shard_key(_event("g1", 0))
+
+        assert key == event_shard_key(_event("g1", 99))
+        assert shard_for(key, 4) == shard_for(key, 4)
+        assert {shard_for(f"mock:group:{i}", 4) for i in range(100)} == {0, 1, 2, 3}
+
+    def test_private_events_keyed_by_user(self):
+        event = {"platform": "mock", "detail_type": "private", "user_id": "42"}
+
+        assert event_shard_key(event) == "mock:user:42"
+
+
+# ==================== 前端 + 工作进程 ====================
+
+
+@pytest.fixture
+async def cluster(tmp_path):
+    front_manager = AdapterManager()
+    front_manager.register("mock", MockAdapter)
+    front = ClusterFront(2, socket_path=str(tmp_path / "bus.sock"),
+                         adapter_manager=front_manager)
+    await front.start(spawn=False)
+
+    handled = {0: [], 1: []}
+    workers, serving = [], []
+    for index in range(2):
+        manager = AdapterManager()
+
+        async def dispatch(event, _index=index, _manager=manager):
+            await asyncio.sleep(random.uniform(0, 0.005))
+            result = await _manager.get("mock").Send.To(
+                "group", event["group_id"]
+            ).Text(f"echo {event['message_id']}")
+            handled[_index].append((event["group_id"], event["message_id"], result))
+
+        worker = ClusterWorker(front.socket_path, index, dispatch=dispatch,
+                               adapter_manager=manager)
+        await worker.connect()
+        workers.append((worker, manager))
+        serving.append(asyncio.create_task(worker.serve()))
+
+    await front.wait_ready(5)
+    yield front, front_manager.get("mock"), workers, handled
+
+    await front.stop()
+    await asyncio.wait_for(asyncio.gather(*serving), 5)
+
+
+class TestCluster:
+    @pytest.mark.asyncio
+    async def test_worker_gets_proxy_adapters(self, cluster):
+        _front, _mock, workers, _handled = cluster
+
+        for worker, manager in workers:
+            assert worker.platforms == ["mock"]
+            assert isinstance(manager.get("mock"), ProxyAdapter)
+            assert manager.is_running("mock")
+
+    @pytest.mark.asyncio
+    async def test_events_sharded_in_session_order(self, cluster):
+        front, mock, _workers, handled = cluster
+        groups = [f"g{i}" for i in range(6)]
+
+        for seq in range(60):
+            await front.forward(_event(groups[seq % len(groups)], seq))
+
+        for _ in range(200):
+            if sum(len(v) for v in handled.values()) == 60:
+                break
+            await asyncio.sleep(0.01)
+
+        assert sum(len(v) for v in handled.values()) == 60
+        assert len(mock.sent) == 60
+        for index, records in handled.items():
+            for group_id in groups:
+                seqs = [seq for g, seq, _ in records if g == group_id]
+                # 同一会话只会出现在一个工作进程中，且保持到达顺序
+                if seqs:
+                    assert seqs == sorted(seqs)
+                    expected = shard_for(f"mock:group:{group_id}", 2)
+                    assert index == expected
+            for _, _, result in records:
+                assert result["status"] == "ok"
+
+    @pytest.mark.asyncio
+    async def test_call_api_and_errors_proxied(self, cluster):
+        _front, _mock, workers, _handled = cluster
+        proxy = workers[0][1].get("mock")
+
+        assert await proxy.call_api("get_info", x=1) == {"endpoint": "get_info", "x": 1}
+        with pytest.raises(ClusterError, match="api failed"):
+            await proxy.call_api("fail")
+        with pytest.raises(ClusterError, match="AttributeError"):
+            await proxy.Send.To("user", "1").NoSuchMethod("x")
+
+
+# ==================== 工作进程守护 ====================
+
+
+class FakeProcess:
+    def __init__(self, alive=False, exitcode=3):
+        self.alive = alive
+        self.exitcode = exitcode
+
+    def is_alive(self):
+        return self.alive
+
+
+_SUPERVISOR = {"backoff_initial": 5, "backoff_multiplier": 2, "backoff_jitter": 0,
+               "circuit_threshold": 3}
+
+
+@pytest.fixture
+def supervised(tmp_path):
+    front = ClusterFront(1, socket_path=str(tmp_path / "bus.sock"))
+    front._ready = {0: asyncio.Event()}
+    front._processes = {0: FakeProcess()}
+    clock = [100.0]
+
+    def spawn(index):
+        front._processes[index] = FakeProcess()
+
+    with patch.object(front, "_spawn", side_effect=spawn) as mock_spawn, \
+            patch.object(AdapterManager, "_get_supervisor_config", return_value=_SUPERVISOR), \
+            patch("ErisPulse.Core.cluster.time.monotonic", side_effect=lambda: clock[0]):
+        yield front, mock_spawn, clock
+
+
+class TestWorkerSupervisor:
+    def test_respawn_waits_for_backoff(self, supervised):
+        front, mock_spawn, clock = supervised
+
+        front._check_workers()
+        clock[0] += 4
+        front._check_workers()
+        assert mock_spawn.call_count == 0
+        assert front._failures == {0: 1}
+
+        clock[0] += 1
+        front._check_workers()
+        assert mock_spawn.call_count == 1
+
+        # 第二次失败的退避时间翻倍
+        front._check_workers()
+        clock[0] += 9
+        front._check_workers()
+        assert mock_spawn.call_count == 1
+        clock[0] += 1
+        front._check_workers()
+        assert mock_spawn.call_count == 2
+
+    def test_stops_after_threshold(self, supervised):
+        front, mock_spawn, clock = supervised
+
+        for _ in range(2):
+            front._check_workers()
+            clock[0] += 60
+            front._check_workers()
+
+        with pytest.raises(ClusterError, match="连续 3 次"):
+            front._check_workers()
+        assert mock_spawn.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_ready_resets_failures(self, tmp_path):
+        front = ClusterFront(1, socket_path=str(tmp_path / "bus.sock"),
+                             adapter_manager=AdapterManager())
+        await front.start(spawn=False)
+        front._failures[0] = 2
+        worker = ClusterWorker(front.socket_path, 0, dispatch=lambda event: None,
+                               adapter_manager=AdapterManager())
+        await worker.connect()
+        serving = asyncio.create_task(worker.serve())
+
+        for _ in range(100):
+            if not front._failures:
+                break
+            await asyncio.sleep(0.01)
+
+        assert front._failures == {}
+        await front.stop()
+        await asyncio.wait_for(serving, 5)
+
+    def test_worker_exit_code_on_init_failure(self):
+        def run(main, implementation=None):
+            main.close()
+            return False
+
+        with patch("ErisPulse.runtime.run_event_loop", side_effect=run), \
+                pytest.raises(SystemExit) as exc_info:
+            worker_main("bus.sock", 0)
+
+        assert exc_info.value.code == 3
+
+
+# ==================== 前端事件转发 ====================
+
+
+class TestEventForwarder:
+    @pytest.mark.asyncio
+    async def test_emit_forwards_instead_of_dispatching(self):
+        manager = AdapterManager()
+        forwarded, dispatched = [], []
+
+        @manager.on("message")
+        async def local(event):
+            dispatched.append(event)
+
+        async def forwarder(event):
+            forwarded.append(event)
+
+        manager.set_event_forwarder(forwarder)
+        await manager.emit(_event("g1", 1))
+        manager.set_event_forwarder(None)
+        await manager.emit(_event("g1", 2))
+
+        assert [e["message_id"] for e in forwarded] == [1]
+        assert [e["message_id"] for e in dispatched] == [2]
+        assert "bot" in manager._bots["mock"]
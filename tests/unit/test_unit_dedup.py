@@ -0,0 +1,174 @@
+"""
+事件去重单元测试
+
+测试 LRU 与轮转布隆过滤器窗口的淘汰边界、按平台启用与计数，以及 adapter.emit 中的重复事件丢弃
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.Core import adapter
+from ErisPulse.Core.dedup import EventDeduplicator, LRUWindow, RotatingBloomWindow
+
+
+@pytest.fixture
+def dedup():
+    dedup = EventDeduplicator()
+    dedup.enabled = False
+    dedup._platforms = {}
+    return dedup
+
+
+# ==================== 去重窗口 ====================
+
+
+class TestLRUWindow:
+    def test_duplicate_within_window(self):
+        window = LRUWindow(window=60, max_entries=10)
+
+        assert window.check_and_add("a") is False
+        assert window.check_and_add("a") is True
+        assert window.check_and_add("b") is False
+
+    def test_size_bound(self):
+        window = LRUWindow(window=60, max_entries=3)
+        for key in "abcd":
+            window.check_and_add(key)
+
+        assert len(window) == 3
+        assert window.check_and_add("a") is False
+
+    def test_time_bound(self):
+        window = LRUWindow(window=10, max_entries=10)
+        with patch("ErisPulse.Core.dedup.time.monotonic", side_effect=[100.0, 105.0, 111.0]):
+            assert window.check_and_add("a") is False
+            assert window.check_and_add("a") is True
+            assert window.check_and_add("a") is False
+
+
+class TestRotatingBloomWindow:
+    def test_duplicate_detection(self):
+        window = RotatingBloomWindow(window=60, capacity=1000, error_rate=0.001)
+
+        assert all(window.check_and_add(f"e{i}") is False for i in range(500))
+        assert all(window.check_and_add(f"e{i}") is True for i in range(500))
+
+    def test_memory_fixed_by_configuration(self):
+        window = RotatingBloomWindow(window=60, capacity=1000, error_rate=0.01)
+        size = window.memory_bytes
+        for i in range(10000):
+            window.check_and_add(f"e{i}")
+
+        assert window.memory_bytes == size
+        assert len(window) <= 1000
+
+    def test_survives_one_rotation(self):
+        window = RotatingBloomWindow(window=60, capacity=2, error_rate=0.001)
+        window.check_and_add("a")
+        window.check_and_add("b")
+
+        # 写满后轮转：上一代中的键仍被识别为重复
+        assert window.check_and_add("a") is True
+        window.check_and_add("c")
+        window.check_and_add("d")
+        window.check_and_add("e")
+        assert window.check_and_add("b") is False
+
+    def test_invalid_error_rate(self):
+        with pytest.raises(ValueError):
+            RotatingBloomWindow(window=60, capacity=10, error_rate=1.5)
+
+
+# ==================== 去重器 ====================
+
+
+class TestEventDeduplicator:
+    def test_disabled_by_default(self, dedup):
+        assert dedup.is_duplicate("qq", "1") is False
+        assert dedup.is_duplicate("qq", "1") is False
+        assert dedup.get_stats() == {}
+
+    def test_per_platform_enable(self, dedup):
+        dedup.enable("telegram")
+
+        assert dedup.is_duplicate("telegram", "1") is False
+        assert dedup.is_duplicate("telegram", "1") is True
+        assert dedup.is_duplicate("qq", "1") is False
+        assert dedup.is_duplicate("qq", "1") is False
+
+        stats = dedup.get_stats()
+        assert stats["telegram"]["checked"] == 2
+        assert stats["telegram"]["duplicates"] == 1
+        assert stats["telegram"]["tracked"] == 1
+        assert "qq" not in stats
+
+    def test_platform_override_global(self, dedup):
+        dedup.enable()
+        dedup.enable("qq", False)
+
+        assert dedup.is_enabled("telegram") is True
+        assert dedup.is_enabled("qq") is False
+
+    def test_same_id_different_platform(self, dedup):
+        dedup.enable()
+
+        assert dedup.is_duplicate("a", "1") is False
+        assert dedup.is_duplicate("b", "1") is False
+
+    def test_missing_id_not_deduplicated(self, dedup):
+        dedup.enable()
+
+        assert dedup.is_duplicate("a", None) is False
+        assert dedup.is_duplicate("a", None) is False
+
+    def test_bloom_strategy(self, dedup):
+        dedup.strategy = "bloom"
+        dedup.bloom_capacity = 100
+        dedup.enable()
+
+        assert dedup.is_duplicate("a", "1") is False
+        assert dedup.is_duplicate("a", "1") is True
+        assert isinstance(dedup._windows["a"], RotatingBloomWindow)
+
+    def test_reset(self, dedup):
+        dedup.enable()
+        dedup.is_duplicate("a", "1")
+        dedup.reset()
+
+        assert dedup.is_duplicate("a", "1") is False
+        assert dedup.get_stats()["a"]["checked"] == 1
+
+
+# ==================== 分发 ====================
+
+
+class TestEmitDeduplication:
+    @pytest.mark.asyncio
+    async def test_emit_drops_duplicates(self, dedup):
+        received = []
+
+        @adapter.on("message", platform="dedupmock")
+        async def on_message(data):
+            received.append(data["id"])
+
+        event = {
+            "id": "retry-1",
+            "type": "message",
+            "detail_type": "private",
+            "platform": "dedupmock",
+            "message": [],
+        }
+        dedup.enable("dedupmock")
+        try:
+            with patch("ErisPulse.Core.adapter.deduplicator", dedup):
+                await adapter.emit(event)
+                await adapter.emit(dict(event))
+                await adapter.emit(dict(event, id="retry-2"))
+        finally:
+            adapter._onebot_handlers["message"] = [
+                h for h in adapter._onebot_handlers["message"] if h["func"] is not on_message
+            ]
+
+        assert received == ["retry-1", "retry-2"]
+        assert dedup.get_stats()["dedupmock"]["duplicates"] == 1
@@ -14,8 +14,8 @@ from ErisPulse.Core.Event import (
     command, message, notice, request, meta,
     register_event_method, register_event_mixin,
     unregister_event_method, unregister_platform_event_methods,
-    get_platform_event_methods,
-    Conversation, CONFIRM_YES_WORDS, CONFIRM_NO_WORDS,
+    get_platform_event_methods, get_event_class,
+    Conversation, CONFIRM_YES_WORDS, CONFIRM_NO_WORDS, EventFilter,
 )
 from ErisPulse.Core.Event.wrapper import Event, _platform_event_methods
 from ErisPulse.Core.Event.base import BaseEventHandler
@@ -430,6 +430,61 @@ class TestCommandHandler:
         assert len(called) == 1
         assert called[0]["command"]["name"] == "test"
 
+    @pytest.mark.asyncio
+    async def test_must_at_bot_uses_event_mentions(self, monkeypatch):
+        """测试 must_at_bot 在群聊中要求@机器人"""
+        called = []
+
+        @command("test", help="测试")
+        async def test_handler(event):
+            called.append(event)
+
+        monkeypatch.setattr(command, "must_at_bot", True)
+
+        def _group_event(mentions):
+            return Event({
+                "type": "message",
+                "detail_type": "group",
+                "platform": "test",
+                "self": {"platform": "test", "user_id": "bot"},
+                "user_id": "user123",
+                "group_id": "g1",
+                "message": [
+                    *({"type": "mention", "data": {"user_id": m}} for m in mentions),
+                    {"type": "text", "data": {"text": "/test"}},
+                ],
+                "alt_message": "/test",
+            })
+
+        await command._handle_message(_group_event(["other"]))
+        assert called == []
+
+        await command._handle_message(_group_event(["bot"]))
+        assert len(called) == 1
+
+    @pytest.mark.asyncio
+    async def test_pending_reply_matches_session_key(self):
+        """测试等待回复按会话键匹配"""
+        future = asyncio.get_running_loop().create_future()
+        command._waiting_replies["test:user123:g1"] = {
+            "future": future,
+            "callback": None,
+            "validator": None,
+            "timestamp": 0,
+        }
+
+        reply = Event({
+            "type": "message",
+            "detail_type": "group",
+            "platform": "test",
+            "user_id": "user123",
+            "group_id": "g1",
+        })
+        await command._check_pending_reply(reply)
+
+        assert future.result() is reply
+        assert reply.is_processed()
+
 
 # ==================== 消息处理测试 ====================
 
@@ -464,7 +519,7 @@ class TestMessageHandler:
         
         # 验证注册
         assert len(message.handler.handlers) == 1
-        assert message.handler.handlers[0]["condition"] is not None
+        assert message.handler.handlers[0]["filter"].detail_type == {"private"}
     
     def test_on_group_message_decorator(self, clear_handlers):
         """测试群聊消息装饰器"""
@@ -762,6 +817,69 @@ class TestEventWrapper:
         assert "message" in repr_str
         assert "private" in repr_str
 
+    def test_session_info(self, sample_event):
+        """测试会话信息派生字段"""
+        assert sample_event.get_receive_type() == "private"
+        assert sample_event.get_send_target() == ("user", "user_123")
+        assert sample_event.get_user_session_key() == "test_platform:user_123:user_123"
+        assert str(sample_event.get_session()) == "test_platform:user:user_123"
+        assert sample_event.get_session() is Event(dict(sample_event)).get_session()
+
+    def test_derived_fields_cached(self, sample_event):
+        """测试派生字段只计算一次"""
+        with patch(
+            "ErisPulse.Core.Event.wrapper.get_send_type_and_target_id",
+            return_value=("user", "user_123"),
+        ) as resolver:
+            sample_event.get_send_target()
+            sample_event.get_user_session_key()
+            sample_event.get_send_target()
+        assert resolver.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_command_replies_reuse_cached_target(self, sample_event):
+        """测试命令错误回复复用缓存的发送目标"""
+        mock_adapter = Mock()
+        mock_adapter.test_platform.Send.To.return_value.Text = AsyncMock()
+        sample_event.get_send_target()
+        with patch("ErisPulse.Core.Event.command.adapter", mock_adapter), patch(
+            "ErisPulse.Core.Event.wrapper.get_send_type_and_target_id"
+        ) as resolver:
+            await command._send_permission_denied(sample_event)
+            await command._send_command_error(sample_event, "boom")
+        resolver.assert_not_called()
+        assert mock_adapter.test_platform.Send.To.call_count == 2
+        mock_adapter.test_platform.Send.To.assert_called_with("user", "user_123")
+
+    def test_derived_fields_invalidated_on_mutation(self, sample_event):
+        """测试修改依赖键后派生字段失效"""
+        assert sample_event.has_mention() is False
+        assert sample_event.get_user_session_key() == "test_platform:user_123:user_123"
+
+        sample_event["detail_type"] = "group"
+        sample_event["group_id"] = "group_1"
+        sample_event["message"] = [
+            {"type": "mention", "data": {"user_id": "bot_123"}},
+            {"type": "text", "data": {"text": "hi"}},
+        ]
+
+        assert sample_event.get_receive_type() == "group"
+        assert sample_event.get_user_session_key() == "test_platform:user_123:group_1"
+        assert sample_event.has_mention() is True
+        assert sample_event.get_mention_set() == frozenset({"bot_123"})
+
+        sample_event.update({"alt_message": "changed"})
+        assert sample_event.get_text() == "changed"
+
+        del sample_event["alt_message"]
+        assert sample_event.get_text() == ""
+
+    def test_unrelated_mutation_keeps_cache(self, sample_event):
+        """测试修改无关键不清空缓存"""
+        sample_event.get_user_session_key()
+        sample_event["_processed"] = True
+        assert "user_session_key" in sample_event._derived
+
 
 # ==================== 平台事件方法扩展测试 ====================
 
@@ -1148,6 +1266,57 @@ class TestEventPlatformMethodDispatch:
         assert event.get_subject() == "Test Subject"
         assert event.get_from() == "sender@example.com"
 
+    def test_event_constructed_as_platform_subclass(self):
+        """测试 Event(data) 构造为平台子类，扩展方法为真实类属性"""
+        @register_event_method("email")
+        def get_subject(self):
+            return self.get("email_raw", {}).get("subject", "")
+
+        event = Event({"platform": "email", "email_raw": {"subject": "Hi"}})
+        email_cls = get_event_class("email")
+
+        assert type(event) is email_cls
+        assert isinstance(event, Event)
+        assert "get_subject" in email_cls.__dict__
+        assert get_event_class("email") is email_cls
+        assert type(Event({"platform": "telegram"})) is Event
+        assert get_event_class("telegram") is Event
+
+    def test_platform_subclass_tracks_registration_changes(self):
+        """测试注册/注销方法原地更新已生成的平台子类"""
+        @register_event_method("email")
+        def get_subject(self):
+            return "subject"
+
+        event = Event({"platform": "email"})
+
+        @register_event_method("email")
+        def get_from(self):
+            return "from"
+
+        assert event.get_from() == "from"
+
+        unregister_event_method("email", "get_subject")
+        assert not hasattr(event, "get_subject")
+
+        unregister_platform_event_methods("email")
+        assert type(Event({"platform": "email"})) is Event
+
+    def test_platform_subclass_survives_copy_and_pickle(self):
+        """测试平台子类事件在复制和序列化后仍为对应子类"""
+        import pickle
+
+        @register_event_method("email")
+        def get_subject(self):
+            return self.get("email_raw", {}).get("subject", "")
+
+        event = Event({"platform": "email", "email_raw": {"subject": "Hi"}})
+
+        assert Event(dict(event)).get_subject() == "Hi"
+        restored = pickle.loads(pickle.dumps(event))
+        assert type(restored) is type(event)
+        assert restored.get_subject() == "Hi"
+
 
 # ==================== 并行事件处理测试 ====================
 
@@ -1279,6 +1448,114 @@ class TestParallelEventHandling:
 
 # ==================== 交互方法测试 ====================
 
+class TestIndexedFilters:
+    """声明式过滤条件索引测试类"""
+
+    @pytest.fixture
+    def handler(self):
+        handler = BaseEventHandler("message", "test_filters")
+        yield handler
+        handler._clear_handlers()
+
+    @staticmethod
+    def _event(**fields):
+        return Event({
+            "type": "message",
+            "detail_type": "group",
+            "platform": "qq",
+            "user_id": "u1",
+            "self": {"user_id": "bot"},
+            **fields,
+        })
+
+    def test_event_filter_matches(self):
+        f = EventFilter(detail_type="group", group_id={1, "2"})
+
+        assert f.matches({"detail_type": "group", "group_id": "1"})
+        assert f.matches({"detail_type": "group", "group_id": 2})
+        assert not f.matches({"detail_type": "group", "group_id": "3"})
+        assert not f.matches({"detail_type": "private", "group_id": "1"})
+        assert f.index_field() == "group_id"
+        assert EventFilter.coerce({}) is None
+
+    def test_unknown_filter_field_rejected(self, handler):
+        with pytest.raises(TypeError):
+            handler.register(lambda e: None, filters={"nickname": "x"})
+
+    @pytest.mark.asyncio
+    async def test_only_matching_handlers_considered(self, handler):
+        called = []
+        conditions = []
+
+        for i in range(200):
+            def condition(event, _i=i):
+                conditions.append(_i)
+                return True
+
+            async def on_group(event, _i=i):
+                called.append(_i)
+
+            handler.register(on_group, condition=condition, filters={"group_id": f"g{i}"})
+
+        await handler._process_event(self._event(group_id="g42"))
+
+        assert called == [42]
+        assert conditions == [42]
+        assert len(handler._candidate_handlers(self._event(group_id="g7"))) == 1
+
+    @pytest.mark.asyncio
+    async def test_priority_order_across_index_and_fallback(self, handler):
+        order = []
+
+        async def by_user(event):
+            order.append("user")
+
+        async def by_condition(event):
+            order.append("condition")
+
+        async def by_group(event):
+            order.append("group")
+
+        handler.register(by_user, priority=2, filters={"user_id": "u1"})
+        handler.register(by_condition, priority=0, condition=lambda e: True)
+        handler.register(by_group, priority=1, filters={"group_id": "g1", "platform": "qq"})
+
+        await handler._process_event(self._event(group_id="g1"))
+        assert order == ["condition", "group", "user"]
+
+        order.clear()
+        await handler._process_event(self._event(group_id="g1", platform="tg"))
+        assert order == ["condition", "user"]
+
+    @pytest.mark.asyncio
+    async def test_index_rebuilt_after_unregister(self, handler):
+        called = []
+
+        async def on_group(event):
+            called.append(event)
+
+        handler.register(on_group, filters={"group_id": "g1"})
+        await handler._process_event(self._event(group_id="g1"))
+        handler.unregister(on_group)
+        await handler._process_event(self._event(group_id="g1"))
+
+        assert len(called) == 1
+
+    def test_message_decorators_use_filters(self):
+        message._clear_message_handlers()
+        try:
+            @message.on_group_message(group_id="123")
+            async def on_group(event):
+                pass
+
+            info = message.handler.handlers[0]
+            assert info["condition"] is None
+            assert info["filter"].detail_type == {"group"}
+            assert info["filter"].group_id == {"123"}
+        finally:
+            message._clear_message_handlers()
+
+
 class TestInteractiveMethods:
     """交互方法测试类"""
 
@@ -0,0 +1,138 @@
+"""
+事件循环配置单元测试
+
+测试事件循环实现选择、uvloop 回退以及默认线程池与调试模式调优
+"""
+
+import asyncio
+import builtins
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.runtime import event_loop
+from ErisPulse.runtime.event_loop import (
+    get_loop_factory,
+    get_loop_info,
+    run_event_loop,
+    tune_event_loop,
+)
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+requires_uvloop = pytest.mark.skipif(uvloop is None, reason="uvloop 未安装")
+
+
+def _loop_config(**overrides):
+    config = {
+        "implementation": "asyncio",
+        "default_executor_workers": 0,
+        "debug": False,
+        "slow_callback_duration": 0.1,
+    }
+    config.update(overrides)
+    return patch.object(event_loop, "get_loop_config", return_value=config)
+
+
+@pytest.fixture(autouse=True)
+def reset_tuned_loop():
+    yield
+    event_loop._tuned_loop = None
+
+
+# ==================== 实现选择 ====================
+
+
+class TestLoopFactory:
+    def test_asyncio_uses_default(self):
+        assert get_loop_factory("asyncio") is None
+
+    def test_invalid_implementation(self):
+        with pytest.raises(ValueError):
+            get_loop_factory("trio")
+
+    def test_reads_config(self):
+        with _loop_config(implementation="asyncio"):
+            assert get_loop_factory() is None
+
+    @requires_uvloop
+    def test_uvloop_factory(self):
+        assert get_loop_factory("uvloop") is uvloop.new_event_loop
+
+    def test_missing_uvloop_falls_back(self):
+        real_import = builtins.__import__
+
+        def fake_import(name, *args, **kwargs):
+            if name == "uvloop":
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        with patch("builtins.__import__", side_effect=fake_import), \
+                patch("ErisPulse.Core.logger.logger.warning") as mock_warning:
+            assert get_loop_factory("uvloop") is None
+
+        assert "uvloop" in mock_warning.call_args[0][0]
+
+
+# ==================== 运行与调优 ====================
+
+
+class TestRunEventLoop:
+    def test_run_with_asyncio(self):
+        async def main():
+            return get_loop_info()["implementation"]
+
+        with _loop_config():
+            assert run_event_loop(main(), "asyncio") == "asyncio"
+
+    @requires_uvloop
+    def test_run_with_uvloop(self):
+        async def main():
+            return get_loop_info()
+
+        with _loop_config():
+            info = run_event_loop(main(), "uvloop")
+
+        assert info["implementation"] == "uvloop"
+
+    def test_tune_default_executor_and_debug(self):
+        async def main():
+            loop = asyncio.get_running_loop()
+            thread_name = await loop.run_in_executor(
+                None, lambda: threading.current_thread().name
+            )
+            return thread_name, get_loop_info()
+
+        with _loop_config(default_executor_workers=2, debug=True,
+                          slow_callback_duration=0.25), \
+                patch("ErisPulse.Core.logger.logger.info"):
+            thread_name, info = run_event_loop(main(), "asyncio")
+
+        assert thread_name.startswith("ErisPulse-loop")
+        assert info["debug"] is True
+        assert info["slow_callback_duration"] == 0.25
+
+    @pytest.mark.asyncio
+    async def test_tune_only_once(self):
+        loop = asyncio.get_running_loop()
+
+        with _loop_config(default_executor_workers=2), \
+                patch.object(loop, "set_default_executor") as mock_set:
+            tune_event_loop()
+            tune_event_loop()
+
+        mock_set.assert_called_once()
+
+    def test_invalid_implementation_closes_coroutine(self):
+        async def main():
+            pass
+
+        coro = main()
+        with pytest.raises(ValueError):
+            run_event_loop(coro, "trio")
+
+        assert coro.cr_frame is None
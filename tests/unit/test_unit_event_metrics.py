@@ -0,0 +1,234 @@
+"""
+事件处理器超时与耗时统计单元测试
+
+测试处理器超时取消、慢处理器告警、延迟直方图以及 get_handler_stats 汇总
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.Core.Event import command, get_handler_stats, message
+from ErisPulse.Core.Event.base import BaseEventHandler, handler_options
+from ErisPulse.Core.Event.metrics import LatencyHistogram, percentile, percentile_rank
+from ErisPulse.Core.Event.wrapper import Event
+
+
+def _event(text="hi"):
+    return Event({
+        "type": "message",
+        "detail_type": "private",
+        "platform": "test",
+        "self": {"user_id": "bot"},
+        "user_id": "u1",
+        "alt_message": text,
+    })
+
+
+# ==================== LatencyHistogram ====================
+
+
+class TestLatencyHistogram:
+    def test_percentiles(self):
+        hist = LatencyHistogram()
+        for _ in range(98):
+            hist.record(0.002)
+        hist.record(0.3)
+        hist.record(0.4)
+
+        assert hist.count == 100
+        assert hist.percentile(50) == 0.0025
+        assert hist.percentile(99) == 0.4
+        assert hist.to_dict()["max_ms"] == 400.0
+
+    def test_overflow_bucket_and_reset(self):
+        hist = LatencyHistogram()
+        hist.record(120.0)
+
+        assert hist.percentile(99) == 120.0
+
+        hist.reset()
+        assert hist.count == 0
+        assert hist.percentile(99) == 0.0
+        assert hist.to_dict()["avg_ms"] == 0.0
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        samples = [float(i) for i in range(1, 101)]
+
+        assert percentile(samples, 50) == 50.0
+        assert percentile(samples, 99) == 99.0
+        assert percentile(samples, 100) == 100.0
+        assert percentile([0.5], 1) == 0.5
+        assert percentile([], 99) == 0.0
+        assert percentile_rank(7, 95) == 7
+        assert percentile_rank(0, 50) == 0
+
+
+# ==================== 超时与告警 ====================
+
+
+class TestHandlerTimeout:
+    @pytest.fixture
+    def handler(self):
+        handler = BaseEventHandler("message", "test_metrics")
+        handler.default_timeout = 0
+        handler.slow_threshold = 0
+        yield handler
+        handler._clear_handlers()
+
+    @pytest.mark.asyncio
+    async def test_hung_handler_cancelled(self, handler):
+        order = []
+        cancelled = asyncio.Event()
+
+        async def hung(event):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def later(event):
+            order.append("later")
+
+        handler.register(hung, priority=0, timeout=0.05)
+        handler.register(later, priority=1)
+
+        with patch("ErisPulse.Core.Event.base.logger") as mock_logger:
+            await handler._process_event(_event())
+
+        assert cancelled.is_set()
+        assert order == ["later"]
+        assert handler.handlers[0]["stats"].timeouts == 1
+        message_text = mock_logger.warning.call_args[0][0]
+        assert "hung" in message_text and "test_metrics" in message_text
+
+    @pytest.mark.asyncio
+    async def test_default_timeout_from_handler(self, handler):
+        handler.default_timeout = 0.05
+
+        async def hung(event):
+            await asyncio.sleep(10)
+
+        handler.register(hung)
+
+        with patch("ErisPulse.Core.Event.base.logger"):
+            await asyncio.wait_for(handler._process_event(_event()), 2)
+
+        assert handler.handlers[0]["stats"].timeouts == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_handler_warning(self, handler):
+        handler.slow_threshold = 0.01
+
+        async def slow(event):
+            await asyncio.sleep(0.02)
+
+        handler.register(slow)
+
+        with patch("ErisPulse.Core.Event.base.logger") as mock_logger:
+            await handler._process_event(_event())
+
+        message_text = mock_logger.warning.call_args[0][0]
+        assert "缓慢" in message_text and "slow" in message_text
+
+    @pytest.mark.asyncio
+    async def test_errors_counted(self, handler):
+        def broken(event):
+            raise RuntimeError("boom")
+
+        handler.register(broken)
+
+        with patch("ErisPulse.Core.Event.base.logger"):
+            await handler._process_event(_event())
+
+        stats = handler.handlers[0]["stats"]
+        assert stats.errors == 1 and stats.count == 1
+
+
+class TestCommandTimeout:
+    @pytest.fixture
+    def dispatcher(self):
+        original = command.handler.default_timeout
+        command.handler.default_timeout = 0.05
+        yield command.handler
+        command.handler.default_timeout = original
+        for name in ("metrics_long", "metrics_limited"):
+            command.commands.pop(name, None)
+
+    @pytest.mark.asyncio
+    async def test_global_timeout_not_applied_to_commands(self, dispatcher):
+        finished = []
+
+        @command("metrics_long")
+        async def long_command(event):
+            await asyncio.sleep(0.1)
+            finished.append(event)
+
+        await dispatcher._process_event(_event("/metrics_long"))
+
+        assert len(finished) == 1
+
+    @pytest.mark.asyncio
+    async def test_per_command_timeout(self, dispatcher):
+        cancelled = asyncio.Event()
+
+        @command("metrics_limited", timeout=0.05)
+        async def limited(event):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch("ErisPulse.Core.Event.command.logger") as mock_logger, \
+                patch.object(command, "_send_command_error") as send_error:
+            await asyncio.wait_for(dispatcher._process_event(_event("/metrics_limited")), 2)
+
+        assert cancelled.is_set()
+        assert "metrics_limited" in mock_logger.warning.call_args[0][0]
+        send_error.assert_awaited_once()
+
+
+# ==================== 汇总 ====================
+
+
+class TestHandlerStats:
+    def test_handler_options_split(self):
+        kwargs = handler_options({"timeout": 3, "user_id": "1"}, detail_type="group")
+
+        assert kwargs == {
+            "timeout": 3,
+            "filters": {"detail_type": "group", "user_id": "1"},
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_handler_stats(self):
+        message._clear_message_handlers()
+        try:
+            @message.on_private_message(timeout=5)
+            async def fast_handler(event):
+                pass
+
+            @message.on_private_message(priority=1)
+            async def slow_handler(event):
+                await asyncio.sleep(0.02)
+
+            assert message.handler.handlers[0]["timeout"] == 5
+
+            await message.handler._process_event(_event())
+
+            stats = {item["handler"]: item for item in get_handler_stats()}
+            fast = stats[f"{__name__}.{fast_handler.__qualname__}"]
+            slow = stats[f"{__name__}.{slow_handler.__qualname__}"]
+
+            assert fast["count"] == slow["count"] == 1
+            assert fast["event_type"] == "message"
+            assert slow["p99_ms"] >= fast["p99_ms"]
+            ordered = [item["handler"] for item in get_handler_stats()]
+            assert ordered.index(slow["handler"]) < ordered.index(fast["handler"])
+        finally:
+            message._clear_message_handlers()
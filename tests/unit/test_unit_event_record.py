@@ -0,0 +1,271 @@
+"""
+紧凑事件记录单元测试
+
+测试 EventRecord 的映射接口、LazyRaw 的延迟解码，
+以及 AdapterManager.emit / Event 对紧凑事件的处理
+"""
+
+import json
+import pickle
+import sys
+
+import pytest
+
+from ErisPulse.Core.adapter import AdapterManager
+from ErisPulse.Core.Event import Event, EventRecord, LazyRaw
+from ErisPulse.Core.Event.base import BaseEventHandler
+
+
+# ==================== Fixtures ====================
+
+
+@pytest.fixture
+def manager():
+    manager = AdapterManager()
+    manager._onebot_handlers.clear()
+    manager._raw_handlers.clear()
+    manager._onebot_middlewares.clear()
+    yield manager
+    manager._onebot_handlers.clear()
+    manager._raw_handlers.clear()
+    manager._onebot_middlewares.clear()
+
+
+class _CountingThunk:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def _make_record(raw=None, **extra):
+    return EventRecord(
+        "message",
+        "private",
+        "fast",
+        id="evt_1",
+        time=1712345678,
+        self_info={"platform": "fast", "user_id": "bot"},
+        user_id="u1",
+        message=[{"type": "text", "data": {"text": "hi"}}],
+        alt_message="hi",
+        raw=raw,
+        raw_type="text_message" if raw is not None else None,
+        **extra,
+    )
+
+
+# ==================== LazyRaw ====================
+
+
+class TestLazyRaw:
+    def test_bytes_decoded_once(self):
+        raw = LazyRaw(json.dumps({"msg_type": "text"}).encode())
+
+        assert raw.decoded is False
+        assert raw["msg_type"] == "text"
+        assert raw.decoded is True
+        assert raw.resolve() is raw.resolve()
+
+    def test_thunk_called_once(self):
+        thunk = _CountingThunk({"a": 1})
+        raw = LazyRaw(thunk)
+
+        assert dict(raw) == {"a": 1}
+        assert raw.get("a") == 1
+        assert thunk.calls == 1
+
+    def test_wrap(self):
+        assert isinstance(LazyRaw.wrap(b"{}"), LazyRaw)
+        assert isinstance(LazyRaw.wrap(lambda: {}), LazyRaw)
+        payload = {"a": 1}
+        assert LazyRaw.wrap(payload) is payload
+        assert LazyRaw.wrap(None) is None
+
+    def test_pickle_carries_decoded_value(self):
+        raw = LazyRaw(lambda: {"a": 1})
+
+        restored = pickle.loads(pickle.dumps(raw))
+
+        assert restored.decoded is True
+        assert restored.resolve() == {"a": 1}
+
+
+# ==================== EventRecord ====================
+
+
+class TestEventRecord:
+    def test_mapping_interface(self):
+        record = _make_record(raw=b'{"k": 1}', custom_field="x")
+
+        assert record["type"] == "message"
+        assert record["self"]["user_id"] == "bot"
+        assert record.get("group_id") is None
+        assert "group_id" not in record
+        assert record["custom_field"] == "x"
+        assert record["fast_raw_type"] == "text_message"
+        assert isinstance(record["fast_raw"], LazyRaw)
+        assert record["fast_raw"].decoded is False
+
+    def test_to_dict_omits_empty_fields(self):
+        data = _make_record().to_dict()
+
+        assert "group_id" not in data
+        assert "fast_raw" not in data
+        assert data["alt_message"] == "hi"
+
+    def test_from_dict_roundtrip(self):
+        data = {
+            "id": "1",
+            "type": "notice",
+            "detail_type": "friend_add",
+            "platform": "qq",
+            "self": {"user_id": "bot"},
+            "user_id": "u",
+            "qq_raw": {"post_type": "notice"},
+            "qq_raw_type": "friend_add",
+            "qq_extra": 1,
+        }
+
+        record = EventRecord.from_dict(data)
+
+        assert record.to_dict() == data
+        assert record.get_raw() == {"post_type": "notice"}
+
+    def test_slots_smaller_than_dict(self):
+        record = _make_record()
+
+        assert not hasattr(record, "__dict__")
+        assert sys.getsizeof(record) < sys.getsizeof(record.to_dict())
+
+
+# ==================== Event 包装 ====================
+
+
+class TestEventFromRecord:
+    def test_event_wraps_record(self):
+        event = Event(_make_record(raw=b'{"msg_type": "text"}'))
+
+        assert isinstance(event, dict)
+        assert event.get_text() == "hi"
+        assert event.get_self_user_id() == "bot"
+        assert event.get_raw_type() == "text_message"
+
+    def test_get_raw_decodes_lazily(self):
+        thunk = _CountingThunk({"msg_type": "text"})
+        event = Event(_make_record(raw=thunk))
+
+        assert thunk.calls == 0
+        assert event.get_raw() == {"msg_type": "text"}
+        assert event["fast_raw"] == {"msg_type": "text"}
+        event.get_raw()
+        assert thunk.calls == 1
+
+    def test_to_dict_resolves_raw(self):
+        event = Event(_make_record(raw=b'{"a": 1}'))
+
+        assert json.loads(json.dumps(event.to_dict()))["fast_raw"] == {"a": 1}
+
+
+# ==================== emit 集成 ====================
+
+
+class TestEmitRecord:
+    @pytest.mark.asyncio
+    async def test_raw_not_decoded_without_raw_handlers(self, manager):
+        thunk = _CountingThunk({"msg_type": "text"})
+        received = []
+
+        @manager.on("message")
+        async def handler(data):
+            received.append(Event(data))
+
+        await manager.emit(_make_record(raw=thunk))
+
+        assert received[0].get_user_id() == "u1"
+        assert thunk.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_raw_handler_for_other_platform_does_not_decode(self, manager):
+        thunk = _CountingThunk({})
+
+        @manager.on("text_message", raw=True, platform="other")
+        async def handler(data):
+            pass
+
+        await manager.emit(_make_record(raw=thunk))
+
+        assert thunk.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_matching_raw_handler_gets_decoded_payload(self, manager):
+        raw_received = []
+
+        @manager.on("text_message", raw=True, platform="fast")
+        async def handler(data):
+            raw_received.append(data)
+
+        await manager.emit(_make_record(raw=b'{"msg_type": "text"}'))
+
+        assert raw_received == [{"msg_type": "text"}]
+
+    @pytest.mark.asyncio
+    async def test_lazy_raw_in_plain_dict_event(self, manager):
+        thunk = _CountingThunk({"x": 1})
+        raw_received = []
+
+        @manager.on("*", raw=True)
+        async def handler(data):
+            raw_received.append(data)
+
+        await manager.emit({
+            "type": "message",
+            "platform": "fast",
+            "fast_raw": LazyRaw(thunk),
+            "fast_raw_type": "anything",
+        })
+
+        assert raw_received == [{"x": 1}]
+        assert thunk.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_middleware_receives_dict(self, manager):
+        seen = []
+
+        @manager.middleware
+        async def middleware(data):
+            seen.append(type(data))
+            data["tagged"] = True
+            return data
+
+        received = []
+
+        @manager.on("message")
+        async def handler(data):
+            received.append(data)
+
+        await manager.emit(_make_record())
+
+        assert seen == [dict]
+        assert received[0]["tagged"] is True
+
+    @pytest.mark.asyncio
+    async def test_event_handler_dispatch(self, manager, monkeypatch):
+        import ErisPulse.Core.Event.base as base_module
+
+        monkeypatch.setattr(base_module, "adapter", manager)
+        handler = BaseEventHandler("message", "record_test")
+        received = []
+
+        @handler.register
+        async def on_message(event):
+            received.append(event)
+            event.mark_processed()
+
+        await manager.emit(_make_record())
+
+        assert isinstance(received[0], Event)
+        assert received[0].is_processed()
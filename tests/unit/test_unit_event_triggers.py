@@ -0,0 +1,224 @@
+"""
+关键词/正则触发引擎单元测试
+
+测试 Aho-Corasick 自动机、正则合并扫描，以及 message.on_keyword / message.on_regex 的分发
+"""
+
+import re
+
+import pytest
+
+from ErisPulse.Core.Event import message
+from ErisPulse.Core.Event.base import BaseEventHandler
+from ErisPulse.Core.Event.triggers import (
+    AhoCorasick,
+    KeywordTrigger,
+    RegexTrigger,
+    TriggerEngine,
+)
+from ErisPulse.Core.Event.wrapper import Event
+
+
+def _event(text, **fields):
+    return Event({
+        "type": "message",
+        "detail_type": "group",
+        "platform": "test",
+        "self": {"user_id": "bot"},
+        "user_id": "u1",
+        "group_id": "g1",
+        "message": [{"type": "text", "data": {"text": text}}],
+        "alt_message": text,
+        **fields,
+    })
+
+
+# ==================== Aho-Corasick ====================
+
+
+class TestAhoCorasick:
+    def test_overlapping_matches(self):
+        ac = AhoCorasick()
+        for word in ("he", "she", "his", "hers"):
+            ac.add(word, word)
+        ac.build()
+
+        assert list(ac.iter_matches("ushers")) == ["she", "he", "hers"]
+
+    def test_matches_naive_search(self):
+        words = ["ab", "abc", "bca", "c", "caab", "aa"]
+        ac = AhoCorasick()
+        for word in words:
+            ac.add(word, word)
+
+        text = "aabcaabcabca"
+        found = set(ac.iter_matches(text))
+
+        assert found == {w for w in words if w in text}
+
+    def test_empty_keyword_rejected(self):
+        with pytest.raises(ValueError):
+            AhoCorasick().add("", 1)
+        with pytest.raises(ValueError):
+            KeywordTrigger([])
+
+
+# ==================== TriggerEngine ====================
+
+
+class TestTriggerEngine:
+    def test_keyword_and_case(self):
+        engine = TriggerEngine()
+        engine.add(0, KeywordTrigger(["Hello", "world"]))
+        engine.add(1, KeywordTrigger("HELLO", ignore_case=True))
+        engine.build()
+
+        hits = engine.match("hello world")
+
+        assert hits[0]["keywords"] == ["world"]
+        assert hits[1]["keyword"] == "HELLO"
+        assert engine.match("nothing here") == {}
+
+    def test_regex_combined_and_uncombinable(self):
+        engine = TriggerEngine()
+        engine.add(0, RegexTrigger(r"roll (\d+)d(\d+)"))
+        engine.add(1, RegexTrigger(r"(a)\1"))
+        engine.add(2, RegexTrigger("(?i)SHOUT"))
+        engine.add(3, RegexTrigger(re.compile("upper", re.IGNORECASE)))
+        engine.add(4, RegexTrigger(r"(?P<name>\w+)!"))
+        engine.build()
+
+        assert len(engine._regex_chunks) == 1
+        assert len(engine._regex_single) == 3
+
+        hits = engine.match("roll 2d6 aa shout UPPER bob!")
+
+        assert hits[0]["groups"] == ("2", "6")
+        assert hits[1]["match"] == "aa"
+        assert hits[2]["match"] == "shout"
+        assert hits[3]["match"] == "UPPER"
+        assert hits[4]["groupdict"] == {"name": "bob"}
+
+    def test_chunked_regexes(self):
+        engine = TriggerEngine()
+        for i in range(200):
+            engine.add(i, RegexTrigger(rf"\bcode{i}\b"))
+        engine.build()
+
+        assert len(engine._regex_chunks) > 1
+        assert set(engine.match("code7 and code150")) == {7, 150}
+
+
+# ==================== 分发 ====================
+
+
+class TestTriggerDispatch:
+    @pytest.fixture
+    def handler(self):
+        handler = BaseEventHandler("message", "test_triggers")
+        yield handler
+        handler._clear_handlers()
+
+    @pytest.mark.asyncio
+    async def test_only_matching_handlers_invoked(self, handler):
+        called = []
+
+        for i in range(100):
+            async def on_keyword(event, _i=i):
+                called.append((_i, event.get_trigger()["keyword"]))
+
+            handler.register(on_keyword, trigger=KeywordTrigger(f"kw{i:03d}"))
+
+        await handler._process_event(_event("say kw042 please"))
+
+        assert called == [(42, "kw042")]
+
+    @pytest.mark.asyncio
+    async def test_trigger_respects_priority_and_filters(self, handler):
+        order = []
+
+        async def plain(event):
+            order.append("plain")
+
+        async def keyword(event):
+            order.append("keyword")
+
+        async def regex(event):
+            order.append(("regex", event.get_trigger()["groups"]))
+
+        handler.register(plain, priority=5)
+        handler.register(keyword, priority=1, filters={"group_id": "g2"},
+                         trigger=KeywordTrigger("ping"))
+        handler.register(regex, priority=0, trigger=RegexTrigger(r"ping (\w+)"))
+
+        await handler._process_event(_event("ping pong"))
+
+        assert order == [("regex", ("pong",)), "plain"]
+
+    @pytest.mark.asyncio
+    async def test_same_priority_copies_get_own_trigger(self, handler):
+        seen = {}
+
+        async def a(event):
+            seen["a"] = event.get_trigger()["type"]
+
+        async def b(event):
+            seen["b"] = event.get_trigger()["type"]
+
+        handler.register(a, trigger=KeywordTrigger("hi"))
+        handler.register(b, trigger=RegexTrigger(r"h."))
+
+        await handler._process_event(_event("hi"))
+
+        assert seen == {"a": "keyword", "b": "regex"}
+
+    @pytest.mark.asyncio
+    async def test_trigger_not_written_to_event(self, handler):
+        seen = []
+
+        async def keyword(event):
+            seen.append(event.get_trigger().get("keyword"))
+
+        async def later(event):
+            seen.append(event.get_trigger().get("keyword"))
+
+        async def parallel_a(event):
+            seen.append(event.get_trigger().get("keyword"))
+
+        async def parallel_b(event):
+            seen.append(event.get_trigger().get("keyword"))
+
+        handler.register(keyword, priority=0, trigger=KeywordTrigger("hi"))
+        handler.register(later, priority=1)
+        handler.register(parallel_a, priority=2, trigger=KeywordTrigger("hi"))
+        handler.register(parallel_b, priority=2)
+
+        event = _event("hi", trigger="platform-field")
+        await handler._process_event(event)
+
+        assert seen == ["hi", None, "hi", None]
+        assert event["trigger"] == "platform-field"
+        assert event.to_dict()["trigger"] == "platform-field"
+        assert event.get_trigger() == {}
+
+    @pytest.mark.asyncio
+    async def test_message_decorators(self):
+        message._clear_message_handlers()
+        called = []
+        try:
+            @message.on_keyword(["天气"], group_id="g1")
+            async def weather(event):
+                called.append(event.get_trigger()["keyword"])
+
+            @message.on_regex(r"^echo (.+)$")
+            async def echo(event):
+                called.append(event.get_trigger()["groups"][0])
+
+            await message.handler._process_event(_event("今天天气如何"))
+            await message.handler._process_event(_event("今天天气如何", group_id="g2"))
+            await message.handler._process_event(_event("echo hi"))
+
+            assert called == ["天气", "hi"]
+            assert message.remove_keyword_handler(weather) is True
+        finally:
+            message._clear_message_handlers()
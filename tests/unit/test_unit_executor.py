@@ -0,0 +1,337 @@
+"""
+同步回调执行器单元测试
+
+测试执行策略、线程池统计，以及事件处理器/条件函数/命令权限/生命周期处理器的线程池投递
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.Core.executor import ExecutorManager, executor
+from ErisPulse.Core.Event.base import BaseEventHandler
+from ErisPulse.Core.Event.wrapper import Event
+
+
+def _event():
+    return Event({
+        "type": "message",
+        "detail_type": "private",
+        "platform": "test",
+        "self": {"user_id": "bot"},
+        "user_id": "u1",
+        "alt_message": "hi",
+    })
+
+
+def _in_worker() -> bool:
+    return threading.current_thread().name.startswith("ErisPulse-worker")
+
+
+# 进程池任务必须是模块顶层函数
+
+
+def _square(x):
+    return x * x
+
+
+def _pid_and_text(event):
+    return os.getpid(), event.get_text(), type(event).__name__
+
+
+def _crash():
+    os._exit(1)
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def _process_reply(event):
+    return f"rendered:{event.get_text()}"
+
+
+@pytest.fixture
+def manager():
+    manager = ExecutorManager()
+    manager.configure(mode="per_handler", max_workers=2)
+    yield manager
+    manager.shutdown()
+
+
+@pytest.fixture
+def thread_mode():
+    original = executor.mode
+    executor.configure(mode="thread")
+    yield executor
+    executor.configure(mode=original)
+
+
+# ==================== 执行策略 ====================
+
+
+class TestExecutorManager:
+    def test_should_offload(self, manager):
+        assert manager.should_offload(True) is True
+        assert manager.should_offload(None) is False
+
+        manager.configure(mode="thread")
+        assert manager.should_offload(None) is True
+        assert manager.should_offload(False) is False
+
+        manager.configure(mode="inline")
+        assert manager.should_offload(True) is False
+
+    def test_invalid_mode(self, manager):
+        with pytest.raises(ValueError):
+            manager.configure(mode="process")
+
+    @pytest.mark.asyncio
+    async def test_call_sync_and_async(self, manager):
+        async def coro(x):
+            return ("async", _in_worker(), x)
+
+        def sync(x):
+            return ("sync", _in_worker(), x)
+
+        assert await manager.call(coro, 1, offload=True) == ("async", False, 1)
+        assert await manager.call(sync, 2) == ("sync", False, 2)
+        assert await manager.call(sync, 3, offload=True) == ("sync", True, 3)
+
+    @pytest.mark.asyncio
+    async def test_context_propagated(self, manager):
+        var = contextvars.ContextVar("var", default=None)
+        var.set("outer")
+
+        assert await manager.run_in_thread(var.get) == "outer"
+
+    @pytest.mark.asyncio
+    async def test_stats_and_bounded_pool(self, manager):
+        def block():
+            time.sleep(0.05)
+
+        tasks = [asyncio.create_task(manager.run_in_thread(block)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        stats = manager.get_stats()
+        assert stats["active"] == 2
+        assert stats["queued"] == 3
+
+        await asyncio.gather(*tasks)
+
+        stats = manager.get_stats()
+        assert stats["threads"] == 2
+        assert stats["completed"] == stats["submitted"] == 5
+        assert stats["peak_queued"] >= 3
+        assert stats["queued"] == stats["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_counted(self, manager):
+        def broken():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await manager.run_in_thread(broken)
+
+        assert manager.get_stats()["failed"] == 1
+
+
+# ==================== 事件处理器 ====================
+
+
+class TestHandlerOffload:
+    @pytest.fixture
+    def handler(self):
+        handler = BaseEventHandler("message", "test_executor")
+        handler.slow_threshold = 0
+        yield handler
+        handler._clear_handlers()
+
+    @pytest.mark.asyncio
+    async def test_offload_handler_and_condition(self, handler):
+        seen = []
+
+        def condition(event):
+            seen.append(("condition", _in_worker()))
+            return True
+
+        def sync_handler(event):
+            seen.append(("handler", _in_worker()))
+
+        handler.register(sync_handler, condition=condition, offload=True)
+        await handler._process_event(_event())
+
+        assert seen == [("condition", True), ("handler", True)]
+
+    @pytest.mark.asyncio
+    async def test_thread_mode_preserves_priority_order(self, handler, thread_mode):
+        order = []
+
+        def first(event):
+            time.sleep(0.02)
+            order.append(("first", _in_worker()))
+            event["first_done"] = True
+
+        async def second(event):
+            order.append(("second", event.get("first_done")))
+
+        def inline(event):
+            order.append(("inline", _in_worker()))
+
+        handler.register(first, priority=0)
+        handler.register(second, priority=1)
+        handler.register(inline, priority=2, offload=False)
+
+        await handler._process_event(_event())
+
+        assert order == [("first", True), ("second", True), ("inline", False)]
+
+    @pytest.mark.asyncio
+    async def test_offloaded_handler_timeout(self, handler):
+        def hung(event):
+            time.sleep(0.2)
+
+        handler.register(hung, offload=True, timeout=0.02)
+
+        with patch("ErisPulse.Core.Event.base.logger") as mock_logger:
+            await handler._process_event(_event())
+
+        assert handler.handlers[0]["stats"].timeouts == 1
+        assert mock_logger.warning.called
+
+
+# ==================== 命令与生命周期 ====================
+
+
+class TestCommandAndLifecycleOffload:
+    @pytest.mark.asyncio
+    async def test_command_permission_offloaded(self):
+        from ErisPulse.Core.Event import command
+
+        seen = []
+
+        def permission(event):
+            seen.append(("permission", _in_worker()))
+            return True
+
+        @command("offload_cmd", permission=permission, offload=True)
+        def handler(event):
+            seen.append(("handler", _in_worker()))
+
+        try:
+            event = _event()
+            event["message"] = [{"type": "text", "data": {"text": "/offload_cmd"}}]
+            event["alt_message"] = "/offload_cmd"
+            with patch("ErisPulse.Core.Event.command.adapter"):
+                await command._handle_message(event)
+
+            assert seen == [("permission", True), ("handler", True)]
+        finally:
+            command.unregister(handler)
+
+    @pytest.mark.asyncio
+    async def test_lifecycle_offload(self):
+        from ErisPulse.Core import lifecycle
+
+        seen = []
+
+        @lifecycle.on("test.offload", offload=True)
+        def on_offload(event_data):
+            seen.append(_in_worker())
+
+        try:
+            await lifecycle.submit_event("test.offload", source="test")
+            assert seen == [True]
+        finally:
+            lifecycle._handlers.pop("test.offload", None)
+            lifecycle._offload.pop(on_offload, None)
+
+
+# ==================== 进程池 ====================
+
+
+class TestProcessPool:
+    @pytest.fixture
+    def manager(self):
+        manager = ExecutorManager()
+        manager.process_workers = 2
+        yield manager
+        manager.shutdown_process_pool()
+
+    @pytest.mark.asyncio
+    async def test_run_in_process(self, manager):
+        await manager.start_process_pool()
+
+        assert await manager.run_in_process(_square, 12) == 144
+
+        pid, text, cls_name = await manager.run_with_event(_pid_and_text, _event())
+        assert pid != os.getpid()
+        assert text == "hi"
+        assert cls_name.endswith("Event")
+
+        stats = manager.get_stats()["process"]
+        assert stats["running"] is True
+        assert stats["completed"] == 2 and stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unpicklable_function_rejected(self, manager):
+        with pytest.raises(TypeError):
+            await manager.run_in_process(lambda: None)
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, manager):
+        with pytest.raises(asyncio.TimeoutError):
+            await manager.run_in_process(_sleep, 1, timeout=0.05)
+
+        assert manager.get_stats()["process"]["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_crash_recovery(self, manager):
+        with patch("ErisPulse.Core.executor.logger"):
+            with pytest.raises(BrokenProcessPool):
+                await manager.run_in_process(_crash)
+
+        assert manager.get_stats()["process"]["crashes"] == 1
+        assert await manager.run_in_process(_square, 3) == 9
+
+    @pytest.mark.asyncio
+    async def test_process_handler_replies_result(self):
+        handler = BaseEventHandler("message", "test_process")
+        handler.slow_threshold = 0
+        event = _event()
+        try:
+            handler.register(_process_reply, executor="process")
+            assert executor.process_requested is True
+
+            with patch.object(type(event), "reply") as mock_reply:
+                await handler._process_event(event)
+
+            mock_reply.assert_called_once_with("rendered:hi")
+        finally:
+            handler._clear_handlers()
+            executor.shutdown_process_pool()
+
+    def test_call_with_event_passes_trigger(self):
+        from ErisPulse.Core.executor import call_with_event
+
+        trigger = {"type": "keyword", "keyword": "hi"}
+        result = call_with_event(lambda event: (event.get_trigger(), "trigger" in event), dict(_event()), trigger)
+
+        assert result == (trigger, False)
+
+    def test_invalid_executor_option(self):
+        handler = BaseEventHandler("message", "test_process")
+
+        async def coro(event):
+            pass
+
+        with pytest.raises(ValueError):
+            handler.register(coro, executor="process")
+        with pytest.raises(ValueError):
+            handler.register(_square, executor="gpu")
@@ -0,0 +1,157 @@
+"""
+事件循环延迟监控单元测试
+
+测试延迟采样与百分位、阻塞调用栈捕获、core.loop.lag 生命周期事件以及状态接口
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.Core import lifecycle
+from ErisPulse.Core.monitor import LoopMonitor
+
+
+@pytest.fixture
+def monitor():
+    monitor = LoopMonitor()
+    monitor.enabled = True
+    monitor.interval = 0.02
+    monitor.lag_threshold = 0.08
+    monitor.event_cooldown = 0
+    yield monitor
+
+
+@pytest.fixture
+def lag_events():
+    events = []
+
+    @lifecycle.on("core.loop.lag")
+    async def on_lag(event_data):
+        events.append(event_data)
+
+    yield events
+    lifecycle._handlers["core.loop.lag"].remove(on_lag)
+
+
+def _blocking_render():
+    time.sleep(0.25)
+
+
+# ==================== 采样统计 ====================
+
+
+class TestLoopMonitorStats:
+    def test_record_percentiles(self, monitor):
+        for _ in range(98):
+            monitor.record(0.001)
+        monitor.record(0.2)
+        monitor.record(0.3)
+
+        stats = monitor.get_stats()
+        assert stats["running"] is False
+        assert stats["lag_ms"] == 300.0
+        assert stats["p50_ms"] == 1.0
+        assert stats["p99_ms"] == 200.0
+        assert stats["max_ms"] == 300.0
+        assert stats["samples"] == 100
+
+    def test_window_bounds_recent_samples(self, monitor):
+        monitor.window = 10
+        monitor.reset()
+        monitor.record(1.0)
+        for _ in range(10):
+            monitor.record(0.001)
+
+        stats = monitor.get_stats()
+        assert stats["max_ms"] == 1.0
+        assert stats["total"]["max_ms"] == 1000.0
+
+    @pytest.mark.asyncio
+    async def test_disabled_does_not_start(self, monitor):
+        monitor.enabled = False
+
+        assert monitor.start() is False
+        assert monitor.is_running is False
+
+
+# ==================== 阻塞检测 ====================
+
+
+class TestLoopMonitorBlocking:
+    @pytest.mark.asyncio
+    async def test_idle_loop_emits_nothing(self, monitor, lag_events):
+        assert monitor.start() is True
+        try:
+            await asyncio.sleep(0.15)
+        finally:
+            await monitor.stop()
+
+        assert lag_events == []
+        assert monitor.get_stats()["samples"] >= 3
+        assert monitor.is_running is False
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_captured(self, monitor, lag_events):
+        async def blocking_job():
+            await asyncio.sleep(0.05)
+            _blocking_render()
+
+        monitor.start()
+        try:
+            with patch("ErisPulse.Core.monitor.logger") as mock_logger:
+                await asyncio.create_task(blocking_job(), name="render-task")
+                await asyncio.sleep(0.1)
+        finally:
+            await monitor.stop()
+
+        assert len(lag_events) == 1
+        data = lag_events[0]["data"]
+        assert data["lag_ms"] >= 80
+        assert data["threshold_ms"] == 80.0
+        assert data["p99_ms"] >= 80
+
+        blocked = data["blocked"]
+        assert blocked["task"] == "render-task"
+        assert "blocking_job" in blocked["coroutine"]
+        assert "_blocking_render" in "\n".join(blocked["stack"])
+        assert "_blocking_render" in mock_logger.warning.call_args[0][0]
+
+        stats = monitor.get_stats()
+        assert stats["lag_events"] == 1
+        assert stats["last_block"] is blocked
+
+    @pytest.mark.asyncio
+    async def test_event_cooldown(self, monitor, lag_events):
+        monitor.event_cooldown = 60
+
+        monitor.start()
+        try:
+            with patch("ErisPulse.Core.monitor.logger") as mock_logger:
+                for _ in range(2):
+                    await asyncio.sleep(0.05)
+                    _blocking_render()
+                await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        assert len(lag_events) == 1
+        assert mock_logger.warning.call_count == 2
+
+
+# ==================== 状态接口 ====================
+
+
+class TestHealthEndpoint:
+    def test_health_includes_loop_lag(self):
+        from fastapi.testclient import TestClient
+
+        from ErisPulse.Core.router import RouterManager
+
+        client = TestClient(RouterManager().app)
+        data = client.get("/health").json()
+
+        assert data["status"] == "ok"
+        assert set(data["loop"]) == {"running", "lag_ms", "p50_ms", "p99_ms", "max_ms"}
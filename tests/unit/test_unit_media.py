@@ -0,0 +1,399 @@
+"""
+媒体模块单元测试
+
+测试 MediaCache 的缓存键计算、命中/过期、持久化，MediaSource 的流式读取，
+以及 BaseAdapter 的媒体解析
+"""
+
+import pytest
+import os
+import tempfile
+
+from ErisPulse.Core.media import MediaCache, MediaSource
+from ErisPulse.Core.storage import StorageManager
+from ErisPulse.Core.Bases import BaseAdapter
+
+
+# ==================== Fixtures ====================
+
+
+@pytest.fixture
+def temp_db_file():
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".db", delete=False) as f:
+        temp_path = f.name
+
+    yield temp_path
+
+    for ext in ["", "-wal", "-shm"]:
+        file_path = temp_path + ext
+        if os.path.exists(file_path):
+            try:
+                os.remove(file_path)
+            except PermissionError:
+                pass
+
+
+@pytest.fixture
+def sm(temp_db_file):
+    StorageManager._instance = None
+
+    manager = StorageManager.__new__(StorageManager)
+    manager.db_path = temp_db_file
+    manager._init_db()
+    manager._initialized = True
+
+    yield manager
+
+    StorageManager._instance = None
+
+
+@pytest.fixture
+def cache(sm):
+    c = MediaCache()
+    c._storage = sm
+    return c
+
+
+@pytest.fixture
+def media_file(tmp_path):
+    path = tmp_path / "banner.png"
+    path.write_bytes(b"\x89PNG banner")
+    return str(path)
+
+
+class _Uploader:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, file):
+        self.calls += 1
+        return f"file_id_{self.calls}"
+
+
+class _MediaAdapter(BaseAdapter):
+    def __init__(self):
+        super().__init__()
+        self.uploads = []
+
+    async def start(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def call_api(self, endpoint, **params):
+        return {}
+
+    async def upload_media(self, media_type, file, **kwargs):
+        self.uploads.append((media_type, file))
+        return f"{media_type}_{len(self.uploads)}"
+
+
+# ==================== 缓存键 ====================
+
+
+class TestMakeKey:
+    def test_bytes_key_is_content_hash(self):
+        assert MediaCache.make_key(b"abc") == MediaCache.make_key(bytearray(b"abc"))
+        assert MediaCache.make_key(b"abc").startswith("sha256:")
+        assert MediaCache.make_key(b"abc") != MediaCache.make_key(b"abd")
+
+    def test_path_key_changes_with_mtime(self, media_file):
+        key1 = MediaCache.make_key(media_file)
+        assert key1.startswith("path:")
+        assert MediaCache.make_key(f"file://{media_file}") == key1
+
+        st = os.stat(media_file)
+        os.utime(media_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert MediaCache.make_key(media_file) != key1
+
+    def test_uncacheable_inputs(self, tmp_path):
+        assert MediaCache.make_key("https://example.com/a.png") is None
+        assert MediaCache.make_key("AgADBAADbqcxG") is None
+        assert MediaCache.make_key(str(tmp_path)) is None
+        assert MediaCache.make_key(123) is None
+
+
+# ==================== 缓存读写 ====================
+
+
+class TestMediaCache:
+    @pytest.mark.asyncio
+    async def test_get_or_upload_reuses_file_id(self, cache):
+        uploader = _Uploader()
+
+        first = await cache.get_or_upload("tg", b"sticker", uploader, media_type="image")
+        second = await cache.get_or_upload("tg", b"sticker", uploader, media_type="image")
+
+        assert first == second == "file_id_1"
+        assert uploader.calls == 1
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_scope_and_media_type_isolated(self, cache):
+        uploader = _Uploader()
+
+        await cache.get_or_upload("tg", b"x", uploader, media_type="image")
+        await cache.get_or_upload("qq", b"x", uploader, media_type="image")
+        await cache.get_or_upload("tg", b"x", uploader, media_type="file")
+
+        assert uploader.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_always_uploads(self, cache):
+        uploader = _Uploader()
+
+        await cache.get_or_upload("tg", "https://example.com/a.png", uploader)
+        await cache.get_or_upload("tg", "https://example.com/a.png", uploader)
+
+        assert uploader.calls == 2
+
+    def test_expired_entry_is_dropped(self, cache):
+        assert cache.put("tg", b"data", "fid", ttl=-1) is True
+        assert cache.get("tg", b"data") is None
+        assert cache.get_stats()["entries"] == 0
+
+    def test_persisted_across_instances(self, cache, sm, media_file):
+        cache.put("tg", media_file, "fid_path", media_type="image")
+
+        reloaded = MediaCache()
+        reloaded._storage = sm
+        assert reloaded.get("tg", media_file, media_type="image") == "fid_path"
+
+    def test_invalidate(self, cache):
+        cache.put("tg", b"a", "fid_a")
+        cache.put("tg", b"b", "fid_b")
+
+        assert cache.invalidate("tg", b"a") == 1
+        assert cache.get("tg", b"a") is None
+        assert cache.invalidate("tg") == 1
+        assert cache.get("tg", b"b") is None
+
+    def test_purge_expired(self, cache):
+        cache.put("tg", b"old", "fid_old", ttl=-1)
+        cache.put("tg", b"new", "fid_new")
+
+        assert cache.purge_expired() == 1
+        assert cache.get("tg", b"new") == "fid_new"
+
+    def test_lru_bound(self, cache, monkeypatch):
+        monkeypatch.setattr(
+            MediaCache, "_get_config", staticmethod(lambda: {"cache_max_entries": 2})
+        )
+        for i in range(3):
+            cache.put("tg", f"data{i}".encode(), f"fid{i}")
+
+        assert cache.get_stats()["entries"] == 2
+
+    def test_disabled(self, cache, monkeypatch):
+        monkeypatch.setattr(
+            MediaCache, "_get_config", staticmethod(lambda: {"cache_enabled": False})
+        )
+        assert cache.put("tg", b"a", "fid") is False
+        assert cache.get("tg", b"a") is None
+
+
+# ==================== BaseAdapter 集成 ====================
+
+
+class TestAdapterResolveMedia:
+    @pytest.fixture(autouse=True)
+    def _patch_cache(self, cache, monkeypatch):
+        import ErisPulse.Core.media as media_module
+
+        monkeypatch.setattr(media_module, "media_cache", cache)
+
+    @pytest.mark.asyncio
+    async def test_resolve_media_uploads_once(self):
+        adapter = _MediaAdapter()
+
+        assert await adapter.resolve_media("image", b"img") == "image_1"
+        assert await adapter.resolve_media("image", b"img") == "image_1"
+        assert len(adapter.uploads) == 1
+
+    @pytest.mark.asyncio
+    async def test_resolve_media_segments(self, media_file):
+        adapter = _MediaAdapter()
+        message = [
+            {"type": "text", "data": {"text": "hi"}},
+            {"type": "image", "data": {"file": b"img"}},
+            {"type": "file", "data": {"file": media_file, "filename": "a.png"}},
+            {"type": "image", "data": {"file": "https://example.com/a.png"}},
+        ]
+
+        resolved = await adapter.resolve_media_segments(message)
+
+        assert resolved[0] == message[0]
+        assert resolved[1]["data"]["file"] == "image_1"
+        assert resolved[2]["data"] == {"file": "file_2", "filename": "a.png"}
+        assert resolved[3] == message[3]
+        assert message[1]["data"]["file"] == b"img"
+
+    @pytest.mark.asyncio
+    async def test_resolve_media_segments_without_upload_support(self):
+        class _NoUpload(_MediaAdapter):
+            async def upload_media(self, media_type, file, **kwargs):
+                raise NotImplementedError
+
+        message = [{"type": "image", "data": {"file": b"img"}}]
+        assert await _NoUpload().resolve_media_segments(message) == message
+
+
+# ==================== MediaSource ====================
+
+
+class TestMediaSource:
+    @pytest.mark.asyncio
+    async def test_path_source_streams_in_chunks(self, tmp_path):
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"x" * 1000)
+        source = MediaSource(path)
+
+        chunks = [bytes(c) async for c in source.iter_chunks(chunk_size=256)]
+
+        assert [len(c) for c in chunks] == [256, 256, 256, 232]
+        assert source.kind == "path"
+        assert source.filename == "video.mp4"
+        assert source.content_type == "video/mp4"
+        assert source.size == 1000
+        assert source.reusable is True
+        assert await source.read() == b"x" * 1000
+
+    @pytest.mark.asyncio
+    async def test_memoryview_chunks_are_zero_copy(self):
+        data = bytearray(b"abcdefgh")
+        source = MediaSource(memoryview(data))
+
+        chunks = [c async for c in source.iter_chunks(chunk_size=3)]
+
+        assert all(isinstance(c, memoryview) for c in chunks)
+        data[0:1] = b"Z"
+        assert bytes(chunks[0]) == b"Zbc"
+        assert source.size == 8
+
+    @pytest.mark.asyncio
+    async def test_async_iterator_is_single_use(self):
+        async def gen():
+            yield b"ab"
+            yield b"cd"
+
+        source = MediaSource(gen(), filename="a.bin")
+
+        assert source.size is None
+        assert await source.read() == b"abcd"
+        with pytest.raises(RuntimeError):
+            await source.read()
+
+    @pytest.mark.asyncio
+    async def test_seekable_file_object_is_rewound(self, tmp_path):
+        path = tmp_path / "report.pdf"
+        path.write_bytes(b"%PDF-report")
+
+        with open(path, "rb") as f:
+            source = MediaSource(f)
+            assert source.filename == "report.pdf"
+            assert await source.read() == b"%PDF-report"
+            assert await source.read() == b"%PDF-report"
+
+    @pytest.mark.asyncio
+    async def test_file_object_keeps_wrapped_offset(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"header0123456789")
+
+        with open(path, "rb") as f:
+            f.read(6)
+            source = MediaSource(f)
+            assert source.size == 10
+            assert await source.read() == b"0123456789"
+            assert await source.read() == b"0123456789"
+            assert source.as_payload().read() == b"0123456789"
+
+    def test_unsupported_type(self):
+        with pytest.raises(TypeError):
+            MediaSource(123)
+
+    def test_wrap_keeps_str_and_bytes(self, tmp_path):
+        assert MediaSource.wrap("https://example.com/a.png") == "https://example.com/a.png"
+        assert MediaSource.wrap(b"abc") == b"abc"
+        assert isinstance(MediaSource.wrap(tmp_path / "a.png"), MediaSource)
+        assert isinstance(MediaSource.wrap(memoryview(b"abc")), MediaSource)
+
+    def test_message_builder_wraps_only_streams(self, tmp_path):
+        import io
+
+        from ErisPulse.Core.Event.message_builder import MessageBuilder
+
+        async def gen():
+            yield b""
+
+        for value in ("a.png", b"abc", tmp_path / "a.png", bytearray(b"abc"), memoryview(b"abc")):
+            assert MessageBuilder.image(value)[0]["data"]["file"] is value
+        assert isinstance(MessageBuilder.image(io.BytesIO(b"abc"))[0]["data"]["file"], MediaSource)
+        assert isinstance(MessageBuilder().file(gen()).build()[0]["data"]["file"], MediaSource)
+
+    def test_make_key(self, media_file):
+        assert MediaCache.make_key(MediaSource(media_file)) == MediaCache.make_key(media_file)
+        assert MediaCache.make_key(MediaSource(memoryview(b"abc"))) == MediaCache.make_key(b"abc")
+
+        async def gen():
+            yield b""
+
+        assert MediaCache.make_key(MediaSource(gen())) is None
+
+    @pytest.mark.asyncio
+    async def test_payload_streams_through_aiohttp_multipart(self, tmp_path):
+        import aiohttp
+
+        path = tmp_path / "big.bin"
+        path.write_bytes(b"0123456789" * 10000)
+        source = MediaSource(path)
+
+        form = aiohttp.FormData()
+        form.add_field("file", source.as_payload(), filename=source.filename,
+                       content_type=source.content_type)
+
+        class _Writer:
+            def __init__(self):
+                self.body = bytearray()
+
+            async def write(self, chunk):
+                self.body += chunk
+
+        writer = _Writer()
+        await form().write(writer)
+
+        assert b"0123456789" * 10000 in writer.body
+        assert b'filename="big.bin"' in writer.body
+
+    @pytest.mark.asyncio
+    async def test_message_builder_wraps_media_source(self, tmp_path):
+        from ErisPulse.Core.Event.message_builder import MessageBuilder
+
+        path = tmp_path / "a.png"
+        path.write_bytes(b"png")
+
+        with open(path, "rb") as f:
+            segments = MessageBuilder().image(f).file(b"raw", filename="r.bin").build()
+
+        assert isinstance(segments[0]["data"]["file"], MediaSource)
+        assert segments[1]["data"]["file"] == b"raw"
+
+    @pytest.mark.asyncio
+    async def test_resolve_media_segments_with_media_source(self, cache, monkeypatch):
+        import ErisPulse.Core.media as media_module
+
+        monkeypatch.setattr(media_module, "media_cache", cache)
+        adapter = _MediaAdapter()
+
+        async def gen():
+            yield b"stream"
+
+        message = [
+            {"type": "video", "data": {"file": MediaSource(memoryview(b"clip"))}},
+            {"type": "video", "data": {"file": MediaSource(memoryview(b"clip"))}},
+            {"type": "file", "data": {"file": MediaSource(gen())}},
+        ]
+
+        resolved = await adapter.resolve_media_segments(message)
+
+        assert [s["data"]["file"] for s in resolved] == ["video_1", "video_1", "file_2"]
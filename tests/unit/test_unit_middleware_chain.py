@@ -0,0 +1,185 @@
+"""
+中间件链单元测试
+
+测试中间件链的编译与失效、同步中间件快速路径、DROP 短路以及按平台/事件类型的作用域
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.Core.adapter import DROP_EVENT, AdapterManager
+
+
+@pytest.fixture
+def manager():
+    manager = AdapterManager()
+    received = []
+
+    @manager.on("*")
+    async def collect(data):
+        received.append(data)
+
+    manager.received = received
+    return manager
+
+
+def _event(platform="qq", event_type="message", **extra):
+    return {"id": "e1", "type": event_type, "detail_type": "private", "platform": platform, **extra}
+
+
+# ==================== 编译 ====================
+
+
+class TestCompile:
+    @pytest.mark.asyncio
+    async def test_no_middleware_no_chain(self, manager):
+        await manager.emit(_event())
+
+        assert manager._middleware_chain is None
+        assert manager._middleware_chain_compiled is True
+        assert len(manager.received) == 1
+
+    @pytest.mark.asyncio
+    async def test_compiled_once(self, manager):
+        manager.middleware(lambda data: data)
+
+        with patch.object(
+            manager, "_compile_middleware_chain", wraps=manager._compile_middleware_chain
+        ) as compile_chain:
+            for _ in range(3):
+                await manager.emit(_event())
+
+        assert compile_chain.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_recompiled_on_list_changes(self, manager):
+        def tag_a(data):
+            return dict(data, a=True)
+
+        def tag_b(data):
+            return dict(data, b=True)
+
+        manager.middleware(tag_a)
+        await manager.emit(_event())
+        assert manager.received[-1].get("a") is True
+
+        manager._onebot_middlewares.append(tag_b)
+        await manager.emit(_event())
+        assert manager.received[-1].get("b") is True
+
+        manager._onebot_middlewares.remove(tag_a)
+        await manager.emit(_event())
+        assert "a" not in manager.received[-1]
+
+        manager._onebot_middlewares = []
+        await manager.emit(_event())
+        assert "b" not in manager.received[-1]
+        assert manager._middleware_chain is None
+
+
+# ==================== 执行 ====================
+
+
+class TestExecution:
+    @pytest.mark.asyncio
+    async def test_sync_and_async_in_order(self, manager):
+        order = []
+
+        @manager.middleware
+        def first(data):
+            order.append("sync")
+            return dict(data, step=1)
+
+        @manager.middleware
+        async def second(data):
+            order.append("async")
+            return dict(data, step=data["step"] + 1)
+
+        class Callable:
+            async def __call__(self, data):
+                order.append("callable")
+                return dict(data, step=data["step"] + 1)
+
+        manager.middleware(Callable())
+        await manager.emit(_event())
+
+        assert order == ["sync", "async", "callable"]
+        assert manager.received[-1]["step"] == 3
+
+    @pytest.mark.asyncio
+    async def test_drop_short_circuits(self, manager):
+        later = []
+
+        @manager.middleware
+        def blocklist(data):
+            return manager.DROP if data.get("user_id") == "spam" else data
+
+        @manager.middleware
+        async def after(data):
+            later.append(data)
+            return data
+
+        await manager.emit(_event(user_id="spam"))
+        await manager.emit(_event(user_id="ok"))
+
+        assert manager.DROP is DROP_EVENT
+        assert [d["user_id"] for d in manager.received] == ["ok"]
+        assert len(later) == 1
+
+    @pytest.mark.asyncio
+    async def test_drop_skips_raw_handlers(self, manager):
+        raw = []
+
+        @manager.on("message", raw=True)
+        async def on_raw(data):
+            raw.append(data)
+
+        manager.middleware(lambda data: DROP_EVENT)
+        await manager.emit(_event(qq_raw={"x": 1}, qq_raw_type="message"))
+
+        assert raw == []
+        assert manager.received == []
+
+
+# ==================== 作用域 ====================
+
+
+class TestScope:
+    @pytest.mark.asyncio
+    async def test_platform_scope(self, manager):
+        @manager.middleware(platform="telegram")
+        def only_telegram(data):
+            return dict(data, scoped=True)
+
+        await manager.emit(_event(platform="qq"))
+        await manager.emit(_event(platform="telegram"))
+
+        assert [d.get("scoped") for d in manager.received] == [None, True]
+
+    @pytest.mark.asyncio
+    async def test_event_type_scope(self, manager):
+        seen = []
+
+        @manager.middleware(event_type=["notice", "request"])
+        def filter_notices(data):
+            seen.append(data["type"])
+            return DROP_EVENT
+
+        for event_type in ("message", "notice", "request"):
+            await manager.emit(_event(event_type=event_type))
+
+        assert seen == ["notice", "request"]
+        assert [d["type"] for d in manager.received] == ["message"]
+
+    @pytest.mark.asyncio
+    async def test_reregister_clears_scope(self, manager):
+        def tag(data):
+            return dict(data, tagged=True)
+
+        manager.middleware(tag, platform="telegram")
+        manager._onebot_middlewares.clear()
+        manager.middleware(tag)
+        await manager.emit(_event(platform="qq"))
+
+        assert manager.received[-1].get("tagged") is True
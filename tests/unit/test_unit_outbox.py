@@ -0,0 +1,326 @@
+"""
+持久化发件箱单元测试
+
+测试适配器不可用时的入队、started 后按序补发、调用链与 bytes 重放、TTL 过期、失败重试与放弃
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.Core.adapter import AdapterManager
+from ErisPulse.Core.Bases.adapter import BaseAdapter, SendDSL
+from ErisPulse.Core.outbox import Outbox
+
+class OutboxAdapter(BaseAdapter):
+    class Send(SendDSL):
+        def At(self, user_id):
+            self._at = user_id
+            return self
+
+        def Text(self, text):
+            adapter = self._adapter
+            at = getattr(self, "_at", None)
+
+            async def _send():
+                if adapter.fail_with is not None:
+                    raise adapter.fail_with
+                adapter.sent.append((self._target_type, self._target_id, self._account_id, at, text))
+                return {"status": "ok", "retcode": 0, "message_id": str(len(adapter.sent))}
+
+            return asyncio.create_task(_send())
+
+        def Image(self, data):
+            adapter = self._adapter
+
+            async def _send():
+                adapter.sent.append(("image", data))
+                return {"status": "ok", "retcode": 0}
+
+            return asyncio.create_task(_send())
+
+        def Object(self, value):
+            async def _send():
+                return {"status": "ok", "retcode": 0, "value": value}
+
+            return asyncio.create_task(_send())
+
+    def __init__(self):
+        super().__init__()
+        self.sent = []
+        self.fail_with = None
+
+    async def call_api(self, endpoint, **params):
+        return {}
+
+    async def start(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
+@pytest.fixture
+def platform():
+    manager = AdapterManager()
+    instance = OutboxAdapter()
+    manager._adapters["mock"] = instance
+    return manager, instance
+
+
+@pytest.fixture
+async def outbox(temp_storage, platform):
+    manager, _ = platform
+    outbox = Outbox(storage=temp_storage, adapter_manager=manager)
+    outbox.enabled = True
+    outbox.retry_interval = 0.05
+    with patch("ErisPulse.Core.outbox.outbox", outbox):
+        yield outbox
+    await outbox.stop()
+
+
+def _set_started(manager, instance, started=True):
+    if started:
+        manager._started_instances.add(instance)
+    else:
+        manager._started_instances.discard(instance)
+
+
+# ==================== 入队 ====================
+
+
+class TestEnqueue:
+    @pytest.mark.asyncio
+    async def test_disabled_passthrough(self, outbox, platform):
+        manager, instance = platform
+        outbox.enabled = False
+
+        result = await instance.Send.To("user", "1").Text("hi")
+
+        assert result["status"] == "ok"
+        assert outbox.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_queued_when_adapter_down(self, outbox, platform):
+        _, instance = platform
+
+        result = await instance.Send.To("user", "1").Text("hi")
+
+        assert result["status"] == "queued"
+        assert instance.sent == []
+        assert outbox.pending("mock") == 1
+        assert outbox.get_stats()["pending"] == {"mock": 1}
+
+    @pytest.mark.asyncio
+    async def test_sent_when_adapter_up(self, outbox, platform):
+        manager, instance = platform
+        _set_started(manager, instance)
+
+        result = await instance.Send.To("user", "1").Text("hi")
+
+        assert result["status"] == "ok"
+        assert outbox.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_connection_error_queued(self, outbox, platform):
+        manager, instance = platform
+        _set_started(manager, instance)
+        instance.fail_with = ConnectionResetError("reset")
+
+        result = await instance.Send.To("user", "1").Text("hi")
+
+        assert result["status"] == "queued"
+        assert outbox.pending("mock") == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error", [
+        ValueError("bad target"), FileNotFoundError("missing.png"), asyncio.TimeoutError(),
+    ])
+    async def test_other_errors_raised(self, outbox, platform, error):
+        manager, instance = platform
+        _set_started(manager, instance)
+        instance.fail_with = error
+
+        with pytest.raises(type(error)):
+            await instance.Send.To("user", "1").Text("hi")
+        assert outbox.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_send_does_not_hold_back_later_sends(self, outbox, platform):
+        manager, instance = platform
+        _set_started(manager, instance)
+        instance.fail_with = FileNotFoundError("missing.png")
+        with pytest.raises(FileNotFoundError):
+            await instance.Send.To("user", "1").Text("broken")
+
+        instance.fail_with = None
+        result = await instance.Send.To("user", "1").Text("next")
+
+        assert result["status"] == "ok"
+        assert [m[4] for m in instance.sent] == ["next"]
+
+    @pytest.mark.asyncio
+    async def test_ordering_kept_while_pending(self, outbox, platform):
+        manager, instance = platform
+        await instance.Send.To("user", "1").Text("first")
+        _set_started(manager, instance)
+
+        result = await instance.Send.To("user", "1").Text("second")
+
+        assert result["status"] == "queued"
+        assert outbox.pending("mock") == 2
+
+    @pytest.mark.asyncio
+    async def test_unserializable_passthrough(self, outbox, platform):
+        _, instance = platform
+
+        result = await instance.Send.To("user", "1").Object(object())
+
+        assert result["status"] == "ok"
+        assert outbox.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_unregistered_adapter_passthrough(self, outbox):
+        instance = OutboxAdapter()
+
+        result = await instance.Send.To("user", "1").Text("hi")
+
+        assert result["status"] == "ok"
+        assert outbox.pending() == 0
+
+
+# ==================== 补发 ====================
+
+
+class TestDrain:
+    @pytest.mark.asyncio
+    async def test_drain_in_order_with_chain(self, outbox, platform):
+        manager, instance = platform
+        for i in range(5):
+            await instance.Send.Using("bot").To("group", "g").At("u1").Text(f"m{i}")
+        await instance.Send.To("user", "1").Image(b"\x89PNG")
+
+        _set_started(manager, instance)
+        outbox.batch_size = 2
+        sent = await outbox.drain("mock")
+
+        assert sent == 6
+        assert [m[4] for m in instance.sent[:5]] == ["m0", "m1", "m2", "m3", "m4"]
+        assert instance.sent[0][:4] == ("group", "g", "bot", "u1")
+        assert instance.sent[5] == ("image", b"\x89PNG")
+        assert outbox.pending() == 0
+        assert outbox.get_stats()["sent"] == 6
+
+    @pytest.mark.asyncio
+    async def test_drain_on_started_event(self, outbox, platform):
+        manager, instance = platform
+        await instance.Send.To("user", "1").Text("hi")
+        _set_started(manager, instance)
+
+        await outbox._on_status_change({"data": {"platform": "mock", "status": "started"}})
+        await asyncio.sleep(0.05)
+
+        assert [m[4] for m in instance.sent] == ["hi"]
+
+    @pytest.mark.asyncio
+    async def test_survives_restart(self, temp_storage, platform):
+        manager, instance = platform
+        first = Outbox(storage=temp_storage, adapter_manager=manager)
+        first.enabled = True
+        with patch("ErisPulse.Core.outbox.outbox", first):
+            await instance.Send.To("user", "1").Text("persisted")
+        await first.stop()
+
+        second = Outbox(storage=temp_storage, adapter_manager=manager)
+        second.enabled = True
+        assert second.pending("mock") == 1
+        _set_started(manager, instance)
+        second.start()
+        await asyncio.sleep(0.05)
+        await second.stop()
+
+        assert [m[4] for m in instance.sent] == ["persisted"]
+
+    @pytest.mark.asyncio
+    async def test_expired_dropped(self, outbox, platform):
+        manager, instance = platform
+        outbox.ttl = 0.01
+        await instance.Send.To("user", "1").Text("stale")
+        await asyncio.sleep(0.02)
+
+        _set_started(manager, instance)
+        sent = await outbox.drain("mock")
+
+        assert sent == 0
+        assert instance.sent == []
+        assert outbox.get_stats()["expired"] == 1
+        assert outbox.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_retried_then_given_up(self, outbox, platform, temp_storage):
+        manager, instance = platform
+        outbox.max_attempts = 2
+        await instance.Send.To("user", "1").Text("poison")
+        await instance.Send.To("user", "1").Text("ok")
+
+        _set_started(manager, instance)
+        instance.fail_with = ConnectionResetError("reset")
+        assert await outbox.drain("mock") == 0
+        assert outbox.pending("mock") == 2
+
+        # 第二次失败后放弃该消息，后续消息继续补发
+        instance.fail_with = None
+        calls = []
+
+        async def flaky(adapter, payload):
+            calls.append(payload)
+            if len(calls) == 1:
+                raise ConnectionResetError("reset")
+            return await Outbox._replay(outbox, adapter, payload)
+
+        with patch.object(outbox, "_replay", flaky):
+            assert await outbox.drain("mock") == 1
+
+        assert [m[4] for m in instance.sent] == ["ok"]
+        assert outbox.get_stats()["failed"] == 1
+        rows = temp_storage.Table(outbox.table).Select("status", "attempts").Execute()
+        assert rows == [("failed", 2)]
+        assert outbox.purge("failed") == 1
+
+    @pytest.mark.asyncio
+    async def test_rejected_message_failed_without_stalling(self, outbox, platform, temp_storage):
+        manager, instance = platform
+        await instance.Send.To("user", "1").Text("poison")
+        await instance.Send.To("user", "1").Text("ok")
+        _set_started(manager, instance)
+
+        async def reject_first(adapter, payload):
+            if "poison" in payload:
+                raise FileNotFoundError("missing.png")
+            return await Outbox._replay(outbox, adapter, payload)
+
+        with patch.object(outbox, "_replay", reject_first):
+            assert await outbox.drain("mock") == 1
+
+        assert [m[4] for m in instance.sent] == ["ok"]
+        assert outbox.pending("mock") == 0
+        assert outbox._retry_handles == {}
+        rows = temp_storage.Table(outbox.table).Select("status", "attempts").Execute()
+        assert rows == [("failed", 1)]
+
+    @pytest.mark.asyncio
+    async def test_adapter_down_during_drain_not_counted(self, outbox, platform, temp_storage):
+        manager, instance = platform
+        await instance.Send.To("user", "1").Text("hi")
+        _set_started(manager, instance)
+
+        async def outage(adapter, payload):
+            _set_started(manager, instance, False)
+            raise ConnectionError("closed")
+
+        with patch.object(outbox, "_replay", outage):
+            assert await outbox.drain("mock") == 0
+
+        assert temp_storage.Table(outbox.table).Select("attempts").Execute() == [(0,)]
+        assert outbox.pending("mock") == 1
@@ -0,0 +1,315 @@
+"""
+模块配额单元测试
+
+测试处理器所属模块解析、并发上限与排队、排队已满时只丢弃该模块的事件、CPU 时间统计以及模块状态中的用量
+"""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.Core.Event import command
+from ErisPulse.Core.Event.base import BaseEventHandler
+from ErisPulse.Core.Event.wrapper import Event
+from ErisPulse.Core.quota import ModuleQuota, QuotaManager
+
+
+def _event(text="hi"):
+    return Event({
+        "type": "message",
+        "detail_type": "private",
+        "platform": "test",
+        "self": {"platform": "test", "user_id": "bot"},
+        "user_id": "u1",
+        "alt_message": text,
+        "message": [{"type": "text", "data": {"text": text}}],
+    })
+
+
+def _owned(func, package):
+    func.__module__ = f"{package}.handlers"
+    return func
+
+
+def _busy(seconds):
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+@pytest.fixture
+def quota():
+    manager = QuotaManager()
+    manager.enabled = True
+    manager.max_concurrency = 0
+    manager.max_queue = 0
+    manager.cpu_accounting = True
+    manager._limits = {}
+    with patch("ErisPulse.Core.Event.base.quota", manager), \
+            patch("ErisPulse.Core.Event.command.quota", manager), \
+            patch("ErisPulse.Core.quota.quota", manager):
+        yield manager
+
+
+@pytest.fixture
+def handler():
+    handler = BaseEventHandler("message", "test_quota")
+    handler.default_timeout = 0
+    handler.slow_threshold = 0
+    yield handler
+    handler._clear_handlers()
+
+
+# ==================== ModuleQuota ====================
+
+
+class TestModuleQuota:
+    @pytest.mark.asyncio
+    async def test_unlimited(self):
+        module_quota = ModuleQuota("m")
+
+        assert all([await module_quota.acquire() for _ in range(3)])
+        assert module_quota.active == module_quota.peak_active == 3
+
+    @pytest.mark.asyncio
+    async def test_queue_then_shed(self):
+        module_quota = ModuleQuota("m", max_concurrency=1, max_queue=1)
+        assert await module_quota.acquire()
+
+        waiter = asyncio.create_task(module_quota.acquire())
+        await asyncio.sleep(0)
+        assert module_quota.waiting == 1
+        assert await module_quota.acquire() is False
+        assert module_quota.shed == 1
+
+        module_quota.release(0.5)
+        assert await waiter is True
+        assert module_quota.to_dict()["wall_ms"] == 500.0
+        assert module_quota.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_cpu_accounting_async_excludes_waiting(self):
+        module_quota = ModuleQuota("m")
+
+        async def work():
+            _busy(0.02)
+            await asyncio.sleep(0.1)
+            return "done"
+
+        assert await module_quota.accounted(work()) == "done"
+        assert 0.02 <= module_quota.cpu_time < 0.08
+
+    @pytest.mark.asyncio
+    async def test_cpu_accounting_propagates_errors(self):
+        module_quota = ModuleQuota("m")
+
+        async def fail():
+            await asyncio.sleep(0)
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await module_quota.accounted(fail())
+
+    def test_cpu_accounting_sync(self):
+        module_quota = ModuleQuota("m")
+
+        module_quota.timed(_busy)(0.02)
+
+        assert module_quota.cpu_time >= 0.02
+
+
+# ==================== QuotaManager ====================
+
+
+class TestQuotaManager:
+    def test_owner_of_registered_module(self, quota):
+        module_class = type("Plugin", (), {"__module__": "myplugin.core"})
+        with patch("ErisPulse.Core.module.module._module_classes", {"MyPlugin": module_class}):
+            assert quota.owner_of(_owned(lambda e: None, "myplugin")) == "MyPlugin"
+            assert quota.owner_of(_owned(lambda e: None, "other")) == "other"
+
+    def test_limits_from_config_and_set_limit(self, quota):
+        quota.max_concurrency = 8
+        quota._limits = {"Heavy": {"max_concurrency": 1}}
+
+        assert quota.get("Heavy").max_concurrency == 1
+        assert quota.get("Light").max_concurrency == 8
+
+        quota.get("Heavy").invocations = 5
+        quota.set_limit("Heavy", max_concurrency=2, max_queue=10)
+
+        usage = quota.get_usage("Heavy")
+        assert (usage["max_concurrency"], usage["max_queue"], usage["invocations"]) == (2, 10, 5)
+
+    def test_reset(self, quota):
+        quota.get("A").invocations = 3
+
+        quota.reset()
+
+        assert quota.get_usage() == {}
+        assert quota.get_usage("A") is None
+
+    def test_status_summary_usage(self, quota):
+        from ErisPulse.Core import module
+
+        module_class = type("Plugin", (), {"__module__": "myplugin.core"})
+        quota.get("MyPlugin").invocations = 2
+        with patch.object(module, "_module_classes", {"MyPlugin": module_class, "Idle": module_class}):
+            summary = module.get_status_summary()["modules"]
+
+        assert summary["MyPlugin"]["usage"]["invocations"] == 2
+        assert summary["Idle"]["usage"] is None
+
+
+# ==================== 事件处理器 ====================
+
+
+class TestHandlerQuota:
+    @pytest.mark.asyncio
+    async def test_disabled_passthrough(self, quota, handler):
+        quota.enabled = False
+        called = []
+        handler.register(lambda event: called.append(event))
+
+        await handler._process_event(_event())
+
+        assert len(called) == 1
+        assert quota.get_usage() == {}
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self, quota, handler):
+        quota.set_limit("slow", max_concurrency=2)
+        running, peak = [0], [0]
+
+        async def slow(event):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.02)
+            running[0] -= 1
+
+        handler.register(_owned(slow, "slow"))
+        await asyncio.gather(*(handler._process_event(_event()) for _ in range(5)))
+
+        assert peak[0] == 2
+        usage = quota.get_usage("slow")
+        assert (usage["invocations"], usage["peak_active"], usage["active"]) == (5, 2, 0)
+
+    @pytest.mark.asyncio
+    async def test_shed_isolated_to_module(self, quota, handler):
+        quota.set_limit("flood", max_concurrency=1, max_queue=1)
+        gate = asyncio.Event()
+        flood_calls, other_calls = [], []
+
+        async def flood(event):
+            flood_calls.append(event)
+            await gate.wait()
+
+        async def other(event):
+            other_calls.append(event)
+
+        handler.register(_owned(flood, "flood"))
+        handler.register(_owned(other, "other"))
+
+        with patch("ErisPulse.Core.quota.logger") as mock_logger:
+            tasks = [asyncio.create_task(handler._process_event(_event())) for _ in range(4)]
+            await asyncio.sleep(0.02)
+            gate.set()
+            await asyncio.gather(*tasks)
+
+        assert len(flood_calls) == 2
+        assert len(other_calls) == 4
+        assert quota.get_usage("flood")["shed"] == 2
+        assert quota.get_usage("other")["shed"] == 0
+        assert "flood" in mock_logger.warning.call_args[0][0]
+
+    @pytest.mark.asyncio
+    async def test_cpu_time_recorded(self, quota, handler):
+        async def async_work(event):
+            _busy(0.01)
+
+        def sync_work(event):
+            _busy(0.01)
+
+        handler.register(_owned(async_work, "cpu_async"))
+        handler.register(_owned(sync_work, "cpu_sync"), offload=True)
+
+        await handler._process_event(_event())
+
+        assert quota.get_usage("cpu_async")["cpu_ms"] >= 10
+        assert quota.get_usage("cpu_sync")["cpu_ms"] >= 10
+
+    @pytest.mark.asyncio
+    async def test_cpu_accounting_disabled(self, quota, handler):
+        quota.cpu_accounting = False
+        handler.register(_owned(lambda event: _busy(0.01), "nocpu"))
+
+        await handler._process_event(_event())
+
+        usage = quota.get_usage("nocpu")
+        assert usage["invocations"] == 1
+        assert usage["cpu_ms"] == 0
+
+
+# ==================== 命令 ====================
+
+
+class TestCommandQuota:
+    @pytest.fixture(autouse=True)
+    def clean_commands(self):
+        yield
+        for name in ("quota_cmd", "quota_slow", "quota_fast"):
+            command.commands.pop(name, None)
+
+    @pytest.mark.asyncio
+    async def test_command_attributed_to_owner(self, quota):
+        quota.set_limit("cmdplugin", max_concurrency=1, max_queue=0)
+        gate = asyncio.Event()
+        called = []
+
+        async def handler(event):
+            called.append(event)
+            _busy(0.01)
+            await gate.wait()
+
+        command("quota_cmd")(_owned(handler, "cmdplugin"))
+        assert command.commands["quota_cmd"]["owner"] == "cmdplugin"
+
+        tasks = [asyncio.create_task(command._handle_message(_event("/quota_cmd"))) for _ in range(2)]
+        await asyncio.sleep(0.02)
+        assert len(called) == 1
+        assert quota.get_usage("cmdplugin")["waiting"] == 1
+
+        gate.set()
+        await asyncio.gather(*tasks)
+        usage = quota.get_usage("cmdplugin")
+        assert usage["invocations"] == 2
+        assert usage["cpu_ms"] >= 10
+
+    @pytest.mark.asyncio
+    async def test_slow_command_does_not_block_other_module(self, quota):
+        quota.max_concurrency = 1
+        gate = asyncio.Event()
+        fast_done = []
+
+        async def slow(event):
+            await gate.wait()
+
+        async def fast(event):
+            fast_done.append(event)
+
+        command("quota_slow")(_owned(slow, "modA"))
+        command("quota_fast")(_owned(fast, "modB"))
+
+        # 经由事件处理器分发，覆盖分发器本身的配额
+        slow_task = asyncio.create_task(command.handler._process_event(_event("/quota_slow")))
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(command.handler._process_event(_event("/quota_fast")), 1)
+
+        assert len(fast_done) == 1
+        assert not slow_task.done()
+        gate.set()
+        await slow_task
+        # 分发器本身不占用配额，只按命令所属模块计算
+        assert set(quota.get_usage()) == {"modA", "modB"}
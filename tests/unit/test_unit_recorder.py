@@ -0,0 +1,211 @@
+"""
+事件录制与回放单元测试
+
+测试录制中间件的分段压缩写入与字段脱敏、录制文件读取，以及回放报告与桩适配器的发送捕获
+"""
+
+import gzip
+import json
+
+import pytest
+
+from ErisPulse.Core import adapter
+from ErisPulse.Core.Event.base import BaseEventHandler
+from ErisPulse.Core.recorder import (
+    EventRecorder,
+    EventReplayer,
+    ReplayAdapter,
+    parse_speed,
+    read_recording,
+)
+
+
+def _event(index: int = 0, platform: str = "recmock"):
+    return {
+        "id": f"evt-{index}",
+        "type": "message",
+        "detail_type": "private",
+        "platform": platform,
+        "self": {"platform": platform, "user_id": "bot"},
+        "user_id": "u1",
+        "user_nickname": "Alice",
+        "message": [{"type": "text", "data": {"text": f"ping {index}"}}],
+        "alt_message": f"ping {index}",
+        f"{platform}_raw": {"secret": "token"},
+        f"{platform}_raw_type": "message",
+    }
+
+
+@pytest.fixture
+def handler():
+    handler = BaseEventHandler("message", "test_recorder")
+    handler.slow_threshold = 0
+    yield handler
+    handler._clear_handlers()
+
+
+# ==================== 录制 ====================
+
+
+class TestRecorder:
+    @pytest.mark.asyncio
+    async def test_records_emitted_events(self, tmp_path):
+        rec = EventRecorder(str(tmp_path), segment_events=2, redact=[], include_raw=False)
+        rec.start(adapter)
+        try:
+            assert adapter._onebot_middlewares[0] == rec.middleware
+            for index in range(5):
+                await adapter.emit(_event(index))
+        finally:
+            rec.stop()
+
+        assert rec.middleware not in adapter._onebot_middlewares
+        assert rec.recorded == 5
+        assert len(rec.segments) == 3
+        assert all(path.endswith(".jsonl.gz") for path in rec.segments)
+
+        with gzip.open(rec.segments[0], "rt", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        assert len(lines) == 2
+        assert lines[0]["event"]["id"] == "evt-0"
+        assert "recmock_raw" not in lines[0]["event"]
+        assert lines[0]["t"] <= lines[1]["t"]
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_restart(self, tmp_path):
+        from unittest.mock import AsyncMock, patch
+
+        from ErisPulse import sdk
+
+        rec = EventRecorder(str(tmp_path), redact=[], include_raw=False)
+        saved = list(adapter._onebot_middlewares)
+
+        async def uninit():
+            # 与 adapter.clear() 一致：清空中间件链
+            adapter._onebot_middlewares.clear()
+
+        rec.start(adapter)
+        try:
+            with patch.object(sdk, "recorder", rec), \
+                    patch.object(sdk, "uninit", side_effect=uninit), \
+                    patch.object(sdk, "init", AsyncMock(return_value=True)), \
+                    patch.object(sdk, "_collect_top_level_modules", return_value=set()), \
+                    patch.object(sdk, "_invalidate_module_cache"), \
+                    patch.object(sdk.adapter, "startup", AsyncMock()), \
+                    patch.object(sdk.outbox, "enabled", False), \
+                    patch.object(sdk.scheduler, "enabled", False):
+                assert await sdk._do_restart() is True
+
+            assert rec.is_recording
+            assert adapter._onebot_middlewares[0] == rec.middleware
+            await adapter.emit(_event(0))
+        finally:
+            rec.stop()
+            adapter._onebot_middlewares[:] = saved
+
+        assert rec.recorded == 1
+
+    def test_redaction_is_stable(self, tmp_path):
+        rec = EventRecorder(str(tmp_path), redact=["user_id", "user_nickname"])
+        rec.start(adapter)
+        try:
+            rec.write(_event(0))
+            rec.write(_event(1))
+        finally:
+            rec.stop()
+
+        first, second = [record["event"] for record in read_recording(str(tmp_path))]
+        assert first["user_id"].startswith("redacted:")
+        assert first["user_id"] == second["user_id"]
+        assert first["self"]["user_id"].startswith("redacted:")
+        assert first["self"]["user_id"] != first["user_id"]
+        assert first["user_nickname"] != "Alice"
+        assert first["alt_message"] == "ping 0"
+
+    def test_include_raw(self, tmp_path):
+        rec = EventRecorder(str(tmp_path), include_raw=True)
+        rec.start(adapter)
+        try:
+            rec.write(_event(0))
+        finally:
+            rec.stop()
+
+        (record,) = read_recording(rec.segments[0])
+        assert record["event"]["recmock_raw"] == {"secret": "token"}
+
+
+# ==================== 读取 ====================
+
+
+class TestReadRecording:
+    def test_plain_jsonl_with_bare_events(self, tmp_path):
+        path = tmp_path / "events.jsonl"
+        path.write_text(
+            json.dumps(_event(0)) + "\n\n" + json.dumps({"t": 1.5, "event": _event(1)}) + "\n",
+            encoding="utf-8",
+        )
+
+        records = list(read_recording(str(path)))
+        assert [r["t"] for r in records] == [0.0, 1.5]
+        assert records[1]["event"]["id"] == "evt-1"
+
+    def test_truncated_segment(self, tmp_path):
+        path = tmp_path / "events-0001.jsonl.gz"
+        data = gzip.compress(
+            "".join(json.dumps({"t": 0, "event": _event(i)}) + "\n" for i in range(50)).encode()
+        )
+        path.write_bytes(data[:-10])
+
+        records = list(read_recording(str(path)))
+        assert 0 < len(records) <= 50
+
+
+# ==================== 回放 ====================
+
+
+class TestReplay:
+    @pytest.mark.parametrize("value, expected", [
+        ("max", None), ("10x", 10.0), ("0.5", 0.5), (2, 2.0),
+    ])
+    def test_parse_speed(self, value, expected):
+        assert parse_speed(value) == expected
+
+    @pytest.mark.parametrize("value", ["fast", "0x", "-1"])
+    def test_parse_speed_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_speed(value)
+
+    @pytest.mark.asyncio
+    async def test_replay_captures_sends(self, handler):
+        async def on_message(event):
+            await event.reply("pong")
+
+        handler.register(on_message)
+        records = [{"t": 0.0, "event": _event(i, "recorded")} for i in range(20)]
+
+        replayer = EventReplayer(records, speed="max", platform="mock", concurrency=4)
+        report = await replayer.run()
+
+        assert report["events"] == 20
+        assert report["errors"] == 0
+        assert report["speed"] == "max"
+        assert report["throughput"] > 0
+        assert report["latency_ms"]["p50"] <= report["latency_ms"]["p99"] <= report["latency_ms"]["max"]
+
+        stub = replayer.stubs["mock"]
+        assert isinstance(stub, ReplayAdapter)
+        assert report["sends"] == len(stub.sent) == 20
+        assert stub.sent[0]["method"] == "Text"
+        assert stub.sent[0]["content"] == "pong"
+        assert stub.sent[0]["target_id"] == "u1"
+        assert adapter.get("mock") is None
+
+    @pytest.mark.asyncio
+    async def test_timed_replay_keeps_intervals(self):
+        records = [{"t": i * 0.1, "event": _event(i)} for i in range(3)]
+
+        report = await EventReplayer(records, speed="2x").run()
+
+        assert report["speed"] == "2x"
+        assert report["duration_s"] >= 0.09
+        assert report["events"] == 3
@@ -0,0 +1,377 @@
+"""
+任务调度器单元测试
+
+测试 cron 表达式解析、interval/once 任务执行、并发限制、错过执行策略、持久化恢复与停止
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from ErisPulse.Core.scheduler import CronExpression, Scheduler
+
+@pytest.fixture
+async def scheduler(temp_storage):
+    scheduler = Scheduler(storage=temp_storage)
+    yield scheduler
+    await scheduler.stop()
+
+
+reminders = []
+
+
+async def persistent_reminder(text):
+    reminders.append(text)
+
+
+# ==================== Cron 表达式 ====================
+
+
+class TestCronExpression:
+    def test_every_minute(self):
+        cron = CronExpression("* * * * *")
+
+        assert cron.next_after(datetime(2024, 1, 1, 12, 0, 30)) == datetime(2024, 1, 1, 12, 1)
+
+    def test_weekdays_with_names(self):
+        cron = CronExpression("30 9 * * mon-fri")
+
+        # 2024-01-06 是周六
+        assert cron.next_after(datetime(2024, 1, 6)) == datetime(2024, 1, 8, 9, 30)
+
+    def test_steps_and_lists(self):
+        cron = CronExpression("*/15 8,20 * * *")
+
+        assert cron.minutes == {0, 15, 30, 45}
+        assert cron.next_after(datetime(2024, 1, 1, 8, 50)) == datetime(2024, 1, 1, 20, 0)
+
+    def test_month_rollover_and_alias(self):
+        cron = CronExpression("@monthly")
+
+        assert cron.next_after(datetime(2024, 12, 15)) == datetime(2025, 1, 1)
+
+    def test_day_or_weekday(self):
+        # 日与周同时限定时满足其一即可：每月 13 日或每周五
+        cron = CronExpression("0 0 13 * 5")
+
+        assert cron.next_after(datetime(2024, 1, 1)) == datetime(2024, 1, 5)
+        assert cron.next_after(datetime(2024, 1, 12, 1)) == datetime(2024, 1, 13)
+
+    def test_sunday_as_seven(self):
+        assert CronExpression("0 0 * * 7").weekdays == {0}
+
+    @pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* * * foo *", "*/0 * * * *"])
+    def test_invalid(self, expression):
+        with pytest.raises(ValueError):
+            CronExpression(expression)
+
+
+# ==================== 执行 ====================
+
+
+class TestExecution:
+    @pytest.mark.asyncio
+    async def test_interval_job(self, scheduler):
+        calls = []
+        scheduler.add_job(lambda: calls.append(1), "interval", seconds=0.05, delay=0)
+        scheduler.start()
+        await asyncio.sleep(0.18)
+
+        assert 3 <= len(calls) <= 5
+        assert scheduler.get_stats()["succeeded"] == len(calls)
+
+    @pytest.mark.asyncio
+    async def test_once_job_with_arguments(self, scheduler):
+        calls = []
+
+        async def remind(user, text="hi"):
+            calls.append((user, text))
+
+        scheduler.start()
+        job = scheduler.once(remind, delay=0.02, args=("alice",), kwargs={"text": "wake up"})
+        await asyncio.sleep(0.1)
+
+        assert calls == [("alice", "wake up")]
+        assert scheduler.get_job(job.id) is None
+
+    @pytest.mark.asyncio
+    async def test_decorators(self, scheduler):
+        @scheduler.interval(60)
+        def tick():
+            pass
+
+        @scheduler.cron("0 9 * * *", job_id="morning")
+        def morning():
+            pass
+
+        ids = {job["id"] for job in scheduler.get_jobs()}
+        assert ids == {f"{tick.__module__}.{tick.__qualname__}", "morning"}
+
+    @pytest.mark.asyncio
+    async def test_duplicate_id(self, scheduler):
+        scheduler.add_job(print, "interval", seconds=10, job_id="dup")
+
+        with pytest.raises(ValueError):
+            scheduler.add_job(print, "interval", seconds=10, job_id="dup")
+        scheduler.add_job(print, "interval", seconds=20, job_id="dup", replace=True)
+        assert scheduler.get_job("dup").spec == {"seconds": 20.0}
+
+    @pytest.mark.asyncio
+    async def test_failure_recorded(self, scheduler):
+        def broken():
+            raise RuntimeError("boom")
+
+        scheduler.start()
+        job = scheduler.add_job(broken, "interval", seconds=10, delay=0)
+        await asyncio.sleep(0.05)
+
+        assert job.last_error == "RuntimeError: boom"
+        assert scheduler.get_stats()["failed"] == 1
+        assert scheduler.is_running
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self, scheduler):
+        scheduler.max_concurrency = 2
+        active = peak = 0
+
+        async def work():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+
+        scheduler.start()
+        for _ in range(6):
+            scheduler.once(work, delay=0)
+        await asyncio.sleep(0.25)
+
+        assert peak == 2
+        assert scheduler.get_stats()["succeeded"] == 6
+
+    @pytest.mark.asyncio
+    async def test_max_instances(self, scheduler):
+        started = []
+
+        async def slow():
+            started.append(1)
+            await asyncio.sleep(0.2)
+
+        scheduler.start()
+        scheduler.add_job(slow, "interval", seconds=0.03, delay=0)
+        await asyncio.sleep(0.12)
+
+        assert len(started) == 1
+        assert scheduler.get_stats()["skipped"] >= 2
+
+
+# ==================== 错过执行策略 ====================
+
+
+class TestMisfire:
+    @pytest.mark.parametrize("policy, expected", [("run_once", 1), ("skip", 0), ("run_all", 5)])
+    @pytest.mark.asyncio
+    async def test_policies(self, scheduler, policy, expected):
+        calls = []
+        job = scheduler.add_job(
+            lambda: calls.append(1), "interval", seconds=10,
+            run_at=time.time() - 45, misfire=policy, misfire_grace=1,
+        )
+        scheduler.start()
+        await asyncio.sleep(0.05)
+
+        assert len(calls) == expected
+        assert job.next_run > time.time()
+        assert scheduler.get_stats()["misfired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_within_grace_runs_normally(self, scheduler):
+        calls = []
+        scheduler.add_job(
+            lambda: calls.append(1), "interval", seconds=10,
+            run_at=time.time() - 5, misfire="skip", misfire_grace=30,
+        )
+        scheduler.start()
+        await asyncio.sleep(0.05)
+
+        assert calls == [1]
+        assert scheduler.get_stats()["misfired"] == 0
+
+    @pytest.mark.asyncio
+    async def test_run_all_capped(self, scheduler):
+        scheduler.max_catchup = 3
+        calls = []
+        scheduler.add_job(
+            lambda: calls.append(1), "interval", seconds=1,
+            run_at=time.time() - 100, misfire="run_all", misfire_grace=0,
+        )
+        scheduler.start()
+        await asyncio.sleep(0.05)
+
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_run_all_sequential(self, scheduler):
+        running, peak, calls = [0], [0], []
+
+        async def job():
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            calls.append(1)
+
+        scheduler.add_job(
+            job, "interval", seconds=10,
+            run_at=time.time() - 45, misfire="run_all", misfire_grace=1,
+        )
+        scheduler.start()
+        await asyncio.sleep(0.15)
+
+        assert len(calls) == 5
+        assert peak[0] == 1
+        stats = scheduler.get_stats()
+        assert (stats["fired"], stats["succeeded"], stats["skipped"]) == (5, 5, 0)
+
+    def test_invalid_policy(self, temp_storage):
+        with pytest.raises(ValueError):
+            Scheduler(storage=temp_storage).add_job(print, "interval", seconds=1, misfire="later")
+
+
+# ==================== 持久化 ====================
+
+
+class TestPersistence:
+    @pytest.mark.asyncio
+    async def test_once_restored_after_restart(self, temp_storage):
+        reminders.clear()
+        first = Scheduler(storage=temp_storage)
+        first.once(persistent_reminder, delay=0.05, args=("drink water",), persistent=True)
+        await first.stop()
+
+        assert reminders == []
+        second = Scheduler(storage=temp_storage)
+        second.start()
+        assert second.get_stats()["persistent"] == 1
+        await asyncio.sleep(0.15)
+        await second.stop()
+
+        assert reminders == ["drink water"]
+        assert temp_storage.Table(second.table).Select("id").Execute() == []
+
+    @pytest.mark.asyncio
+    async def test_registered_task_name(self, temp_storage):
+        first = Scheduler(storage=temp_storage)
+        first.once("remind", delay=0, args=(1,), persistent=True, job_id="r1")
+        await first.stop()
+
+        calls = []
+        second = Scheduler(storage=temp_storage)
+
+        @second.task("remind")
+        async def remind(value):
+            calls.append(value)
+
+        second.start()
+        await asyncio.sleep(0.05)
+        await second.stop()
+
+        assert calls == [1]
+
+    @pytest.mark.asyncio
+    async def test_unregistered_once_kept_in_storage(self, temp_storage):
+        first = Scheduler(storage=temp_storage)
+        first.once("missing", delay=0, persistent=True, job_id="m1")
+        await first.stop()
+
+        second = Scheduler(storage=temp_storage)
+        second.start()
+        await asyncio.sleep(0.05)
+        await second.stop()
+
+        assert second.get_job("m1") is None
+        assert temp_storage.Table(second.table).Select("id").Execute() == [("m1",)]
+
+    @pytest.mark.asyncio
+    async def test_reregistered_job_keeps_stored_schedule(self, temp_storage):
+        first = Scheduler(storage=temp_storage)
+        job = first.add_job(persistent_reminder, "interval", seconds=3600, job_id="hourly", persistent=True)
+        stored_next_run = job.next_run
+        await first.stop()
+
+        second = Scheduler(storage=temp_storage)
+        job = second.add_job(persistent_reminder, "interval", seconds=3600, job_id="hourly", persistent=True)
+        assert job.next_run == stored_next_run
+
+        # 触发方式变化时按新配置重新计算
+        third = Scheduler(storage=temp_storage)
+        job = third.add_job(persistent_reminder, "interval", seconds=60, job_id="hourly", persistent=True)
+        assert job.next_run != stored_next_run
+
+    def test_closure_rejected(self, temp_storage):
+        scheduler = Scheduler(storage=temp_storage)
+
+        with pytest.raises(ValueError):
+            scheduler.once(lambda: None, delay=1, persistent=True)
+
+    def test_unserializable_args_rejected(self, temp_storage):
+        scheduler = Scheduler(storage=temp_storage)
+
+        with pytest.raises(ValueError):
+            scheduler.once(persistent_reminder, delay=1, args=(object(),), persistent=True)
+
+    @pytest.mark.asyncio
+    async def test_remove_job_deletes_row(self, temp_storage):
+        scheduler = Scheduler(storage=temp_storage)
+        scheduler.once(persistent_reminder, delay=60, args=("x",), persistent=True, job_id="x")
+
+        assert scheduler.remove_job("x") is True
+        assert scheduler.remove_job("x") is False
+        assert temp_storage.Table(scheduler.table).Select("id").Execute() == []
+
+
+# ==================== 停止 ====================
+
+
+class TestStop:
+    @pytest.mark.asyncio
+    async def test_stop_waits_and_clears(self, scheduler):
+        finished = []
+
+        async def work():
+            await asyncio.sleep(0.05)
+            finished.append(1)
+
+        scheduler.task("named")(work)
+        scheduler.start()
+        scheduler.once(work, delay=0)
+        scheduler.add_job(work, "interval", seconds=60)
+        await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+        assert finished == [1]
+        assert not scheduler.is_running
+        assert scheduler.get_jobs() == []
+        assert scheduler._tasks == {}
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_after_timeout(self, scheduler):
+        scheduler.shutdown_timeout = 0.05
+        cancelled = []
+
+        async def hang():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+
+        scheduler.start()
+        scheduler.once(hang, delay=0)
+        await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+        assert cancelled == [1]
+        assert scheduler.get_stats()["executing"] == 0
@@ -19,6 +19,11 @@ from ErisPulse.Core.Event.session_type import (
     get_receive_type,
     convert_to_send_type,
     convert_to_receive_type,
+    resolve_session_type,
+    
+    # 会话键
+    SessionKey,
+    get_session_key,
     
     # 自动推断方法
     infer_receive_type,
@@ -264,6 +269,58 @@ class TestCustomTypes:
         assert get_target_id({"detail_type": "custom_type", "custom_id": "999"}, "TestPlatform") == "999"
 
 
+class TestSessionResolver:
+    """测试编译后的会话类型解析表"""
+
+    def setup_method(self):
+        clear_custom_types()
+
+    def teardown_method(self):
+        clear_custom_types()
+
+    def test_standard_resolution(self):
+        assert resolve_session_type("private") == ("user", "user_id")
+        assert resolve_session_type("group", "qq") == ("group", "group_id")
+        assert resolve_session_type("unknown", "qq") == ("user", "user_id")
+
+    def test_rebuilt_on_registry_change(self):
+        assert resolve_session_type("room", "matrix") == ("user", "user_id")
+
+        register_custom_type("room", "room", "room_id", platform="matrix")
+        assert resolve_session_type("room", "matrix") == ("room", "room_id")
+        assert resolve_session_type("room", "other") == ("user", "user_id")
+
+        unregister_custom_type("room", "matrix")
+        assert resolve_session_type("room", "matrix") == ("user", "user_id")
+
+        register_custom_type("room", "room", "room_id", platform="matrix")
+        clear_custom_types("matrix")
+        assert resolve_session_type("room", "matrix") == ("user", "user_id")
+
+    def test_platform_type_overrides_global(self):
+        register_custom_type("group", "team", "team_id", platform="slack")
+
+        assert resolve_session_type("group", "slack") == ("team", "team_id")
+        assert resolve_session_type("group") == ("group", "group_id")
+
+    def test_session_key_interned(self):
+        event = {"platform": "qq", "detail_type": "group", "group_id": 123}
+
+        key = get_session_key(event)
+
+        assert key is SessionKey("qq", "group", "123")
+        assert key is get_session_key(dict(event, user_id="another"))
+        assert str(key) == "qq:group:123"
+        assert key != SessionKey("qq", "user", "123")
+        assert {key: 1}[SessionKey("qq", "group", "123")] == 1
+
+    def test_session_key_pickle_reinterns(self):
+        import pickle
+
+        key = SessionKey("qq", "user", "1")
+        assert pickle.loads(pickle.dumps(key)) is key
+
+
 class TestUtilityMethods:
     """测试工具方法"""
     
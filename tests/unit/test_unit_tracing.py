@@ -0,0 +1,234 @@
+"""
+事件追踪单元测试
+
+测试采样、追踪上下文从 adapter.emit 到处理器/回复/发送/API 调用的传递，以及 JSONL / Chrome Trace 导出
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from ErisPulse.Core import adapter
+from ErisPulse.Core.Bases.adapter import BaseAdapter, SendDSL
+from ErisPulse.Core.Event.base import BaseEventHandler
+from ErisPulse.Core.tracing import Tracer, tracer
+
+
+class TraceAdapter(BaseAdapter):
+    class Send(SendDSL):
+        def Text(self, text: str):
+            return asyncio.create_task(
+                self._adapter.call_api(
+                    "send_message", target=self._target_id, text=text
+                )
+            )
+
+        def Reply(self, message_id: str):
+            return self
+
+    async def call_api(self, endpoint: str, **params):
+        await asyncio.sleep(0)
+        return {"status": "ok", "message_id": "m1"}
+
+    async def start(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
+def _event():
+    return {
+        "id": "evt-1",
+        "type": "message",
+        "detail_type": "private",
+        "platform": "tracemock",
+        "self": {"user_id": "bot"},
+        "user_id": "u1",
+        "message": [{"type": "text", "data": {"text": "ping"}}],
+        "alt_message": "ping",
+    }
+
+
+@pytest.fixture
+def sampled():
+    original = tracer.sample_rate
+    tracer.clear()
+    tracer.configure(sample_rate=1.0)
+    yield tracer
+    tracer.configure(sample_rate=original)
+    tracer.clear()
+
+
+@pytest.fixture
+def handler():
+    adapter.register("tracemock", TraceAdapter)
+    handler = BaseEventHandler("message", "test_tracing")
+    handler.slow_threshold = 0
+    yield handler
+    handler._clear_handlers()
+    adapter.unregister("tracemock")
+
+
+# ==================== 采样 ====================
+
+
+class TestSampling:
+    @pytest.mark.asyncio
+    async def test_unsampled_records_nothing(self, handler):
+        tracer.clear()
+
+        async def on_message(event):
+            await event.reply("pong")
+
+        handler.register(on_message)
+        with patch.object(tracer, "sample_rate", 0.0):
+            await adapter.emit(_event())
+
+        assert tracer.get_spans() == []
+
+    def test_sample_rate(self):
+        local = Tracer()
+        local.configure(sample_rate=0.5)
+
+        with patch("ErisPulse.Core.tracing.random.random", side_effect=[0.2, 0.7]):
+            with local.trace("a") as first:
+                pass
+            with local.trace("b") as second:
+                pass
+
+        assert first is not None and second is None
+        assert local.get_stats()["sampled"] == 1
+
+    def test_invalid_sample_rate(self):
+        with pytest.raises(ValueError):
+            Tracer().configure(sample_rate=2)
+
+    def test_bounded_store(self):
+        local = Tracer()
+        local.configure(sample_rate=1.0, max_spans=3)
+        for _ in range(5):
+            with local.trace("e"):
+                pass
+
+        assert len(local.get_spans()) == 3
+
+
+# ==================== 上下文传递 ====================
+
+
+class TestPropagation:
+    @pytest.mark.asyncio
+    async def test_emit_to_call_api(self, handler, sampled):
+        @adapter.middleware
+        async def tag(data):
+            data["tagged"] = True
+            return data
+
+        async def on_message(event):
+            await event.reply("pong")
+
+        handler.register(on_message)
+        try:
+            await adapter.emit(_event())
+        finally:
+            adapter._onebot_middlewares.remove(tag)
+
+        spans = {
+            span["name"]: span for span in tracer.get_spans()
+            if span["name"] != "dispatch" or span["attrs"]["handler"].endswith("_process_event")
+        }
+        root = spans["emit"]
+        assert root["parent_id"] is None
+        assert root["attrs"]["event_id"] == "evt-1"
+        assert len({span["trace_id"] for span in spans.values()}) == 1
+
+        def parent_of(name):
+            parent_id = spans[name]["parent_id"]
+            return next(n for n, s in spans.items() if s["span_id"] == parent_id)
+
+        assert parent_of("middleware") == "emit"
+        assert spans["middleware"]["attrs"]["middleware"].endswith("tag")
+        assert parent_of("handler") == "dispatch"
+        assert spans["handler"]["attrs"]["handler"].endswith("on_message")
+        assert parent_of("reply") == "handler"
+        assert parent_of("send.Text") == "reply"
+        assert spans["send.Text"]["attrs"]["target_id"] == "u1"
+        assert parent_of("call_api") == "send.Text"
+        assert spans["call_api"]["attrs"]["endpoint"] == "send_message"
+
+        summary = tracer.get_traces()[0]
+        assert summary["name"] == "emit"
+        assert summary["spans"] == len(tracer.get_spans())
+
+    @pytest.mark.asyncio
+    async def test_handler_error_recorded(self, handler, sampled):
+        async def broken(event):
+            raise RuntimeError("boom")
+
+        handler.register(broken)
+        with patch("ErisPulse.Core.Event.base.logger"):
+            await adapter.emit(_event())
+
+        span = next(
+            s for s in tracer.get_spans()
+            if s["name"] == "handler" and s["attrs"]["handler"].endswith("broken")
+        )
+        assert span["error"] == "RuntimeError: boom"
+
+    @pytest.mark.asyncio
+    async def test_modifiers_not_recorded(self, handler, sampled):
+        send = adapter.get("tracemock").Send
+
+        with tracer.trace("manual"):
+            await send.To("user", "u2").Reply("m0").Text("hi")
+
+        names = [span["name"] for span in tracer.get_spans()]
+        assert "send.Reply" not in names
+        assert "send.Text" in names
+
+    @pytest.mark.asyncio
+    async def test_sends_outside_trace_untouched(self, handler):
+        tracer.clear()
+        send = adapter.get("tracemock").Send
+
+        assert (await send.To("user", "u2").Text("hi"))["status"] == "ok"
+        assert tracer.get_spans() == []
+
+
+# ==================== 导出 ====================
+
+
+class TestExport:
+    @pytest.fixture
+    def local(self):
+        local = Tracer()
+        local.configure(sample_rate=1.0)
+        with local.trace("emit", event_id="e1"):
+            with local.span("handler", "handler", handler=_event):
+                pass
+        return local
+
+    def test_export_jsonl(self, local, tmp_path):
+        path = tmp_path / "spans.jsonl"
+
+        assert local.export(str(path)) == 2
+        lines = [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+        assert [line["name"] for line in lines] == ["handler", "emit"]
+        assert lines[0]["attrs"]["handler"].endswith("_event")
+
+    def test_export_chrome(self, local, tmp_path):
+        path = tmp_path / "trace.json"
+
+        assert local.export(str(path), format="chrome") == 2
+        data = json.loads(path.read_text("utf-8"))
+        events = data["traceEvents"]
+        assert [e["name"] for e in events] == ["emit", "handler"]
+        assert all(e["ph"] == "X" and e["tid"] == 1 for e in events)
+        assert events[0]["args"]["event_id"] == "e1"
+
+    def test_invalid_format(self, local, tmp_path):
+        with pytest.raises(ValueError):
+            local.export(str(tmp_path / "x"), format="xml")